@@ -8,11 +8,50 @@ import shutil
 import subprocess
 import json
 import re
+import sys
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import redirect_stdout
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from ..utils.archive_ops import StreamingArchive, detect_archive_format
+from ..utils.file_ops import is_text_file
+
+if TYPE_CHECKING:
+    from ..utils.git_ops import FastImportSession
+    from ..utils.pipeline import Pipeline
+    from ..utils.pod_graph import PodGraph
+    from ..utils.spec_index import SpecIndex
+    from ..utils.template_ops import TemplatePackage
 
 __version__ = "1.0.0"
 
+
+class ProjectEntry:
+    """生成项目中的一个条目（目录或文件），内容按需从模板读取"""
+    
+    def __init__(self, path: str, is_dir: bool = False, mode: int = 0o644,
+                 source: Optional[Path] = None,
+                 transform: Optional[Callable[[bytes], bytes]] = None):
+        self.path = path  # 以项目名开头、使用 / 分隔的相对路径
+        self.is_dir = is_dir
+        self.mode = mode
+        self.source = source
+        self.transform = transform
+    
+    def source_path(self) -> Path:
+        """模板中的源文件（目录条目没有源文件）"""
+        if self.source is None:
+            raise ValueError(f"{self.path} 没有源文件")
+        return self.source
+    
+    def read_bytes(self) -> bytes:
+        """读取（并转换）文件内容"""
+        data = self.source_path().read_bytes()
+        return self.transform(data) if self.transform else data
+
+
 class CocoaPodsScaffold:
     def __init__(self):
         self.template_name = "NBTemplateModule"
@@ -117,11 +156,6 @@ class CocoaPodsScaffold:
     
     def find_template_files(self, template_dir: Path) -> List[Path]:
         """查找需要处理的文件"""
-        text_extensions = {
-            '.swift', '.h', '.m', '.mm', '.podspec', '.md', '.txt',
-            '.json', '.yml', '.yaml', '.plist', '.pbxproj', '.xcscheme'
-        }
-        
         files = []
         for root, dirs, filenames in os.walk(template_dir):
             # 跳过 .git 目录
@@ -130,7 +164,7 @@ class CocoaPodsScaffold:
             
             for filename in filenames:
                 file_path = Path(root) / filename
-                if file_path.suffix in text_extensions or filename == "Podfile":
+                if is_text_file(file_path):
                     files.append(file_path)
         
         return files
@@ -191,25 +225,31 @@ class CocoaPodsScaffold:
                 shutil.rmtree(example_dir)
                 print("🗑️  已移除 Example 目录")
     
+    def render_podspec_metadata(self, content: str, module_name: str) -> str:
+        """返回更新元数据后的 podspec 内容"""
+        # 更新基本信息
+        author = self.config_manager.get('author', 'Unknown')
+        email = self.config_manager.get('email', 'unknown@example.com')
+        
+        replacements = {
+            r"s\.author\s*=\s*['\"].*?['\"]": f"s.author = '{author}'",
+            r"s\.email\s*=\s*['\"].*?['\"]": f"s.email = '{email}'",
+            r"s\.summary\s*=\s*['\"].*?['\"]": f"s.summary = 'A brief description of {module_name}'",
+            r"s\.description\s*=\s*['\"].*?['\"]": f"s.description = 'A longer description of {module_name} library'",
+        }
+        
+        for pattern, replacement in replacements.items():
+            content = re.sub(pattern, replacement, content)
+        
+        return content
+    
     def update_podspec_metadata(self, podspec_path: Path, module_name: str):
         """更新 podspec 元数据"""
         try:
             with open(podspec_path, 'r', encoding='utf-8') as f:
                 content = f.read()
             
-            # 更新基本信息
-            author = self.config_manager.get('author', 'Unknown')
-            email = self.config_manager.get('email', 'unknown@example.com')
-            
-            replacements = {
-                r"s\.author\s*=\s*['\"].*?['\"]": f"s.author = '{author}'",
-                r"s\.email\s*=\s*['\"].*?['\"]": f"s.email = '{email}'",
-                r"s\.summary\s*=\s*['\"].*?['\"]": f"s.summary = 'A brief description of {module_name}'",
-                r"s\.description\s*=\s*['\"].*?['\"]": f"s.description = 'A longer description of {module_name} library'",
-            }
-            
-            for pattern, replacement in replacements.items():
-                content = re.sub(pattern, replacement, content)
+            content = self.render_podspec_metadata(content, module_name)
             
             with open(podspec_path, 'w', encoding='utf-8') as f:
                 f.write(content)
@@ -219,11 +259,8 @@ class CocoaPodsScaffold:
         except Exception as e:
             print(f"⚠️  更新 podspec 文件失败: {e}")
     
-    def create_project(self, module_name: str, include_example: bool = True,
-                      output_dir: str = ".", force_update: bool = False) -> bool:
-        """创建新项目"""
-        import tempfile
-        
+    def ensure_template(self, force_update: bool = False) -> bool:
+        """确保模板目录可用"""
         # 首先检查模板目录是否存在
         template_dir = self.templates_dir / self.template_name
         
@@ -259,6 +296,18 @@ class CocoaPodsScaffold:
             print("请确保模板仓库包含 template/NBTemplateModule 目录")
             return False
         
+        return True
+    
+    def create_project(self, module_name: str, include_example: bool = True,
+                       output_dir: str = ".", force_update: bool = False,
+                       git_init: bool = False, remote_url: Optional[str] = None,
+                       template_package: Optional[str] = None) -> bool:
+        """创建新项目"""
+        import tempfile
+        
+        if not template_package and not self.ensure_template(force_update):
+            return False
+        
         # 确保输出目录存在
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
@@ -272,6 +321,15 @@ class CocoaPodsScaffold:
         print(f"🚀 正在创建项目: {module_name}")
         print(f"📁 输出路径: {project_path}")
         
+        if git_init or template_package:
+            entries = self._project_entries(module_name, include_example, template_package)
+            if not self._create_project_from_entries(module_name, entries, project_path,
+                                                     git_init, remote_url):
+                return False
+            print(f"✅ 项目创建成功: {project_path}")
+            self.print_next_steps(module_name, project_path, include_example)
+            return True
+        
         # 使用临时目录处理模板
         with tempfile.TemporaryDirectory() as tmpdir:
             temp_project_path = Path(tmpdir) / module_name
@@ -331,6 +389,252 @@ class CocoaPodsScaffold:
         
         return True
     
+    def iter_project_entries(self, module_name: str,
+                             include_example: bool = True) -> Iterator[ProjectEntry]:
+        """按 create_project 的处理规则生成项目条目，不写入任何中间目录"""
+        template_module_dir = self.templates_dir / self.template_name
+        old_bytes = self.template_name.encode('utf-8')
+        new_bytes = module_name.encode('utf-8')
+        
+        # 收集模板路径：模块目录内容在前，根级别文件覆盖同名条目
+        sources: Dict[str, Path] = {}
+        if template_module_dir.exists():
+            for root, dirs, filenames in os.walk(template_module_dir):
+                dirs.sort()
+                rel_root = Path(root).relative_to(template_module_dir)
+                for name in dirs + sorted(filenames):
+                    sources[(rel_root / name).as_posix()] = Path(root) / name
+        for item in sorted(self.templates_dir.iterdir()):
+            if item.is_file():
+                sources[item.name] = item
+        
+        def replace_content(data: bytes) -> bytes:
+            return data.replace(old_bytes, new_bytes)
+        
+        def replace_podspec(data: bytes) -> bytes:
+            data = replace_content(data)
+            try:
+                content = self.render_podspec_metadata(data.decode('utf-8'), module_name)
+                return content.encode('utf-8')
+            except Exception as e:
+                print(f"⚠️  更新 podspec 文件失败: {e}")
+                return data
+        
+        yield ProjectEntry(module_name, is_dir=True, mode=0o755)
+        
+        for rel_path, source in sources.items():
+            parts = [part.replace(self.template_name, module_name)
+                     for part in rel_path.split('/')]
+            if not include_example and parts[0] == "Example":
+                continue
+            
+            new_rel = '/'.join(parts)
+            mode = source.stat().st_mode & 0o777
+            if source.is_dir():
+                yield ProjectEntry(f"{module_name}/{new_rel}", is_dir=True, mode=mode)
+                continue
+            
+            # 与 create_project 一致，跳过临时文件
+            if parts[-1].endswith(('.orig', '~')):
+                continue
+            
+            transform = None
+            if new_rel == f"{module_name}.podspec":
+                transform = replace_podspec
+            elif is_text_file(Path(new_rel)):
+                transform = replace_content
+            yield ProjectEntry(f"{module_name}/{new_rel}", mode=mode,
+                               source=source, transform=transform)
+    
+    def iter_package_entries(self, package: 'TemplatePackage', module_name: str,
+                             include_example: bool = True) -> Iterator[ProjectEntry]:
+        """按模板包生成项目条目"""
+        yield ProjectEntry(module_name, is_dir=True, mode=0o755)
+        
+        def render(data: bytes) -> bytes:
+            return package.render(data, module_name)
+        
+        for rel_path, source, mode, needs_render in package.iter_files(module_name):
+            if not include_example and rel_path.split('/')[0] == "Example":
+                continue
+            yield ProjectEntry(f"{module_name}/{rel_path}", mode=mode, source=source,
+                               transform=render if needs_render else None)
+    
+    def _project_entries(self, module_name: str, include_example: bool,
+                         template_package: Optional[str]) -> Iterator[ProjectEntry]:
+        """根据是否指定模板包选择条目来源"""
+        if template_package:
+            from ..utils.template_ops import TemplatePackage
+            package = TemplatePackage(Path(template_package))
+            return self.iter_package_entries(package, module_name, include_example)
+        return self.iter_project_entries(module_name, include_example)
+    
+    def create_archive(self, module_name: str, archive: str,
+                       include_example: bool = True, force_update: bool = False,
+                       archive_format: Optional[str] = None,
+                       template_package: Optional[str] = None) -> bool:
+        """将新项目直接流式写入归档文件，'-' 表示写到标准输出"""
+        to_stdout = archive == '-'
+        stream = sys.stdout.buffer if to_stdout else None
+        archive_format = archive_format or detect_archive_format(archive)
+        
+        # 写到标准输出时，提示信息改走标准错误
+        with redirect_stdout(sys.stderr if to_stdout else sys.stdout):
+            if not template_package and not self.ensure_template(force_update):
+                return False
+            
+            print(f"🚀 正在生成归档: {module_name}")
+            print(f"📦 归档路径: {'<stdout>' if to_stdout else archive} ({archive_format})")
+            
+            if stream is None:
+                Path(archive).parent.mkdir(parents=True, exist_ok=True)
+                stream = open(archive, 'wb')
+            
+            try:
+                entries = self._project_entries(module_name, include_example, template_package)
+                count = self._write_archive(stream, archive_format, entries)
+            except Exception as e:
+                print(f"❌ 生成归档失败: {e}")
+                if not to_stdout:
+                    stream.close()
+                    Path(archive).unlink(missing_ok=True)
+                return False
+            finally:
+                if not to_stdout:
+                    stream.close()
+            
+            print(f"✅ 归档创建成功，共 {count} 个条目")
+        return True
+    
+    def _iter_loaded_entries(self, entries: Iterator[ProjectEntry]) -> Iterator[Tuple[ProjectEntry, Optional[bytes]]]:
+        """需要替换内容的文件在线程池中预读，窗口大小固定以限制内存
+        
+        Yields:
+            (条目, 转换后的内容)；目录和原样复制的文件内容为 None
+        """
+        workers = min(8, (os.cpu_count() or 1) + 4)
+        window = workers * 2
+        pending: Deque[Tuple[ProjectEntry, Optional['Future[bytes]']]] = deque()
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for entry in entries:
+                future = None
+                if not entry.is_dir and entry.transform is not None:
+                    future = executor.submit(entry.read_bytes)
+                pending.append((entry, future))
+                if len(pending) >= window:
+                    entry, future = pending.popleft()
+                    yield entry, future.result() if future else None
+            while pending:
+                entry, future = pending.popleft()
+                yield entry, future.result() if future else None
+    
+    def _write_archive(self, stream: BinaryIO, archive_format: str,
+                       entries: Iterator[ProjectEntry]) -> int:
+        """将条目写入归档，返回条目数量"""
+        count = 0
+        with StreamingArchive(stream, archive_format) as writer:
+            for entry, data in self._iter_loaded_entries(entries):
+                if entry.is_dir:
+                    writer.add_directory(entry.path, entry.mode)
+                elif data is not None:
+                    writer.add_bytes(entry.path, data, entry.mode)
+                else:
+                    with open(entry.source_path(), 'rb') as f:
+                        writer.add_file(entry.path, f, os.fstat(f.fileno()).st_size, entry.mode)
+                count += 1
+        return count
+    
+    def materialize_project(self, entries: Iterator[ProjectEntry], base_dir: Path,
+                            git_session: Optional['FastImportSession'] = None) -> int:
+        """将条目写入 base_dir，同时（可选）把文件内容写入 fast-import 会话
+        
+        条目路径的第一级（项目名）会被 base_dir 替代。
+        """
+        count = 0
+        for entry, data in self._iter_loaded_entries(entries):
+            rel_path = entry.path.partition('/')[2]
+            target = base_dir / rel_path if rel_path else base_dir
+            if entry.is_dir:
+                target.mkdir(parents=True, exist_ok=True)
+                continue
+            
+            target.parent.mkdir(parents=True, exist_ok=True)
+            executable = bool(entry.mode & 0o111)
+            if data is not None:
+                target.write_bytes(data)
+                if git_session is not None:
+                    git_session.add_file(rel_path, data, executable)
+            else:
+                with open(entry.source_path(), 'rb') as src, open(target, 'wb') as dst:
+                    size = os.fstat(src.fileno()).st_size
+                    chunks = iter(lambda: src.read(1024 * 1024), b'')
+                    if git_session is not None:
+                        def tee(chunks: Iterator[bytes] = chunks, dst: BinaryIO = dst) -> Iterator[bytes]:
+                            for chunk in chunks:
+                                dst.write(chunk)
+                                yield chunk
+                        git_session.add_stream(rel_path, tee(), size, executable)
+                    else:
+                        for chunk in chunks:
+                            dst.write(chunk)
+            os.chmod(target, entry.mode)
+            count += 1
+        return count
+    
+    def _create_project_from_entries(self, module_name: str,
+                                     entries: Iterator[ProjectEntry], project_path: Path,
+                                     git_init: bool = False,
+                                     remote_url: Optional[str] = None) -> bool:
+        """在临时目录中生成项目，成功后再原子移动到目标位置
+        
+        git_init 为 True 时，生成文件的同时通过 git fast-import 写入首次提交。
+        """
+        import tempfile
+        from ..utils.git_ops import GitOperations
+        
+        staging = Path(tempfile.mkdtemp(prefix=f".{module_name}.", dir=project_path.parent))
+        try:
+            if not git_init:
+                self.materialize_project(entries, staging)
+                staging.rename(project_path)
+                return True
+            
+            branch = self.config_manager.get('git.default_branch', 'main')
+            template = self.config_manager.get('git.commit_template', '{message}')
+            message = template.format(message=f"initial commit of {module_name}")
+            author = self.config_manager.get('author', 'Unknown')
+            email = self.config_manager.get('email', 'unknown@example.com')
+            
+            git = GitOperations(str(staging))
+            if not git.init_repo(initial_branch=branch):
+                return False
+            
+            session = git.start_fast_import(branch)
+            try:
+                count = self.materialize_project(entries, staging, session)
+            except Exception:
+                session.abort()
+                raise
+            if not session.commit(message, author, email):
+                return False
+            
+            # 由提交直接生成索引，无需重新暂存文件
+            git.run_git_command(['read-tree', 'HEAD'])
+            print(f"✅ 已通过 git fast-import 提交 {count} 个文件到 {branch} 分支")
+            
+            if remote_url and not git.add_remote('origin', remote_url):
+                return False
+            
+            staging.rename(project_path)
+            return True
+        except Exception as e:
+            print(f"❌ 生成项目失败: {e}")
+            return False
+        finally:
+            if staging.exists():
+                shutil.rmtree(staging)
+    
     def print_next_steps(self, module_name: str, project_path: Path, include_example: bool):
         """打印下一步操作"""
         print("\n📋 接下来你可以：")
@@ -368,27 +672,886 @@ class CocoaPodsScaffold:
         else:
             print("❌ 没有找到模板")
 
+def rename_module(root: Path, old_name: str, new_name: str, dry_run: bool = False,
+                  use_git: bool = True, jobs: Optional[int] = None) -> bool:
+    """在已有项目中重命名模块（路径 + 文件内容）"""
+    from ..utils.rename_ops import ModuleRenamer
+    
+    if not root.is_dir():
+        print(f"❌ 目录不存在: {root}")
+        return False
+    if old_name == new_name:
+        print("❌ 新旧名称相同")
+        return False
+    
+    renamer = ModuleRenamer(root, old_name, new_name, jobs=jobs, use_git=use_git)
+    print(f"🔍 正在扫描: {renamer.root}")
+    content_files, path_renames = renamer.scan()
+    print(f"📋 需要替换内容的文件: {len(content_files)}，需要重命名的路径: {len(path_renames)}")
+    
+    conflicts = renamer.check_conflicts()
+    if conflicts:
+        print("❌ 以下目标路径已存在:")
+        for path in conflicts:
+            print(f"  - {path}")
+        return False
+    
+    if dry_run:
+        for path in content_files:
+            print(f"替换内容: {path.relative_to(renamer.root)}")
+        for old_path, new_path in path_renames:
+            print(f"重命名: {old_path.relative_to(renamer.root)} -> {new_path.name}")
+        print("🔍 干运行模式完成")
+        return True
+    
+    stats = renamer.apply()
+    print(f"✅ 重命名完成: {old_name} -> {new_name}")
+    print(f"  替换内容: {stats['files']} 个文件，共 {stats['replacements']} 处")
+    print(f"  重命名路径: {stats['renamed']} 个")
+    if stats['git_moved']:
+        print(f"  Git 索引移动: {stats['git_moved']} 个文件")
+    return True
+
+def extract_template(source: Path, token: str, output: Optional[Path] = None,
+                     includes: Optional[List[str]] = None,
+                     excludes: Optional[List[str]] = None,
+                     jobs: Optional[int] = None) -> bool:
+    """从已有模块提取模板包"""
+    from ..utils.template_ops import TemplateExtractor
+    
+    if not source.is_dir():
+        print(f"❌ 目录不存在: {source}")
+        return False
+    
+    output = output or Path(f"{token}-template")
+    if output.exists() and any(output.iterdir()):
+        print(f"❌ 输出目录已存在且不为空: {output}")
+        return False
+    output.mkdir(parents=True, exist_ok=True)
+    
+    extractor = TemplateExtractor(source, token, includes, excludes, jobs)
+    print(f"🔍 正在从 {extractor.source} 提取模板")
+    variants = ', '.join(f"{value} -> {{{{{key}}}}}"
+                         for key, value in extractor.variants.items())
+    print(f"📋 名称变体: {variants}")
+    
+    stats = extractor.extract(output)
+    print(f"✅ 模板包已生成: {output.resolve()}")
+    print(f"  文件: {stats['files']} 个，其中 {stats['rendered']} 个包含占位符（共 {stats['replacements']} 处）")
+    print(f"  路径含占位符: {stats['renamed']} 个")
+    print(f"💡 使用方式: lee-devkit pod create MyNewModule --template-package {output}")
+    return True
+
+# 创建项目后可选执行的步骤：名称 -> (依赖的步骤, 说明)
+# git 提交依赖 pod install，保证 Podfile.lock 等生成文件一并提交
+POST_CREATE_STEPS = {
+    'pod-install': ([], 'Example 目录执行 pod install'),
+    'git': (['pod-install'], 'Git 初始化并提交'),
+    'open': ([], '使用编辑器打开项目'),
+}
+
+def build_post_create_pipeline(project_path: Path, step_names: List[str], config: Any,
+                               jobs: Optional[int] = None) -> 'Pipeline':
+    """构建创建项目后的流水线，只保留所选步骤之间的依赖"""
+    from ..utils.git_ops import GitOperations
+    from ..utils.pipeline import Pipeline, PipelineStep
+    from ..utils.tools import resolve_tool, run_tool
+    
+    def run(command: List[str], cwd: Path) -> bool:
+        result = run_tool(command, cwd=cwd)
+        if result.returncode != 0:
+            print(f"❌ 命令执行失败: {' '.join(command)}")
+            print(f"错误: {(result.stderr or result.stdout).strip()}")
+            return False
+        return True
+    
+    def pod_install() -> bool:
+        example_dir = project_path / "Example"
+        if not (example_dir / "Podfile").exists():
+            print("⚠️  未找到 Example/Podfile，跳过 pod install")
+            return True
+        return run(resolve_tool('pod', config) + ['install'], example_dir)
+    
+    def git_commit() -> bool:
+        git = GitOperations(str(project_path))
+        if not (project_path / ".git").exists():
+            branch = config.get('git.default_branch', 'main')
+            if not git.init_repo(initial_branch=branch):
+                return False
+        elif not git.has_uncommitted_changes():
+            print("✅ 工作区没有需要提交的更改")
+            return True
+        template = config.get('git.commit_template', '{message}')
+        message = template.format(message=f"initial commit of {project_path.name}")
+        return git.add_files() and git.commit(message)
+    
+    def open_editor() -> bool:
+        editor = resolve_tool('editor', default=config.get('editor', 'code'))
+        return run(editor + [str(project_path)], project_path)
+    
+    actions = {'pod-install': pod_install, 'git': git_commit, 'open': open_editor}
+    
+    steps = []
+    for name in step_names:
+        depends_on, description = POST_CREATE_STEPS[name]
+        steps.append(PipelineStep(
+            name, actions[name],
+            depends_on=[dep for dep in depends_on if dep in step_names],
+            description=description
+        ))
+    return Pipeline(steps, max_workers=jobs)
+
+def run_post_create(project_path: Path, step_names: List[str], config: Any,
+                    jobs: Optional[int] = None) -> bool:
+    """执行创建项目后的流水线并打印每个步骤的耗时"""
+    from ..utils.pipeline import Pipeline
+    
+    print("\n🔧 正在执行创建后步骤...")
+    pipeline = build_post_create_pipeline(project_path, step_names, config, jobs)
+    results = pipeline.run()
+    Pipeline.print_summary(results, "创建后步骤耗时")
+    return all(result.success for result in results.values())
+
+def parse_post_create_steps(value: Optional[str]) -> List[str]:
+    """解析 --post-create 参数，all 表示全部步骤"""
+    if not value:
+        return []
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    if 'all' in names:
+        return list(POST_CREATE_STEPS)
+    unknown = [name for name in names if name not in POST_CREATE_STEPS]
+    if unknown:
+        raise ValueError(f"未知的创建后步骤: {', '.join(unknown)}（可选: {', '.join(POST_CREATE_STEPS)}, all）")
+    return names
+
+def load_pod_graph(root: Path, config: Any = None, use_cache: bool = True,
+                   jobs: Optional[int] = None) -> 'PodGraph':
+    """构建 root 下的 pod 依赖图（默认使用缓存目录中的解析缓存）"""
+    from ..utils.pod_graph import PodGraph
+    
+    cache_dir = config.get_cache_dir() if (config is not None and use_cache) else None
+    return PodGraph.build(root, cache_dir=cache_dir, jobs=jobs)
+
+def show_pod_graph(root: Path, config: Any = None, output_format: str = 'text',
+                   output: Optional[str] = None, reverse: Optional[str] = None,
+                   include_external: bool = False, use_cache: bool = True,
+                   jobs: Optional[int] = None) -> bool:
+    """输出 pod 依赖图（文本报告、DOT 或 JSON）"""
+    if not root.is_dir():
+        print(f"❌ 目录不存在: {root}")
+        return False
+    
+    graph = load_pod_graph(root, config, use_cache, jobs)
+    if reverse and reverse not in graph.nodes:
+        print(f"❌ 未找到 pod: {reverse}")
+        return False
+    
+    if output_format == 'dot':
+        content = graph.to_dot(include_external=include_external)
+    elif output_format == 'json':
+        content = json.dumps(graph.to_json(), indent=2, ensure_ascii=False) + '\n'
+    else:
+        content = None
+    
+    if content is not None:
+        if output:
+            Path(output).write_text(content, encoding='utf-8')
+            print(f"✅ 已导出依赖图: {output}")
+        else:
+            sys.stdout.write(content)
+        return not graph.find_cycles()
+    
+    # 文本报告
+    stats = graph.stats
+    print(f"📋 共 {len(graph.nodes)} 个 pod（解析 {stats['parsed']} 个，缓存命中 {stats['cached']} 个）")
+    for name, path in graph.duplicates:
+        print(f"⚠️  重复的 pod 名称 {name}: {path}（已忽略）")
+    for node in graph.nodes.values():
+        if node.error:
+            print(f"⚠️  无法解析 {node.path}: {node.error}")
+    
+    if reverse:
+        direct = graph.reverse_dependencies(reverse)
+        transitive = graph.reverse_dependencies(reverse, transitive=True)
+        print(f"\n🔍 依赖 {reverse} 的 pod:")
+        print(f"  直接: {', '.join(direct) or '无'}")
+        print(f"  间接: {', '.join(p for p in transitive if p not in direct) or '无'}")
+    else:
+        print("\n📦 构建层级:")
+        for index, level in enumerate(graph.levels()):
+            print(f"  {index}: {', '.join(level)}")
+    
+    cycles = graph.find_cycles()
+    if cycles:
+        print("\n❌ 存在循环依赖:")
+        for cycle in cycles:
+            print(f"  - {' -> '.join(cycle + [cycle[0]])}")
+        return False
+    print("\n✅ 没有循环依赖")
+    return True
+
+def resolve_lockfile_path(path: Path, name: str = 'Podfile.lock') -> Path:
+    """目录参数解析为其中的锁文件"""
+    return path / name if path.is_dir() else path
+
+def check_sandbox(path: Path) -> bool:
+    """比较 Podfile.lock 与 Pods/Manifest.lock，判断是否需要重新 pod install"""
+    from ..utils.lockfile import Lockfile, LockfileError, compare_lockfiles
+    
+    lockfile_path = resolve_lockfile_path(path)
+    manifest_path = lockfile_path.parent / 'Pods' / 'Manifest.lock'
+    if not lockfile_path.is_file():
+        print(f"❌ 未找到 Podfile.lock: {lockfile_path}")
+        return False
+    if not manifest_path.is_file():
+        print(f"❌ 未找到 {manifest_path}，请执行 pod install")
+        return False
+    
+    try:
+        changes = compare_lockfiles(Lockfile.from_file(lockfile_path), Lockfile.from_file(manifest_path))
+    except LockfileError as e:
+        print(f"❌ 无法解析锁文件: {e}")
+        return False
+    
+    if not changes:
+        print("✅ 沙盒与 Podfile.lock 一致")
+        return True
+    for mark, name, detail in changes:
+        print(f"{mark}{name} ({detail})")
+    print(f"❌ {len(changes)} 个 pod 与 Podfile.lock 不一致，请执行 pod install")
+    return False
+
+def open_spec_index(config: Any, jobs: Optional[int] = None) -> 'SpecIndex':
+    """打开 spec 仓库索引，并按本地 checkout 增量更新"""
+    from ..utils.spec_index import SpecIndex, spec_index_path, update_spec_index
+    
+    index = SpecIndex(spec_index_path(config.get_cache_dir()), jobs=jobs)
+    update_spec_index(index, sorted(config.get_spec_repos()))
+    return index
+
+def show_outdated(path: Path, config: Any, output_format: str = 'text',
+                  jobs: Optional[int] = None) -> bool:
+    """离线检查 Podfile.lock 中的 pod 在本地 spec 仓库中是否有更新的版本"""
+    from ..utils.lockfile import Lockfile, LockfileError
+    from ..utils.podspec import version_key
+    
+    lockfile_path = resolve_lockfile_path(path)
+    try:
+        lockfile = Lockfile.from_file(lockfile_path)
+    except (LockfileError, OSError) as e:
+        print(f"❌ 无法读取 {lockfile_path}: {e}")
+        return False
+    
+    spec_repos = config.get_spec_repos()
+    names_by_url = {url: name for name, url in spec_repos.items()}
+    rows: List[Dict[str, Any]] = []
+    with open_spec_index(config, jobs) as index:
+        for name, current in sorted(lockfile.root_pods.items()):
+            if lockfile.is_external(name):
+                continue
+            source = lockfile.repo_for(name)
+            repo = names_by_url.get(source, source if source in spec_repos else None)
+            latest = index.latest(name, repo, include_prerelease='-' in current)
+            if latest is None:
+                status = 'unknown'
+            elif version_key(latest) > version_key(current):
+                status = 'outdated'
+            else:
+                status = 'current'
+            rows.append({'pod': name, 'current': current, 'latest': latest,
+                         'repo': repo or source, 'status': status})
+    
+    if output_format == 'json':
+        sys.stdout.write(json.dumps(rows, indent=2, ensure_ascii=False) + '\n')
+        return True
+    
+    outdated = [row for row in rows if row['status'] == 'outdated']
+    unknown = [row for row in rows if row['status'] == 'unknown']
+    for row in outdated:
+        print(f"  - {row['pod']} {row['current']} -> {row['latest']}（{row['repo']}）")
+    if unknown:
+        print(f"ℹ️  {len(unknown)} 个 pod 不在本地 spec 仓库中: {', '.join(row['pod'] for row in unknown)}")
+    if outdated:
+        print(f"⬆️  {len(outdated)} 个 pod 有更新的版本")
+    else:
+        print("✅ 本地 spec 仓库中没有更新的版本")
+    return True
+
+def analyze_lockfiles_command(paths: List[str], output_format: str = 'text',
+                              jobs: Optional[int] = None) -> bool:
+    """并行分析多个目录下的 Podfile.lock，汇总版本差异和沙盒状态"""
+    from ..utils.lockfile import analyze_lockfiles, find_lockfiles
+    
+    lockfile_paths = []
+    for path in paths or ['.']:
+        lockfile_paths.extend(find_lockfiles(path))
+    if not lockfile_paths:
+        print("❌ 未找到 Podfile.lock")
+        return False
+    
+    report = analyze_lockfiles(lockfile_paths, jobs=jobs)
+    if output_format == 'json':
+        sys.stdout.write(json.dumps(report, indent=2, ensure_ascii=False) + '\n')
+        return not report['errors']
+    
+    lockfiles = report['lockfiles']
+    print(f"📋 共分析 {len(lockfile_paths)} 个 Podfile.lock，{len(report['pods'])} 个不同的 pod")
+    versions: Dict[str, int] = {}
+    for item in lockfiles:
+        versions[item['cocoapods'] or '未知'] = versions.get(item['cocoapods'] or '未知', 0) + 1
+    print("\n🔧 CocoaPods 版本: " + "，".join(f"{v}（{n}）" for v, n in sorted(versions.items())))
+    
+    if report['drift']:
+        print("\n⚠️  锁定了多个版本的 pod:")
+        for name, pod_versions in report['drift'].items():
+            detail = "，".join(f"{version}（{len(files)}）" for version, files in pod_versions.items())
+            print(f"  - {name}: {detail}")
+    
+    stale = [item for item in lockfiles if item['stale']]
+    if stale:
+        print("\n❌ 沙盒过期（Pods/Manifest.lock 与 Podfile.lock 不一致）:")
+        for item in stale:
+            print(f"  - {item['path']}: {len(item['changes'])} 个 pod")
+    for path, error in report['errors'].items():
+        print(f"❌ 无法解析 {path}: {error}")
+    return not report['errors']
+
+def show_cache_key(path: Path, config: Any = None, salt: str = '', output_format: str = 'text',
+                   use_memo: bool = True, jobs: Optional[int] = None) -> bool:
+    """输出 Pods 目录的 CI 缓存键，诊断信息输出到标准错误"""
+    from ..utils.cache_key import compute_cache_key
+    from ..utils.tools import tool_version
+    
+    project_dir = path
+    if not (project_dir / 'Podfile').is_file() and (project_dir / 'Example' / 'Podfile').is_file():
+        project_dir = project_dir / 'Example'
+    if not (project_dir / 'Podfile').is_file():
+        print(f"❌ 未找到 Podfile: {project_dir}", file=sys.stderr)
+        return False
+    
+    cache_dir = config.get_cache_dir() if (config is not None and use_memo) else None
+    result = compute_cache_key(project_dir, {'pod': tool_version('pod', config)},
+                               cache_dir=cache_dir, salt=salt, jobs=jobs)
+    
+    for warning in result['warnings']:
+        print(f"⚠️  {warning}", file=sys.stderr)
+    if result['changes']:
+        print(f"🔄 缓存键已变化，{len(result['changes'])} 个输入不同:", file=sys.stderr)
+        for mark, name in result['changes']:
+            print(f"  {mark}{name}", file=sys.stderr)
+    stats = result['stats']
+    print(f"🔑 {len(result['inputs'])} 个输入（计算哈希 {stats['hashed']} 个，缓存命中 {stats['cached']} 个）",
+          file=sys.stderr)
+    
+    if output_format == 'json':
+        sys.stdout.write(json.dumps({key: result[key] for key in ('key', 'inputs', 'changes')},
+                                    indent=2, ensure_ascii=False) + '\n')
+    else:
+        print(result['key'])
+    return True
+
+def bump_versions(part: str, paths: List[str], dry_run: bool = False,
+                  jobs: Optional[int] = None) -> bool:
+    """更新一个或多个模块的 podspec、Info.plist 和 project.pbxproj 中的版本号"""
+    from ..utils.version_bump import BumpError, apply_bump, plan_bump
+    
+    try:
+        modules = plan_bump(paths or ['.'], part, jobs=jobs)
+    except (BumpError, OSError, UnicodeDecodeError) as e:
+        print(f"❌ {e}")
+        return False
+    
+    cwd = Path.cwd()
+    for module in modules:
+        print(f"📦 {module.name}: {module.old_version} -> {module.new_version}")
+        for site in module.sites:
+            try:
+                shown = site.path.relative_to(cwd)
+            except ValueError:
+                shown = site.path
+            olds = ', '.join(sorted(set(site.old_values)))
+            print(f"  - {shown}（{site.kind}，{len(site.old_values)} 处，原值 {olds}）")
+        for path, kind, values in module.skipped:
+            try:
+                shown = path.relative_to(cwd)
+            except ValueError:
+                shown = path
+            others = ', '.join(sorted(set(values)))
+            print(f"  ⏭️ {shown}（{kind}，{len(values)} 处版本号 {others} 与 {module.old_version} 不同，已跳过）")
+    
+    total = sum(len(module.sites) for module in modules)
+    if dry_run:
+        print(f"🔍 预览模式：{len(modules)} 个模块，{total} 个文件未修改")
+        return True
+    try:
+        apply_bump(modules)
+    except OSError as e:
+        print(f"❌ 写入失败，已恢复所有文件: {e}")
+        return False
+    print(f"✅ 已更新 {len(modules)} 个模块的 {total} 个文件")
+    return True
+
+def podspecs_at(path: Path) -> List[Path]:
+    """podspec 文件本身，或目录中的 podspec"""
+    if path.is_file():
+        return [path]
+    return sorted(path.glob('*.podspec')) + sorted(path.glob('*.podspec.json'))
+
+def show_pod_files(path: Path, output_format: str = 'text', show_all: bool = False) -> bool:
+    """在进程内解析 podspec 的文件模式，报告空模式、未被引用的文件和每个变体的资源包大小"""
+    from ..utils.pod_glob import evaluate_podspec, glob_issues
+    from ..utils.podspec import Podspec, PodspecError
+    
+    podspecs = podspecs_at(path)
+    if not podspecs:
+        print(f"❌ 未找到 podspec: {path}")
+        return False
+    
+    success = True
+    results = {}
+    for podspec in podspecs:
+        try:
+            spec = Podspec.from_file(podspec)
+        except (PodspecError, OSError, UnicodeDecodeError) as e:
+            print(f"❌ 无法解析 {podspec}: {e}")
+            success = False
+            continue
+        report = evaluate_podspec(spec)
+        issues = glob_issues(report)
+        if any(issue.is_error for issue in issues):
+            success = False
+        if output_format == 'json':
+            results[str(podspec)] = report.to_json()
+            continue
+        
+        variants = f"（变体: {'; '.join(report.variants)}）" if report.variants else ''
+        print(f"📦 {spec.name}{variants}")
+        for match in report.matches if show_all else []:
+            target = f"{match.attribute}[{match.bundle}]" if match.bundle else match.attribute
+            variant = f"（{match.variant}）" if match.variant else ''
+            status = f"{len(match.files)} 个文件" if match.files else "没有匹配任何文件"
+            print(f"  {'✅' if match.files else '❌'} {match.spec} {target} '{match.pattern}'{variant}: {status}")
+        for variant, bundles in report.bundles.items():
+            for name, (count, size) in bundles.items():
+                label = f"（{variant}）" if variant else ''
+                print(f"  📁 资源包 {name}{label}: {count} 个文件，{size / 1024:.1f} KB")
+        if report.unmatched:
+            print(f"  ⚠️  {len(report.unmatched)} 个文件未被任何模式引用:")
+            for rel in report.unmatched:
+                print(f"    - {rel}")
+        for issue in issues:
+            print(f"  {'❌' if issue.is_error else '⚠️ '} {issue.message}")
+    
+    if output_format == 'json':
+        sys.stdout.write(json.dumps(results, indent=2, ensure_ascii=False) + '\n')
+    elif success:
+        print("✅ 所有文件模式都有匹配的文件")
+    return success
+
+def check_pod_dependencies(path: Path, config: Any = None, output_format: str = 'text',
+                           module_map: Optional[List[str]] = None, use_cache: bool = True,
+                           jobs: Optional[int] = None) -> bool:
+    """比较源文件的 import 与 podspec 声明的依赖，缺少依赖时返回 False"""
+    from ..utils.deps_check import check_dependencies, parse_module_map
+    from ..utils.podspec import PodspecError
+    
+    podspecs = podspecs_at(path)
+    if not podspecs:
+        print(f"❌ 未找到 podspec: {path}")
+        return False
+    try:
+        mapping = parse_module_map(module_map)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return False
+    
+    cache_dir = config.get_cache_dir() if (config is not None and use_cache) else None
+    success = True
+    results = {}
+    for podspec in podspecs:
+        try:
+            result = check_dependencies(podspec, cache_dir=cache_dir, module_map=mapping, jobs=jobs)
+        except (PodspecError, OSError, UnicodeDecodeError) as e:
+            print(f"❌ 无法检查 {podspec}: {e}")
+            success = False
+            continue
+        if result['missing']:
+            success = False
+        if output_format == 'json':
+            results[str(podspec)] = result
+            continue
+        
+        stats = result['stats']
+        print(f"🔍 {result['module']}: {result['files']} 个源文件（扫描 {stats['scanned']} 个，缓存命中 {stats['cached']} 个）")
+        for module, files in result['missing'].items():
+            shown = ', '.join(files[:3]) + (f" 等 {len(files)} 个文件" if len(files) > 3 else '')
+            print(f"  ❌ 缺少依赖 {module}（{shown}）")
+        for name in result['unused']:
+            print(f"  ⚠️  未使用的依赖 {name}")
+        for name in result['unused_frameworks']:
+            print(f"  ⚠️  未使用的系统框架 {name}")
+        if not (result['missing'] or result['unused'] or result['unused_frameworks']):
+            print("  ✅ import 与声明的依赖一致")
+    
+    if output_format == 'json':
+        sys.stdout.write(json.dumps(results, indent=2, ensure_ascii=False) + '\n')
+    return success
+
+def generate_headers(path: Path, config: Any = None, output: Optional[str] = None, check: bool = False,
+                     force: bool = False) -> bool:
+    """根据 public_header_files 生成或更新伞头文件和 module.modulemap"""
+    from ..utils.podspec import PodspecError
+    from ..utils.umbrella import apply_headers, plan_headers
+    
+    podspecs = podspecs_at(path)
+    if not podspecs:
+        print(f"❌ 未找到 podspec: {path}")
+        return False
+    
+    cache_dir = config.get_cache_dir() if config is not None else None
+    success = True
+    for podspec in podspecs:
+        try:
+            plan = plan_headers(podspec, output_dir=output, cache_dir=cache_dir)
+        except (PodspecError, OSError, UnicodeDecodeError) as e:
+            print(f"❌ 无法读取 {podspec}: {e}")
+            success = False
+            continue
+        
+        print(f"📑 {plan.module}: {len(plan.headers)} 个公开头文件")
+        for name, paths in plan.conflicts.items():
+            print(f"  ⚠️  同名头文件 {name}: {', '.join(paths)}")
+        for header in plan.added if plan.previous else []:
+            print(f"  +{header}")
+        for header in plan.removed:
+            print(f"  -{header}")
+        if not plan.headers:
+            print("  ⚠️  没有公开头文件，伞头文件只包含系统框架")
+        
+        changed = plan.changed
+        if not changed:
+            print("  ✅ 伞头文件和 module.modulemap 已是最新")
+            continue
+        if check:
+            for file_path in changed:
+                print(f"  ❌ 需要更新: {file_path}")
+            success = False
+            continue
+        try:
+            written = apply_headers(plan, force=force)
+        except FileExistsError as e:
+            print(f"  ❌ 文件不是由 lee-devkit 生成的，使用 --force 覆盖: {e}")
+            success = False
+            continue
+        except OSError as e:
+            print(f"  ❌ 写入失败: {e}")
+            success = False
+            continue
+        for file_path in written:
+            print(f"  ✏️  已更新 {file_path}")
+    return success
+
+def generate_workspace(root: Path, config: Any = None, pods: Optional[List[str]] = None,
+                       output: Optional[str] = None, name: str = 'Dev', target: Optional[str] = None,
+                       project: Optional[str] = None, platform: Optional[str] = None,
+                       force: bool = False, use_cache: bool = True, jobs: Optional[int] = None) -> bool:
+    """为 root 下的本地 pod 生成使用 :path 引用的 Podfile 和 .xcworkspace"""
+    from ..utils.workspace import WORKSPACE_MARKER, WorkspaceError, plan_workspace, write_if_changed
+    
+    graph = load_pod_graph(root, config, use_cache=use_cache, jobs=jobs)
+    if not graph.nodes:
+        print(f"❌ 未找到 podspec: {root}")
+        return False
+    for duplicate, path in graph.duplicates:
+        print(f"⚠️  重复的 pod {duplicate}，已忽略 {path}")
+    
+    output_dir = Path(output) if output else root / 'DevWorkspace'
+    try:
+        selected, files = plan_workspace(graph, output_dir, names=pods, workspace=name, target=target,
+                                         project=project, platform=platform)
+    except WorkspaceError as e:
+        print(f"❌ {e}")
+        return False
+    
+    podfile = output_dir.resolve() / 'Podfile'
+    if podfile.is_file() and not force and WORKSPACE_MARKER not in podfile.read_text(encoding='utf-8', errors='replace'):
+        print(f"❌ {podfile} 不是由 lee-devkit 生成的，使用 --force 覆盖")
+        return False
+    
+    requested = {pod.split('/')[0] for pod in pods or []}
+    extra = len(selected) - len(requested) if requested else 0
+    source = '缓存' if graph.discovery == 'cached' else '遍历目录'
+    print(f"🧩 {len(selected)} 个本地 pod（{source}发现 {len(graph.nodes)} 个"
+          + (f"，依赖闭包新增 {extra} 个" if extra else '') + "）")
+    try:
+        written = write_if_changed(files)
+    except OSError as e:
+        print(f"❌ 写入失败: {e}")
+        return False
+    for file_path in files:
+        mark = '✏️  已更新' if file_path in written else '✅ 未变化'
+        print(f"  {mark} {file_path}")
+    if written:
+        print(f"👉 在 {output_dir} 中运行 pod install")
+    return True
+
+def show_affected(root: Path, config: Any = None, since: str = 'HEAD', output_format: str = 'text',
+                  dependents: bool = True, use_cache: bool = True, jobs: Optional[int] = None) -> bool:
+    """输出相对于 since 的变更影响到的 pod（含反向依赖）"""
+    from ..utils.affected import affected_pods, podspec_paths
+    from ..utils.git_ops import GitOperations
+    
+    if not root.is_dir():
+        print(f"❌ 目录不存在: {root}")
+        return False
+    changed = GitOperations(str(root)).changed_files(since)
+    if changed is None:
+        print(f"❌ 无法与 {since} 比较（不是 Git 仓库或引用不存在）")
+        return False
+    graph = load_pod_graph(root, config, use_cache=use_cache, jobs=jobs)
+    result = affected_pods(graph, changed, dependents=dependents)
+    
+    if output_format == 'json':
+        sys.stdout.write(json.dumps(result, indent=2, ensure_ascii=False) + '\n')
+        return True
+    if output_format == 'names':
+        for name in result['pods']:
+            print(name)
+        return True
+    if output_format == 'paths':
+        for path in podspec_paths(graph, result['pods']):
+            print(path)
+        return True
+    
+    print(f"🔍 相对于 {since} 变更了 {result['changed']} 个文件，影响 {len(result['pods'])} 个 pod"
+          f"（共 {len(graph.nodes)} 个）")
+    for name, files in result['direct'].items():
+        more = f" 等 {len(files)} 个文件" if len(files) > 1 else ''
+        print(f"  ✏️  {name}: {files[0]}{more}")
+    for name in result['dependents']:
+        print(f"  🔗 {name}（依赖变更的 pod）")
+    if result['unowned']:
+        print(f"  ℹ️  {len(result['unowned'])} 个文件不属于任何 pod")
+    if result['pods']:
+        print(f"📋 顺序: {' '.join(result['pods'])}")
+    return True
+
 def register_arguments(parser):
-    parser.add_argument('action', choices=['create'], help='操作类型')
-    parser.add_argument('module_name', help='新库名称')
-    parser.add_argument('--include-example', action='store_true', help='包含 Example 工程')
-    parser.add_argument('--output', default='.', help='输出目录（默认为当前目录）')
-    parser.add_argument('--force-update', action='store_true', help='强制更新模板')
+    subparsers = parser.add_subparsers(dest='action', required=True, help='操作类型')
+    
+    # create 子命令
+    create_parser = subparsers.add_parser('create', help='基于模板创建新库')
+    create_parser.add_argument('module_name', help='新库名称')
+    create_parser.add_argument('--include-example', action='store_true', help='包含 Example 工程')
+    create_parser.add_argument('--output', default='.', help='输出目录（默认为当前目录）')
+    create_parser.add_argument('--force-update', action='store_true', help='强制更新模板')
+    create_parser.add_argument('--archive', metavar='PATH',
+                               help='直接生成归档文件（.tar.gz/.tar/.zip），- 表示输出到标准输出')
+    create_parser.add_argument('--archive-format', choices=['tar.gz', 'tar', 'zip'],
+                               help='归档格式（默认根据文件扩展名推断）')
+    create_parser.add_argument('--git', action='store_true',
+                               help='初始化 Git 仓库，并通过 git fast-import 直接写入首次提交')
+    create_parser.add_argument('--remote-url', help='首次提交后设置的 origin 远程仓库地址')
+    create_parser.add_argument('--template-package', metavar='DIR',
+                               help='使用 pod template extract 生成的模板包')
+    create_parser.add_argument('--post-create', metavar='STEPS',
+                               help=f"创建后执行的步骤，逗号分隔（{', '.join(POST_CREATE_STEPS)}, all）")
+    
+    # rename 子命令
+    rename_parser = subparsers.add_parser('rename', help='在已有项目中重命名模块')
+    rename_parser.add_argument('old_name', help='原模块名')
+    rename_parser.add_argument('new_name', help='新模块名')
+    rename_parser.add_argument('--path', default='.', help='项目目录（默认为当前目录）')
+    rename_parser.add_argument('--dry-run', action='store_true', help='仅显示将要修改的内容')
+    rename_parser.add_argument('--no-git', action='store_true', help='不更新 Git 索引')
+    rename_parser.add_argument('--jobs', '-j', type=int, help='并行线程数')
+    
+    # template 子命令
+    template_parser = subparsers.add_parser('template', help='模板包管理')
+    template_subparsers = template_parser.add_subparsers(dest='template_action', required=True, help='模板操作')
+    extract_parser = template_subparsers.add_parser('extract', help='从已有模块提取模板包')
+    extract_parser.add_argument('path', help='已有模块的根目录')
+    extract_parser.add_argument('--token', required=True, help='要替换为占位符的模块名')
+    extract_parser.add_argument('--output', '-o', help='模板包输出目录（默认为 <token>-template）')
+    extract_parser.add_argument('--include', action='append', metavar='PATTERN',
+                                help='只提取匹配的路径（可多次指定）')
+    extract_parser.add_argument('--exclude', action='append', metavar='PATTERN',
+                                help='额外排除的路径（可多次指定）')
+    extract_parser.add_argument('--jobs', '-j', type=int, help='并行线程数')
+    
+    # graph 子命令
+    graph_parser = subparsers.add_parser('graph', help='分析目录下所有 podspec 的依赖关系')
+    graph_parser.add_argument('path', nargs='?', default='.', help='搜索根目录（默认为当前目录）')
+    graph_parser.add_argument('--format', choices=['text', 'dot', 'json'], default='text',
+                              help='输出格式（默认 text）')
+    graph_parser.add_argument('--output', '-o', help='导出到文件（dot/json）')
+    graph_parser.add_argument('--reverse', metavar='POD', help='显示依赖指定 pod 的所有 pod')
+    graph_parser.add_argument('--external', action='store_true', help='DOT 输出中包含外部依赖')
+    graph_parser.add_argument('--no-cache', action='store_true', help='忽略解析缓存')
+    graph_parser.add_argument('--jobs', '-j', type=int, help='并行线程数')
+    
+    # 锁文件分析
+    check_parser = subparsers.add_parser('check', help='检查 Pods 沙盒是否与 Podfile.lock 一致')
+    check_parser.add_argument('path', nargs='?', default='.', help='Podfile.lock 或其所在目录（默认为当前目录）')
+    
+    outdated_parser = subparsers.add_parser('outdated', help='离线检查本地 spec 仓库中是否有更新的版本')
+    outdated_parser.add_argument('path', nargs='?', default='.', help='Podfile.lock 或其所在目录（默认为当前目录）')
+    outdated_parser.add_argument('--format', choices=['text', 'json'], default='text', help='输出格式（默认 text）')
+    outdated_parser.add_argument('--jobs', '-j', type=int, help='更新索引时的并行线程数')
+    
+    cache_key_parser = subparsers.add_parser('cache-key', help='计算 Pods 目录的 CI 缓存键')
+    cache_key_parser.add_argument('path', nargs='?', default='.', help='Podfile 所在目录（默认为当前目录）')
+    cache_key_parser.add_argument('--salt', default='', help='额外混入缓存键的字符串')
+    cache_key_parser.add_argument('--format', choices=['text', 'json'], default='text', help='输出格式（默认 text）')
+    cache_key_parser.add_argument('--no-memo', action='store_true', help='不使用文件哈希缓存，也不比较上一次的输入')
+    cache_key_parser.add_argument('--jobs', '-j', type=int, help='并行线程数')
+    
+    bump_parser = subparsers.add_parser('bump', help='更新 podspec、Info.plist 和 project.pbxproj 中的版本号')
+    bump_parser.add_argument('part', help='major、minor、patch 或明确的版本号（例如 1.2.0）')
+    bump_parser.add_argument('paths', nargs='*', help='模块目录、podspec 或包含多个模块的目录（默认为当前目录）')
+    bump_parser.add_argument('--dry-run', action='store_true', help='仅显示将要修改的内容')
+    bump_parser.add_argument('--jobs', '-j', type=int, help='并行线程数')
+    
+    files_parser = subparsers.add_parser('files', help='解析 podspec 的文件模式，检查空模式和未被引用的文件')
+    files_parser.add_argument('path', nargs='?', default='.', help='podspec 或其所在目录（默认为当前目录）')
+    files_parser.add_argument('--format', choices=['text', 'json'], default='text', help='输出格式（默认 text）')
+    files_parser.add_argument('--all', action='store_true', help='同时列出有匹配的模式')
+    
+    deps_parser = subparsers.add_parser('deps-check', help='检查源文件的 import 与 podspec 声明的依赖是否一致')
+    deps_parser.add_argument('path', nargs='?', default='.', help='podspec 或其所在目录（默认为当前目录）')
+    deps_parser.add_argument('--format', choices=['text', 'json'], default='text', help='输出格式（默认 text）')
+    deps_parser.add_argument('--map', action='append', metavar='POD=MODULE', help='模块名与 pod 名称不同时的映射（可重复）')
+    deps_parser.add_argument('--no-cache', action='store_true', help='不使用扫描缓存')
+    deps_parser.add_argument('--jobs', '-j', type=int, help='并行线程数')
+    
+    headers_parser = subparsers.add_parser('headers', help='根据 public_header_files 生成伞头文件和 module.modulemap')
+    headers_parser.add_argument('path', nargs='?', default='.', help='podspec 或其所在目录（默认为当前目录）')
+    headers_parser.add_argument('--output', '-o', help='输出目录（默认为与模块同名的目录）')
+    headers_parser.add_argument('--check', action='store_true', help='只检查是否需要更新，需要时返回失败')
+    headers_parser.add_argument('--force', action='store_true', help='覆盖不是由 lee-devkit 生成的同名文件')
+    
+    workspace_parser = subparsers.add_parser('workspace', help='为目录下的本地 pod 生成 :path 引用的 Podfile 和工作区')
+    workspace_parser.add_argument('path', nargs='?', default='.', help='搜索根目录（默认为当前目录）')
+    workspace_parser.add_argument('--pod', action='append', dest='pods', metavar='NAME',
+                                  help='选中的 pod（可重复，自动加入本地依赖；默认为全部）')
+    workspace_parser.add_argument('--output', '-o', help='Podfile 输出目录（默认为 <path>/DevWorkspace）')
+    workspace_parser.add_argument('--name', default='Dev', help='工作区名称（默认 Dev）')
+    workspace_parser.add_argument('--target', help='Podfile 中的 target 名称（默认与工作区同名）')
+    workspace_parser.add_argument('--project', help='用户工程（.xcodeproj）路径')
+    workspace_parser.add_argument('--platform', metavar='PLATFORM[:VERSION]',
+                                  help='平台和部署版本，例如 ios:13.0（默认取所选 pod 的最高部署版本）')
+    workspace_parser.add_argument('--force', action='store_true', help='覆盖不是由 lee-devkit 生成的 Podfile')
+    workspace_parser.add_argument('--no-cache', action='store_true', help='忽略发现和解析缓存')
+    workspace_parser.add_argument('--jobs', '-j', type=int, help='并行线程数')
+    
+    affected_parser = subparsers.add_parser('affected', help='列出受 Git 变更影响的 pod（含反向依赖），用于 CI 只 lint 或发布必要的 pod')
+    affected_parser.add_argument('path', nargs='?', default='.', help='搜索根目录（默认为当前目录）')
+    affected_parser.add_argument('--since', default='HEAD', metavar='REF',
+                                 help='与该引用的合并基准比较，例如 origin/main（默认 HEAD，即未提交的修改）')
+    affected_parser.add_argument('--format', choices=['text', 'names', 'paths', 'json'], default='text',
+                                 help='输出格式：text、names（每行一个 pod）、paths（每行一个 podspec）或 json')
+    affected_parser.add_argument('--no-dependents', action='store_true', help='不加入反向依赖')
+    affected_parser.add_argument('--no-cache', action='store_true', help='忽略发现和解析缓存')
+    affected_parser.add_argument('--jobs', '-j', type=int, help='并行线程数')
+    
+    lockfiles_parser = subparsers.add_parser('lockfiles', help='并行分析多个目录下的 Podfile.lock')
+    lockfiles_parser.add_argument('paths', nargs='*', help='搜索目录或 Podfile.lock（默认为当前目录）')
+    lockfiles_parser.add_argument('--format', choices=['text', 'json'], default='text', help='输出格式（默认 text）')
+    lockfiles_parser.add_argument('--jobs', '-j', type=int, help='并行线程数')
 
 def execute(args, config):
     if args.action == 'create':
         scaffold = CocoaPodsScaffold()
         include_example = args.include_example  # 默认不包含，只有使用 --include-example 时才包含
         
+        if getattr(args, 'archive', None):
+            return scaffold.create_archive(
+                module_name=args.module_name,
+                archive=args.archive,
+                include_example=include_example,
+                force_update=args.force_update,
+                archive_format=args.archive_format,
+                template_package=args.template_package
+            )
+        
+        try:
+            post_create = parse_post_create_steps(args.post_create)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return False
+        
         # 确保输出目录是绝对路径，默认为当前工作目录
         output_dir = Path(args.output).resolve()
         
-        return scaffold.create_project(
+        success = scaffold.create_project(
             module_name=args.module_name,
             include_example=include_example,
             output_dir=str(output_dir),
-            force_update=args.force_update
+            force_update=args.force_update,
+            git_init=args.git,
+            remote_url=args.remote_url,
+            template_package=args.template_package
+        )
+        if success and post_create:
+            success = run_post_create(output_dir / args.module_name, post_create, config)
+        return success
+    elif args.action == 'rename':
+        return rename_module(
+            Path(args.path),
+            args.old_name,
+            args.new_name,
+            dry_run=args.dry_run,
+            use_git=not args.no_git,
+            jobs=args.jobs
+        )
+    elif args.action == 'template':
+        if args.template_action == 'extract':
+            return extract_template(
+                Path(args.path),
+                args.token,
+                output=Path(args.output) if args.output else None,
+                includes=args.include,
+                excludes=args.exclude,
+                jobs=args.jobs
+            )
+        print(f'❌ 未知模板操作: {args.template_action}')
+        return False
+    elif args.action == 'graph':
+        return show_pod_graph(
+            Path(args.path),
+            config,
+            output_format=args.format,
+            output=args.output,
+            reverse=args.reverse,
+            include_external=args.external,
+            use_cache=not args.no_cache,
+            jobs=args.jobs
         )
+    elif args.action == 'check':
+        return check_sandbox(Path(args.path))
+    elif args.action == 'outdated':
+        return show_outdated(Path(args.path), config, output_format=args.format, jobs=args.jobs)
+    elif args.action == 'cache-key':
+        return show_cache_key(Path(args.path), config, salt=args.salt, output_format=args.format,
+                              use_memo=not args.no_memo, jobs=args.jobs)
+    elif args.action == 'bump':
+        return bump_versions(args.part, args.paths, dry_run=args.dry_run, jobs=args.jobs)
+    elif args.action == 'files':
+        return show_pod_files(Path(args.path), output_format=args.format, show_all=args.all)
+    elif args.action == 'deps-check':
+        return check_pod_dependencies(Path(args.path), config, output_format=args.format, module_map=args.map,
+                                      use_cache=not args.no_cache, jobs=args.jobs)
+    elif args.action == 'headers':
+        return generate_headers(Path(args.path), config, output=args.output, check=args.check, force=args.force)
+    elif args.action == 'workspace':
+        return generate_workspace(Path(args.path), config, pods=args.pods, output=args.output, name=args.name,
+                                  target=args.target, project=args.project, platform=args.platform,
+                                  force=args.force, use_cache=not args.no_cache, jobs=args.jobs)
+    elif args.action == 'affected':
+        return show_affected(Path(args.path), config, since=args.since, output_format=args.format,
+                             dependents=not args.no_dependents, use_cache=not args.no_cache, jobs=args.jobs)
+    elif args.action == 'lockfiles':
+        return analyze_lockfiles_command(args.paths, output_format=args.format, jobs=args.jobs)
     else:
         print(f'❌ 未知操作: {args.action}')
         return False
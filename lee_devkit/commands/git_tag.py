@@ -4,13 +4,19 @@ Git Tag 管理命令模块
 """
 
 import argparse
+import glob
+import logging
 import subprocess
 import sys
+import time
 from pathlib import Path
 from typing import Optional
 
 from ..config import Config
 from ..utils.logger import setup_logger
+from ..utils.podspec import Podspec, PodspecError
+from ..utils.source_archive import (SourceArchiveError, archive_path, http_source, render_http_podspec,
+                                    stream_git_archive)
 
 
 def register_arguments(parser: argparse.ArgumentParser):
@@ -57,6 +63,36 @@ def register_arguments(parser: argparse.ArgumentParser):
         help='只创建本地 tag，不推送到远程'
     )
     
+    create_parser.add_argument(
+        '--archive',
+        metavar='PATH',
+        help='把 tag 的 git archive 流式写入归档（.zip/.tar.gz/.tar 文件，或目录下的 <Name>-<tag>.zip），'
+             '同时计算 sha256 并生成 :http source 的 podspec'
+    )
+    
+    create_parser.add_argument(
+        '--archive-format',
+        choices=['zip', 'tar.gz', 'tar'],
+        help='归档格式（默认根据文件扩展名推断，目录时为 zip）'
+    )
+    
+    create_parser.add_argument(
+        '--archive-url',
+        metavar='URL',
+        help='归档的下载地址，可使用 {name}、{version}、{tag}、{file} 占位符（默认读取配置 tag.archive_url）'
+    )
+    
+    create_parser.add_argument(
+        '--podspec',
+        help='podspec 文件（默认为当前目录下唯一的 podspec）'
+    )
+    
+    create_parser.add_argument(
+        '--http-podspec',
+        metavar='PATH',
+        help=':http source 的 podspec 输出路径（默认与归档在同一目录、与原 podspec 同名）'
+    )
+    
     # retag 子命令
     retag_parser = subparsers.add_parser(
         'retag',
@@ -132,7 +168,12 @@ def _handle_create(args: argparse.Namespace, config: Config, logger) -> bool:
     if not _create_tag(tag_name, commit, args.message, logger, args.dry_run):
         return False
     
-    # 步骤2: 推送 tag 到远程（如果不是 --no-push）
+    # 步骤2: 生成源码归档和 :http podspec（推送前完成，失败时不推送）
+    if getattr(args, 'archive', None):
+        if not _create_archive(args, config, tag_name, logger):
+            return False
+    
+    # 步骤3: 推送 tag 到远程（如果不是 --no-push）
     if not args.no_push:
         if not _push_tags(remote, logger, args.dry_run):
             return False
@@ -187,6 +228,77 @@ def _handle_retag(args: argparse.Namespace, config: Config, logger) -> bool:
     return True
 
 
+def _find_podspec(podspec: Optional[str], logger: logging.Logger) -> Optional[Path]:
+    """确定用于生成 :http 变体的 podspec"""
+    if podspec:
+        return Path(podspec)
+    candidates = sorted(glob.glob('*.podspec') + glob.glob('*.podspec.json'))
+    if len(candidates) > 1:
+        logger.warning(f"⚠️  找到多个 podspec，使用 --podspec 指定: {', '.join(candidates)}")
+    return Path(candidates[0]) if len(candidates) == 1 else None
+
+
+def _create_archive(args: argparse.Namespace, config: Config, tag_name: str, logger: logging.Logger) -> bool:
+    """流式归档 tag 并写入 :http / :sha256 source 的 podspec"""
+    podspec_path = _find_podspec(getattr(args, 'podspec', None), logger)
+    spec = None
+    if podspec_path is not None:
+        try:
+            spec = Podspec.from_file(podspec_path)
+        except (PodspecError, OSError, UnicodeDecodeError) as e:
+            logger.error(f"❌ 无法解析 {podspec_path}: {e}")
+            return False
+    name = (spec.name if spec else None) or Path.cwd().name
+    version = (spec.version if spec else None) or tag_name.lstrip('v')
+    if spec and spec.version and spec.version != tag_name.lstrip('v'):
+        logger.warning(f"⚠️  podspec 版本 {spec.version} 与 tag {tag_name} 不一致")
+    
+    try:
+        output = archive_path(args.archive, name, tag_name, getattr(args, 'archive_format', None))
+    except SourceArchiveError as e:
+        logger.error(f"❌ {e}")
+        return False
+    http_podspec = None
+    if podspec_path is not None:
+        http_podspec = Path(getattr(args, 'http_podspec', None) or output.parent / podspec_path.name)
+        if http_podspec.resolve() == podspec_path.resolve():
+            logger.error(f"❌ :http podspec 不能覆盖原 podspec {podspec_path}，请使用 --http-podspec 或其他归档目录")
+            return False
+    
+    logger.info(f"📦 归档 {tag_name}: git archive --prefix={name}-{tag_name}/ {tag_name} > {output}")
+    if args.dry_run:
+        return True
+    
+    start = time.monotonic()
+    try:
+        result = stream_git_archive('.', tag_name, output, getattr(args, 'archive_format', None),
+                                    prefix=f"{name}-{tag_name}")
+    except (SourceArchiveError, OSError) as e:
+        logger.error(f"❌ 生成归档失败: {e}")
+        return False
+    logger.info(f"✅ {output} ({result['size'] / 1024 / 1024:.1f} MB, {time.monotonic() - start:.2f}s)")
+    logger.info(f"🔐 sha256: {result['sha256']}")
+    
+    if podspec_path is None or http_podspec is None:
+        logger.warning("⚠️  未找到 podspec，跳过生成 :http podspec")
+        return True
+    template = getattr(args, 'archive_url', None) or (config.get('tag.archive_url') if config is not None else None)
+    if template:
+        url = template.format(name=name, version=version, tag=tag_name, file=output.name)
+    else:
+        url = output.resolve().as_uri()
+        logger.warning("⚠️  未指定 --archive-url（或配置 tag.archive_url），:http 使用本地文件地址")
+    try:
+        text = render_http_podspec(podspec_path, http_source(url, result['sha256'], result['format']))
+        http_podspec.parent.mkdir(parents=True, exist_ok=True)
+        http_podspec.write_text(text, encoding='utf-8')
+    except (PodspecError, OSError, UnicodeDecodeError) as e:
+        logger.error(f"❌ 生成 :http podspec 失败: {e}")
+        return False
+    logger.info(f"📝 :http podspec: {http_podspec}")
+    return True
+
+
 def _is_git_repo() -> bool:
     """检查当前目录是否是 Git 仓库"""
     try:
@@ -3,24 +3,96 @@
 CocoaPods Repo Push Tool - Push podspec files to spec repositories
 """
 
+import argparse
+import copy
 import os
+import re
+import shutil
+import sqlite3
 import subprocess
 import glob
+import json
+import tempfile
+import threading
+import time
+from collections import deque
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..utils.cdn_index import CDNIndexError, build_cdn_index
+from ..utils.git_ops import GitOperations
+from ..utils.lint_cache import LintCache
+from ..utils.lint_matrix import MatrixJob, build_matrix, merge_issues, parse_lint_issues, split_list
+from ..utils.pipeline import Pipeline, PipelineStep, StepResult, backoff_delay
+from ..utils.pod_glob import evaluate_podspec, glob_issues
+from ..utils.pod_graph import discover_podspecs, podspec_name_from_path
+from ..utils.podspec import Podspec, PodspecError, prelint
+from ..utils.push_journal import FAILED, PUSHED, PushJournal
+from ..utils.spec_index import SpecIndex, default_repos_dir, spec_index_path, update_spec_index
+from ..utils.tools import command_version, resolve_tool, stream_tool
 
 __version__ = "1.0.0"
 
-def register_arguments(parser):
+# Retries for pushes that fail with a transient (network) error
+DEFAULT_RETRIES = 3
+
+# Commit message for --direct pushes, overridable with spec_repos.commit_message
+DIRECT_COMMIT_MESSAGE = "[Add] {name} {version}"
+
+# Direct pushes of a batch share one local checkout per repository
+_checkout_locks: Dict[str, threading.Lock] = {}
+_checkout_locks_guard = threading.Lock()
+
+# Queries understood by `pod-push index`
+INDEX_QUERIES = ('update', 'exists', 'latest', 'versions', 'dependents')
+
+class _PushSubParsersAction(argparse._SubParsersAction):
+    """pod-push subcommands; a first argument that is not a subcommand is a podspec path for `push`"""
+    
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # Names are checked in __call__ so that paths fall back to the push subcommand
+        self.choices = None  # type: ignore[assignment]
+    
+    def __call__(self, parser: argparse.ArgumentParser, namespace: argparse.Namespace, values: Any,
+                 option_string: Optional[str] = None) -> None:
+        if values[0] not in self._name_parser_map:
+            values = ['push'] + list(values)
+        super().__call__(parser, namespace, values, option_string)
+
+def _add_lint_arguments(parser: argparse.ArgumentParser, default: bool = True) -> None:
+    """Flags shared by push and lint (defaults are suppressed on subcommands so they keep the top-level value)"""
+    keep: Dict[str, Any] = {} if default else {'default': argparse.SUPPRESS}
+    parser.add_argument('--no-allow-warnings', action='store_true', help='Disable --allow-warnings flag', **keep)
+    parser.add_argument('--no-verbose', action='store_true', help='Disable --verbose flag', **keep)
+    parser.add_argument('--no-skip-import-validation', action='store_true', help='Disable --skip-import-validation flag', **keep)
+    parser.add_argument('--no-use-libraries', action='store_true', help='Disable --use-libraries flag', **keep)
+    parser.add_argument('--no-use-modular-headers', action='store_true', help='Disable --use-modular-headers flag', **keep)
+    parser.add_argument('--extra-args', help='Additional arguments to pass to pod repo push (comma-separated)', **keep)
+    parser.add_argument('--no-lint-cache', action='store_true', help='Always run pod spec lint, ignoring cached results', **keep)
+    parser.add_argument('--jobs', '-j', type=int, help='Maximum parallel lint/push jobs (default: 4)',
+                        **({'default': 4} if default else keep))
+
+def _add_push_arguments(parser: argparse.ArgumentParser, default: bool = True) -> None:
+    """Arguments of the push command"""
+    keep: Dict[str, Any] = {} if default else {'default': argparse.SUPPRESS}
+    parser.add_argument('--repo', '-r', help='Spec repository name (uses default if not specified)', **keep)
+    _add_lint_arguments(parser, default)
+    parser.add_argument('--yes', '-y', action='store_true', help='Do not prompt; lint errors fail, warnings follow --allow-warnings', **keep)
+    parser.add_argument('--resume', action='store_true', help='Resume the last batch push from its journal', **keep)
+    parser.add_argument('--journal', metavar='PATH', help='Batch push journal file (default: in the cache directory)', **keep)
+    parser.add_argument('--force', action='store_true', help='Start a new batch push even if the journal has unfinished pods', **keep)
+    parser.add_argument('--retries', type=int, help=f'Retries for transient push failures in batch mode (default: {DEFAULT_RETRIES})',
+                        **({'default': DEFAULT_RETRIES} if default else keep))
+    parser.add_argument('--direct', action='store_true',
+                        help='Skip pod repo push: write the .podspec.json into the local spec repo checkout, commit and git push', **keep)
+    parser.add_argument('--no-index-check', action='store_true',
+                        help='Do not check the local spec index for versions that are already published', **keep)
+
+def register_arguments(parser: argparse.ArgumentParser) -> None:
     """Register command arguments"""
-    parser.add_argument('podspec', nargs='?', help='Path to the podspec file (optional, will auto-detect if not provided)')
-    parser.add_argument('--repo', '-r', help='Spec repository name (uses default if not specified)')
-    parser.add_argument('--no-allow-warnings', action='store_true', help='Disable --allow-warnings flag')
-    parser.add_argument('--no-verbose', action='store_true', help='Disable --verbose flag')
-    parser.add_argument('--no-skip-import-validation', action='store_true', help='Disable --skip-import-validation flag')
-    parser.add_argument('--no-use-libraries', action='store_true', help='Disable --use-libraries flag')
-    parser.add_argument('--no-use-modular-headers', action='store_true', help='Disable --use-modular-headers flag')
-    parser.add_argument('--extra-args', help='Additional arguments to pass to pod repo push (comma-separated)')
+    _add_push_arguments(parser)
     
     # Repository management
     repo_group = parser.add_argument_group('Repository Management')
@@ -28,6 +100,38 @@ def register_arguments(parser):
     repo_group.add_argument('--add-repo', nargs=2, metavar=('NAME', 'URL'), help='Add a new spec repository')
     repo_group.add_argument('--remove-repo', metavar='NAME', help='Remove a spec repository')
     repo_group.add_argument('--set-default-repo', metavar='NAME', help='Set the default spec repository')
+    
+    subparsers = parser.add_subparsers(dest='push_action', action=_PushSubParsersAction,
+                                       metavar='{push,lint,index,cdn-index} | PODSPEC',
+                                       help='Subcommand; a podspec file or directory pushes it (same as push)')
+    
+    push_parser = subparsers.add_parser('push', help='Push podspec files (default)')
+    push_parser.add_argument('podspec', nargs='*',
+                             help='Podspec files or directories to push (optional, will auto-detect if not provided)')
+    _add_push_arguments(push_parser, default=False)
+    
+    lint_parser = subparsers.add_parser('lint', help='Lint podspec files without pushing')
+    lint_parser.add_argument('podspec', nargs='*', help='Podspec files or directories (auto-detect if not provided)')
+    _add_lint_arguments(lint_parser, default=False)
+    lint_parser.add_argument('--matrix', action='store_true',
+                             help='Run one job per subspec, platform and Swift version concurrently (limited by --jobs)')
+    lint_parser.add_argument('--subspec', action='append', metavar='NAME',
+                             help='Only lint these subspecs (repeatable or comma-separated)')
+    lint_parser.add_argument('--platforms', help='Platforms to lint, comma-separated (default: from the podspec)')
+    lint_parser.add_argument('--swift-version', help='Swift versions to lint, comma-separated (default: from the podspec)')
+    
+    index_parser = subparsers.add_parser('index', help='Update the local spec repo index and query it')
+    index_parser.add_argument('query', nargs='*', metavar='QUERY',
+                              help='update | exists NAME VERSION | latest NAME | versions NAME | dependents NAME')
+    index_parser.add_argument('--repo', '-r', default=argparse.SUPPRESS, help='Only this spec repository')
+    
+    cdn_parser = subparsers.add_parser('cdn-index', help='Build a static CDN spec source from a repo checkout')
+    cdn_parser.add_argument('output', help='Output directory')
+    cdn_parser.add_argument('--repo', '-r', default=argparse.SUPPRESS,
+                            help='Spec repository name or directory (uses default if not specified)')
+    cdn_parser.add_argument('--full', action='store_true',
+                            help='Rebuild from every spec instead of the changes since the last run')
+    cdn_parser.add_argument('--jobs', '-j', type=int, default=argparse.SUPPRESS, help='Parallel conversion jobs')
 
 def execute(args, config):
     """Execute the pod repo push command"""
@@ -42,40 +146,92 @@ def execute(args, config):
         elif hasattr(args, 'set_default_repo') and args.set_default_repo:
             return set_default_repository(config, args.set_default_repo)
         
-        # Find podspec file if not provided
-        podspec_file = args.podspec if hasattr(args, 'podspec') else None
-        if not podspec_file:
-            podspec_file = find_podspec_file()
-            if not podspec_file:
-                print("❌ No podspec file found in the current directory")
-                print("Please specify a podspec file or run the command in a directory containing a .podspec file")
-                return False
+        assume_yes = getattr(args, 'yes', False)
+        use_cache = not getattr(args, 'no_lint_cache', False)
         
-        # Validate podspec file
-        if not validate_podspec_file(podspec_file):
-            return False
+        if getattr(args, 'resume', False):
+            return resume_batch(config, getattr(args, 'journal', None), use_cache=use_cache,
+                                assume_yes=assume_yes, jobs=getattr(args, 'jobs', None),
+                                retries=getattr(args, 'retries', DEFAULT_RETRIES))
         
-        # Get repository
-        repo_name = args.repo if hasattr(args, 'repo') else None
-        if not repo_name:
-            repo_name = get_default_repository(config)
-            if not repo_name:
-                print("❌ No default repository configured.")
-                print("Use --repo to specify a repository or set a default with --set-default-repo")
-                return False
+        action = getattr(args, 'push_action', None) or 'push'
+        if action == 'index':
+            return index_command(config, args.query, getattr(args, 'repo', None))
+        if action == 'cdn-index':
+            return cdn_index_command(config, args.output, getattr(args, 'repo', None),
+                                     full=args.full, jobs=getattr(args, 'jobs', None))
         
-        # Verify repository exists
-        repo_url = get_repository_url(config, repo_name)
-        if not repo_url:
-            print(f"❌ Repository not found: {repo_name}")
-            print("Available repositories:")
-            list_repositories(config)
-            print("Use --add-repo to add a new repository")
+        # Find podspec files if not provided
+        podspec_paths = getattr(args, 'podspec', None) or []
+        if isinstance(podspec_paths, str):
+            podspec_paths = [podspec_paths]
+        if action == 'lint':
+            if podspec_paths:
+                lint_files = collect_podspec_files(podspec_paths)
+            else:
+                found = find_podspec_file()
+                lint_files = [found] if found else None
+            if not lint_files:
+                return False
+            return lint_matrix(lint_files, PushOptions.from_args(args), config,
+                               matrix=getattr(args, 'matrix', False),
+                               subspecs=split_list(getattr(args, 'subspec', None)),
+                               platforms=split_list([getattr(args, 'platforms', None) or '']),
+                               swift_versions=split_list([getattr(args, 'swift_version', None) or '']),
+                               jobs=getattr(args, 'jobs', None), use_cache=use_cache)
+        check_index = not getattr(args, 'no_index_check', False)
+        if podspec_paths:
+            podspec_files = collect_podspec_files(podspec_paths)
+            if podspec_files is None:
+                return False
+        elif assume_yes:
+            # Without a prompt there is nobody to pick one; never widen the push to all of them
+            podspec_files = sorted(glob.glob("*.podspec") + glob.glob("*.podspec.json"))
+            if len(podspec_files) > 1:
+                print("❌ Multiple podspec files found in the current directory:")
+                for podspec_file in podspec_files:
+                    print(f"  - {podspec_file}")
+                print("Pass the podspec files to push explicitly when using --yes")
+                return False
+        else:
+            found = find_podspec_file()
+            podspec_files = [found] if found else []
+        if not podspec_files:
+            print("❌ No podspec file found in the current directory")
+            print("Please specify a podspec file or run the command in a directory containing a .podspec file")
             return False
         
         # Create push options from arguments
         options = PushOptions.from_args(args)
         
+        # Batch mode: resolve the target repository before doing any work
+        if len(podspec_files) > 1:
+            repo = resolve_repository(config, getattr(args, 'repo', None))
+            if repo is None:
+                return False
+            repo_name, repo_url = repo
+            return push_batch(podspec_files, repo_name, repo_url, options, config,
+                              use_cache=use_cache, assume_yes=assume_yes,
+                              jobs=getattr(args, 'jobs', None),
+                              journal_path=getattr(args, 'journal', None),
+                              retries=getattr(args, 'retries', DEFAULT_RETRIES),
+                              check_index=check_index, force=getattr(args, 'force', False))
+        podspec_file = podspec_files[0]
+        
+        # Get repository
+        repo = resolve_repository(config, getattr(args, 'repo', None))
+        if repo is None:
+            return False
+        repo_name, repo_url = repo
+        
+        # Refuse versions that are already published before linting
+        if check_index and not check_unpublished(config, repo_name, [podspec_file]):
+            return False
+        
+        # Validate podspec file
+        if not validate_podspec_file(podspec_file, options, config, use_cache, assume_yes):
+            return False
+        
         # Print summary
         print("\n📋 Push Summary:")
         print(f"  Podspec: {podspec_file}")
@@ -89,16 +245,22 @@ def execute(args, config):
         print()
         
         # Confirm
-        confirm = input("Continue with push? (Y/n): ")
-        if confirm.lower() in ('n', 'no'):
-            print("❌ Operation cancelled by user")
-            return False
+        if not assume_yes:
+            answer = input("Continue with push? (Y/n): ")
+            if answer.lower() in ('n', 'no'):
+                print("❌ Operation cancelled by user")
+                return False
+        
+        if options.direct:
+            result = direct_push(podspec_file, repo_name, repo_url, config, options.commit_message)
+            if result is not None:
+                return result
         
         # Build and execute command
-        command = build_push_command(repo_name, podspec_file, options, repo_url)
+        command = build_push_command(repo_name, podspec_file, options, repo_url, config)
         print(f"\n📦 Pushing {os.path.basename(podspec_file)} to {repo_name}...")
         
-        return run_pod_command(command)
+        return run_pod_command(command, log_dir=pod_log_dir(config))
         
     except KeyboardInterrupt:
         print("\n⚠️ Operation cancelled by user")
@@ -109,8 +271,364 @@ def execute(args, config):
         traceback.print_exc()
         return False
 
-def validate_podspec_file(podspec_file: str) -> bool:
-    """Validate a podspec file"""
+def resolve_repository(config: Any, repo_name: Optional[str] = None) -> Optional[Tuple[str, str]]:
+    """Resolve the target repository name and URL, printing hints and returning None when it is missing"""
+    if not repo_name:
+        repo_name = get_default_repository(config)
+        if not repo_name:
+            print("❌ No default repository configured.")
+            print("Use --repo to specify a repository or set a default with --set-default-repo")
+            return None
+    
+    # Verify repository exists
+    repo_url = get_repository_url(config, repo_name)
+    if not repo_url:
+        print(f"❌ Repository not found: {repo_name}")
+        print("Available repositories:")
+        list_repositories(config)
+        print("Use --add-repo to add a new repository")
+        return None
+    return repo_name, repo_url
+
+def collect_podspec_files(paths: List[str]) -> Optional[List[str]]:
+    """Expand podspec files and directories into a list of podspec files"""
+    podspec_files: List[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            podspec_files.extend(str(found) for found in discover_podspecs(path))
+        elif os.path.exists(path):
+            podspec_files.append(path)
+        else:
+            print(f"❌ Podspec file not found: {path}")
+            return None
+    # Keep the first occurrence of each file
+    return list(dict.fromkeys(podspec_files))
+
+def batch_dependencies(podspec_files: List[str]) -> Tuple[Dict[str, str], Dict[str, List[str]]]:
+    """Map pod names to podspec files and to the other pods of the batch they depend on"""
+    pods: Dict[str, str] = {}
+    all_deps: Dict[str, set] = {}
+    for podspec_file in podspec_files:
+        try:
+            spec = Podspec.from_file(podspec_file)
+            name = spec.name or podspec_name_from_path(podspec_file)
+            deps = {dep.split('/')[0] for dep in spec.all_dependencies()}
+        except (PodspecError, OSError, UnicodeDecodeError) as e:
+            print(f"⚠️ Could not read dependencies of {podspec_file}: {e}")
+            name, deps = podspec_name_from_path(podspec_file), set()
+        if name in pods:
+            raise ValueError(f"Pod {name} is defined by both {pods[name]} and {podspec_file}")
+        pods[name] = podspec_file
+        all_deps[name] = deps
+    
+    dependencies = {
+        name: sorted(dep for dep in deps if dep in pods and dep != name)
+        for name, deps in all_deps.items()
+    }
+    return pods, dependencies
+
+def default_journal_path(config: Any = None) -> Path:
+    """Location of the batch push journal"""
+    base = Path(config.get_cache_dir()) if config is not None else Path(tempfile.gettempdir()) / "lee-devkit"
+    return base / "push-journal.json"
+
+def push_batch(podspec_files: List[str], repo_name: str, repo_url: str, options: 'PushOptions',
+               config: Any = None, use_cache: bool = True, assume_yes: bool = False,
+               jobs: Optional[int] = None, journal_path: Optional[str] = None,
+               retries: int = DEFAULT_RETRIES, check_index: bool = True, force: bool = False) -> bool:
+    """Lint many podspecs in parallel and push them in dependency order
+    
+    Each pod is pushed once it has passed lint and every pod of the batch it
+    depends on has been pushed, so independent pods are released concurrently.
+    Progress is journaled to disk so a failed batch can be resumed; an unfinished
+    journal is only replaced with force.
+    """
+    path = Path(journal_path) if journal_path else default_journal_path(config)
+    if not force and path.exists():
+        try:
+            remaining = PushJournal.load(path).incomplete()
+        except (OSError, ValueError):
+            remaining = []
+        if remaining:
+            print(f"❌ The push journal {path} has {len(remaining)} unfinished pods: {', '.join(remaining)}")
+            print("Continue it with --resume, or pass --force to start a new batch")
+            return False
+    
+    try:
+        pods, dependencies = batch_dependencies(podspec_files)
+        # Validate the schedule before anything is written
+        Pipeline([PipelineStep(name, lambda: True, deps) for name, deps in dependencies.items()])
+    except ValueError as e:
+        print(f"❌ {e}")
+        return False
+    
+    if check_index and not check_unpublished(config, repo_name, list(pods.values())):
+        return False
+    
+    print("\n📋 Batch Push Summary:")
+    print(f"  Repository: {repo_name} ({repo_url})")
+    for name, podspec_file in pods.items():
+        deps = f" (after {', '.join(dependencies[name])})" if dependencies[name] else ""
+        print(f"  - {name}: {podspec_file}{deps}")
+    print()
+    
+    if not assume_yes:
+        answer = input(f"Push {len(pods)} pods? (Y/n): ")
+        if answer.lower() in ('n', 'no'):
+            print("❌ Operation cancelled by user")
+            return False
+    
+    journal = PushJournal.create(path, repo_name, pods, dependencies, vars(options))
+    return run_push_queue(journal, repo_url, options, config, use_cache, jobs, retries)
+
+def resume_batch(config: Any, journal_path: Optional[str] = None, use_cache: bool = True,
+                 assume_yes: bool = False, jobs: Optional[int] = None,
+                 retries: int = DEFAULT_RETRIES) -> bool:
+    """Continue a journaled batch push from its first incomplete item"""
+    path = Path(journal_path) if journal_path else default_journal_path(config)
+    try:
+        journal = PushJournal.load(path)
+    except FileNotFoundError:
+        print(f"❌ No push journal found: {path}")
+        return False
+    except ValueError as e:
+        print(f"❌ Invalid push journal {path}: {e}")
+        return False
+    
+    repo = resolve_repository(config, journal.repo)
+    if repo is None:
+        return False
+    repo_name, repo_url = repo
+    
+    incomplete = journal.incomplete()
+    print(f"\n📋 Resuming batch push to {repo_name} ({path})")
+    for name, item in journal.items.items():
+        print(f"  - {name}: {item['state']}" + (f" ({item['error']})" if item['error'] else ""))
+    if not incomplete:
+        print("✅ Nothing to resume, every pod has been pushed")
+        return True
+    
+    if not assume_yes:
+        answer = input(f"Resume {len(incomplete)} pods? (Y/n): ")
+        if answer.lower() in ('n', 'no'):
+            print("❌ Operation cancelled by user")
+            return False
+    
+    options = PushOptions.from_dict(journal.options)
+    return run_push_queue(journal, repo_url, options, config, use_cache, jobs, retries)
+
+def check_unpublished(config: Any, repo_name: str, podspec_files: List[str]) -> bool:
+    """Fail when a podspec's version already exists in the target repository
+    
+    The check is skipped (and passes) when the repository has no local
+    checkout or the index cannot be used.
+    """
+    try:
+        with SpecIndex(spec_index_path(config.get_cache_dir() if config is not None else None)) as index:
+            if update_spec_index(index, [repo_name])[repo_name] is None:
+                return True
+            published = []
+            for podspec_file in podspec_files:
+                try:
+                    spec = Podspec.from_file(podspec_file)
+                except (PodspecError, OSError, UnicodeDecodeError):
+                    continue
+                if spec.name and spec.version and index.exists(spec.name, spec.version, repo_name):
+                    published.append(f"{spec.name} ({spec.version})")
+    except (sqlite3.Error, OSError) as e:
+        print(f"⚠️ Spec index unavailable, skipping the published version check: {e}")
+        return True
+    
+    if published:
+        for pod in published:
+            print(f"❌ {pod} is already published to {repo_name}")
+        print("Bump the version or use --no-index-check to push anyway")
+        return False
+    return True
+
+def index_command(config: Any, query: List[str], repo_name: Optional[str] = None) -> bool:
+    """Update the spec index and answer version queries from it"""
+    action = query[0] if query else 'update'
+    arity = {'update': 0, 'exists': 2, 'latest': 1, 'versions': 1, 'dependents': 1}
+    if action not in INDEX_QUERIES or len(query) - 1 != arity[action]:
+        print("❌ Usage: pod-push index [update|exists NAME VERSION|latest NAME|versions NAME|dependents NAME]")
+        return False
+    
+    with SpecIndex(spec_index_path(config.get_cache_dir() if config is not None else None)) as index:
+        results = update_spec_index(index, [repo_name] if repo_name else sorted(get_repositories(config)))
+        if action == 'update':
+            for name, stats in results.items():
+                if stats is None:
+                    print(f"⚠️ No local checkout of {name} at {default_repos_dir() / name} "
+                          f"(run 'pod repo add {name} <url>')")
+                else:
+                    print(f"🗂️ {name}: {stats['mode']}, {stats['indexed']} indexed, "
+                          f"{stats['removed']} removed ({stats['seconds']:.2f}s)")
+            for repo in index.repos():
+                commit = (repo['commit'] or '')[:10]
+                print(f"  - {repo['name']}: {repo['specs']} specs @ {commit}")
+            return True
+        
+        name = query[1]
+        if action == 'exists':
+            found = index.exists(name, query[2], repo_name)
+            print(f"{'✅' if found else '❌'} {name} {query[2]} {'exists' if found else 'not found'}")
+            return found
+        if action == 'latest':
+            latest = index.latest(name, repo_name)
+            print(latest or f"❌ {name} not found")
+            return latest is not None
+        if action == 'versions':
+            versions = index.versions(name, repo_name)
+            for version in versions:
+                print(version)
+            return bool(versions)
+        
+        dependents = index.dependents(name, repo_name)
+        for dep in dependents:
+            requirement = f" ({dep['requirement']})" if dep['requirement'] else ""
+            print(f"{dep['name']} {dep['version']} [{dep['repo']}] -> {dep['dependency']}{requirement}")
+        if not dependents:
+            print(f"No pods depend on {name}")
+        return True
+
+def cdn_index_command(config: Any, output_dir: str, repo: Optional[str] = None, full: bool = False,
+                      jobs: Optional[int] = None) -> bool:
+    """Build or update a static CDN layout of a spec repository
+    
+    The source is the local checkout of the --repo (or default) repository, or
+    a directory given with --repo. Serve the output with any static file server
+    and add it with `pod repo add-cdn NAME URL`.
+    """
+    if repo and os.path.isdir(repo):
+        repo_path = Path(repo)
+    else:
+        repo_name = repo or get_default_repository(config)
+        if not repo_name:
+            print("❌ No default repository configured.")
+            print("Use --repo to specify a repository name or a spec repo directory")
+            return False
+        repo_path = default_repos_dir() / repo_name
+        if not repo_path.is_dir():
+            print(f"❌ No local checkout of {repo_name} at {repo_path} (run 'pod repo add {repo_name} <url>')")
+            return False
+    
+    start = time.monotonic()
+    try:
+        stats = build_cdn_index(repo_path, output_dir, full=full, jobs=jobs)
+    except (CDNIndexError, OSError) as e:
+        print(f"❌ {e}")
+        return False
+    for rel_path, error in sorted(stats['errors'].items()):
+        print(f"⚠️ Skipped {rel_path}: {error}")
+    commit = (stats['commit'] or 'working tree')[:10]
+    print(f"🌐 {output_dir}: {stats['mode']} @ {commit}, {stats['written']} specs written, "
+          f"{stats['removed']} removed, {stats['shards']} shards updated, {stats['pods']} pods "
+          f"({time.monotonic() - start:.2f}s)")
+    return not stats['errors']
+
+# Output that indicates a failure worth retrying
+TRANSIENT_ERROR_RE = re.compile(
+    r"Could not resolve host|Connection (reset|refused|timed out)|Operation timed out|"
+    r"timed out|early EOF|The remote end hung up|RPC failed|unable to access|"
+    r"Failed to connect|SSL_ERROR|SSL_connect|Network is unreachable|"
+    r"Temporary failure in name resolution|HTTP (429|50[234])",
+    re.IGNORECASE
+)
+
+def is_transient_failure(lines: Iterable[str]) -> bool:
+    """Whether the output of a failed command looks like a network blip"""
+    return any(TRANSIENT_ERROR_RE.search(line) for line in lines)
+
+def run_push_queue(journal: PushJournal, repo_url: str, options: 'PushOptions', config: Any = None,
+                   use_cache: bool = True, jobs: Optional[int] = None,
+                   retries: int = DEFAULT_RETRIES) -> bool:
+    """Lint and push every incomplete journal item in dependency order"""
+    repo_name = journal.repo
+    incomplete = set(journal.incomplete())
+    
+    def lint(name: str) -> bool:
+        podspec_file = journal.items[name]['podspec']
+        if validate_podspec_file(podspec_file, options, config, use_cache, assume_yes=True):
+            journal.mark_linted(name)
+            return True
+        journal.update(name, FAILED, error="lint failed")
+        return False
+    
+    def push(name: str) -> bool:
+        item = journal.items[name]
+        prefix = f"[{name}] "
+        if options.direct:
+            pushed = direct_push(item['podspec'], repo_name, repo_url, config, options.commit_message,
+                                 retries, prefix)
+            if pushed is not None:
+                journal.update(name, attempts=item['attempts'] + 1)
+                if pushed:
+                    journal.update(name, PUSHED, error=None)
+                    return True
+                journal.update(name, FAILED, error="direct push failed")
+                return False
+        for attempt in range(retries + 1):
+            journal.update(name, attempts=item['attempts'] + 1)
+            command = build_push_command(repo_name, item['podspec'], copy.deepcopy(options), repo_url, config)
+            result = execute_pod_command(command, prefix, pod_log_dir(config))
+            if result is not None and result.success:
+                journal.update(name, PUSHED, error=None, log=str(result.log_path))
+                return True
+            
+            log = str(result.log_path) if result is not None else None
+            error = f"exit code {result.returncode}" if result is not None else "could not run pod"
+            if result is None or attempt == retries or not is_transient_failure(result.tail):
+                journal.update(name, FAILED, error=f"push failed: {error}", log=log)
+                return False
+            delay = backoff_delay(attempt)
+            print(f"{prefix}🔁 Transient failure, retrying in {delay:.1f}s ({attempt + 1}/{retries})")
+            time.sleep(delay)
+        return False
+    
+    steps: List[PipelineStep] = []
+    for name in journal.items:
+        if name not in incomplete:
+            continue
+        deps = [f"push:{dep}" for dep in journal.items[name]['depends_on'] if dep in incomplete]
+        if journal.lint_still_valid(name):
+            print(f"⏭️  {name}: lint already passed, pushing directly")
+        else:
+            steps.append(PipelineStep(f"lint:{name}", partial(lint, name), description=f"Lint {name}"))
+            deps.insert(0, f"lint:{name}")
+        steps.append(PipelineStep(f"push:{name}", partial(push, name),
+                                  depends_on=deps, description=f"Push {name}"))
+    
+    results = Pipeline(steps, max_workers=jobs).run()
+    Pipeline.print_summary(results, "Batch push results")
+    
+    counts = journal.counts()
+    print(f"📒 Journal: {journal.path}")
+    print("  " + ", ".join(f"{state}: {count}" for state, count in counts.items()))
+    remaining = journal.incomplete()
+    if remaining:
+        print(f"❌ {len(remaining)} pod(s) not pushed: {', '.join(remaining)}")
+        print("Fix the problem and continue with: lee-devkit pod-push --resume")
+        return False
+    print(f"✅ Pushed {len(journal.items)} pods to {repo_name}")
+    return True
+
+def confirm(prompt: str, assume_yes: bool = False) -> bool:
+    """Ask a yes/no question, answering yes without prompting when assume_yes is set"""
+    if assume_yes:
+        print(f"{prompt} y (--yes)")
+        return True
+    return input(f"{prompt} (y/n): ").lower() == 'y'
+
+def validate_podspec_file(podspec_file: str, options: Optional['PushOptions'] = None,
+                          config: Any = None, use_cache: bool = True, assume_yes: bool = False) -> bool:
+    """Validate a podspec file
+    
+    Lint results are cached by content hash when a config is given, so an unchanged
+    podspec with unchanged sources, flags and pod version is not linted twice.
+    With assume_yes nothing is prompted: lint warnings are accepted when the push
+    allows warnings, lint errors always fail.
+    """
     # Check if file exists
     if not os.path.exists(podspec_file):
         print(f"❌ Podspec file not found: {podspec_file}")
@@ -124,33 +642,227 @@ def validate_podspec_file(podspec_file: str) -> bool:
     # Check file extension
     if not podspec_file.endswith(('.podspec', '.podspec.json')):
         print(f"⚠️ File does not have a .podspec or .podspec.json extension: {podspec_file}")
-        confirm = input("Continue anyway? (y/n): ")
-        if confirm.lower() != 'y':
+        if not confirm("Continue anyway?", assume_yes):
             return False
     
+    # Fast in-process checks, so obviously broken specs fail before pod is spawned
+    if not prelint_podspec(podspec_file):
+        return False
+    
+    # Look up a cached lint result
+    cache, cache_key = None, None
+    if use_cache and config is not None:
+        cache, cache_key = lint_cache_lookup(podspec_file, options, config)
+        cached = cache.get(cache_key) if cache and cache_key else None
+        if cached is not None:
+            print("✅ Podspec validation passed (cached)")
+            return True
+    
     # Validate podspec with pod command
     print(f"🔍 Validating podspec file: {podspec_file}")
     try:
         result = subprocess.run(
-            ["pod", "spec", "lint", "--quick", podspec_file],
+            resolve_tool('pod', config) + ["spec", "lint", "--quick", podspec_file],
             capture_output=True,
             text=True,
             check=False  # Don't raise exception on non-zero exit
         )
         
+        output = "\n".join(part for part in (result.stdout, result.stderr) if part)
+        # Only passing results are cached: failures may be transient (e.g. a dependency not pushed yet)
+        if cache and cache_key and result.returncode == 0:
+            cache.put(cache_key, output, podspec_file)
+        
         if result.returncode == 0:
             print("✅ Podspec validation passed")
             return True
         else:
             print("⚠️ Podspec validation failed with warnings:")
-            print(result.stderr)
-            confirm = input("Continue anyway? (y/n): ")
-            return confirm.lower() == 'y'
+            print(output)
+            return accept_lint_failure(output, options, assume_yes)
             
     except subprocess.SubprocessError as e:
         print(f"⚠️ Could not validate podspec: {e}")
-        confirm = input("Continue anyway? (y/n): ")
-        return confirm.lower() == 'y'
+        return confirm("Continue anyway?", assume_yes)
+
+def lint_args(options: Optional['PushOptions'] = None) -> List[str]:
+    """pod spec lint flags matching the push options"""
+    options = options or PushOptions()
+    args = []
+    if options.allow_warnings:
+        args.append("--allow-warnings")
+    if options.skip_import_validation:
+        args.append("--skip-import-validation")
+    if options.use_libraries:
+        args.append("--use-libraries")
+    if options.use_modular_headers:
+        args.append("--use-modular-headers")
+    if options.sources:
+        args.append(f"--sources={','.join(options.sources)}")
+    args.extend(options.extra_args)
+    return args
+
+def lint_matrix(podspec_files: List[str], options: Optional['PushOptions'] = None, config: Any = None,
+                matrix: bool = True, subspecs: Sequence[str] = (), platforms: Sequence[str] = (),
+                swift_versions: Sequence[str] = (), jobs: Optional[int] = None,
+                use_cache: bool = True) -> bool:
+    """Lint podspecs as independent jobs and print one merged report
+    
+    With matrix the lint of each podspec is split into one job per subspec,
+    platform and Swift version, so a pod with many subspecs is linted in
+    parallel instead of in one serial pod spec lint run. Passed jobs are
+    cached by content hash like regular lints.
+    """
+    planned: Dict[str, Tuple[str, MatrixJob]] = {}
+    for podspec_file in podspec_files:
+        if not prelint_podspec(podspec_file):
+            return False
+        try:
+            spec = Podspec.from_file(podspec_file)
+        except (PodspecError, OSError, UnicodeDecodeError):
+            spec = None
+        name = (spec.name if spec else None) or podspec_name_from_path(podspec_file)
+        if matrix:
+            matrix_jobs = build_matrix(podspec_file, spec, subspecs, platforms, swift_versions)
+        elif len(subspecs) > 1 or len(swift_versions) > 1:
+            print("❌ Several subspecs or Swift versions need --matrix")
+            return False
+        else:
+            matrix_jobs = [MatrixJob(podspec_file, subspecs[0] if subspecs else None,
+                                     ','.join(platforms) or None,
+                                     swift_versions[0] if swift_versions else None)]
+        for job in matrix_jobs:
+            planned[job.label(name)] = (name, job)
+    
+    pod = resolve_tool('pod', config)
+    base_args = lint_args(options)
+    allow_warnings = options.allow_warnings if options else True
+    cache = LintCache(config.get_cache_dir()) if use_cache and config is not None else None
+    pod_version = get_pod_version(tuple(pod)) if cache else None
+    outcomes: Dict[str, Dict] = {}
+    
+    def run(label: str, job: MatrixJob) -> bool:
+        args = base_args + job.args
+        key = None
+        if cache and pod_version:
+            try:
+                key = cache.compute_key(job.podspec, args, pod_version)
+            except (PodspecError, OSError) as e:
+                print(f"[{label}] ⚠️ Lint cache disabled: {e}")
+            cached = cache.get(key) if key else None
+            if cached is not None:
+                outcomes[label] = {'status': 'cached', 'passed': True,
+                                   'lines': cached['output'].splitlines(), 'log': None}
+                print(f"[{label}] ✅ passed (cached)")
+                return True
+        
+        command = pod + ["spec", "lint", job.podspec] + args
+        result = stream_pod_command(command, f"[{label}] ", new_log_path(pod_log_dir(config)), echo=False)
+        lines = result.log_path.read_text(encoding='utf-8').splitlines()
+        output = "\n".join(lines)
+        if cache and key and result.returncode == 0:
+            cache.put(key, output, job.podspec)
+        accepted = result.success or (allow_warnings and not lint_has_errors(output))
+        outcomes[label] = {'status': 'linted', 'passed': accepted, 'lines': lines,
+                           'log': str(result.log_path), 'returncode': result.returncode}
+        print(f"[{label}] {'✅ passed' if accepted else '❌ failed'}")
+        return accepted
+    
+    print(f"🔍 Linting {len(planned)} job(s) with up to {jobs or len(planned)} in parallel")
+    steps = [PipelineStep(label, partial(run, label, job), description=label)
+             for label, (_, job) in planned.items()]
+    results = Pipeline(steps, max_workers=jobs, verbose=False).run()
+    return print_lint_report(planned, outcomes, results)
+
+def print_lint_report(planned: Dict[str, Tuple[str, MatrixJob]], outcomes: Dict[str, Dict],
+                      results: Dict[str, StepResult]) -> bool:
+    """Print the merged report of a lint matrix, returns whether every job passed"""
+    passed = sum(1 for label in planned if label in outcomes and outcomes[label]['passed'])
+    print(f"\n📊 Lint report: {passed}/{len(planned)} job(s) passed")
+    width = max(len(label) for label in planned)
+    for label in planned:
+        outcome = outcomes.get(label)
+        result = results.get(label)
+        if outcome is None:
+            error = result.error if result is not None and result.error else "did not run"
+            print(f"  ❌ {label:<{width}}  {error}")
+            continue
+        mark = "✅" if outcome['passed'] else "❌"
+        duration = result.duration if result is not None else 0.0
+        detail = "cached" if outcome['status'] == 'cached' else f"{duration:.1f}s"
+        log = f"  {outcome['log']}" if outcome['log'] and not outcome['passed'] else ""
+        print(f"  {mark} {label:<{width}}  {detail}{log}")
+    
+    issues = merge_issues({label: parse_lint_issues(outcomes[label]['lines'])
+                           for label in planned if label in outcomes})
+    if issues:
+        print("\n  Issues:")
+        marks = {'ERROR': '❌', 'WARN': '⚠️', 'NOTE': 'ℹ️'}
+        for level, message, labels in issues:
+            where = "all jobs" if len(labels) == len(planned) > 1 else ", ".join(labels)
+            print(f"  {marks[level]} {level} | {message}")
+            print(f"      in: {where}")
+    return passed == len(planned)
+
+def lint_has_errors(output: str) -> bool:
+    """Whether pod spec lint output contains errors rather than only warnings"""
+    if re.search(r'-\s*ERROR\s*\|', output):
+        return True
+    # A failure without any reported warning is an error (e.g. a crash)
+    return not re.search(r'-\s*WARN\s*\|', output)
+
+def accept_lint_failure(output: str, options: Optional['PushOptions'], assume_yes: bool) -> bool:
+    """Decide whether to continue after a failed lint"""
+    if not assume_yes:
+        return confirm("Continue anyway?")
+    allow_warnings = options.allow_warnings if options else True
+    if allow_warnings and not lint_has_errors(output):
+        print("⚠️ Continuing with warnings (--yes, warnings allowed)")
+        return True
+    print("❌ Podspec validation failed")
+    return False
+
+def prelint_podspec(podspec_file: str) -> bool:
+    """Run the in-process pre-lint, returns False if the spec has errors"""
+    try:
+        spec = Podspec.from_file(podspec_file)
+    except (PodspecError, OSError, UnicodeDecodeError) as e:
+        # The parser only covers the common DSL subset, leave the rest to pod spec lint
+        print(f"⚠️ Pre-lint skipped, could not parse podspec: {e}")
+        return True
+    
+    issues = prelint(spec, podspec_file)
+    # pod spec lint checks the file patterns against the tagged source, so a local
+    # checkout that does not match is only worth a warning here
+    issues.extend(glob_issues(evaluate_podspec(spec), strict=False))
+    errors = [issue for issue in issues if issue.is_error]
+    for issue in issues:
+        mark = "❌" if issue.is_error else "⚠️"
+        print(f"{mark} {issue.message}")
+    
+    if errors:
+        print(f"❌ Pre-lint found {len(errors)} error(s) in {os.path.basename(podspec_file)}")
+        return False
+    return True
+
+@lru_cache(maxsize=None)
+def get_pod_version(pod_command: Tuple[str, ...] = ('pod',)) -> Optional[str]:
+    """Return the CocoaPods version, or None if pod is not available (cached per pod command)"""
+    return command_version(pod_command + ("--version",))
+
+def lint_cache_lookup(podspec_file: str, options: Optional['PushOptions'],
+                      config: Any) -> Tuple[Optional[LintCache], Optional[str]]:
+    """Return the lint cache and the key for a podspec, or (None, None) if it cannot be keyed"""
+    pod_version = get_pod_version(tuple(resolve_tool('pod', config)))
+    if pod_version is None:
+        return None, None
+    try:
+        cache = LintCache(config.get_cache_dir())
+        lint_args = (options or PushOptions()).to_args()
+        return cache, cache.compute_key(podspec_file, lint_args, pod_version)
+    except (PodspecError, OSError, TypeError) as e:
+        print(f"⚠️ Lint cache disabled for this run: {e}")
+        return None, None
 
 def find_podspec_file() -> Optional[str]:
     """Find a podspec file in the current directory"""
@@ -203,6 +915,7 @@ class PushOptions:
         self.no_overwrite = False
         self.local_only = False
         self.commit_message = None
+        self.direct = False
     
     def to_args(self) -> List[str]:
         """Convert options to command line arguments"""
@@ -241,6 +954,15 @@ class PushOptions:
         
         return args
     
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'PushOptions':
+        """Create options from a dict produced by vars(options)"""
+        options = cls()
+        for key, value in data.items():
+            if hasattr(options, key):
+                setattr(options, key, copy.deepcopy(value))
+        return options
+    
     @classmethod
     def from_args(cls, args) -> 'PushOptions':
         """Create options from command line arguments"""
@@ -252,6 +974,7 @@ class PushOptions:
         options.skip_import_validation = not args.no_skip_import_validation
         options.use_libraries = not args.no_use_libraries
         options.use_modular_headers = not args.no_use_modular_headers
+        options.direct = getattr(args, 'direct', False)
         
         # Parse extra arguments
         if args.extra_args:
@@ -259,10 +982,93 @@ class PushOptions:
         
         return options
 
-def build_push_command(repo_name: str, podspec_file: str, options: PushOptions, repo_url: str) -> List[str]:
+def checkout_lock(repo_path: Path) -> threading.Lock:
+    """Lock serializing writes to one local spec repo checkout"""
+    with _checkout_locks_guard:
+        return _checkout_locks.setdefault(str(repo_path), threading.Lock())
+
+def direct_push(podspec_file: str, repo_name: str, repo_url: str, config: Any = None,
+                commit_message: Optional[str] = None, retries: int = DEFAULT_RETRIES,
+                prefix: str = "") -> Optional[bool]:
+    """Publish a podspec by committing its JSON form straight into the spec repo
+    
+    This bypasses `pod repo push` (no lint, no source updates), so it is only
+    meant for specs that have already been validated. The spec is written to
+    <Name>/<version>/<Name>.podspec.json (under Specs/ when the repo uses it)
+    in the local checkout, committed and pushed; a push rejected because the
+    remote moved is rebased and retried.
+    
+    Returns None when the spec cannot be converted to JSON in-process (it
+    depends on ENV, a ternary or other Ruby the parser cannot evaluate); the
+    caller should fall back to `pod repo push`.
+    """
+    try:
+        spec = Podspec.from_file(podspec_file)
+    except (PodspecError, OSError, UnicodeDecodeError) as e:
+        print(f"{prefix}❌ Could not parse {podspec_file}: {e}")
+        return False
+    if not spec.name or not spec.version:
+        print(f"{prefix}❌ {podspec_file} has no literal name or version")
+        return False
+    try:
+        content = json.dumps(spec.to_json(), indent=2, ensure_ascii=False) + "\n"
+    except PodspecError as e:
+        print(f"{prefix}⚠️ Cannot publish {podspec_file} directly: {e}; falling back to pod repo push")
+        return None
+    
+    repo_path = default_repos_dir() / repo_name
+    with checkout_lock(repo_path):
+        if not repo_path.is_dir():
+            repo_path.parent.mkdir(parents=True, exist_ok=True)
+            if not GitOperations().clone_repo(repo_url, str(repo_path)):
+                return False
+        git = GitOperations(str(repo_path))
+        if git.has_uncommitted_changes():
+            print(f"{prefix}❌ Local checkout {repo_path} has uncommitted changes")
+            return False
+        branch = git.get_current_branch()
+        if not git.pull('origin', branch, rebase=True):
+            return False
+        
+        base = repo_path / "Specs" if (repo_path / "Specs").is_dir() else repo_path
+        spec_dir = base / spec.name / spec.version
+        if spec_dir.exists():
+            print(f"{prefix}❌ {spec.name} ({spec.version}) is already published to {repo_name}")
+            return False
+        spec_dir.mkdir(parents=True)
+        spec_path = spec_dir / f"{spec.name}.podspec.json"
+        spec_path.write_text(content, encoding='utf-8')
+        
+        template = (commit_message
+                    or (config.get('spec_repos.commit_message') if config is not None else None)
+                    or DIRECT_COMMIT_MESSAGE)
+        message = template.format(name=spec.name, version=spec.version)
+        if not (git.add_files([str(spec_path.relative_to(repo_path))]) and git.commit(message)):
+            git.reset_hard('HEAD')
+            shutil.rmtree(spec_dir, ignore_errors=True)
+            return False
+        
+        for attempt in range(retries + 1):
+            if git.push('origin', branch):
+                print(f"{prefix}✅ Published {spec.name} ({spec.version}) to {repo_name}")
+                return True
+            if attempt == retries:
+                break
+            # Most rejections mean someone else pushed first: replay our commit on top
+            if not git.pull('origin', branch, rebase=True):
+                time.sleep(backoff_delay(attempt))
+        
+        # Leave the checkout matching the remote so the next push starts clean
+        git.run_git_command(['rebase', '--abort'], check=False)
+        git.reset_hard('@{u}')
+        print(f"{prefix}❌ Could not push {spec.name} ({spec.version}) to {repo_name}")
+        return False
+
+def build_push_command(repo_name: str, podspec_file: str, options: PushOptions, repo_url: str,
+                       config: Any = None) -> List[str]:
     """Build the pod repo push command"""
     # Start with the base command
-    command = ["pod", "repo", "push", repo_name, podspec_file]
+    command = resolve_tool('pod', config) + ["repo", "push", repo_name, podspec_file]
     
     # Add the repository URL to sources if not already included
     if repo_url not in options.sources:
@@ -273,73 +1079,167 @@ def build_push_command(repo_name: str, podspec_file: str, options: PushOptions,
     
     return command
 
-def run_pod_command(command: List[str]) -> bool:
-    """Execute the pod command and handle output"""
-    print(f"🚀 Executing: {' '.join(command)}")
-    print("⏳ This may take a while...")
+# Lines of output kept in memory for the failure report
+OUTPUT_TAIL_LINES = 50
+
+# Number of pod command logs kept in the log directory, older ones are removed
+MAX_LOG_FILES = 100
+
+# Known CocoaPods phases, a phase lasts until the next one starts
+POD_PHASES = (
+    ('Cloning sources', re.compile(r"^(Cloning spec repo|Updating spec repo|Updating local specs repositories|Cloning into)")),
+    ('Linting', re.compile(r"^Validating (spec|podspec)")),
+    ('Resolving dependencies', re.compile(r"^Analyzing dependencies")),
+    ('Downloading dependencies', re.compile(r"^Downloading dependencies")),
+    ('Building', re.compile(r"^(Building|Testing) with `xcodebuild`")),
+    ('Updating repo', re.compile(r"^Updating the `.+' repo")),
+    ('Adding spec', re.compile(r"^Adding the spec to the `")),
+    ('Pushing', re.compile(r"^Pushing the `")),
+)
+
+class PhaseTracker:
+    """Track how long each known CocoaPods phase takes, based on output lines"""
     
-    try:
-        # Run the command with real-time output
-        process = subprocess.Popen(
-            command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,  # Line buffered
-            universal_newlines=True
-        )
-        
-        # Process output in real-time
-        stdout_lines = []
-        stderr_lines = []
-        
-        # Function to read from a pipe and print lines
-        def read_and_print(pipe, lines_list, prefix=""):
-            for line in iter(pipe.readline, ''):
-                if line:
-                    print(f"{prefix}{line.rstrip()}")
-                    lines_list.append(line)
-            
-        # Create threads to read stdout and stderr
-        import threading
-        stdout_thread = threading.Thread(
-            target=read_and_print, 
-            args=(process.stdout, stdout_lines)
-        )
-        stderr_thread = threading.Thread(
-            target=read_and_print, 
-            args=(process.stderr, stderr_lines, "⚠️ ")
-        )
-        
-        # Start threads
-        stdout_thread.start()
-        stderr_thread.start()
-        
-        # Wait for process to complete
-        exit_code = process.wait()
-        
-        # Wait for threads to complete
-        stdout_thread.join()
-        stderr_thread.join()
-        
-        # Close pipes
-        process.stdout.close()
-        process.stderr.close()
+    def __init__(self, phases: Sequence[Tuple[str, 're.Pattern[str]']] = POD_PHASES,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.phases = phases
+        self.clock = clock
+        self.current: Optional[str] = None
+        self.started = clock()
+        self.durations: Dict[str, float] = {}
+    
+    def feed(self, line: str) -> Optional[str]:
+        """Process an output line, returns the name of a phase that just started"""
+        stripped = line.strip()
+        for name, pattern in self.phases:
+            if pattern.search(stripped):
+                if name == self.current:
+                    return None
+                self._close()
+                self.current = name
+                return name
+        return None
+    
+    def _close(self) -> None:
+        now = self.clock()
+        if self.current is not None:
+            self.durations[self.current] = self.durations.get(self.current, 0.0) + now - self.started
+        self.started = now
+    
+    def finish(self) -> Dict[str, float]:
+        """Close the running phase and return durations in the order phases were seen"""
+        self._close()
+        self.current = None
+        return self.durations
+
+class PodCommandResult:
+    """Outcome of a pod command"""
+    
+    def __init__(self, returncode: int, tail: deque, phases: Dict[str, float], log_path: Path):
+        self.returncode = returncode
+        self.tail = tail
+        self.phases = phases
+        self.log_path = log_path
+    
+    @property
+    def success(self) -> bool:
+        return self.returncode == 0
+
+def pod_log_dir(config: Any) -> Optional[Path]:
+    """Directory for pod command logs, inside the cache directory when a config is given"""
+    return Path(config.get_cache_dir()) / "logs" if config is not None else None
+
+def prune_logs(log_dir: Path, keep: int = MAX_LOG_FILES) -> None:
+    """Remove the oldest pod command logs so that at most keep remain"""
+    logs = []
+    for path in log_dir.glob("pod-*.log"):
+        try:
+            logs.append((path.stat().st_mtime, path))
+        except OSError:
+            continue
+    for _, path in sorted(logs)[:max(len(logs) - keep, 0)]:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+def new_log_path(log_dir: Optional[Path] = None) -> Path:
+    """Create a unique log file for a pod command, rotating out the oldest logs"""
+    log_dir = Path(log_dir) if log_dir else Path(tempfile.gettempdir()) / "lee-devkit"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    prune_logs(log_dir, MAX_LOG_FILES - 1)
+    fd, path = tempfile.mkstemp(prefix=time.strftime("pod-%Y%m%d-%H%M%S-"), suffix=".log", dir=log_dir)
+    os.close(fd)
+    return Path(path)
+
+def stream_pod_command(command: List[str], prefix: str = "", log_path: Optional[Path] = None,
+                       tail_lines: int = OUTPUT_TAIL_LINES, echo: bool = True) -> PodCommandResult:
+    """Run a pod command, echoing its output and spooling the full log to a file
+    
+    Only the last tail_lines lines are kept in memory, so verbose pushes do not
+    grow without bound.
+    """
+    log_path = log_path or new_log_path()
+    tail: Deque[str] = deque(maxlen=tail_lines)
+    tracker = PhaseTracker()
+    
+    with open(log_path, 'w', encoding='utf-8') as log:
+        def on_line(stream: str, line: str) -> None:
+            marker = "⚠️ " if stream == 'stderr' else ""
+            log.write(f"{marker}{line}\n")
+            tail.append(f"{marker}{line}")
+            if echo:
+                print(f"{prefix}{marker}{line}")
+            phase = tracker.feed(line)
+            if phase and echo:
+                print(f"{prefix}⏱️  {phase}...")
         
-        # Check result
-        if exit_code == 0:
-            print("✅ Podspec pushed successfully")
-            return True
-        else:
-            print(f"❌ Command failed with exit code {exit_code}")
-            return False
-            
-    except subprocess.SubprocessError as e:
-        print(f"❌ Failed to execute command: {e}")
-        return False
+        returncode = stream_tool(command, on_line)
+    
+    return PodCommandResult(returncode, tail, tracker.finish(), log_path)
+
+def print_phase_summary(phases: Dict[str, float], prefix: str = "") -> None:
+    """Print the duration of each CocoaPods phase"""
+    if not phases:
+        return
+    print(f"{prefix}⏱️  Phase durations:")
+    for name, duration in phases.items():
+        print(f"{prefix}  {name:<26} {duration:>8.1f}s")
+
+def run_pod_command(command: List[str], prefix: str = "", log_dir: Optional[Path] = None) -> bool:
+    """Execute the pod command and handle output, prefixing each line with prefix"""
+    try:
+        result = execute_pod_command(command, prefix, log_dir)
     except KeyboardInterrupt:
         print("\n⚠️ Operation cancelled by user")
         return False
+    return result is not None and result.success
+
+def execute_pod_command(command: List[str], prefix: str = "",
+                        log_dir: Optional[Path] = None) -> Optional[PodCommandResult]:
+    """Execute the pod command and report the outcome, returns None if it could not be started"""
+    print(f"{prefix}🚀 Executing: {' '.join(command)}")
+    print(f"{prefix}⏳ This may take a while...")
+    
+    try:
+        result = stream_pod_command(command, prefix, new_log_path(log_dir))
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"{prefix}❌ Failed to execute command: {e}")
+        return None
+    
+    print_phase_summary(result.phases, prefix)
+    if result.success:
+        print(f"{prefix}✅ Podspec pushed successfully")
+        return result
+    
+    print(f"{prefix}❌ Command failed with exit code {result.returncode}")
+    if prefix:
+        # Concurrent pushes interleave their output, repeat the end of this one
+        print(f"{prefix}📄 Last {len(result.tail)} lines of output:")
+        for line in result.tail:
+            print(f"{prefix}  {line}")
+    print(f"{prefix}📄 Full log: {result.log_path}")
+    return result
 
 # Repository management functions
 
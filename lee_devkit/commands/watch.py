@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Watch 命令模块
+监听目录下的文件变更（Linux 上使用 inotify，否则轮询），合并连续的事件后把变更的文件映射到 pod，
+只对受影响的 pod 重新运行所选的 podspec 检查和生成器；依赖图和 podspec 解析结果在进程内复用
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..config import Config
+
+# 依赖图、podspec 解析和检查器在使用时才导入，保持 CLI 启动时导入本模块的开销很小
+if TYPE_CHECKING:
+    from ..utils.file_watch import Watcher
+    from ..utils.pod_graph import PodNode
+    from ..utils.podspec import Podspec
+
+# 可以运行的检查和生成器
+CHECKS = ('lint', 'deps', 'headers')
+
+DEFAULT_CHECKS = ('lint', 'deps')
+
+
+def register_arguments(parser: argparse.ArgumentParser) -> None:
+    """注册命令参数"""
+    parser.add_argument('path', nargs='?', default='.', help='监听的根目录（默认为当前目录）')
+    parser.add_argument('--run', default=','.join(DEFAULT_CHECKS),
+                        help=f"变更后运行的检查，逗号分隔（{', '.join(CHECKS)}；默认 {','.join(DEFAULT_CHECKS)}）")
+    parser.add_argument('--debounce', type=float, default=0.3,
+                        help='最后一个事件之后等待的秒数，期间的事件合并为一批（默认 0.3）')
+    parser.add_argument('--poll', action='store_true', help='不使用 inotify，按 mtime 轮询')
+    parser.add_argument('--interval', type=float, default=1.0, help='轮询间隔秒数（默认 1.0）')
+    parser.add_argument('--no-initial', action='store_true', help='启动时不对所有 pod 运行一次检查')
+    parser.add_argument('--jobs', '-j', type=int, help='并行线程数')
+
+
+def parse_checks(value: str) -> List[str]:
+    """解析 --run 参数"""
+    checks = [item.strip() for item in value.split(',') if item.strip()]
+    unknown = [item for item in checks if item not in CHECKS]
+    if unknown or not checks:
+        raise ValueError(f"未知的检查: {', '.join(unknown) or value}（可选 {', '.join(CHECKS)}）")
+    return checks
+
+
+class WatchSession:
+    """一次 watch 会话：在内存中维护依赖图和 podspec 解析结果，按变更计划并运行检查"""
+
+    def __init__(self, root: Path, checks: Iterable[str], cache_dir: Optional[Path] = None,
+                 jobs: Optional[int] = None):
+        """发现 root 下的 podspec 并构建依赖图
+
+        Args:
+            root: 根目录
+            checks: 要运行的检查
+            cache_dir: 缓存目录（依赖图、deps-check 和 headers 的持久缓存）
+            jobs: 并行线程数
+        """
+        from ..utils.pod_graph import PodGraph
+
+        self.root = Path(root).resolve()
+        self.checks = [check for check in CHECKS if check in set(checks)]
+        self.cache_dir = cache_dir
+        self.jobs = jobs
+        graph = PodGraph.build(self.root, cache_dir=cache_dir, jobs=jobs)
+        self.nodes: Dict[str, 'PodNode'] = {node.path: node for node in graph.nodes.values()}
+        self.graph = graph
+        self.specs: Dict[str, Tuple[int, int, 'Podspec']] = {}
+        # 生成器写入的文件及其 mtime，对应的事件不再触发检查
+        self.generated: Dict[str, int] = {}
+
+    def _update_podspecs(self, rel_paths: Iterable[str]) -> None:
+        """重新解析变更的 podspec 并重建依赖图（其余节点直接复用）"""
+        from ..utils.pod_graph import PodGraph, PodNode
+
+        for rel_path in rel_paths:
+            self.specs.pop(rel_path, None)
+            if (self.root / rel_path).is_file():
+                self.nodes[rel_path] = PodNode.from_podspec(self.root / rel_path, rel_path)
+            else:
+                self.nodes.pop(rel_path, None)
+        self.graph = PodGraph(sorted(self.nodes.values(), key=lambda node: node.path), self.root)
+
+    def rescan(self) -> None:
+        """重新发现 podspec（事件丢失后使用，未变化的 podspec 命中解析缓存）"""
+        from ..utils.pod_graph import PodGraph
+
+        graph = PodGraph.build(self.root, cache_dir=self.cache_dir, jobs=self.jobs)
+        self.nodes = {node.path: node for node in graph.nodes.values()}
+        self.graph = graph
+
+    def plan_all(self) -> Dict[str, List[str]]:
+        """对所有 pod 运行全部检查"""
+        return {name: list(self.checks) for name in sorted(self.graph.nodes)}
+
+    def spec(self, name: str) -> 'Podspec':
+        """pod 的 podspec（文件未变化时复用上次的解析结果）"""
+        from ..utils.podspec import Podspec
+
+        rel_path = self.graph.nodes[name].path
+        stat = (self.root / rel_path).stat()
+        cached = self.specs.get(rel_path)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+        spec = Podspec.from_file(self.root / rel_path)
+        self.specs[rel_path] = (stat.st_mtime_ns, stat.st_size, spec)
+        return spec
+
+    def plan(self, paths: Optional[Set[str]]) -> Dict[str, List[str]]:
+        """变更对应的检查
+
+        Args:
+            paths: 变更的相对路径；None 表示全部重新检查
+
+        Returns:
+            pod 名称到需要运行的检查
+        """
+        from ..utils.affected import pod_owners
+        from ..utils.deps_check import SCAN_EXTENSIONS
+        from ..utils.pod_glob import HEADER_EXTENSIONS
+
+        if paths is None:
+            self.rescan()
+            return self.plan_all()
+
+        paths = {path for path in paths if not self._is_generated(path)}
+        podspecs = {path for path in paths if path.endswith(('.podspec', '.podspec.json'))}
+        if podspecs:
+            self._update_podspecs(podspecs)
+
+        plan: Dict[str, List[str]] = {}
+        for name, files in pod_owners(self.graph, paths).items():
+            if any(path in podspecs for path in files):
+                plan[name] = list(self.checks)
+                continue
+            lowered = [path.lower() for path in files]
+            checks = []
+            for check in self.checks:
+                if check == 'lint':
+                    checks.append(check)
+                elif check == 'deps' and any(path.endswith(SCAN_EXTENSIONS) for path in lowered):
+                    checks.append(check)
+                elif check == 'headers' and any(path.endswith(HEADER_EXTENSIONS) for path in lowered):
+                    checks.append(check)
+            if checks:
+                plan[name] = checks
+        return plan
+
+    def _is_generated(self, rel_path: str) -> bool:
+        mtime_ns = self.generated.get(rel_path)
+        if mtime_ns is None:
+            return False
+        try:
+            return os.stat(self.root / rel_path).st_mtime_ns == mtime_ns
+        except OSError:
+            return False
+
+    def run(self, plan: Dict[str, List[str]]) -> bool:
+        """运行计划中的检查，返回是否全部通过"""
+        from ..utils.podspec import PodspecError
+
+        success = True
+        for name, checks in plan.items():
+            node = self.graph.nodes[name]
+            if node.error:
+                print(f"❌ {name}: 无法解析 {node.path}: {node.error}")
+                success = False
+                continue
+            for check in checks:
+                try:
+                    ok = getattr(self, f"_run_{check}")(name)
+                except (PodspecError, OSError, UnicodeDecodeError) as e:
+                    print(f"❌ {name} {check}: {e}")
+                    ok = False
+                success = success and ok
+        return success
+
+    def _run_lint(self, name: str) -> bool:
+        from ..utils.pod_glob import evaluate_podspec, glob_issues
+        from ..utils.podspec import prelint
+
+        spec = self.spec(name)
+        podspec_path = self.root / self.graph.nodes[name].path
+        issues = prelint(spec, podspec_path)
+        issues.extend(glob_issues(evaluate_podspec(spec, podspec_path.parent)))
+        for issue in issues:
+            print(f"  {'❌' if issue.is_error else '⚠️ '} {name}: {issue.message}")
+        errors = sum(1 for issue in issues if issue.is_error)
+        if not errors:
+            print(f"✅ {name} lint" + (f"（{len(issues)} 个警告）" if issues else ''))
+        return not errors
+
+    def _run_deps(self, name: str) -> bool:
+        from ..utils.deps_check import check_dependencies
+
+        result = check_dependencies(self.root / self.graph.nodes[name].path, cache_dir=self.cache_dir,
+                                    jobs=self.jobs, spec=self.spec(name))
+        for module, files in result['missing'].items():
+            print(f"  ❌ {name}: 缺少依赖 {module}（{files[0]}" + (f" 等 {len(files)} 个文件）" if len(files) > 1 else '）'))
+        for dependency in result['unused']:
+            print(f"  ⚠️  {name}: 未使用的依赖 {dependency}")
+        if not result['missing']:
+            print(f"✅ {name} deps（扫描 {result['stats']['scanned']} 个文件，缓存命中 {result['stats']['cached']} 个）")
+        return not result['missing']
+
+    def _run_headers(self, name: str) -> bool:
+        from ..utils.umbrella import apply_headers, plan_headers
+
+        plan = plan_headers(self.root / self.graph.nodes[name].path, cache_dir=self.cache_dir,
+                            spec=self.spec(name))
+        try:
+            written = apply_headers(plan)
+        except FileExistsError as e:
+            print(f"  ❌ {name}: 文件不是由 lee-devkit 生成的，未覆盖: {e}")
+            return False
+        for path in written:
+            if self.root in path.parents:
+                self.generated[path.relative_to(self.root).as_posix()] = path.stat().st_mtime_ns
+            print(f"  ✏️  {name}: 已更新 {path}")
+        print(f"✅ {name} headers（{len(plan.headers)} 个公开头文件）")
+        return True
+
+
+def watch(session: WatchSession, watcher: 'Watcher', debounce: float = 0.3, max_runs: Optional[int] = None,
+          idle_timeout: Optional[float] = None) -> bool:
+    """监听变更并运行受影响的检查
+
+    Args:
+        session: watch 会话
+        watcher: create_watcher 的结果
+        debounce: 合并事件的安静时间
+        max_runs: 运行检查的最大批次数（None 表示一直运行）
+        idle_timeout: 超过该秒数没有变更时返回
+
+    Returns:
+        最后一批检查是否全部通过
+    """
+    from ..utils.file_watch import wait_for_changes
+
+    runs = 0
+    success = True
+    while max_runs is None or runs < max_runs:
+        changes = wait_for_changes(watcher, debounce, timeout=idle_timeout)
+        if changes is not None and not changes:
+            if idle_timeout is not None:
+                break
+            continue
+        start = time.monotonic()
+        plan = session.plan(changes)
+        if not plan:
+            continue
+        described = '事件队列溢出，全部重新检查' if changes is None else f"{len(changes)} 个文件变更"
+        print(f"\n🔄 {described}: {', '.join(plan)}")
+        success = session.run(plan)
+        runs += 1
+        print(f"⏱️  {time.monotonic() - start:.2f}s")
+    return success
+
+
+def execute(args: argparse.Namespace, config: Config) -> bool:
+    """执行命令"""
+    root = Path(args.path)
+    if not root.is_dir():
+        print(f"❌ 目录不存在: {root}")
+        return False
+    try:
+        checks = parse_checks(args.run)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return False
+
+    from ..utils.file_watch import create_watcher
+
+    cache_dir = Path(config.get_cache_dir()) if config is not None else None
+    session = WatchSession(root, checks, cache_dir=cache_dir, jobs=args.jobs)
+    watcher = create_watcher(session.root, polling=args.poll, interval=args.interval)
+    print(f"👀 监听 {session.root}（{watcher.backend}，{len(session.graph.nodes)} 个 pod，"
+          f"检查: {', '.join(session.checks)}），按 Ctrl+C 退出")
+    try:
+        if not args.no_initial and session.graph.nodes:
+            session.run(session.plan_all())
+        watch(session, watcher, debounce=args.debounce)
+    except KeyboardInterrupt:
+        print("\n👋 已停止监听")
+    finally:
+        watcher.close()
+    return True
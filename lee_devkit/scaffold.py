@@ -11,7 +11,7 @@ from typing import Dict, Any, Optional, List
 from . import __version__
 from .config import Config
 from .utils.logger import setup_logger
-from .commands import cocoapods, git_tools, file_tools, code_gen, project_init, pod_repo_push, git_tag
+from .commands import cocoapods, git_tools, file_tools, code_gen, project_init, pod_repo_push, git_tag, watch
 
 
 class LeeScaffold:
@@ -73,6 +73,13 @@ class LeeScaffold:
             'description': 'CocoaPods 库发布工具',
             'aliases': ['push', 'pp']
         }
+        
+        # 注册 Watch 命令
+        self.commands['watch'] = {
+            'module': watch,
+            'description': '监听文件变更并只重新运行受影响的检查',
+            'aliases': ['w']
+        }
     
     def create_parser(self) -> argparse.ArgumentParser:
         """创建主命令解析器"""
@@ -200,6 +207,10 @@ class LeeScaffold:
   lee-devkit init react-app MyApp
   lee-devkit new fastapi-project MyAPI
   
+  # 监听变更
+  lee-devkit watch
+  lee-devkit watch LocalPods/ --run lint,deps,headers
+  
   # 配置管理
   lee-devkit config --show
   lee-devkit config --author "Lee" --email "lee@example.com"
@@ -0,0 +1,104 @@
+"""
+受变更影响的 pod
+把 git diff 中变更的路径映射到 source_files、resources 等文件模式覆盖它们的 pod（按模式匹配，
+不遍历文件系统，已删除的文件同样适用），再沿依赖图加入所有反向依赖，得到需要 lint 或发布的最小集合
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Set
+
+from .pod_glob import compile_patterns
+from .pod_graph import PodGraph
+
+
+def _ancestors(path: str) -> List[str]:
+    """path 本身及其所有上级目录（由近到远，不含根目录）"""
+    result = [path]
+    while '/' in path:
+        path = path.rpartition('/')[0]
+        result.append(path)
+    return result
+
+
+def pod_owners(graph: PodGraph, paths: Iterable[str]) -> Dict[str, List[str]]:
+    """变更文件直接影响的 pod
+
+    文件本身或其上级目录与 pod 的任一文件模式匹配（目录模式表示目录下的所有文件），
+    或者文件就是 podspec 时，该 pod 受影响；无法解析的 podspec 所在目录下的任何文件都视为影响该 pod。
+
+    Args:
+        graph: 依赖图
+        paths: 相对于图根目录的变更路径
+
+    Returns:
+        pod 名称到影响它的文件
+    """
+    by_dir: Dict[str, List[str]] = {}
+    by_podspec: Dict[str, str] = {}
+    for name, node in graph.nodes.items():
+        podspec_dir = node.path.rpartition('/')[0]
+        by_dir.setdefault(podspec_dir, []).append(name)
+        by_podspec[node.path] = name
+    for path, name in graph.duplicates:
+        by_podspec.setdefault(path, name)
+
+    matchers = {name: compile_patterns(node.patterns) for name, node in graph.nodes.items()}
+
+    owners: Dict[str, List[str]] = {}
+    for path in paths:
+        hits: Set[str] = set()
+        if path in by_podspec and by_podspec[path] in graph.nodes:
+            hits.add(by_podspec[path])
+        candidates = _ancestors(path)[1:] + ['']
+        for pod_dir in candidates:
+            names = by_dir.get(pod_dir)
+            if not names:
+                continue
+            rel = path[len(pod_dir) + 1:] if pod_dir else path
+            for name in names:
+                if graph.nodes[name].error:
+                    hits.add(name)
+                    continue
+                matcher = matchers[name]
+                if matcher is not None and any(matcher.fullmatch(part) for part in _ancestors(rel)):
+                    hits.add(name)
+        for name in hits:
+            owners.setdefault(name, []).append(path)
+    return {name: owners[name] for name in sorted(owners)}
+
+
+def affected_pods(graph: PodGraph, paths: Iterable[str], dependents: bool = True) -> Dict:
+    """计算受变更影响的 pod
+
+    Args:
+        graph: 依赖图
+        paths: 相对于图根目录的变更路径
+        dependents: 是否加入反向依赖
+
+    Returns:
+        changed（变更文件数）、direct（直接影响的 pod 到文件）、dependents（因依赖而受影响的 pod）、
+        pods（按依赖顺序排列的全部受影响 pod，被依赖的在前）和 unowned（不属于任何 pod 的文件）
+    """
+    paths = sorted(set(paths))
+    direct = pod_owners(graph, paths)
+    selected = set(direct)
+    if dependents:
+        for name in direct:
+            selected.update(graph.reverse_dependencies(name, transitive=True))
+    owned = {path for files in direct.values() for path in files}
+    order = [name for name in graph.topological_order() if name in selected]
+    order += sorted(selected - set(order))
+    return {
+        'changed': len(paths),
+        'direct': direct,
+        'dependents': sorted(selected - set(direct)),
+        'pods': order,
+        'unowned': [path for path in paths if path not in owned],
+    }
+
+
+def podspec_paths(graph: PodGraph, names: Iterable[str]) -> List[Path]:
+    """pod 对应的 podspec 文件路径"""
+    if graph.root is None:
+        raise ValueError("依赖图没有根目录")
+    return [graph.root / graph.nodes[name].path for name in names]
@@ -0,0 +1,185 @@
+"""
+归档工具
+提供流式写入 tar / tar.gz / zip 归档的功能
+"""
+
+import gzip
+import io
+import shutil
+import subprocess
+import tarfile
+import time
+import zipfile
+from typing import Any, BinaryIO, Optional, Tuple
+
+
+ARCHIVE_FORMATS = ('tar.gz', 'tar', 'zip')
+
+
+def detect_archive_format(target: str, default: str = 'tar.gz') -> str:
+    """根据目标文件名推断归档格式
+
+    Args:
+        target: 归档文件路径，'-' 表示标准输出
+        default: 无法推断时使用的格式
+
+    Returns:
+        归档格式 ('tar.gz', 'tar' 或 'zip')
+    """
+    name = target.lower()
+    if name.endswith(('.tar.gz', '.tgz')):
+        return 'tar.gz'
+    if name.endswith('.tar'):
+        return 'tar'
+    if name.endswith('.zip'):
+        return 'zip'
+    return default
+
+
+class StreamingArchive:
+    """流式归档写入器
+
+    所有条目直接写入目标流，不落地中间目录；tar.gz 优先交给多线程的
+    ``pigz`` 压缩，找不到时回退到标准库 gzip。
+    """
+
+    def __init__(self, stream: BinaryIO, archive_format: str = 'tar.gz',
+                 compresslevel: int = 6):
+        """初始化归档写入器
+
+        Args:
+            stream: 可写的二进制流（可以是不可 seek 的管道或标准输出）
+            archive_format: 归档格式
+            compresslevel: 压缩级别
+        """
+        if archive_format not in ARCHIVE_FORMATS:
+            raise ValueError(f"不支持的归档格式: {archive_format}")
+
+        self.stream = stream
+        self.archive_format = archive_format
+        self.compresslevel = compresslevel
+        self._process: Optional[subprocess.Popen] = None
+        self._tar: Optional[tarfile.TarFile] = None
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._gzip: Optional[gzip.GzipFile] = None
+        self._mtime = time.time()
+
+    def __enter__(self) -> 'StreamingArchive':
+        self.open()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.close()
+
+    def open(self) -> None:
+        """打开底层归档"""
+        if self.archive_format == 'zip':
+            self._zip = zipfile.ZipFile(
+                self.stream, 'w',
+                compression=zipfile.ZIP_DEFLATED,
+                compresslevel=self.compresslevel
+            )
+            return
+
+        if self.archive_format == 'tar.gz':
+            pigz = shutil.which('pigz')
+            # pigz 直接写入文件描述符，BytesIO 等没有真实 fileno() 的流只能用 gzip
+            fileno = self._fileno() if pigz else None
+            if pigz is not None and fileno is not None:
+                self.stream.flush()
+                self._process = subprocess.Popen(
+                    [pigz, f'-{self.compresslevel}', '-c'],
+                    stdin=subprocess.PIPE,
+                    stdout=fileno
+                )
+                self._tar = tarfile.open(fileobj=self._process.stdin, mode='w|',
+                                         format=tarfile.PAX_FORMAT)
+            else:
+                self._gzip = gzip.GzipFile(fileobj=self.stream, mode='wb',
+                                           compresslevel=self.compresslevel)
+                self._tar = tarfile.open(fileobj=self._gzip, mode='w|',
+                                         format=tarfile.PAX_FORMAT)
+        else:
+            self._tar = tarfile.open(fileobj=self.stream, mode='w|',
+                                     format=tarfile.PAX_FORMAT)
+
+    def _fileno(self) -> Optional[int]:
+        try:
+            return self.stream.fileno()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            return None
+
+    def _tar_file(self) -> tarfile.TarFile:
+        if self._tar is None:
+            raise ValueError("归档尚未打开")
+        return self._tar
+
+    def add_directory(self, path: str, mode: int = 0o755) -> None:
+        """添加目录条目
+
+        Args:
+            path: 归档内的相对路径（使用 / 分隔）
+            mode: 权限位
+        """
+        path = path.rstrip('/')
+        if self._zip is not None:
+            zinfo = zipfile.ZipInfo(path + '/', date_time=self._zip_date_time())
+            zinfo.external_attr = ((0o40000 | mode) << 16) | 0x10
+            self._zip.writestr(zinfo, b'')
+        else:
+            tinfo = tarfile.TarInfo(path)
+            tinfo.type = tarfile.DIRTYPE
+            tinfo.mode = mode
+            tinfo.mtime = self._mtime
+            self._tar_file().addfile(tinfo)
+
+    def add_file(self, path: str, fileobj: BinaryIO, size: int, mode: int = 0o644) -> None:
+        """从文件对象流式添加文件条目
+
+        Args:
+            path: 归档内的相对路径（使用 / 分隔）
+            fileobj: 可读的二进制文件对象
+            size: 文件大小（字节）
+            mode: 权限位
+        """
+        if self._zip is not None:
+            zinfo = zipfile.ZipInfo(path, date_time=self._zip_date_time())
+            zinfo.external_attr = (0o100000 | mode) << 16
+            zinfo.compress_type = zipfile.ZIP_DEFLATED
+            zinfo.file_size = size
+            with self._zip.open(zinfo, 'w', force_zip64=size > 0x7FFFFFFF) as dst:
+                shutil.copyfileobj(fileobj, dst, 1024 * 1024)
+        else:
+            tinfo = tarfile.TarInfo(path)
+            tinfo.size = size
+            tinfo.mode = mode
+            tinfo.mtime = self._mtime
+            self._tar_file().addfile(tinfo, fileobj)
+
+    def add_bytes(self, path: str, data: bytes, mode: int = 0o644) -> None:
+        """添加内存中的文件内容"""
+        self.add_file(path, io.BytesIO(data), len(data), mode)
+
+    def close(self) -> None:
+        """关闭归档并等待压缩进程结束"""
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+        if self._tar is not None:
+            self._tar.close()
+            self._tar = None
+        if self._gzip is not None:
+            self._gzip.close()
+            self._gzip = None
+        if self._process is not None:
+            if self._process.stdin is not None:
+                self._process.stdin.close()
+            exit_code = self._process.wait()
+            self._process = None
+            if exit_code != 0:
+                raise OSError(f"压缩进程退出码异常: {exit_code}")
+        self.stream.flush()
+
+    def _zip_date_time(self) -> Tuple[int, int, int, int, int, int]:
+        t = time.localtime(self._mtime)
+        return t.tm_year, t.tm_mon, t.tm_mday, t.tm_hour, t.tm_min, t.tm_sec
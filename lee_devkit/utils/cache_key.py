@@ -0,0 +1,225 @@
+"""
+Pods 目录的 CI 缓存键
+由 Podfile、Podfile.lock、本地 pod（:path）的 podspec 及其源文件和工具版本计算稳定的摘要，
+文件哈希按 mtime/size 缓存，并记录上一次的输入以便说明缓存键为何变化
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from .lint_cache import hash_file
+from .lockfile import Lockfile, LockfileError
+from .pod_glob import resolve_patterns
+from .podspec import Podspec, PodspecError
+
+CACHE_KEY_VERSION = 1
+
+# 修改时间距今小于该秒数的文件不写入哈希缓存（同一秒内再次修改时 mtime 可能不变）
+RACY_SECONDS = 2.0
+
+# Podfile 中的本地 pod：pod 'Name', :path => '../Name' 或 path: '../Name'
+PODFILE_PATH_RE = re.compile(
+    r"""^\s*pod\s+['"]([^'"]+)['"].*?(?::path\s*=>|\bpath:)\s*['"]([^'"]+)['"]""", re.MULTILINE
+)
+
+
+class HashMemo:
+    """按路径、mtime 和大小缓存文件哈希"""
+
+    def __init__(self, memo_path: Optional[Union[str, Path]] = None, jobs: Optional[int] = None):
+        """初始化缓存
+
+        Args:
+            memo_path: 缓存文件路径，为 None 时不持久化
+            jobs: 计算哈希的并行线程数
+        """
+        self.memo_path = Path(memo_path) if memo_path else None
+        self.jobs = jobs or min(32, (os.cpu_count() or 1) + 4)
+        self.entries: Dict[str, List] = {}
+        self.stats = {'hashed': 0, 'cached': 0}
+        if self.memo_path:
+            try:
+                with open(self.memo_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == CACHE_KEY_VERSION:
+                    self.entries = data.get('files', {})
+            except (OSError, ValueError):
+                pass
+
+    def hash_files(self, paths: Iterable[Path]) -> Dict[str, str]:
+        """计算文件哈希（未变化的文件直接使用缓存）
+
+        Returns:
+            绝对路径到 sha256
+        """
+        now = time.time()
+        result: Dict[str, str] = {}
+        todo: List[Tuple[str, os.stat_result]] = []
+        for path in paths:
+            key = str(Path(path).resolve())
+            st = os.stat(key)
+            entry = self.entries.get(key)
+            if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                result[key] = entry[2]
+                self.stats['cached'] += 1
+            else:
+                todo.append((key, st))
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            digests = list(executor.map(lambda item: hash_file(item[0]), todo))
+        for (key, st), digest in zip(todo, digests):
+            result[key] = digest
+            self.stats['hashed'] += 1
+            if now - st.st_mtime_ns / 1e9 >= RACY_SECONDS:
+                self.entries[key] = [st.st_mtime_ns, st.st_size, digest]
+            else:
+                self.entries.pop(key, None)
+        return result
+
+    def save(self) -> None:
+        """写回缓存文件（先写临时文件再替换）"""
+        if not self.memo_path:
+            return
+        self.memo_path.parent.mkdir(parents=True, exist_ok=True)
+        existing = {key: entry for key, entry in self.entries.items() if os.path.exists(key)}
+        temp_path = self.memo_path.with_name(f".{self.memo_path.name}.{os.getpid()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_KEY_VERSION, 'files': existing}, f)
+        os.replace(temp_path, self.memo_path)
+
+
+def find_local_podspec(path: Path, name: str) -> Optional[Path]:
+    """查找 :path 指向的目录中的 podspec"""
+    if path.is_file():
+        return path
+    for file_name in (f"{name}.podspec", f"{name}.podspec.json"):
+        if (path / file_name).is_file():
+            return path / file_name
+    candidates = sorted(path.glob('*.podspec')) + sorted(path.glob('*.podspec.json'))
+    return candidates[0] if len(candidates) == 1 else None
+
+
+def local_pods(project_dir: Path) -> Dict[str, Path]:
+    """Podfile.lock 的 EXTERNAL SOURCES 和 Podfile 中通过 :path / :podspec 引用的本地 pod"""
+    pods: Dict[str, Path] = {}
+    lockfile_path = project_dir / 'Podfile.lock'
+    if lockfile_path.is_file():
+        try:
+            lockfile = Lockfile.from_file(lockfile_path)
+        except (LockfileError, OSError, UnicodeDecodeError):
+            lockfile = None
+        for name, source in (lockfile.external_sources if lockfile else {}).items():
+            if isinstance(source, dict):
+                local = source.get(':path') or source.get(':podspec')
+                if local and '://' not in local:
+                    pods[name] = (project_dir / local).resolve()
+    podfile = project_dir / 'Podfile'
+    if podfile.is_file():
+        for name, local in PODFILE_PATH_RE.findall(podfile.read_text(encoding='utf-8', errors='replace')):
+            pods.setdefault(name.split('/')[0], (project_dir / local).resolve())
+    return dict(sorted(pods.items()))
+
+
+def collect_inputs(project_dir: Path) -> Tuple[Dict[str, Path], List[str]]:
+    """收集参与缓存键计算的文件
+
+    Returns:
+        (输入名称到文件路径, 警告信息)
+    """
+    inputs: Dict[str, Path] = {}
+    warnings: List[str] = []
+    for name in ('Podfile', 'Podfile.lock'):
+        if (project_dir / name).is_file():
+            inputs[name] = project_dir / name
+        else:
+            warnings.append(f"缺少 {name}")
+
+    for name, local in local_pods(project_dir).items():
+        podspec = find_local_podspec(local, name)
+        if podspec is None:
+            warnings.append(f"本地 pod {name} 的 podspec 不存在: {local}")
+            continue
+        inputs[f"{name}:{podspec.name}"] = podspec
+        try:
+            patterns = Podspec.from_file(podspec).file_patterns()
+        except (PodspecError, OSError, UnicodeDecodeError) as e:
+            warnings.append(f"无法解析 {podspec}（仅使用 podspec 本身）: {e}")
+            continue
+        for rel_path in resolve_patterns(podspec.parent, patterns):
+            inputs[f"{name}:{rel_path}"] = podspec.parent / rel_path
+    return inputs, warnings
+
+
+def compute_cache_key(project_dir: Union[str, Path], tool_versions: Dict[str, Optional[str]],
+                      cache_dir: Optional[Union[str, Path]] = None, salt: str = '',
+                      jobs: Optional[int] = None) -> Dict:
+    """计算 Pods 目录的缓存键
+
+    Args:
+        project_dir: Podfile 所在目录
+        tool_versions: 工具名称到版本（例如 pod）
+        cache_dir: 缓存目录，保存文件哈希缓存和上一次的输入
+        salt: 额外混入的字符串（手动使缓存失效）
+        jobs: 计算哈希的并行线程数
+
+    Returns:
+        key（缓存键）、inputs（输入名称到摘要）、changes（与上一次相比变化的输入，首次为 None）、
+        warnings、stats
+    """
+    project_dir = Path(project_dir).resolve()
+    state_dir = None
+    if cache_dir is not None:
+        state_dir = Path(cache_dir) / 'cache-key' / hashlib.sha1(str(project_dir).encode('utf-8')).hexdigest()[:16]
+    memo = HashMemo(state_dir / 'memo.json' if state_dir else None, jobs=jobs)
+
+    files, warnings = collect_inputs(project_dir)
+    hashes = memo.hash_files(files.values())
+    inputs = {name: hashes[str(path.resolve())] for name, path in files.items()}
+    for tool, version in sorted(tool_versions.items()):
+        inputs[f"tool:{tool}"] = version or 'unknown'
+    if salt:
+        inputs['salt'] = salt
+
+    digest = hashlib.sha256(f"lee-devkit-pods-cache-key/{CACHE_KEY_VERSION}\n".encode('utf-8'))
+    for name in sorted(inputs):
+        digest.update(f"{name}\0{inputs[name]}\n".encode('utf-8'))
+    key = digest.hexdigest()
+
+    changes = None
+    if state_dir:
+        memo.save()
+        last_path = state_dir / 'last.json'
+        try:
+            with open(last_path, 'r', encoding='utf-8') as f:
+                last = json.load(f)
+        except (OSError, ValueError):
+            last = None
+        if last and last.get('key') != key:
+            changes = diff_inputs(last.get('inputs', {}), inputs)
+        elif last:
+            changes = []
+        temp_path = last_path.with_name(f".last.{os.getpid()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'key': key, 'inputs': inputs}, f, indent=1, sort_keys=True)
+        os.replace(temp_path, last_path)
+
+    return {'key': key, 'inputs': inputs, 'changes': changes, 'warnings': warnings, 'stats': memo.stats}
+
+
+def diff_inputs(old: Dict[str, str], new: Dict[str, str]) -> List[Tuple[str, str]]:
+    """比较两次的输入，返回 (标记, 输入名称)；+ 新增，- 删除，~ 修改"""
+    changes = []
+    for name in sorted(set(old) | set(new)):
+        if name not in old:
+            changes.append(('+', name))
+        elif name not in new:
+            changes.append(('-', name))
+        elif old[name] != new[name]:
+            changes.append(('~', name))
+    return changes
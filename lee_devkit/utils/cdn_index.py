@@ -0,0 +1,283 @@
+"""
+spec 仓库的静态 CDN 索引
+按 CocoaPods trunk CDN 的布局（CocoaPods-version.yml、分片的 all_pods_versions_*.txt、
+deprecated_podspecs.txt 和 Specs/ 下每个版本的 .podspec.json）生成可由任意静态文件服务器提供的目录，
+记录上次生成时的提交，之后只按 git diff 处理变更的 spec；转换失败的 spec 不发布旧内容，下次生成时重试
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from .git_ops import GitOperations
+from .podspec import Podspec, PodspecError, version_key
+from .spec_index import scan_spec_files, spec_paths
+
+CDN_INDEX_VERSION = 1
+
+# 输出目录中记录上次生成状态的文件
+STATE_FILE_NAME = '.lee-devkit-cdn.json'
+
+# 与 trunk 一致：名称 MD5 的前三位十六进制字符各作为一级分片
+PREFIX_LENGTHS = (1, 1, 1)
+
+# CocoaPods-version.yml 中声明的客户端版本范围
+MIN_COCOAPODS_VERSION = '1.8.0'
+LAST_COCOAPODS_VERSION = '1.16.2'
+
+
+class CDNIndexError(ValueError):
+    """无法生成 CDN 索引"""
+
+
+def shard_parts(name: str) -> List[str]:
+    """pod 名称所在的分片（MD5 前缀按 PREFIX_LENGTHS 拆分）"""
+    digest = hashlib.md5(name.encode('utf-8')).hexdigest()
+    parts, pos = [], 0
+    for length in PREFIX_LENGTHS:
+        parts.append(digest[pos:pos + length])
+        pos += length
+    return parts
+
+
+def spec_json_path(name: str, version: str) -> str:
+    """某个版本的 .podspec.json 在输出目录中的相对路径"""
+    return '/'.join(['Specs', *shard_parts(name), name, version, f"{name}.podspec.json"])
+
+
+def shard_file_name(parts: Iterable[str]) -> str:
+    """分片版本列表的文件名"""
+    return f"all_pods_versions_{'_'.join(parts)}.txt"
+
+
+def render_version_file() -> str:
+    """生成 CocoaPods-version.yml"""
+    lines = ['---', f"min: {MIN_COCOAPODS_VERSION}", f"last: {LAST_COCOAPODS_VERSION}", 'prefix_lengths:']
+    lines += [f"- {length}" for length in PREFIX_LENGTHS]
+    return '\n'.join(lines) + '\n'
+
+
+def _read(path: Path) -> Optional[str]:
+    try:
+        return path.read_text(encoding='utf-8')
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _write_if_changed(path: Path, text: str) -> bool:
+    if _read(path) == text:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(temp_path, path)
+    return True
+
+
+def _remove(path: Path, stop: Path) -> None:
+    """删除文件以及因此变空的上级目录（不超过 stop）"""
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+    parent = path.parent
+    while parent != stop and stop in parent.parents:
+        try:
+            parent.rmdir()
+        except OSError:
+            break
+        parent = parent.parent
+
+
+def convert_spec(path: Path) -> Tuple[str, bool]:
+    """把 spec 仓库中的 podspec 转换为 .podspec.json 内容
+
+    Returns:
+        (JSON 文本, 是否已废弃)
+
+    Raises:
+        PodspecError: 无法解析，或 Ruby podspec 的取值依赖 ENV、三元表达式等运行时条件
+            （此时无法得到与 CocoaPods 一致的 JSON，不发布猜测的结果）
+    """
+    if path.name.endswith('.json'):
+        text = path.read_text(encoding='utf-8')
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise PodspecError(f"invalid JSON: {e}") from e
+        if not isinstance(data, dict):
+            raise PodspecError("invalid JSON: not an object")
+        text = text if text.endswith('\n') else text + '\n'
+    else:
+        data = Podspec.from_file(path).to_json()
+        text = json.dumps(data, indent=2, ensure_ascii=False) + '\n'
+    deprecated = data.get('deprecated') is True or bool(data.get('deprecated_in_favor_of'))
+    return text, deprecated
+
+
+def _shard_versions(output_dir: Path, parts: List[str]) -> Dict[str, List[str]]:
+    shard_dir = output_dir.joinpath('Specs', *parts)
+    pods: Dict[str, List[str]] = {}
+    try:
+        names = sorted(os.listdir(shard_dir))
+    except OSError:
+        return pods
+    for name in names:
+        try:
+            versions = [v for v in os.listdir(shard_dir / name)
+                        if (shard_dir / name / v / f"{name}.podspec.json").is_file()]
+        except OSError:
+            continue
+        if versions:
+            pods[name] = sorted(versions, key=version_key)
+    return pods
+
+
+def _all_shards(output_dir: Path) -> List[List[str]]:
+    specs_dir = output_dir / 'Specs'
+    shards: List[List[str]] = [[]]
+    for _ in PREFIX_LENGTHS:
+        shards = [parts + [entry] for parts in shards
+                  for entry in (sorted(os.listdir(specs_dir.joinpath(*parts)))
+                                if specs_dir.joinpath(*parts).is_dir() else [])
+                  if specs_dir.joinpath(*parts, entry).is_dir()]
+    return shards
+
+
+def _load_state(output_dir: Path) -> Dict:
+    try:
+        with open(output_dir / STATE_FILE_NAME, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return state if isinstance(state, dict) and state.get('version') == CDN_INDEX_VERSION else {}
+
+
+def build_cdn_index(repo_path: Union[str, Path], output_dir: Union[str, Path], full: bool = False,
+                    jobs: Optional[int] = None) -> Dict:
+    """生成或增量更新 spec 仓库的 CDN 目录
+
+    Args:
+        repo_path: 本地 spec 仓库目录
+        output_dir: 输出目录
+        full: 忽略上次生成的提交，重新处理所有 spec
+        jobs: 转换 podspec 的并行线程数
+
+    Returns:
+        统计信息，包含 mode（full / incremental / unchanged）、commit、written、removed、
+        pods、shards（重写的分片文件数）和 errors（相对路径到错误信息）；
+        转换失败的 spec 删除已发布的旧 JSON，并记录在状态文件中供下次重试
+    """
+    repo_path = Path(repo_path).resolve()
+    output_dir = Path(output_dir).resolve()
+    if not repo_path.is_dir():
+        raise CDNIndexError(f"本地 spec 仓库不存在: {repo_path}")
+    if output_dir == repo_path or repo_path in output_dir.parents:
+        raise CDNIndexError("输出目录不能位于 spec 仓库内")
+    jobs = jobs or min(32, (os.cpu_count() or 1) + 4)
+
+    head = GitOperations(str(repo_path)).get_head_commit()
+    state = {} if full else _load_state(output_dir)
+    changes = None
+    if state.get('repo') == str(repo_path) and state.get('commit') and head:
+        if state['commit'] == head and not state.get('retry') \
+                and (output_dir / 'CocoaPods-version.yml').is_file():
+            return {'mode': 'unchanged', 'commit': head, 'written': 0, 'removed': 0,
+                    'pods': state.get('pods', 0), 'shards': 0, 'errors': {}}
+        changes = GitOperations(str(repo_path)).diff_name_status(state['commit'], head)
+
+    deprecated: Set[str] = set()
+    if changes is None:
+        mode = 'full'
+        to_write = spec_paths(scan_spec_files(repo_path))
+        removed_paths: List[str] = []
+        keep = {spec_json_path(*info) for info in to_write.values()}
+        specs_dir = output_dir / 'Specs'
+        for dirpath, _, filenames in os.walk(specs_dir):
+            for file_name in filenames:
+                rel = Path(dirpath, file_name).relative_to(output_dir).as_posix()
+                if rel.endswith('.podspec.json') and rel not in keep:
+                    removed_paths.append(rel)
+    else:
+        mode = 'incremental'
+        deprecated = set((_read(output_dir / 'deprecated_podspecs.txt') or '').split())
+        to_write = spec_paths(rel for status, rel in changes if status != 'D')
+        # 上次转换失败的 spec 即使没有变更也重新处理
+        to_write.update(spec_paths(rel for rel in state.get('retry', []) if (repo_path / rel).is_file()))
+        # 同一版本可能从 .podspec 改为 .podspec.json，此时不删除
+        kept = set(to_write.values())
+        removed_paths = [spec_json_path(*info)
+                         for info in spec_paths(rel for status, rel in changes if status == 'D').values()
+                         if info not in kept]
+
+    def convert(rel: str) -> Tuple[str, Optional[Tuple[str, bool]], Optional[str]]:
+        try:
+            return rel, convert_spec(repo_path / rel), None
+        except (PodspecError, OSError, UnicodeDecodeError) as e:
+            return rel, None, str(e)
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        results = list(executor.map(convert, to_write))
+
+    touched: Set[str] = set()
+    errors: Dict[str, str] = {}
+    written = 0
+    for rel, converted, error in results:
+        name, version = to_write[rel]
+        target = spec_json_path(name, version)
+        if converted is None:
+            errors[rel] = error or ''
+            # 已发布的 JSON 来自旧内容，不能继续提供
+            if target not in removed_paths and (output_dir / target).exists():
+                removed_paths.append(target)
+            continue
+        text, is_deprecated = converted
+        written += _write_if_changed(output_dir / target, text)
+        touched.add(name)
+        deprecated.discard(target)
+        if is_deprecated:
+            deprecated.add(target)
+    for target in removed_paths:
+        _remove(output_dir / target, output_dir / 'Specs')
+        touched.add(target.split('/')[-3])
+        deprecated.discard(target)
+
+    if mode == 'full':
+        # 包括已经没有 pod 的旧分片文件
+        candidates = _all_shards(output_dir) + [path.name[len('all_pods_versions_'):-len('.txt')].split('_')
+                                                for path in output_dir.glob('all_pods_versions_*.txt')]
+    else:
+        candidates = [shard_parts(name) for name in touched]
+    shards = sorted({tuple(parts) for parts in candidates})
+
+    rewritten = 0
+    for parts in shards:
+        pods = _shard_versions(output_dir, list(parts))
+        shard_path = output_dir / shard_file_name(parts)
+        if pods:
+            text = ''.join('/'.join([name] + versions) + '\n' for name, versions in pods.items())
+            rewritten += _write_if_changed(shard_path, text)
+        elif shard_path.exists():
+            shard_path.unlink()
+            rewritten += 1
+
+    names = sorted(name for parts in _all_shards(output_dir)
+                   for name in _shard_versions(output_dir, parts))
+    _write_if_changed(output_dir / 'all_pods.txt', ''.join(f"{name}\n" for name in names))
+    _write_if_changed(output_dir / 'deprecated_podspecs.txt', ''.join(f"{path}\n" for path in sorted(deprecated)))
+    _write_if_changed(output_dir / 'CocoaPods-version.yml', render_version_file())
+
+    # 状态最后写入，中途失败时下次会从上次成功的提交重新处理
+    _write_if_changed(output_dir / STATE_FILE_NAME, json.dumps({
+        'version': CDN_INDEX_VERSION,
+        'repo': str(repo_path),
+        'commit': head,
+        'pods': len(names),
+        'retry': sorted(errors),
+    }, indent=1) + '\n')
+    return {'mode': mode, 'commit': head, 'written': written, 'removed': len(removed_paths),
+            'pods': len(names), 'shards': rewritten, 'errors': errors}
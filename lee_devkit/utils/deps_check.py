@@ -0,0 +1,216 @@
+"""
+import 与声明依赖的一致性检查
+并行扫描 pod 的 Swift / Objective-C 源文件中的 import X、@import X 和 #import <X/...>，
+与 podspec 声明的 s.dependency、系统框架和 vendored_frameworks 比较，报告缺失或未使用的依赖；
+每个文件的扫描结果按内容哈希缓存
+"""
+
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from .cache_key import HashMemo
+from .pod_glob import evaluate_podspec
+from .podspec import PLATFORMS, Podspec
+
+DEPS_CHECK_VERSION = 2
+
+SCAN_EXTENSIONS = ('.swift', '.h', '.hh', '.hpp', '.m', '.mm', '.c', '.cc', '.cpp', '.cxx')
+
+# 编译器或 SDK 自带、不需要 s.dependency 的模块
+SYSTEM_MODULES = frozenset((
+    'Swift', 'SwiftUI', 'Foundation', 'Darwin', 'Dispatch', 'ObjectiveC', 'os', 'Combine', 'Observation',
+    'UIKit', 'AppKit', 'WatchKit', 'TVUIKit', 'CoreFoundation', 'CoreGraphics', 'CoreImage', 'CoreText',
+    'CoreData', 'CoreLocation', 'CoreMotion', 'CoreBluetooth', 'CoreTelephony', 'CoreServices', 'CoreML',
+    'CoreMedia', 'CoreVideo', 'CoreAudio', 'CoreHaptics', 'CoreNFC', 'CoreSpotlight', 'CoreAnimation',
+    'QuartzCore', 'AVFoundation', 'AVKit', 'AudioToolbox', 'MediaPlayer', 'Photos', 'PhotosUI',
+    'MapKit', 'WebKit', 'SafariServices', 'Security', 'SystemConfiguration', 'Network', 'CFNetwork',
+    'Accelerate', 'Metal', 'MetalKit', 'SceneKit', 'SpriteKit', 'ARKit', 'RealityKit', 'GameKit', 'Vision',
+    'NaturalLanguage', 'Speech', 'UserNotifications', 'UserNotificationsUI', 'StoreKit', 'MessageUI',
+    'Contacts', 'ContactsUI', 'EventKit', 'EventKitUI', 'HealthKit', 'HomeKit', 'CallKit', 'PushKit',
+    'LocalAuthentication', 'AuthenticationServices', 'CryptoKit', 'CommonCrypto', 'BackgroundTasks',
+    'WidgetKit', 'Intents', 'IntentsUI', 'AppTrackingTransparency', 'AdSupport', 'LinkPresentation',
+    'QuickLook', 'PDFKit', 'ImageIO', 'MobileCoreServices', 'UniformTypeIdentifiers', 'NetworkExtension',
+    'ExternalAccessory', 'GLKit', 'OpenGLES', 'JavaScriptCore', 'Accessibility', 'XCTest', 'zlib', 'sqlite3',
+    'libkern', 'simd', 'CryptoTokenKit', 'OSLog', 'MultipeerConnectivity', 'CarPlay',
+    # SDK 中 libc、Objective-C 运行时等头文件的目录（#import <objc/runtime.h>、<sys/sysctl.h> 等）
+    'objc', 'sys', 'mach', 'mach-o', 'machine', 'arm', 'i386', 'netinet', 'netinet6', 'arpa', 'net',
+    'dispatch', 'xpc', 'malloc', 'pthread', 'bsm', 'uuid', 'xlocale',
+))
+
+# 字符串字面量排在注释前面，先被整体匹配，其中的 // 和 /* 不会被当作注释
+_COMMENT_RE = re.compile(
+    r'("""[\s\S]*?"""|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\')|//[^\n]*|/\*[\s\S]*?\*/'
+)
+_SWIFT_IMPORT_RE = re.compile(
+    r'^[ \t]*(?:@\w+(?:\([^)]*\))?[ \t]+)*import[ \t]+'
+    r'(?:(?:typealias|struct|class|enum|protocol|let|var|func)[ \t]+)?([A-Za-z_]\w*)', re.MULTILINE
+)
+_OBJC_MODULE_RE = re.compile(r'^[ \t]*@import[ \t]+([A-Za-z_]\w*)', re.MULTILINE)
+_OBJC_HEADER_RE = re.compile(r'^[ \t]*#[ \t]*(?:import|include)[ \t]*<([A-Za-z_][\w+-]*)/', re.MULTILINE)
+_CAN_IMPORT_RE = re.compile(r'canImport\(\s*([A-Za-z_]\w*)')
+_HAS_INCLUDE_RE = re.compile(r'__has_include\(\s*<([A-Za-z_][\w+-]*)/')
+
+
+def module_name(pod_name: str) -> str:
+    """pod 名称对应的默认模块名（与 CocoaPods 的 c99ext_identifier 一致）"""
+    name = re.sub(r'[^A-Za-z0-9_]', '_', pod_name.split('/')[0])
+    return f"_{name}" if name[:1].isdigit() else name
+
+
+def _language(rel_path: str) -> str:
+    return 'swift' if rel_path.lower().endswith('.swift') else 'objc'
+
+
+def scan_imports(text: str, swift: bool) -> Tuple[List[str], List[str]]:
+    """提取源文件引用的模块
+
+    Returns:
+        (import 的模块, 只在 canImport / __has_include 条件中出现的模块)
+    """
+    optional = set(_CAN_IMPORT_RE.findall(text)) | set(_HAS_INCLUDE_RE.findall(text))
+    text = _COMMENT_RE.sub(lambda match: match.group(1) or '', text)
+    if swift:
+        modules = set(_SWIFT_IMPORT_RE.findall(text))
+    else:
+        modules = set(_OBJC_MODULE_RE.findall(text)) | set(_OBJC_HEADER_RE.findall(text))
+    return sorted(modules), sorted(optional)
+
+
+def _attribute_values(spec: Podspec, names: Tuple[str, ...]) -> List[str]:
+    values: List[str] = []
+    for sub in spec.walk():
+        if not sub.is_library:
+            continue
+        for key in sub.attributes:
+            prefix, _, attr = key.rpartition('.')
+            if attr not in names or (prefix and prefix not in PLATFORMS):
+                continue
+            value = sub.get(key)
+            for item in value if isinstance(value, list) else [value]:
+                if isinstance(item, str):
+                    values.extend(part.strip() for part in item.split(',') if part.strip())
+    return values
+
+
+def source_files(spec: Podspec, root: Optional[Path] = None) -> List[str]:
+    """podspec 所有变体的 source_files 中需要扫描的文件（相对路径，不含 test_spec / app_spec 的文件）"""
+    report = evaluate_podspec(spec, root)
+    libraries = {sub.full_name for sub in spec.walk() if sub.is_library}
+    files = {path for match in report.matches
+             if match.attribute == 'source_files' and match.spec in libraries for path in match.files}
+    return sorted(path for path in files if path.lower().endswith(SCAN_EXTENSIONS))
+
+
+def check_dependencies(podspec_path: Union[str, Path], cache_dir: Optional[Union[str, Path]] = None,
+                       module_map: Optional[Dict[str, str]] = None, jobs: Optional[int] = None,
+                       spec: Optional[Podspec] = None) -> Dict:
+    """比较源文件的 import 与 podspec 声明的依赖
+
+    Args:
+        podspec_path: podspec 文件路径
+        cache_dir: 缓存目录，保存文件哈希缓存和每个内容哈希的扫描结果；为 None 时不缓存
+        module_map: pod 名称到模块名（模块名与 pod 名称不同时）
+        jobs: 并行线程数
+        spec: 已解析的 podspec（为 None 时从 podspec_path 解析）
+
+    Returns:
+        module、files（扫描的文件数）、missing（模块到引用它的文件）、unused（未被 import 的依赖）、
+        unused_frameworks、stats（scanned / cached）
+    """
+    podspec_path = Path(podspec_path)
+    root = podspec_path.resolve().parent
+    if spec is None:
+        spec = Podspec.from_file(podspec_path)
+    files = source_files(spec, root)
+    jobs = jobs or min(32, (os.cpu_count() or 1) + 4)
+
+    state_dir = None
+    if cache_dir is not None:
+        state_dir = Path(cache_dir) / 'deps-check' / hashlib.sha1(str(root).encode('utf-8')).hexdigest()[:16]
+    memo = HashMemo(state_dir / 'memo.json' if state_dir else None, jobs=jobs)
+    scans: Dict[str, List[List[str]]] = {}
+    if state_dir:
+        try:
+            with open(state_dir / 'imports.json', 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == DEPS_CHECK_VERSION:
+                scans = data.get('files', {})
+        except (OSError, ValueError):
+            pass
+
+    hashes = memo.hash_files(root / rel for rel in files)
+    # 扫描结果同时取决于内容和语言（Swift 与 Objective-C 的 import 语法不同）
+    digests = {rel: f"{hashes[str((root / rel).resolve())]}:{_language(rel)}" for rel in files}
+    todo = sorted({digest: rel for rel, digest in digests.items() if digest not in scans}.items())
+    cached = sum(1 for rel in files if digests[rel] in scans)
+
+    def scan(item: Tuple[str, str]) -> Tuple[str, List[List[str]]]:
+        digest, rel = item
+        text = (root / rel).read_text(encoding='utf-8', errors='replace')
+        modules, optional = scan_imports(text, _language(rel) == 'swift')
+        return digest, [modules, optional]
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        scans.update(executor.map(scan, todo))
+
+    if state_dir:
+        memo.save()
+        live = set(digests.values())
+        temp_path = state_dir / f".imports.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': DEPS_CHECK_VERSION,
+                       'files': {digest: scans[digest] for digest in sorted(live)}}, f)
+        os.replace(temp_path, state_dir / 'imports.json')
+
+    own_module = spec.get('module_name') if isinstance(spec.get('module_name'), str) else module_name(spec.name or '')
+    module_map = module_map or {}
+    dependencies = {name.split('/')[0]: None for name in spec.all_dependencies()}
+    # 映射的模块名和默认模块名（通常也是头文件目录）都算作该依赖提供的模块
+    provided: Dict[str, str] = {}
+    for name in dependencies:
+        provided[module_name(name)] = name
+        provided[module_map.get(name, module_name(name))] = name
+    vendored = {re.sub(r'\.(xc)?framework$', '', Path(path).name)
+                for path in _attribute_values(spec, ('vendored_frameworks',))}
+    frameworks = set(_attribute_values(spec, ('frameworks', 'framework', 'weak_frameworks', 'weak_framework')))
+
+    imported: Dict[str, List[str]] = {}
+    optional: Set[str] = set()
+    for rel in files:
+        modules, conditional = scans[digests[rel]]
+        optional.update(conditional)
+        for module in modules:
+            imported.setdefault(module, []).append(rel)
+
+    missing = {
+        module: users for module, users in sorted(imported.items())
+        if module not in provided and module != own_module and module not in vendored
+        and module not in frameworks and module not in SYSTEM_MODULES and module not in optional
+    }
+    used = {name for module, name in provided.items() if module in imported}
+    unused = sorted(name for name in dependencies if name not in used)
+    unused_frameworks = sorted(name for name in frameworks if name not in imported)
+    return {
+        'module': own_module,
+        'files': len(files),
+        'missing': missing,
+        'unused': unused,
+        'unused_frameworks': unused_frameworks,
+        'stats': {'scanned': len(todo), 'cached': cached},
+    }
+
+
+def parse_module_map(items: Optional[Iterable[str]]) -> Dict[str, str]:
+    """解析 POD=MODULE 形式的映射"""
+    result = {}
+    for item in items or []:
+        pod, sep, module = item.partition('=')
+        if not sep or not pod or not module:
+            raise ValueError(f"无效的映射（应为 POD=MODULE）: {item}")
+        result[pod.strip()] = module.strip()
+    return result
@@ -1,8 +1,27 @@
 import os
+import re
 import shutil
 import fnmatch
+import tempfile
 from pathlib import Path
-from typing import List, Optional, Callable, Dict, Any
+from typing import List, Optional, Callable, Dict, Any, Union
+
+
+# 需要做文本替换的文件类型（Podfile 等无扩展名文件单独处理）
+TEXT_EXTENSIONS = {
+    '.swift', '.h', '.m', '.mm', '.podspec', '.md', '.txt',
+    '.json', '.yml', '.yaml', '.plist', '.pbxproj', '.xcscheme'
+}
+TEXT_FILENAMES = {'Podfile'}
+
+
+# 流式读写时的块大小
+CHUNK_SIZE = 1024 * 1024
+
+
+def is_text_file(path: Path) -> bool:
+    """判断文件是否属于需要做文本替换的类型"""
+    return path.suffix in TEXT_EXTENSIONS or path.name in TEXT_FILENAMES
 
 
 class FileOperations:
@@ -136,4 +155,101 @@ class FileOperations:
             
         except Exception as e:
             print(f"❌ 创建目录结构失败: {e}")
-            return False
\ No newline at end of file
+            return False
+    
+    @staticmethod
+    def is_binary_file(file_path: Path, sample_size: int = 8192) -> bool:
+        """文件开头包含 NUL 字节时视为二进制文件"""
+        try:
+            with open(file_path, 'rb') as f:
+                return b'\0' in f.read(sample_size)
+        except OSError:
+            return False
+    
+    @staticmethod
+    def file_contains(file_path: Path, needle: bytes, skip_binary: bool = True,
+                      chunk_size: int = CHUNK_SIZE) -> bool:
+        """分块检查文件是否包含指定字节串
+        
+        Args:
+            file_path: 文件路径
+            needle: 要查找的字节串
+            skip_binary: 首块中包含 NUL 字节时视为二进制文件并跳过
+            chunk_size: 每次读取的字节数
+            
+        Returns:
+            是否包含
+        """
+        overlap = max(len(needle) - 1, 0)
+        tail = b''
+        try:
+            with open(file_path, 'rb') as f:
+                first = True
+                while True:
+                    chunk = f.read(chunk_size)
+                    if not chunk:
+                        return False
+                    if first and skip_binary and b'\0' in chunk:
+                        return False
+                    first = False
+                    buf = tail + chunk
+                    if needle in buf:
+                        return True
+                    tail = buf[-overlap:] if overlap else b''
+        except OSError:
+            return False
+    
+    @staticmethod
+    def stream_replace(file_path: Path, pattern: 're.Pattern[bytes]',
+                       replacement: Union[bytes, Callable[['re.Match[bytes]'], bytes]],
+                       max_match: int, dest_path: Optional[Path] = None,
+                       chunk_size: int = CHUNK_SIZE) -> int:
+        """分块替换文件内容，内存占用与文件大小无关
+        
+        结果先写入同目录临时文件，再原子替换目标文件。
+        
+        Args:
+            file_path: 源文件路径
+            pattern: 编译好的字节串正则，匹配长度不超过 max_match
+            replacement: 替换内容或替换函数
+            max_match: 单个匹配的最大长度，用于处理跨块匹配
+            dest_path: 目标路径，默认原地替换
+            chunk_size: 每次读取的字节数
+            
+        Returns:
+            替换次数
+        """
+        dest_path = Path(dest_path or file_path)
+        overlap = max(max_match - 1, 0)
+        count = 0
+        
+        fd, tmp_name = tempfile.mkstemp(dir=dest_path.parent, prefix=f".{dest_path.name}.")
+        try:
+            with open(file_path, 'rb') as src, os.fdopen(fd, 'wb') as dst:
+                carry = b''
+                while True:
+                    chunk = src.read(chunk_size)
+                    eof = not chunk
+                    buf = carry + chunk
+                    # 起点在 limit 之前的匹配一定完整落在 buf 内
+                    limit = len(buf) if eof else len(buf) - overlap
+                    pos = 0
+                    for match in pattern.finditer(buf):
+                        if match.start() >= limit:
+                            break
+                        dst.write(buf[pos:match.start()])
+                        dst.write(replacement(match) if callable(replacement) else replacement)
+                        pos = match.end()
+                        count += 1
+                    cut = max(pos, limit)
+                    dst.write(buf[pos:cut])
+                    carry = buf[cut:]
+                    if eof:
+                        break
+            shutil.copymode(file_path, tmp_name)
+            os.replace(tmp_name, dest_path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        
+        return count
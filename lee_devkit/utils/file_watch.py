@@ -0,0 +1,254 @@
+"""
+文件变更监听
+Linux 上通过 ctypes 调用 inotify 递归监听目录（新建的目录自动加入监听），inotify 不可用时回退到
+按 mtime 轮询；wait_for_changes 把短时间内连续到达的事件合并为一批
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple, Union
+
+from .pod_graph import SKIP_DIRS
+
+# inotify 事件掩码（linux/inotify.h）
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+              | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def is_ignored(rel_path: str) -> bool:
+    """隐藏文件、跳过的目录（Pods、build 等）以及编辑器的临时文件不触发检查"""
+    for part in rel_path.split('/'):
+        if part.startswith('.') or part in SKIP_DIRS:
+            return True
+    return rel_path.endswith(('~', '.swp', '.swx'))
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+    except OSError:
+        return None
+    if not all(hasattr(libc, name) for name in ('inotify_init1', 'inotify_add_watch', 'inotify_rm_watch')):
+        return None
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    return libc
+
+
+class InotifyWatcher:
+    """基于 inotify 的递归目录监听"""
+
+    backend = 'inotify'
+
+    def __init__(self, root: Union[str, Path]):
+        """初始化并监听 root 下所有未被忽略的目录
+
+        Raises:
+            OSError: 不支持 inotify 或超过监听数量上限（fs.inotify.max_user_watches）
+        """
+        self.root = Path(root).resolve()
+        libc = _load_libc()
+        if libc is None:
+            raise OSError(errno.ENOSYS, "inotify 不可用")
+        self.libc = libc
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code))
+        self.watches: Dict[int, str] = {}
+        try:
+            self._add_tree('')
+        except OSError:
+            self.close()
+            raise
+
+    def _add_watch(self, rel_dir: str) -> None:
+        path = self.root / rel_dir if rel_dir else self.root
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(str(path)), WATCH_MASK)
+        if wd < 0:
+            code = ctypes.get_errno()
+            # 目录在遍历期间被删除时忽略
+            if code in (errno.ENOENT, errno.ENOTDIR):
+                return
+            raise OSError(code, f"{os.strerror(code)}: {path}")
+        self.watches[wd] = rel_dir
+
+    def _add_tree(self, rel_dir: str) -> Set[str]:
+        """监听 rel_dir 及其子目录，返回其中已有的文件（目录新建后、加入监听前写入的文件）"""
+        files: Set[str] = set()
+        top = self.root / rel_dir if rel_dir else self.root
+        for dirpath, dirs, filenames in os.walk(top):
+            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in SKIP_DIRS]
+            rel = Path(dirpath).relative_to(self.root).as_posix()
+            rel = '' if rel == '.' else rel
+            self._add_watch(rel)
+            files.update(f"{rel}/{name}" if rel else name for name in filenames)
+        return files
+
+    def read(self, timeout: Optional[float] = None) -> Optional[Set[str]]:
+        """等待事件
+
+        Args:
+            timeout: 最长等待秒数，None 表示一直等待
+
+        Returns:
+            变更的相对路径（超时时为空集合）；事件队列溢出时返回 None，调用方应视为全部变更
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed: Set[str] = set()
+        overflow = False
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                rel_dir = self.watches.get(wd)
+                if rel_dir is None:
+                    continue
+                if mask & (IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF):
+                    if mask & IN_IGNORED:
+                        self.watches.pop(wd, None)
+                    continue
+                rel_path = f"{rel_dir}/{name}" if rel_dir else name
+                if not name or is_ignored(rel_path):
+                    continue
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        changed.update(self._add_tree(rel_path))
+                    elif mask & IN_MOVED_FROM:
+                        # 移走的目录仍以旧路径保留监听，之后的事件会映射到错误的路径，需要移除
+                        prefix = rel_path + '/'
+                        for stale in [w for w, d in self.watches.items() if d == rel_path or d.startswith(prefix)]:
+                            self.libc.inotify_rm_watch(self.fd, stale)
+                            self.watches.pop(stale, None)
+                    changed.add(rel_path)
+                else:
+                    changed.add(rel_path)
+            if len(data) < 65536:
+                break
+        return None if overflow else {path for path in changed if not is_ignored(path)}
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingWatcher:
+    """按文件 mtime 和大小轮询的目录监听"""
+
+    backend = 'polling'
+
+    def __init__(self, root: Union[str, Path], interval: float = 1.0):
+        """记录初始快照
+
+        Args:
+            root: 监听的根目录
+            interval: 轮询间隔（秒）
+        """
+        self.root = Path(root).resolve()
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        files: Dict[str, Tuple[int, int]] = {}
+        for dirpath, dirs, filenames in os.walk(self.root):
+            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in SKIP_DIRS]
+            rel = Path(dirpath).relative_to(self.root).as_posix()
+            for name in filenames:
+                rel_path = name if rel == '.' else f"{rel}/{name}"
+                if is_ignored(rel_path):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(dirpath, name))
+                except OSError:
+                    continue
+                files[rel_path] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def read(self, timeout: Optional[float] = None) -> Optional[Set[str]]:
+        """轮询直到发现变更或超时（与 InotifyWatcher.read 相同的约定）"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.interval if deadline is None else min(self.interval, deadline - time.monotonic())
+            if wait > 0:
+                time.sleep(wait)
+            current = self._scan()
+            changed = {path for path in set(current) | set(self.snapshot)
+                       if current.get(path) != self.snapshot.get(path)}
+            self.snapshot = current
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self) -> None:
+        pass
+
+
+Watcher = Union[InotifyWatcher, PollingWatcher]
+
+
+def create_watcher(root: Union[str, Path], polling: bool = False, interval: float = 1.0) -> Watcher:
+    """创建监听器：优先使用 inotify，不可用（非 Linux、超过监听上限等）时回退到轮询"""
+    if not polling:
+        try:
+            return InotifyWatcher(root)
+        except OSError:
+            pass
+    return PollingWatcher(root, interval)
+
+
+def wait_for_changes(watcher: Watcher, debounce: float = 0.3, timeout: Optional[float] = None,
+                     max_delay: float = 5.0) -> Optional[Set[str]]:
+    """等待一批变更：收到第一个事件后继续收集，直到安静 debounce 秒（最多延迟 max_delay 秒）
+
+    Returns:
+        变更的相对路径（timeout 内没有变更时为空集合）；None 表示需要全部重新检查
+    """
+    changed = watcher.read(timeout)
+    if changed is None or not changed:
+        return changed
+    deadline = time.monotonic() + max_delay
+    while time.monotonic() < deadline:
+        more = watcher.read(min(debounce, max(0.0, deadline - time.monotonic())))
+        if more is None:
+            return None
+        if not more:
+            break
+        changed |= more
+    return changed
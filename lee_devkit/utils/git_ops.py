@@ -6,7 +6,7 @@ Git 操作工具
 import subprocess
 import os
 from pathlib import Path
-from typing import List, Optional, Tuple, Dict
+from typing import Iterable, List, Optional, Tuple, Dict
 
 
 class GitOperations:
@@ -53,10 +53,16 @@ class GitOperations:
         except subprocess.CalledProcessError:
             return False
     
-    def init_repo(self) -> bool:
-        """初始化Git仓库"""
+    def init_repo(self, initial_branch: Optional[str] = None) -> bool:
+        """初始化Git仓库
+        
+        Args:
+            initial_branch: 初始分支名，默认使用 Git 的配置
+        """
         try:
             self.run_git_command(['init'])
+            if initial_branch:
+                self.run_git_command(['symbolic-ref', 'HEAD', f'refs/heads/{initial_branch}'])
             print(f"✅ Git仓库初始化成功: {self.repo_path}")
             return True
         except subprocess.CalledProcessError:
@@ -228,18 +234,20 @@ class GitOperations:
             print(f"❌ 推送失败到 {remote}")
             return False
     
-    def pull(self, remote: str = 'origin', branch: Optional[str] = None) -> bool:
+    def pull(self, remote: str = 'origin', branch: Optional[str] = None, rebase: bool = False) -> bool:
         """从远程仓库拉取
         
         Args:
             remote: 远程仓库名称
             branch: 分支名，默认为当前分支
+            rebase: 是否把本地提交变基到远程分支之上
         """
         try:
+            args = ['pull', '--rebase'] if rebase else ['pull']
             if branch:
-                self.run_git_command(['pull', remote, branch])
+                self.run_git_command(args + [remote, branch])
             else:
-                self.run_git_command(['pull', remote])
+                self.run_git_command(args + [remote])
             print(f"✅ 从 {remote} 拉取成功")
             return True
         except subprocess.CalledProcessError:
@@ -281,6 +289,61 @@ class GitOperations:
             print("❌ 获取提交历史失败")
             return []
     
+    def get_head_commit(self) -> Optional[str]:
+        """获取 HEAD 的提交哈希，不是 Git 仓库或没有提交时返回 None"""
+        result = self.run_git_command(['rev-parse', '--verify', '-q', 'HEAD'], check=False)
+        return result.stdout.strip() if result.returncode == 0 else None
+    
+    def diff_name_status(self, old: str, new: str = 'HEAD') -> Optional[List[Tuple[str, str]]]:
+        """获取两个提交之间变更的文件（不检测重命名，重命名表现为删除 + 新增）
+        
+        Args:
+            old: 起始提交
+            new: 结束提交
+            
+        Returns:
+            (状态, 路径) 列表，状态为 A/M/D/T 等；old 不存在时返回 None
+        """
+        result = self.run_git_command(
+            ['diff', '--name-status', '--no-renames', '-z', old, new], check=False
+        )
+        if result.returncode != 0:
+            return None
+        parts = result.stdout.split('\0')
+        return [(parts[i][0], parts[i + 1]) for i in range(0, len(parts) - 1, 2) if parts[i]]
+    
+    def changed_files(self, since: str, include_untracked: bool = True) -> Optional[List[str]]:
+        """获取相对于 since 与 HEAD 的合并基准变更过的文件（含工作区中未提交的修改）
+
+        Args:
+            since: 起始引用，例如 origin/main
+            include_untracked: 是否包含未跟踪的文件
+
+        Returns:
+            相对于 repo_path 的路径列表（只包含 repo_path 下的文件）；引用不存在时返回 None
+        """
+        result = self.run_git_command(['merge-base', since, 'HEAD'], check=False)
+        base = result.stdout.strip() if result.returncode == 0 else since
+        result = self.run_git_command(
+            ['diff', '--name-only', '--no-renames', '--relative', '-z', base, '--'], check=False
+        )
+        if result.returncode != 0:
+            return None
+        files = [path for path in result.stdout.split('\0') if path]
+        if include_untracked:
+            result = self.run_git_command(['ls-files', '--others', '--exclude-standard', '-z'], check=False)
+            if result.returncode == 0:
+                files.extend(path for path in result.stdout.split('\0') if path)
+        return sorted(set(files))
+
+    def start_fast_import(self, branch: str) -> 'FastImportSession':
+        """启动 git fast-import 会话，用于直接写入提交
+        
+        Args:
+            branch: 提交写入的分支名
+        """
+        return FastImportSession(self.repo_path, branch)
+    
     def has_uncommitted_changes(self) -> bool:
         """检查是否有未提交的更改"""
         try:
@@ -346,4 +409,114 @@ class GitOperations:
             return True
         except subprocess.CalledProcessError:
             print(f"❌ 重置失败到: {commit}")
-            return False
\ No newline at end of file
+            return False
+
+class FastImportSession:
+    """git fast-import 会话
+
+    文件内容以 blob 形式边生成边写入，最后一次性写入提交，
+    不经过索引，也不需要再次读取和哈希工作区文件。
+    """
+    
+    def __init__(self, repo_path: Path, branch: str):
+        """启动 git fast-import 进程
+        
+        Args:
+            repo_path: 已初始化的 Git 仓库路径
+            branch: 提交写入的分支名
+        """
+        self.repo_path = Path(repo_path)
+        self.branch = branch
+        self.files: List[Tuple[str, int, str]] = []
+        self.process = subprocess.Popen(
+            ['git', 'fast-import', '--quiet', '--done'],
+            cwd=self.repo_path,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE
+        )
+        assert self.process.stdin is not None and self.process.stderr is not None
+        self.stdin = self.process.stdin
+        self.stderr = self.process.stderr
+    
+    def add_file(self, path: str, data: bytes, executable: bool = False) -> None:
+        """写入内存中的文件内容
+        
+        Args:
+            path: 仓库内的相对路径（使用 / 分隔）
+            data: 文件内容
+            executable: 是否为可执行文件
+        """
+        self._write_blob_header(path, len(data), executable)
+        self.stdin.write(data)
+        self.stdin.write(b'\n')
+    
+    def add_stream(self, path: str, chunks: Iterable[bytes], size: int, executable: bool = False) -> None:
+        """从数据块迭代器写入文件内容
+        
+        Args:
+            path: 仓库内的相对路径（使用 / 分隔）
+            chunks: 字节块迭代器，总长度必须等于 size
+            size: 文件大小（字节）
+            executable: 是否为可执行文件
+        """
+        self._write_blob_header(path, size, executable)
+        for chunk in chunks:
+            self.stdin.write(chunk)
+        self.stdin.write(b'\n')
+    
+    def commit(self, message: str, author_name: str, author_email: str) -> bool:
+        """写入提交并结束会话
+        
+        Args:
+            message: 提交信息
+            author_name: 作者名称
+            author_email: 作者邮箱
+        """
+        import time
+        
+        stamp = f"{int(time.time())} {time.strftime('%z')}"
+        ident = f"{author_name} <{author_email}> {stamp}"
+        message_bytes = message.encode('utf-8')
+        
+        lines = [
+            f"commit refs/heads/{self.branch}",
+            f"author {ident}",
+            f"committer {ident}",
+            f"data {len(message_bytes)}",
+        ]
+        out = self.stdin
+        out.write('\n'.join(lines).encode('utf-8') + b'\n')
+        out.write(message_bytes + b'\n')
+        for path, mark, mode in self.files:
+            out.write(f"M {mode} :{mark} {self._quote(path)}\n".encode('utf-8'))
+        out.write(b'\ndone\n')
+        return self._finish()
+    
+    def abort(self) -> None:
+        """放弃本次导入"""
+        if self.process.poll() is None:
+            self.process.kill()
+            self.process.wait()
+    
+    def _write_blob_header(self, path: str, size: int, executable: bool) -> None:
+        mark = len(self.files) + 1
+        self.files.append((path, mark, '100755' if executable else '100644'))
+        self.stdin.write(f"blob\nmark :{mark}\ndata {size}\n".encode('utf-8'))
+    
+    def _finish(self) -> bool:
+        self.stdin.close()
+        stderr = self.stderr.read().decode('utf-8', 'replace')
+        exit_code = self.process.wait()
+        if exit_code != 0:
+            print(f"❌ git fast-import 执行失败: {stderr.strip()}")
+            return False
+        return True
+    
+    @staticmethod
+    def _quote(path: str) -> str:
+        """按 fast-import 规则为包含特殊字符的路径加引号"""
+        if path.startswith('"') or any(c in path for c in ' \n\\'):
+            escaped = path.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+            return f'"{escaped}"'
+        return path
@@ -0,0 +1,108 @@
+"""
+podspec lint 结果缓存
+以 podspec、其引用的文件、lint 参数和工具版本的内容哈希作为键，命中时跳过 pod spec lint；
+只缓存通过的结果，失败可能是暂时的（依赖尚未发布到 spec 仓库、网络错误等），下次总是重新 lint
+"""
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .file_ops import CHUNK_SIZE
+from .pod_glob import resolve_patterns
+from .podspec import Podspec
+
+# 2：不再缓存失败的结果（忽略旧版本缓存中的失败条目）
+CACHE_VERSION = 2
+
+
+def hash_file(path: Union[str, Path]) -> str:
+    """计算文件内容的 sha256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class LintCache:
+    """通过的 lint 结果缓存，每个键对应缓存目录中的一个 JSON 文件"""
+
+    def __init__(self, cache_dir: Union[str, Path], jobs: Optional[int] = None):
+        """初始化缓存
+
+        Args:
+            cache_dir: 缓存根目录（结果保存在其下的 lint 子目录）
+            jobs: 计算文件哈希的并行线程数
+        """
+        self.cache_dir = Path(cache_dir) / 'lint'
+        self.jobs = jobs or min(32, (os.cpu_count() or 1) + 4)
+
+    def compute_key(self, podspec_path: Union[str, Path], lint_args: List[str],
+                    tool_version: str, spec: Optional[Podspec] = None) -> str:
+        """计算缓存键
+
+        Args:
+            podspec_path: podspec 文件路径
+            lint_args: lint 参数
+            tool_version: pod 版本
+            spec: 已解析的 podspec（为空时自动解析）
+
+        Returns:
+            十六进制哈希字符串
+        """
+        podspec_path = Path(podspec_path)
+        if spec is None:
+            spec = Podspec.from_file(podspec_path)
+        root = podspec_path.resolve().parent
+        files = resolve_patterns(root, spec.file_patterns())
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            hashes = list(executor.map(lambda rel: hash_file(root / rel), files))
+
+        digest = hashlib.sha256()
+        digest.update(f"v{CACHE_VERSION}\0{tool_version}\0".encode('utf-8'))
+        digest.update('\0'.join(lint_args).encode('utf-8') + b'\0')
+        digest.update(hash_file(podspec_path).encode('ascii'))
+        for rel, file_hash in zip(files, hashes):
+            digest.update(f"\0{rel}\0{file_hash}".encode('utf-8'))
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict]:
+        """读取通过的 lint 结果，不存在或损坏时返回 None"""
+        try:
+            with open(self._entry_path(key), 'r', encoding='utf-8') as f:
+                entry: Dict = json.load(f)
+            return entry
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, output: str = '', podspec: str = '') -> None:
+        """记录通过的 lint 结果（先写临时文件再替换，避免并发读到半个文件）"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = {
+            'output': output,
+            'podspec': podspec,
+            'created': time.time(),
+        }
+        path = self._entry_path(key)
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+    def clear(self) -> int:
+        """清空缓存，返回删除的条目数"""
+        count = 0
+        if self.cache_dir.exists():
+            for path in self.cache_dir.glob('*.json'):
+                path.unlink()
+                count += 1
+        return count
@@ -0,0 +1,137 @@
+"""
+podspec lint 矩阵
+把一次 pod spec lint 按子 spec、平台和 Swift 版本拆分为互不依赖的任务，并合并各任务的 lint 结果
+"""
+
+import re
+from itertools import product
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .podspec import Podspec
+
+# pod spec lint 输出中的问题行，例如 "    - ERROR | [iOS] xcodebuild: ..."
+ISSUE_RE = re.compile(r"^\s*-\s*(ERROR|WARN|NOTE)\s*\|\s*(.+?)\s*$")
+
+
+class MatrixJob:
+    """lint 矩阵中的一个任务"""
+
+    def __init__(self, podspec: str, subspec: Optional[str] = None, platform: Optional[str] = None,
+                 swift_version: Optional[str] = None, no_subspecs: bool = False):
+        """初始化任务
+
+        Args:
+            podspec: podspec 文件路径
+            subspec: 只 lint 该子 spec（相对根 spec 的名称，例如 Core/Utils）
+            platform: 只 lint 该平台
+            swift_version: 使用的 Swift 版本
+            no_subspecs: 只 lint 根 spec，不 lint 子 spec
+        """
+        self.podspec = podspec
+        self.subspec = subspec
+        self.platform = platform
+        self.swift_version = swift_version
+        self.no_subspecs = no_subspecs
+
+    @property
+    def args(self) -> List[str]:
+        """传给 pod spec lint 的参数"""
+        args = []
+        if self.subspec:
+            args.append(f"--subspec={self.subspec}")
+        elif self.no_subspecs:
+            args.append("--no-subspecs")
+        if self.platform:
+            args.append(f"--platforms={self.platform}")
+        if self.swift_version:
+            args.append(f"--swift-version={self.swift_version}")
+        return args
+
+    def label(self, pod_name: str = '') -> str:
+        """任务的显示名称，例如 MyPod/Core · ios · 5.9"""
+        target = f"{pod_name}/{self.subspec}" if self.subspec else pod_name or '(root)'
+        parts = [target] + [p for p in (self.platform, self.swift_version) if p]
+        return ' · '.join(parts)
+
+
+def split_list(values: Optional[Iterable[str]]) -> List[str]:
+    """展开逗号分隔的参数（可重复传入），保持顺序并去重"""
+    result: List[str] = []
+    for value in values or []:
+        for item in str(value).split(','):
+            item = item.strip()
+            if item and item not in result:
+                result.append(item)
+    return result
+
+
+def spec_swift_versions(spec: Podspec) -> List[str]:
+    """podspec 声明的 Swift 版本（swift_versions / swift_version）"""
+    value = spec.get('swift_versions', spec.get('swift_version'))
+    if isinstance(value, str):
+        return split_list([value])
+    if isinstance(value, list):
+        return split_list(str(v) for v in value if isinstance(v, (str, int, float)))
+    return []
+
+
+def build_matrix(podspec: str, spec: Optional[Podspec], subspecs: Sequence[str] = (),
+                 platforms: Sequence[Optional[str]] = (),
+                 swift_versions: Sequence[Optional[str]] = ()) -> List[MatrixJob]:
+    """生成 lint 矩阵
+
+    未指定的维度从 podspec 中读取：子 spec 为根 spec（--no-subspecs）加每个子 spec（test_spec / app_spec
+    随所属 spec 一起 lint，不单独生成任务），
+    平台为声明的平台，Swift 版本为声明的 swift_versions。无法解析的 podspec 只生成一个任务。
+
+    Args:
+        podspec: podspec 文件路径
+        spec: 解析后的 podspec
+        subspecs: 只 lint 这些子 spec
+        platforms: 只 lint 这些平台
+        swift_versions: 使用这些 Swift 版本
+    """
+    if spec is not None:
+        root = spec.name or ''
+        declared = [(sub.full_name or '')[len(root) + 1:] for sub in spec.walk()
+                    if sub is not spec and sub.is_library]
+        targets: List[Tuple[Optional[str], bool]] = (
+            [(name, False) for name in subspecs] if subspecs
+            else [(None, True)] + [(name, False) for name in declared] if declared
+            else [(None, False)]
+        )
+        platforms = list(platforms) or list(spec.platforms)
+        swift_versions = list(swift_versions) or spec_swift_versions(spec)
+    else:
+        targets = [(name, False) for name in subspecs] or [(None, False)]
+
+    return [
+        MatrixJob(podspec, subspec, platform, swift_version, no_subspecs)
+        for (subspec, no_subspecs), platform, swift_version
+        in product(targets, list(platforms) or [None], list(swift_versions) or [None])
+    ]
+
+
+def parse_lint_issues(lines: Iterable[str]) -> List[Tuple[str, str]]:
+    """从 pod spec lint 输出中提取 (级别, 信息)"""
+    issues = []
+    for line in lines:
+        match = ISSUE_RE.match(line)
+        if match and (match.group(1), match.group(2)) not in issues:
+            issues.append((match.group(1), match.group(2)))
+    return issues
+
+
+def merge_issues(job_issues: Dict[str, List[Tuple[str, str]]]) -> List[Tuple[str, str, List[str]]]:
+    """合并各任务的问题，相同的问题只保留一条并记录出现在哪些任务中
+
+    Returns:
+        (级别, 信息, 任务名称列表)，错误在前
+    """
+    merged: Dict[Tuple[str, str], List[str]] = {}
+    for label, issues in job_issues.items():
+        for issue in issues:
+            merged.setdefault(issue, []).append(label)
+    order = {'ERROR': 0, 'WARN': 1, 'NOTE': 2}
+    return [(level, message, labels)
+            for (level, message), labels in sorted(merged.items(), key=lambda item: order[item[0][0]])]
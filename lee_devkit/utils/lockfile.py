@@ -0,0 +1,298 @@
+"""
+Podfile.lock / Manifest.lock 解析
+按行流式解析 CocoaPods 锁文件使用的 YAML 子集，提取 pod、版本、校验和与 spec 仓库
+"""
+
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .pod_graph import SKIP_DIRS
+
+LOCKFILE_NAMES = ('Podfile.lock', 'Manifest.lock')
+
+# "Name (version)"、"Name (from `../`)"、"Name (~> 1.0)"
+POD_ENTRY_RE = re.compile(r"^(?P<name>\S+)(?:\s+\((?P<detail>.*)\))?$")
+
+
+class LockfileError(ValueError):
+    """锁文件格式错误"""
+
+
+def _unquote(text: str) -> str:
+    """去掉 YAML 标量的引号"""
+    if len(text) >= 2 and text[0] == text[-1] == '"':
+        try:
+            return str(json.loads(text))
+        except ValueError:
+            return text[1:-1]
+    if len(text) >= 2 and text[0] == text[-1] == "'":
+        return text[1:-1].replace("''", "'")
+    return text
+
+
+def _split_key(text: str) -> Tuple[str, Optional[str]]:
+    """拆分 "key: value"，不是键值对时返回 (标量, None)"""
+    if text[:1] in ('"', "'"):
+        quote = text[0]
+        end = 1
+        while end < len(text):
+            if text[end] == '\\' and quote == '"':
+                end += 2
+                continue
+            if text[end] == quote:
+                if quote == "'" and text[end + 1:end + 2] == "'":
+                    end += 2
+                    continue
+                break
+            end += 1
+        key, rest = text[:end + 1], text[end + 1:]
+        if rest.startswith(':'):
+            return _unquote(key), rest[1:].strip()
+        return _unquote(text), None
+    index = text.find(': ')
+    if index >= 0:
+        return text[:index], text[index + 2:].strip()
+    if text.endswith(':'):
+        return text[:-1], ''
+    return text, None
+
+
+def parse_yaml_subset(lines: Iterable[str]) -> Dict[str, Any]:
+    """逐行解析锁文件使用的 YAML 子集（缩进的映射、列表和带子列表的列表项）
+
+    Args:
+        lines: 文本行（可以直接传入打开的文件对象）
+
+    Returns:
+        嵌套的 dict / list / str 结构
+    """
+    root: Dict[str, Any] = {}
+    # (子元素缩进, 容器)
+    stack: List[Tuple[int, Any]] = [(0, root)]
+    pending: Optional[Tuple[int, Any, Any]] = None
+
+    for number, raw in enumerate(lines, 1):
+        line = raw.rstrip('\r\n').rstrip()
+        stripped = line.lstrip(' ')
+        if not stripped or stripped.startswith('#'):
+            continue
+        indent = len(line) - len(stripped)
+        is_item = stripped == '-' or stripped.startswith('- ')
+
+        # 上一行是 "key:"：根据本行决定子容器是列表还是映射
+        if pending is not None:
+            parent_indent, parent, key = pending
+            pending = None
+            if indent > parent_indent or (is_item and indent == parent_indent):
+                container: Any = [] if is_item else {}
+                parent[key] = container
+                stack.append((indent, container))
+
+        while len(stack) > 1 and indent < stack[-1][0]:
+            stack.pop()
+        container = stack[-1][1]
+
+        if is_item:
+            if not isinstance(container, list):
+                raise LockfileError(f"第 {number} 行: 意外的列表项")
+            key, value = _split_key(stripped[1:].strip())
+            if value is None:
+                container.append(key)
+            elif value == '':
+                item: Dict[str, Any] = {key: None}
+                container.append(item)
+                pending = (indent, item, key)
+            else:
+                container.append({key: _unquote(value)})
+        else:
+            if not isinstance(container, dict):
+                raise LockfileError(f"第 {number} 行: 意外的映射项")
+            key, value = _split_key(stripped)
+            if value is None:
+                raise LockfileError(f"第 {number} 行: 无法解析: {stripped}")
+            if value == '':
+                container[key] = None
+                pending = (indent, container, key)
+            else:
+                container[key] = _unquote(value)
+    return root
+
+
+def parse_pod_entry(entry: str) -> Tuple[str, Optional[str]]:
+    """解析 "Name (detail)"，返回 (名称, 括号内容)"""
+    match = POD_ENTRY_RE.match(entry.strip())
+    if not match:
+        return entry.strip(), None
+    return match.group('name'), match.group('detail')
+
+
+class Lockfile:
+    """Podfile.lock / Manifest.lock"""
+
+    def __init__(self, data: Dict[str, Any], path: Optional[Union[str, Path]] = None):
+        """从解析结果构建锁文件模型
+
+        Args:
+            data: parse_yaml_subset 的结果
+            path: 文件路径
+        """
+        self.path = Path(path) if path else None
+        self.data = data
+        # pod（含子 spec）到版本，以及每个 pod 锁定时的依赖
+        self.pods: Dict[str, str] = {}
+        self.pod_dependencies: Dict[str, List[str]] = {}
+        for entry in data.get('PODS') or []:
+            if isinstance(entry, dict):
+                (entry, deps), = entry.items()
+            else:
+                deps = []
+            name, version = parse_pod_entry(entry)
+            self.pods[name] = version or ''
+            self.pod_dependencies[name] = [str(dep) for dep in deps or []]
+        self.dependencies: List[str] = [str(dep) for dep in data.get('DEPENDENCIES') or []]
+        self.spec_repos: Dict[str, List[str]] = {
+            repo: [str(pod) for pod in pods or []] for repo, pods in (data.get('SPEC REPOS') or {}).items()
+        }
+        self.external_sources: Dict[str, Dict[str, str]] = dict(data.get('EXTERNAL SOURCES') or {})
+        self.checkout_options: Dict[str, Dict[str, str]] = dict(data.get('CHECKOUT OPTIONS') or {})
+        self.checksums: Dict[str, str] = dict(data.get('SPEC CHECKSUMS') or {})
+        self.podfile_checksum: Optional[str] = data.get('PODFILE CHECKSUM')
+        self.cocoapods_version: Optional[str] = data.get('COCOAPODS')
+
+    @classmethod
+    def parse(cls, lines: Iterable[str], path: Optional[Union[str, Path]] = None) -> 'Lockfile':
+        """从文本行解析"""
+        return cls(parse_yaml_subset(lines), path)
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> 'Lockfile':
+        """逐行读取并解析锁文件"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.parse(f, path)
+
+    @property
+    def root_pods(self) -> Dict[str, str]:
+        """根 pod 到版本（子 spec 合并到根 pod）"""
+        result: Dict[str, str] = {}
+        for name, version in self.pods.items():
+            result.setdefault(name.split('/')[0], version)
+        return result
+
+    def repo_for(self, pod: str) -> Optional[str]:
+        """pod 所在的 spec 仓库（trunk 或仓库地址），外部来源的 pod 返回 None"""
+        root = pod.split('/')[0]
+        for repo, pods in self.spec_repos.items():
+            if root in pods:
+                return repo
+        return None
+
+    def is_external(self, pod: str) -> bool:
+        """pod 是否来自 :path / :git / :podspec 等外部来源"""
+        return pod.split('/')[0] in self.external_sources
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            'path': str(self.path) if self.path else None,
+            'pods': self.pods,
+            'dependencies': self.dependencies,
+            'spec_repos': self.spec_repos,
+            'external_sources': self.external_sources,
+            'checksums': self.checksums,
+            'podfile_checksum': self.podfile_checksum,
+            'cocoapods': self.cocoapods_version,
+        }
+
+
+def compare_lockfiles(expected: Lockfile, installed: Lockfile) -> List[Tuple[str, str, str]]:
+    """比较 Podfile.lock 与 Pods/Manifest.lock，找出沙盒中过期的 pod
+
+    Args:
+        expected: Podfile.lock
+        installed: Pods/Manifest.lock
+
+    Returns:
+        (标记, pod, 说明) 列表；+ 表示需要安装，- 表示需要移除，~ 表示版本或校验和不同
+    """
+    changes = []
+    expected_pods, installed_pods = expected.root_pods, installed.root_pods
+    for name in sorted(set(expected_pods) | set(installed_pods)):
+        if name not in installed_pods:
+            changes.append(('+', name, expected_pods[name]))
+        elif name not in expected_pods:
+            changes.append(('-', name, installed_pods[name]))
+        elif expected_pods[name] != installed_pods[name]:
+            changes.append(('~', name, f"{installed_pods[name]} -> {expected_pods[name]}"))
+        elif expected.checksums.get(name) != installed.checksums.get(name):
+            changes.append(('~', name, "校验和不同"))
+        elif expected.external_sources.get(name) != installed.external_sources.get(name):
+            changes.append(('~', name, "外部来源不同"))
+    return changes
+
+
+def find_lockfiles(root: Union[str, Path]) -> List[Path]:
+    """递归查找 root 下的 Podfile.lock（跳过 Pods、build 和隐藏目录）"""
+    root = Path(root)
+    if root.is_file():
+        return [root]
+    found = []
+    for dirpath, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS and not d.startswith('.'))
+        if 'Podfile.lock' in files:
+            found.append(Path(dirpath, 'Podfile.lock'))
+    return found
+
+
+def _load_with_manifest(path: Path) -> Tuple[Path, Optional[Lockfile], Optional[str], Optional[List]]:
+    """解析锁文件，并在存在 Pods/Manifest.lock 时比较沙盒状态"""
+    try:
+        lockfile = Lockfile.from_file(path)
+    except (LockfileError, OSError, UnicodeDecodeError) as e:
+        return path, None, str(e), None
+    manifest = path.parent / 'Pods' / 'Manifest.lock'
+    changes = None
+    if manifest.is_file():
+        try:
+            changes = compare_lockfiles(lockfile, Lockfile.from_file(manifest))
+        except (LockfileError, OSError, UnicodeDecodeError) as e:
+            changes = [('!', 'Manifest.lock', str(e))]
+    return path, lockfile, None, changes
+
+
+def analyze_lockfiles(paths: Iterable[Union[str, Path]], jobs: Optional[int] = None) -> Dict[str, Any]:
+    """并行解析多个锁文件并汇总
+
+    Args:
+        paths: 锁文件路径
+        jobs: 并行线程数
+
+    Returns:
+        汇总结果：lockfiles（每个文件的 pod 数量、CocoaPods 版本、沙盒状态）、
+        pods（每个 pod 的各个版本及使用它的锁文件）、drift（锁定了多个版本的 pod）、errors
+    """
+    paths = [Path(p) for p in paths]
+    workers = jobs or min(32, (os.cpu_count() or 1) + 4)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        loaded = list(executor.map(_load_with_manifest, paths))
+
+    lockfiles, errors = [], {}
+    pods: Dict[str, Dict[str, List[str]]] = {}
+    for path, lockfile, error, changes in loaded:
+        if lockfile is None:
+            errors[str(path)] = error
+            continue
+        lockfiles.append({
+            'path': str(path),
+            'pods': len(lockfile.root_pods),
+            'cocoapods': lockfile.cocoapods_version,
+            'stale': None if changes is None else bool(changes),
+            'changes': changes or [],
+        })
+        for name, version in lockfile.root_pods.items():
+            pods.setdefault(name, {}).setdefault(version, []).append(str(path))
+
+    drift = {name: versions for name, versions in sorted(pods.items()) if len(versions) > 1}
+    return {'lockfiles': lockfiles, 'pods': pods, 'drift': drift, 'errors': errors}
@@ -0,0 +1,161 @@
+"""
+任务流水线工具
+按声明的依赖关系并发执行步骤，并记录每个步骤的耗时
+"""
+
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+
+def backoff_delay(attempt: int, base: float = 2.0, cap: float = 60.0,
+                  rng: Optional[random.Random] = None) -> float:
+    """第 attempt 次（从 0 开始）重试前的等待秒数：指数退避加全抖动，避免并发任务同时重试"""
+    return (rng or random).uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class PipelineStep:
+    """流水线中的一个步骤"""
+
+    def __init__(self, name: str, action: Callable[[], bool],
+                 depends_on: Iterable[str] = (), description: str = ''):
+        """初始化步骤
+
+        Args:
+            name: 步骤名称（唯一）
+            action: 执行函数，返回是否成功
+            depends_on: 依赖的步骤名称
+            description: 步骤说明
+        """
+        self.name = name
+        self.action = action
+        self.depends_on = list(depends_on)
+        self.description = description or name
+
+
+class StepResult:
+    """步骤执行结果"""
+
+    def __init__(self, name: str, success: bool, duration: float = 0.0,
+                 skipped: bool = False, error: Optional[str] = None):
+        self.name = name
+        self.success = success
+        self.duration = duration
+        self.skipped = skipped
+        self.error = error
+
+
+class Pipeline:
+    """按依赖关系并发执行的流水线
+
+    没有依赖关系的步骤会同时执行；某个步骤失败后，依赖它的步骤会被跳过。
+    """
+
+    def __init__(self, steps: Iterable[PipelineStep], max_workers: Optional[int] = None,
+                 verbose: bool = True):
+        """初始化流水线
+
+        Args:
+            steps: 步骤列表
+            max_workers: 最大并发数，默认等于步骤数量
+            verbose: 是否打印每个步骤的开始和结束信息
+        """
+        self.steps: Dict[str, PipelineStep] = {}
+        for step in steps:
+            if step.name in self.steps:
+                raise ValueError(f"步骤名称重复: {step.name}")
+            self.steps[step.name] = step
+        self.max_workers = max_workers or max(len(self.steps), 1)
+        self.verbose = verbose
+        self._validate()
+
+    def _validate(self) -> None:
+        """检查未知依赖和循环依赖"""
+        for step in self.steps.values():
+            for dep in step.depends_on:
+                if dep not in self.steps:
+                    raise ValueError(f"步骤 {step.name} 依赖未知步骤: {dep}")
+
+        visiting: Set[str] = set()
+        done: Set[str] = set()
+
+        def visit(name: str, path: List[str]) -> None:
+            if name in done:
+                return
+            if name in visiting:
+                cycle = path[path.index(name):] + [name]
+                raise ValueError(f"存在循环依赖: {' -> '.join(cycle)}")
+            visiting.add(name)
+            for dep in self.steps[name].depends_on:
+                visit(dep, path + [name])
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.steps:
+            visit(name, [])
+
+    def _run_step(self, step: PipelineStep) -> StepResult:
+        if self.verbose:
+            print(f"▶️  {step.description}")
+        start = time.perf_counter()
+        try:
+            success = bool(step.action())
+            error = None
+        except Exception as e:
+            success = False
+            error = str(e)
+        duration = time.perf_counter() - start
+        if self.verbose:
+            mark = '✅' if success else '❌'
+            detail = f": {error}" if error else ''
+            print(f"{mark} {step.description} ({duration:.2f}s){detail}")
+        return StepResult(step.name, success, duration, error=error)
+
+    def run(self) -> Dict[str, StepResult]:
+        """执行流水线
+
+        Returns:
+            步骤名称到执行结果的映射（按完成顺序）
+        """
+        results: Dict[str, StepResult] = {}
+        remaining = dict(self.steps)
+        running: Dict['Future[StepResult]', str] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while remaining or running:
+                # 依赖失败或被跳过的步骤直接跳过
+                for name, step in list(remaining.items()):
+                    failed = [d for d in step.depends_on if d in results and not results[d].success]
+                    if failed:
+                        del remaining[name]
+                        results[name] = StepResult(name, False, skipped=True,
+                                                   error=f"依赖步骤失败: {', '.join(failed)}")
+                        if self.verbose:
+                            print(f"⏭️  跳过 {step.description}（依赖步骤失败）")
+
+                for name, step in list(remaining.items()):
+                    if all(d in results for d in step.depends_on):
+                        del remaining[name]
+                        running[executor.submit(self._run_step, step)] = name
+
+                if not running:
+                    continue
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    results[name] = future.result()
+
+        return results
+
+    @staticmethod
+    def print_summary(results: Dict[str, StepResult], title: str = "流水线执行结果") -> None:
+        """打印每个步骤的耗时汇总"""
+        print(f"\n⏱️  {title}:")
+        for result in results.values():
+            if result.skipped:
+                status = '⏭️ '
+            else:
+                status = '✅' if result.success else '❌'
+            print(f"  {status} {result.name:<16} {result.duration:>7.2f}s")
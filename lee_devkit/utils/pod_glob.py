@@ -0,0 +1,440 @@
+"""
+podspec 文件模式求值
+按 CocoaPods（Ruby File.fnmatch，FNM_PATHNAME | FNM_CASEFOLD）的语义在进程内解析
+source_files、resource_bundles 等文件模式：支持 **、{a,b}、字符类，一次遍历目录树解析所有模式，
+并报告空模式、未被引用的文件以及每个变体的资源包大小
+"""
+
+import itertools
+import os
+import re
+from bisect import bisect_left
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from .podspec import PLATFORMS, LintIssue, Podspec
+
+HEADER_EXTENSIONS = ('.h', '.hh', '.hpp', '.ipp', '.tpp', '.hxx', '.def', '.inl', '.inc')
+SOURCE_EXTENSIONS = ('.m', '.mm', '.i', '.c', '.cc', '.cxx', '.cpp', '.c++', '.swift') + HEADER_EXTENSIONS
+
+# 模式是目录时追加的子模式（与 CocoaPods 的 FileAccessor::GLOB_PATTERNS 一致，不递归）
+DIR_PATTERNS = {
+    'source_files': '*{' + ','.join(SOURCE_EXTENSIONS) + '}',
+    'public_header_files': '*{' + ','.join(HEADER_EXTENSIONS) + '}',
+    'private_header_files': '*{' + ','.join(HEADER_EXTENSIONS) + '}',
+    'project_header_files': '*{' + ','.join(HEADER_EXTENSIONS) + '}',
+}
+
+# 结果中保留目录（目录作为整体被复制或保留）的属性
+INCLUDE_DIRS_ATTRIBUTES = ('resources', 'resource_bundles', 'preserve_paths', 'vendored_frameworks')
+
+GLOB_ATTRIBUTES = ('source_files', 'public_header_files', 'private_header_files',
+                   'project_header_files', 'resources', 'resource_bundles', 'preserve_paths',
+                   'vendored_frameworks', 'vendored_libraries', 'module_map', 'prefix_header_file')
+
+_WILDCARDS = '*?[{\\'
+
+
+def expand_braces(pattern: str) -> List[str]:
+    """展开 Ruby glob 中的 {a,b} 分支"""
+    match = re.search(r'\{([^{}]*)\}', pattern)
+    if not match:
+        return [pattern]
+    head, tail = pattern[:match.start()], pattern[match.end():]
+    results = []
+    for option in match.group(1).split(','):
+        for expanded in expand_braces(head + option + tail):
+            if expanded not in results:
+                results.append(expanded)
+    return results
+
+
+def _normalize(pattern: str) -> str:
+    while pattern.startswith('./'):
+        pattern = pattern[2:]
+    return pattern.rstrip('/') if pattern != '/' else pattern
+
+
+def literal_prefix(pattern: str) -> str:
+    """模式中第一个通配符之前的部分"""
+    for index, char in enumerate(pattern):
+        if char in _WILDCARDS:
+            return pattern[:index]
+    return pattern
+
+
+def base_dir(pattern: str) -> str:
+    """模式的字面基准路径：不含通配符时为模式本身，否则为通配符之前的目录"""
+    prefix = literal_prefix(pattern)
+    if prefix == pattern:
+        return pattern
+    return prefix.rpartition('/')[0]
+
+
+@lru_cache(maxsize=1024)
+def compile_glob(pattern: str) -> 're.Pattern':
+    """将不含 {} 的 glob 编译为正则表达式
+
+    * 和 ? 不匹配 /，**/ 匹配零或多级目录；通配符不匹配以 . 开头的文件名；不区分大小写
+    """
+    out = []
+    i, n = 0, len(pattern)
+    component_start = True
+    while i < n:
+        char = pattern[i]
+        if pattern.startswith('**/', i) and component_start:
+            out.append(r'(?:[^/.][^/]*/)*')
+            i += 3
+            continue
+        if char == '*':
+            while i + 1 < n and pattern[i + 1] == '*':
+                i += 1
+            out.append(r'(?!\.)[^/]*' if component_start else r'[^/]*')
+        elif char == '?':
+            out.append(r'[^/.]' if component_start else r'[^/]')
+        elif char == '[':
+            end = i + 1
+            if end < n and pattern[end] in '!^':
+                end += 1
+            if end < n and pattern[end] == ']':
+                end += 1
+            end = pattern.find(']', end)
+            if end == -1:
+                out.append(re.escape(char))
+            else:
+                body = pattern[i + 1:end]
+                negate = body[:1] in ('!', '^')
+                if negate:
+                    body = body[1:]
+                body = body.replace('\\', '\\\\').replace('[', '\\[')
+                out.append(f"(?!/)[{'^' if negate else ''}{body}]")
+                i = end
+        elif char == '\\' and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(char))
+        component_start = char == '/'
+        i += 1
+    return re.compile(''.join(out), re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
+def _compile_any(patterns: Tuple[str, ...]) -> 're.Pattern':
+    """将多个 glob 合并为一个正则表达式，每个路径只匹配一次"""
+    if len(patterns) == 1:
+        return compile_glob(patterns[0])
+    return re.compile('|'.join(f"(?:{compile_glob(pattern).pattern})" for pattern in patterns), re.IGNORECASE)
+
+
+def compile_patterns(patterns: Iterable[str]) -> Optional['re.Pattern']:
+    """将 podspec 中的文件模式（可含 ./ 前缀和 {a,b} 分支）合并为一个正则表达式
+
+    Returns:
+        匹配任一模式的正则表达式；没有模式时为 None
+    """
+    expanded = tuple(value for pattern in patterns for value in expand_braces(_normalize(pattern)))
+    return _compile_any(expanded) if expanded else None
+
+
+class FileTree:
+    """pod 根目录下的文件列表，只遍历一次，按小写路径排序以便按前缀缩小匹配范围"""
+
+    def __init__(self, root: Union[str, Path], patterns: Optional[Iterable[str]] = None):
+        """遍历目录树
+
+        Args:
+            root: pod 根目录
+            patterns: 要解析的模式，只遍历它们的基准目录；为 None 时遍历整个根目录
+        """
+        self.root = Path(root)
+        self._root_prefix = os.path.join(str(self.root), '')
+        self._kinds: Dict[str, bool] = {}
+        self._sizes: Dict[str, int] = {}
+        bases = {''} if patterns is None else {
+            base_dir(_normalize(expanded)) for pattern in patterns for expanded in expand_braces(pattern)
+        }
+        walked: List[str] = []
+        for base in sorted(bases):
+            if any(base == done or base.startswith(done + '/') or done == '' for done in walked):
+                continue
+            path = self.root / base if base else self.root
+            if base and os.path.isfile(path):
+                self._kinds[base] = False
+            elif os.path.isdir(path):
+                if base:
+                    self._kinds[base] = True
+                self._walk(path, base)
+                walked.append(base)
+        self.entries = sorted(((path.lower(), path) for path in self._kinds), key=lambda item: item[0])
+        self._keys = [key for key, _ in self.entries]
+        self._lookup = {key: path for key, path in self.entries}
+
+    def _walk(self, path: Path, rel: str) -> None:
+        stack = [(str(path), rel)]
+        while stack:
+            current, current_rel = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        if entry.name == '.git':
+                            continue
+                        child = f"{current_rel}/{entry.name}" if current_rel else entry.name
+                        is_dir = entry.is_dir(follow_symlinks=True)
+                        self._kinds[child] = is_dir
+                        if is_dir and not entry.is_symlink():
+                            stack.append((entry.path, child))
+            except OSError:
+                continue
+
+    @property
+    def files(self) -> List[str]:
+        """所有文件（相对路径）"""
+        return [path for _, path in self.entries if not self._kinds[path]]
+
+    def is_dir(self, path: str) -> bool:
+        """路径是否为目录（不区分大小写）"""
+        kind = self._kinds.get(path)
+        if kind is not None:
+            return kind
+        actual = self._lookup.get(path.lower())
+        return actual is not None and self._kinds[actual]
+
+    def _candidates(self, prefix: str) -> List[str]:
+        prefix = prefix.lower()
+        start = bisect_left(self._keys, prefix)
+        end = bisect_left(self._keys, prefix + '\uffff', start)
+        return [path for _, path in self.entries[start:end]]
+
+    def match(self, pattern: str, dir_pattern: Optional[str] = None,
+              include_dirs: bool = False) -> List[str]:
+        """解析单个模式
+
+        Args:
+            pattern: podspec 中的文件模式
+            dir_pattern: 模式是目录时追加的子模式
+            include_dirs: 结果中是否保留目录
+
+        Returns:
+            匹配的相对路径（已排序）
+        """
+        # 按字面前缀分组，同一前缀下的分支合并为一个正则表达式
+        groups: Dict[str, List[str]] = {}
+        for expanded in expand_braces(pattern):
+            expanded = _normalize(expanded)
+            if dir_pattern and self.is_dir(expanded):
+                expanded = f"{expanded}/{dir_pattern}"
+            for single in expand_braces(expanded):
+                groups.setdefault(literal_prefix(single), []).append(single)
+        results: Set[str] = set()
+        for prefix, singles in groups.items():
+            regex = _compile_any(tuple(singles))
+            kinds = self._kinds
+            results.update(path for path in self._candidates(prefix)
+                           if regex.fullmatch(path) and (include_dirs or not kinds[path]))
+        return sorted(results)
+
+    def expand(self, paths: Iterable[str]) -> List[str]:
+        """将目录展开为其下的所有文件"""
+        files: Set[str] = set()
+        for path in paths:
+            if self._kinds.get(path):
+                files.update(child for child in self._candidates(path + '/') if not self._kinds[child])
+            else:
+                files.add(path)
+        return sorted(files)
+
+    def size(self, path: str) -> int:
+        """文件大小（字节）"""
+        if path not in self._sizes:
+            try:
+                self._sizes[path] = os.stat(self._root_prefix + path).st_size
+            except OSError:
+                self._sizes[path] = 0
+        return self._sizes[path]
+
+
+def resolve_patterns(root: Path, patterns: Iterable[str]) -> List[str]:
+    """将 podspec 文件模式解析为 root 下的文件列表（相对路径，已排序；目录包含其下所有文件）"""
+    patterns = list(patterns)
+    tree = FileTree(root, patterns)
+    matched: Set[str] = set()
+    for pattern in patterns:
+        matched.update(tree.match(pattern, include_dirs=True))
+    return tree.expand(matched)
+
+
+class PatternMatch:
+    """一个文件模式在一个变体下的匹配结果"""
+
+    def __init__(self, spec: Optional[str], attribute: str, pattern: str, variant: str, files: List[str],
+                 bundle: Optional[str] = None):
+        self.spec = spec
+        self.attribute = attribute
+        self.pattern = pattern
+        self.variant = variant
+        self.files = files
+        self.bundle = bundle
+
+    def to_dict(self) -> Dict:
+        return {'spec': self.spec, 'attribute': self.attribute, 'pattern': self.pattern,
+                'variant': self.variant, 'bundle': self.bundle, 'files': len(self.files)}
+
+
+class GlobReport:
+    """podspec 文件模式的求值结果"""
+
+    def __init__(self, variants: List[str], matches: List[PatternMatch], unmatched: List[str],
+                 bundles: Dict[str, Dict[str, Tuple[int, int]]]):
+        self.variants = variants
+        self.matches = matches
+        self.unmatched = unmatched
+        self.bundles = bundles
+
+    @property
+    def empty(self) -> List[PatternMatch]:
+        """没有匹配任何文件的模式"""
+        return [match for match in self.matches if not match.files]
+
+    def to_json(self) -> Dict:
+        return {
+            'variants': self.variants,
+            'patterns': [match.to_dict() for match in self.matches],
+            'empty': [match.to_dict() for match in self.empty],
+            'unmatched': self.unmatched,
+            'bundles': {variant: {name: {'files': count, 'bytes': size} for name, (count, size) in bundles.items()}
+                        for variant, bundles in self.bundles.items()},
+        }
+
+
+def _spec_patterns(spec: Podspec, attrs: Tuple[str, ...]) -> List[Tuple[str, str, Optional[str]]]:
+    """spec 自身（含平台前缀属性）声明的 (属性, 模式, 资源包名称)"""
+    result: List[Tuple[str, str, Optional[str]]] = []
+    for key in spec.attributes:
+        prefix, _, attr = key.rpartition('.')
+        if attr not in attrs or (prefix and prefix not in PLATFORMS):
+            continue
+        value = spec.attributes[key]
+        items = value.items() if isinstance(value, dict) else [(None, value)]
+        for bundle, item in items:
+            for pattern in item if isinstance(item, list) else [item]:
+                if isinstance(pattern, str) and (pattern, bundle) not in [(p, b) for _, p, b in result]:
+                    result.append((attr, pattern, bundle if isinstance(bundle, str) else None))
+    return result
+
+
+def _label(combo: Dict[str, str]) -> str:
+    return ', '.join(f"{name}={value}" for name, value in combo.items())
+
+
+def evaluate_podspec(spec: Podspec, root: Optional[Union[str, Path]] = None) -> GlobReport:
+    """在一次目录遍历中解析 podspec 及其子 spec 的所有文件模式
+
+    Args:
+        spec: 已解析的 podspec
+        root: pod 根目录（默认为 podspec 所在目录）
+
+    Returns:
+        GlobReport；多值变量（例如 type = cond ? 'Overseas' : 'China'）的每种取值作为一个变体
+
+    Raises:
+        ValueError: 未指定 root 且 podspec 不是从文件解析的
+    """
+    if root is None:
+        if spec.path is None:
+            raise ValueError(f"{spec.full_name}: 未指定 pod 根目录")
+        root = Path(spec.path).parent
+    root = Path(root)
+    specs = list(spec.walk())
+    declared = {id(sub): _spec_patterns(sub, GLOB_ATTRIBUTES) for sub in specs}
+    excludes = {id(sub): _spec_patterns(sub, ('exclude_files',)) for sub in specs}
+
+    raw_patterns = [pattern for items in list(declared.values()) + list(excludes.values()) for _, pattern, _ in items]
+    used = set(re.findall(r'#\{([^}]*)\}', '\n'.join(raw_patterns)))
+    options = {name: values for name, values in spec.root.variable_options().items() if name in used and values}
+    combos = [dict(zip(options, values)) for values in itertools.product(*options.values())]
+
+    def resolve(sub: Podspec, pattern: str, combo: Dict[str, str]) -> List[str]:
+        return [value for value in sub.expand_variants(pattern, combo) if '#{' not in value]
+
+    all_patterns = {value for sub in specs for combo in combos
+                    for items in (declared[id(sub)], excludes[id(sub)]) for _, pattern, _ in items
+                    for value in resolve(sub, sub.resolve(pattern), combo)}
+    tree = FileTree(root, all_patterns)
+
+    matches: Dict[Tuple, PatternMatch] = {}
+    bundles: Dict[str, Dict[str, Set[str]]] = {}
+    covered: Set[str] = set()
+    for combo in combos:
+        variant = _label(combo)
+        for sub in specs:
+            excluded: Set[str] = set()
+            excluded_dirs: List[str] = []
+            current: Optional[Podspec] = sub
+            # exclude_files 会被子 spec 继承
+            while current is not None:
+                for _, pattern, _ in excludes[id(current)]:
+                    for value in resolve(current, current.resolve(pattern), combo):
+                        found = tree.match(value, include_dirs=True)
+                        excluded_dirs.extend(path for path in found if tree.is_dir(path))
+                        excluded.update(tree.expand(found))
+                current = current.parent
+            covered.update(excluded)
+
+            for attr, pattern, bundle in declared[id(sub)]:
+                names = set(re.findall(r'#\{([^}]*)\}', pattern))
+                label = _label({name: value for name, value in combo.items() if name in names})
+                include_dirs = attr in INCLUDE_DIRS_ATTRIBUTES
+                files: Set[str] = set()
+                for value in resolve(sub, sub.resolve(pattern), combo):
+                    for path in tree.match(value, DIR_PATTERNS.get(attr), include_dirs):
+                        if path in excluded or (tree.is_dir(path) and any(
+                                path == d or path.startswith(d + '/') for d in excluded_dirs)):
+                            continue
+                        files.add(path)
+                expanded = [path for path in tree.expand(files) if path not in excluded]
+                covered.update(expanded)
+                if bundle is not None:
+                    bundles.setdefault(variant, {}).setdefault(bundle, set()).update(expanded)
+                key = (sub.full_name, attr, bundle, pattern, label)
+                if key not in matches:
+                    matches[key] = PatternMatch(sub.full_name, attr, pattern, label, sorted(files), bundle)
+
+    scopes = [base_dir(_normalize(value)) for value in all_patterns]
+    scopes = sorted({scope for scope in scopes if scope and tree.is_dir(scope)})
+    unmatched = [
+        path for path in tree.files
+        if path not in covered
+        and not any(part.startswith('.') for part in path.split('/'))
+        and any(path.startswith(scope + '/') for scope in scopes)
+    ]
+    sizes = {
+        variant: {name: (len(files), sum(tree.size(path) for path in files)) for name, files in sorted(named.items())}
+        for variant, named in bundles.items()
+    }
+    return GlobReport([_label(combo) for combo in combos if combo], list(matches.values()), unmatched, sizes)
+
+
+def glob_issues(report: GlobReport, strict: bool = True) -> List[LintIssue]:
+    """将空模式转换为 lint 问题
+
+    Args:
+        report: evaluate_podspec 的结果
+        strict: 所有变体都为空时是否作为错误（只在部分变体下为空始终是警告）
+    """
+    issues = []
+    groups: Dict[Tuple, List[PatternMatch]] = {}
+    for match in report.matches:
+        groups.setdefault((match.spec, match.attribute, match.bundle, match.pattern), []).append(match)
+    for (spec, attr, _, pattern), items in groups.items():
+        empty = [item for item in items if not item.files]
+        if not empty:
+            continue
+        if len(empty) == len(items):
+            issues.append(LintIssue('error' if strict else 'warning', f"`{spec}`: the `{attr}` pattern `{pattern}` did not match any file."))
+        else:
+            variants = '; '.join(item.variant for item in empty)
+            issues.append(LintIssue('warning', f"`{spec}`: the `{attr}` pattern `{pattern}` "
+                                               f"did not match any file for {variants}."))
+    return issues
@@ -0,0 +1,375 @@
+"""
+podspec 依赖图工具
+发现目录下的所有 podspec，解析依赖和子 spec，构建依赖图（按文件 mtime 缓存解析结果）
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from .podspec import Podspec, PodspecError
+
+GRAPH_CACHE_VERSION = 3
+
+# 搜索 podspec 时跳过的目录
+SKIP_DIRS = {'.git', 'Pods', 'build', 'DerivedData', 'Carthage', 'node_modules'}
+
+
+def discover_podspecs(root: Union[str, Path]) -> List[Path]:
+    """递归查找 root 下的 .podspec / .podspec.json 文件（跳过 Pods、build 和隐藏目录）"""
+    root = Path(root)
+    return [root / rel_path for rel_path in _walk_podspecs(root)[0]]
+
+
+def _walk_podspecs(root: Path) -> Tuple[List[str], Dict[str, int]]:
+    """查找 podspec，同时记录遍历过的目录的 mtime（目录中增删文件时 mtime 会变化）"""
+    found: List[str] = []
+    dirs_state: Dict[str, int] = {}
+    for dirpath, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS and not d.startswith('.'))
+        rel_dir = Path(dirpath).relative_to(root).as_posix()
+        dirs_state[rel_dir] = os.stat(dirpath).st_mtime_ns
+        prefix = '' if rel_dir == '.' else rel_dir + '/'
+        found.extend(prefix + name for name in sorted(files) if name.endswith(('.podspec', '.podspec.json')))
+    return found, dirs_state
+
+
+def _dirs_unchanged(root: Path, dirs_state: Dict[str, int]) -> bool:
+    if not dirs_state:
+        return False
+    for rel_dir, mtime_ns in dirs_state.items():
+        try:
+            if os.stat(root / rel_dir).st_mtime_ns != mtime_ns:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def podspec_name_from_path(path: Union[str, Path]) -> str:
+    """由 podspec 文件名推断 pod 名称"""
+    name = Path(path).name
+    for suffix in ('.podspec.json', '.podspec'):
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+class PodNode:
+    """依赖图中的一个 pod"""
+
+    def __init__(self, name: str, path: str, version: Optional[str] = None,
+                 dependencies: Optional[Dict[str, List[str]]] = None,
+                 subspecs: Optional[List[str]] = None, error: Optional[str] = None,
+                 platforms: Optional[Dict[str, Optional[str]]] = None,
+                 patterns: Optional[List[str]] = None):
+        """初始化节点
+
+        Args:
+            name: pod 名称
+            path: podspec 路径（相对于图的根目录）
+            version: 版本号
+            dependencies: 依赖（含子 spec 的依赖），名称到版本要求
+            subspecs: 子 spec 完整名称
+            error: 解析失败时的错误信息
+            platforms: 平台及部署版本
+            patterns: 自身及子 spec 声明的文件模式（相对于 podspec 所在目录）
+        """
+        self.name = name
+        self.path = path
+        self.version = version
+        self.dependencies = dependencies or {}
+        self.subspecs = subspecs or []
+        self.error = error
+        self.platforms = platforms or {}
+        self.patterns = patterns or []
+
+    @classmethod
+    def from_podspec(cls, path: Path, rel_path: str) -> 'PodNode':
+        """解析 podspec 文件生成节点，解析失败时记录错误"""
+        try:
+            spec = Podspec.from_file(path)
+        except (PodspecError, OSError, UnicodeDecodeError) as e:
+            return cls(podspec_name_from_path(path), rel_path, error=str(e))
+        return cls(
+            spec.name or podspec_name_from_path(path),
+            rel_path,
+            version=spec.version,
+            dependencies=spec.all_dependencies(),
+            subspecs=[sub.full_name for sub in spec.walk() if sub is not spec and sub.full_name],
+            platforms={name: str(target) if target is not None else None
+                       for name, target in spec.platforms.items()},
+            patterns=spec.file_patterns(),
+        )
+
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'path': self.path,
+            'version': self.version,
+            'dependencies': self.dependencies,
+            'subspecs': self.subspecs,
+            'error': self.error,
+            'platforms': self.platforms,
+            'patterns': self.patterns,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'PodNode':
+        return cls(data['name'], data['path'], data.get('version'), data.get('dependencies'),
+                   data.get('subspecs'), data.get('error'), data.get('platforms'), data.get('patterns'))
+
+
+class PodGraph:
+    """pod 依赖图"""
+
+    def __init__(self, nodes: Iterable[PodNode], root: Optional[Path] = None):
+        """初始化依赖图，重名的 pod 只保留第一个并记录在 duplicates 中"""
+        self.root = Path(root) if root else None
+        self.nodes: Dict[str, PodNode] = {}
+        self.duplicates: List[Tuple[str, str]] = []
+        for node in nodes:
+            if node.name in self.nodes:
+                self.duplicates.append((node.name, node.path))
+                continue
+            self.nodes[node.name] = node
+        self.stats = {'parsed': 0, 'cached': 0}
+        self.discovery = 'walked'
+
+        # 图内依赖边（按 pod 根名称）
+        self.edges: Dict[str, Set[str]] = {
+            name: {dep.split('/')[0] for dep in node.dependencies
+                   if dep.split('/')[0] in self.nodes and dep.split('/')[0] != name}
+            for name, node in self.nodes.items()
+        }
+        self.reverse_edges: Dict[str, Set[str]] = {name: set() for name in self.nodes}
+        for name, deps in self.edges.items():
+            for dep in deps:
+                self.reverse_edges[dep].add(name)
+
+    # -- 查询 ------------------------------------------------------------
+
+    def external_dependencies(self, name: str) -> Dict[str, List[str]]:
+        """pod 依赖的图外 pod"""
+        return {dep: reqs for dep, reqs in self.nodes[name].dependencies.items()
+                if dep.split('/')[0] not in self.nodes}
+
+    def dependencies(self, name: str, transitive: bool = False) -> List[str]:
+        """pod 依赖的图内 pod"""
+        return self._closure(name, self.edges) if transitive else sorted(self.edges[name])
+
+    def reverse_dependencies(self, name: str, transitive: bool = False) -> List[str]:
+        """依赖该 pod 的图内 pod"""
+        return self._closure(name, self.reverse_edges) if transitive else sorted(self.reverse_edges[name])
+
+    def _closure(self, name: str, edges: Dict[str, Set[str]]) -> List[str]:
+        seen: Set[str] = set()
+        stack = list(edges[name])
+        while stack:
+            current = stack.pop()
+            if current in seen or current == name:
+                continue
+            seen.add(current)
+            stack.extend(edges[current])
+        return sorted(seen)
+
+    def find_cycles(self) -> List[List[str]]:
+        """使用 Tarjan 算法查找循环依赖（强连通分量）"""
+        index_of: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        stack: List[str] = []
+        cycles: List[List[str]] = []
+        counter = 0
+
+        for start in sorted(self.nodes):
+            if start in index_of:
+                continue
+            # 迭代实现，避免大图递归过深
+            work = [(start, iter(sorted(self.edges[start])))]
+            index_of[start] = lowlink[start] = counter
+            counter += 1
+            stack.append(start)
+            on_stack.add(start)
+            while work:
+                node, children = work[-1]
+                child = next(children, None)
+                if child is not None:
+                    if child not in index_of:
+                        index_of[child] = lowlink[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(sorted(self.edges[child]))))
+                    elif child in on_stack:
+                        lowlink[node] = min(lowlink[node], index_of[child])
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index_of[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1:
+                        cycles.append(sorted(component))
+        return sorted(cycles)
+
+    def levels(self) -> List[List[str]]:
+        """按依赖深度分层：第 0 层没有图内依赖，第 n 层只依赖前面各层
+
+        处于循环依赖中的 pod 及依赖它们的 pod 不会出现在结果中。
+        """
+        remaining = {name: set(deps) for name, deps in self.edges.items()}
+        levels = []
+        while remaining:
+            ready = sorted(name for name, deps in remaining.items() if not deps)
+            if not ready:
+                break
+            levels.append(ready)
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return levels
+
+    def topological_order(self) -> List[str]:
+        """按层展开的拓扑顺序"""
+        return [name for level in self.levels() for name in level]
+
+    # -- 导出 ------------------------------------------------------------
+
+    def to_json(self) -> Dict:
+        """导出为 JSON 结构"""
+        return {
+            'pods': {
+                name: {
+                    'path': node.path,
+                    'version': node.version,
+                    'dependencies': sorted(self.edges[name]),
+                    'external_dependencies': self.external_dependencies(name),
+                    'dependents': sorted(self.reverse_edges[name]),
+                    'subspecs': node.subspecs,
+                    'error': node.error,
+                }
+                for name, node in sorted(self.nodes.items())
+            },
+            'levels': self.levels(),
+            'cycles': self.find_cycles(),
+        }
+
+    def to_dot(self, include_external: bool = False) -> str:
+        """导出为 Graphviz DOT 格式"""
+        cyclic = {name for cycle in self.find_cycles() for name in cycle}
+        lines = ['digraph pods {', '  rankdir=LR;', '  node [shape=box];']
+        for name, node in sorted(self.nodes.items()):
+            label = f"{name}\\n{node.version}" if node.version else name
+            attrs = [f'label="{label}"']
+            if name in cyclic:
+                attrs.append('color=red')
+            if node.error:
+                attrs.append('style=dashed')
+            lines.append(f'  "{name}" [{", ".join(attrs)}];')
+        for name in sorted(self.nodes):
+            for dep in sorted(self.edges[name]):
+                color = ' [color=red]' if name in cyclic and dep in cyclic else ''
+                lines.append(f'  "{name}" -> "{dep}"{color};')
+            if include_external:
+                for dep in sorted(self.external_dependencies(name)):
+                    lines.append(f'  "{dep}" [style=dotted];')
+                    lines.append(f'  "{name}" -> "{dep}" [style=dotted];')
+        lines.append('}')
+        return '\n'.join(lines) + '\n'
+
+    # -- 构建 ------------------------------------------------------------
+
+    @classmethod
+    def build(cls, root: Union[str, Path], cache_dir: Optional[Union[str, Path]] = None,
+              jobs: Optional[int] = None) -> 'PodGraph':
+        """发现并解析 root 下的所有 podspec
+
+        Args:
+            root: 搜索根目录
+            cache_dir: 缓存根目录（为空时不使用缓存）
+            jobs: 并行解析线程数
+
+        Returns:
+            依赖图，stats 中记录了重新解析和命中缓存的数量；所有目录的 mtime 都未变化时
+            直接使用缓存的 podspec 列表而不重新遍历（discovery 为 cached，否则为 walked）
+        """
+        root = Path(root).resolve()
+        cache_path = graph_cache_path(cache_dir, root) if cache_dir else None
+        cache = _load_cache(cache_path) if cache_path else {}
+        cached = cache.get('entries', {})
+
+        if _dirs_unchanged(root, cache.get('dirs', {})):
+            rel_paths, dirs_state, discovery = sorted(cached), cache['dirs'], 'cached'
+        else:
+            (rel_paths, dirs_state), discovery = _walk_podspecs(root), 'walked'
+
+        entries: Dict[str, Dict] = {}
+        to_parse: List[Tuple[str, Path, os.stat_result]] = []
+        for rel_path in rel_paths:
+            path = root / rel_path
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entry = cached.get(rel_path)
+            if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+                entries[rel_path] = entry
+            else:
+                to_parse.append((rel_path, path, stat))
+
+        if to_parse:
+            workers = jobs or min(32, (os.cpu_count() or 1) + 4)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                nodes = executor.map(lambda item: PodNode.from_podspec(item[1], item[0]), to_parse)
+                for (rel_path, _, stat), node in zip(to_parse, nodes):
+                    entries[rel_path] = {
+                        'mtime_ns': stat.st_mtime_ns,
+                        'size': stat.st_size,
+                        'node': node.to_dict(),
+                    }
+
+        if cache_path and (to_parse or set(entries) != set(cached) or dirs_state != cache.get('dirs')):
+            _save_cache(cache_path, root, entries, dirs_state)
+
+        graph = cls((PodNode.from_dict(entries[rel]['node']) for rel in sorted(entries)), root)
+        graph.stats = {'parsed': len(to_parse), 'cached': len(entries) - len(to_parse)}
+        graph.discovery = discovery
+        return graph
+
+
+def graph_cache_path(cache_dir: Union[str, Path], root: Path) -> Path:
+    """依赖图缓存文件路径（按根目录区分）"""
+    digest = hashlib.sha1(str(root).encode('utf-8')).hexdigest()[:16]
+    return Path(cache_dir) / 'graph' / f"{digest}.json"
+
+
+def _load_cache(path: Path) -> Dict[str, Dict]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data: Dict[str, Any] = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != GRAPH_CACHE_VERSION:
+        return {}
+    return data
+
+
+def _save_cache(path: Path, root: Path, entries: Dict[str, Dict], dirs_state: Dict[str, int]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': GRAPH_CACHE_VERSION, 'root': str(root), 'entries': entries,
+                   'dirs': dirs_state}, f, ensure_ascii=False)
+    os.replace(temp_path, path)
@@ -0,0 +1,1055 @@
+"""
+Podspec 解析工具
+解析常用的 Ruby podspec DSL 子集以及 .podspec.json，构建结构化模型
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+
+class PodspecError(ValueError):
+    """podspec 无法解析"""
+
+
+class RubyExpr:
+    """无法直接求值的 Ruby 表达式，保留原始文本"""
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def __repr__(self) -> str:
+        return f"RubyExpr({self.text!r})"
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, RubyExpr) and other.text == self.text
+
+    def __hash__(self) -> int:
+        return hash(self.text)
+
+
+class RubyChoice:
+    """三元表达式 cond ? a : b，取值为若干候选之一"""
+
+    def __init__(self, options: List[Any], condition: str = '') -> None:
+        self.options = options
+        self.condition = condition
+
+    def __repr__(self) -> str:
+        return f"RubyChoice({self.options!r})"
+
+
+class _Heredoc(str):
+    """heredoc 字符串，记录正文结束位置以便整体改写"""
+
+    end: int = 0
+
+
+# ---------------------------------------------------------------------------
+# 词法分析
+# ---------------------------------------------------------------------------
+
+class Token:
+    """词法单元"""
+
+    __slots__ = ('kind', 'value', 'start', 'end', 'line')
+
+    def __init__(self, kind: str, value: Any, start: int, end: int, line: int):
+        self.kind = kind
+        self.value = value
+        self.start = start
+        self.end = end
+        self.line = line
+
+    def is_op(self, *ops: str) -> bool:
+        return self.kind == 'op' and self.value in ops
+
+    def is_ident(self, *names: str) -> bool:
+        return self.kind == 'ident' and (not names or self.value in names)
+
+    def __repr__(self) -> str:
+        return f"Token({self.kind}, {self.value!r}, line={self.line})"
+
+
+_OPERATORS = ['=>', '==', '!=', '=~', '||', '&&', '::', '..', '<=', '>=', '<<',
+              '=', '.', ',', '(', ')', '[', ']', '{', '}', '|', '?', ':', '+', '-',
+              '*', '/', '!', '<', '>', '&', '%']
+_IDENT_RE = re.compile(r'[A-Za-z_]\w*[?!]?')
+_NUMBER_RE = re.compile(r'\d+(?:\.\d+)*')
+_HEREDOC_RE = re.compile(r'<<([-~]?)([\'"]?)([A-Za-z_]\w*)\2')
+_PERCENT_RE = re.compile(r'%([wWiIqQ]?)([\[\(\{<|!/])')
+_CLOSERS = {'[': ']', '(': ')', '{': '}', '<': '>'}
+
+
+def tokenize(text: str) -> List[Token]:
+    """将 podspec 源码切分为词法单元"""
+    tokens: List[Token] = []
+    pending_heredocs: List[Tuple[Token, str, str]] = []
+    i, line, n = 0, 1, len(text)
+
+    def read_quoted(pos: int, closer: str, opener: Optional[str] = None,
+                    keep_escapes: bool = False) -> Tuple[str, int]:
+        """读取引号内容，返回 (内容, 结束位置)，支持嵌套括号和 #{} 插值"""
+        out = []
+        depth = 0
+        while pos < n:
+            c = text[pos]
+            if c == '\\' and pos + 1 < n:
+                nxt = text[pos + 1]
+                if keep_escapes:
+                    out.append(c + nxt)
+                elif nxt in (closer, '\\') or (opener and nxt == opener):
+                    out.append(nxt)
+                else:
+                    out.append({'n': '\n', 't': '\t'}.get(nxt, c + nxt) if closer == '"' else c + nxt)
+                pos += 2
+                continue
+            if opener and c == opener:
+                depth += 1
+            elif c == closer:
+                if depth == 0:
+                    return ''.join(out), pos + 1
+                depth -= 1
+            elif c == '#' and closer == '"' and text.startswith('#{', pos):
+                end = text.find('}', pos)
+                if end == -1:
+                    break
+                out.append(text[pos:end + 1])
+                pos = end + 1
+                continue
+            out.append(c)
+            pos += 1
+        raise PodspecError(f"line {line}: unterminated string")
+
+    while i < n:
+        c = text[i]
+        if c in ' \t\r':
+            i += 1
+            continue
+        if c == '\\' and text.startswith('\\\n', i):
+            i += 2
+            line += 1
+            continue
+        if c == '#':
+            end = text.find('\n', i)
+            i = n if end == -1 else end
+            continue
+        if c == '\n' or c == ';':
+            tokens.append(Token('nl', c, i, i + 1, line))
+            i += 1
+            if c == '\n':
+                line += 1
+                # 读取挂起的 heredoc 正文
+                for token, dash, ident in pending_heredocs:
+                    body_lines: List[str] = []
+                    body_end = i
+                    while i < n:
+                        end = text.find('\n', i)
+                        end = n if end == -1 else end
+                        current = text[i:end]
+                        i = min(end + 1, n)
+                        line += 1
+                        check = current.strip() if dash else current
+                        if check == ident:
+                            body_end = end
+                            break
+                        body_lines.append(current)
+                    else:
+                        raise PodspecError(f"unterminated heredoc {ident}")
+                    body = '\n'.join(body_lines)
+                    if dash == '~':
+                        indents = [len(body_line) - len(body_line.lstrip())
+                                   for body_line in body_lines if body_line.strip()]
+                        cut = min(indents) if indents else 0
+                        body = '\n'.join(body_line[cut:] for body_line in body_lines)
+                    heredoc = _Heredoc(body)
+                    heredoc.end = body_end
+                    token.value = heredoc
+                pending_heredocs = []
+            continue
+        if c == '_' and text.startswith('__END__', i) and (i == 0 or text[i - 1] == '\n'):
+            break
+
+        start = i
+        match = _HEREDOC_RE.match(text, i)
+        if match and (not tokens or tokens[-1].kind in ('op', 'nl')):
+            token = Token('str', '', start, match.end(), line)
+            pending_heredocs.append((token, match.group(1), match.group(3)))
+            tokens.append(token)
+            i = match.end()
+            continue
+        if c in '\'"':
+            value, i = read_quoted(i + 1, c)
+            tokens.append(Token('str', value, start, i, line))
+            line += text.count('\n', start, i)
+            continue
+        match = _PERCENT_RE.match(text, i)
+        if match and (not tokens or tokens[-1].kind in ('op', 'nl')):
+            kind, opener = match.group(1), match.group(2)
+            closer = _CLOSERS.get(opener, opener)
+            value, i = read_quoted(match.end(), closer, opener if closer != opener else None)
+            line += text.count('\n', start, i)
+            if kind in ('w', 'W', 'i', 'I'):
+                tokens.append(Token('list', value.split(), start, i, line))
+            else:
+                tokens.append(Token('str', value, start, i, line))
+            continue
+        if c == ':' and i + 1 < n and text[i + 1] != ':':
+            if text[i + 1] in '\'"':
+                value, i = read_quoted(i + 2, text[i + 1])
+                tokens.append(Token('sym', value, start, i, line))
+                continue
+            match = _IDENT_RE.match(text, i + 1)
+            if match and (not tokens or not tokens[-1].is_op('?') and
+                          not (tokens[-1].kind in ('str', 'num', 'ident') and text[i - 1] in ' \t')):
+                tokens.append(Token('sym', match.group(0), start, match.end(), line))
+                i = match.end()
+                continue
+        match = _NUMBER_RE.match(text, i)
+        if match:
+            tokens.append(Token('num', match.group(0), start, match.end(), line))
+            i = match.end()
+            continue
+        match = _IDENT_RE.match(text, i)
+        if match:
+            end = match.end()
+            # Ruby 1.9 风格的 hash 键：key: value
+            if end < n and text[end] == ':' and text[end:end + 2] != '::' \
+                    and end + 1 < n and text[end + 1] in ' \t\n':
+                tokens.append(Token('label', match.group(0), start, end + 1, line))
+                i = end + 1
+            else:
+                tokens.append(Token('ident', match.group(0), start, end, line))
+                i = end
+            continue
+        for op in _OPERATORS:
+            if text.startswith(op, i):
+                tokens.append(Token('op', op, start, i + len(op), line))
+                i += len(op)
+                break
+        else:
+            raise PodspecError(f"line {line}: unexpected character {c!r}")
+
+    tokens.append(Token('eof', None, n, n, line))
+    return tokens
+
+
+# ---------------------------------------------------------------------------
+# 模型
+# ---------------------------------------------------------------------------
+
+# 通过方法调用（而非赋值）声明的可累积属性
+_LIST_CALLS = {'dependency'}
+# 平台名称
+PLATFORMS = ('ios', 'osx', 'macos', 'tvos', 'watchos', 'visionos')
+# 引用 pod 内文件的属性
+FILE_ATTRIBUTES = ('source_files', 'public_header_files', 'private_header_files',
+                   'project_header_files', 'resources', 'resource_bundles',
+                   'preserve_paths', 'vendored_frameworks', 'vendored_libraries',
+                   'module_map', 'prefix_header_file')
+
+
+class Podspec:
+    """podspec 结构化模型"""
+
+    def __init__(self, name: Optional[str] = None, parent: Optional['Podspec'] = None):
+        self.parent = parent
+        self.attributes: Dict[str, Any] = {}
+        self.dependencies: Dict[str, List[str]] = {}
+        self.subspecs: List['Podspec'] = []
+        self.spans: Dict[str, Tuple[int, int]] = {}
+        self.variables: Dict[str, Any] = parent.variables if parent else {}
+        self.path: Optional[Path] = None
+        self.source_text: str = ''
+        # 被跳过的条件语句（if / unless 块和后置 if / unless 修饰的语句）的源码
+        self.conditionals: List[str] = []
+        self.format = 'ruby'
+        # library（subspec）、test（test_spec）或 app（app_spec）
+        self.spec_type = 'library'
+        if name is not None:
+            self.attributes['name'] = name
+
+    # -- 基本属性 --------------------------------------------------------
+
+    @property
+    def root(self) -> 'Podspec':
+        """根 spec"""
+        spec = self
+        while spec.parent is not None:
+            spec = spec.parent
+        return spec
+
+    @property
+    def name(self) -> Optional[str]:
+        """spec 名称（子 spec 只返回自身名称）"""
+        value = self.attributes.get('name')
+        return value if isinstance(value, str) else None
+
+    @property
+    def full_name(self) -> Optional[str]:
+        """完整名称，例如 MyPod/Core"""
+        if self.parent is None:
+            return self.name
+        return f"{self.parent.full_name}/{self.name}"
+
+    @property
+    def version(self) -> Optional[str]:
+        """版本号（子 spec 继承根 spec 的版本）"""
+        value = self.root.attributes.get('version')
+        return value if isinstance(value, str) else None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """获取解析后的属性值，支持 ios.deployment_target 这种带平台前缀的键"""
+        if key not in self.attributes:
+            return default
+        return self.resolve(self.attributes[key])
+
+    @property
+    def platforms(self) -> Dict[str, Optional[str]]:
+        """平台及部署版本"""
+        result: Dict[str, Optional[str]] = {}
+        platform = self.get('platform')
+        if isinstance(platform, list) and platform:
+            result[str(platform[0])] = str(platform[1]) if len(platform) > 1 else None
+        elif isinstance(platform, str):
+            result[platform] = None
+        for key, value in self.get('platforms', {}).items() if isinstance(self.get('platforms'), dict) else []:
+            result[key] = value
+        for key in self.attributes:
+            prefix, _, attr = key.partition('.')
+            if prefix in PLATFORMS and attr == 'deployment_target':
+                result[prefix] = self.get(key)
+        return result
+
+    @property
+    def is_library(self) -> bool:
+        """自身及上级 spec 都不是 test_spec / app_spec"""
+        spec: Optional[Podspec] = self
+        while spec is not None:
+            if spec.spec_type != 'library':
+                return False
+            spec = spec.parent
+        return True
+
+    def all_dependencies(self, include_non_library: bool = False) -> Dict[str, List[str]]:
+        """自身及所有子 spec 的依赖（不含本 pod 内的子 spec 之间的依赖）
+
+        Args:
+            include_non_library: 同时包含 test_spec / app_spec 的依赖
+        """
+        deps: Dict[str, List[str]] = {}
+        root_name = self.root.name
+        for spec in self.walk():
+            if not include_non_library and not spec.is_library:
+                continue
+            for name, reqs in spec.dependencies.items():
+                if root_name and name.split('/')[0] == root_name:
+                    continue
+                deps.setdefault(name, list(reqs))
+        return deps
+
+    def file_patterns(self, attrs: Tuple[str, ...] = FILE_ATTRIBUTES) -> List[str]:
+        """自身及所有子 spec（含平台前缀属性）声明的文件模式，多值变量展开为所有取值"""
+        patterns: List[str] = []
+        for spec in self.walk():
+            for key in spec.attributes:
+                prefix, _, attr = key.rpartition('.')
+                if attr not in attrs or (prefix and prefix not in PLATFORMS):
+                    continue
+                value = spec.get(key)
+                values = value.values() if isinstance(value, dict) else [value]
+                for item in values:
+                    for pattern in item if isinstance(item, list) else [item]:
+                        if not isinstance(pattern, str):
+                            continue
+                        for variant in spec.expand_variants(pattern):
+                            if variant not in patterns:
+                                patterns.append(variant)
+        return patterns
+
+    def walk(self) -> Iterator['Podspec']:
+        """深度优先遍历自身及所有子 spec"""
+        yield self
+        for sub in self.subspecs:
+            yield from sub.walk()
+
+    # -- 求值 ------------------------------------------------------------
+
+    def resolve(self, value: Any) -> Any:
+        """求值：展开 s.version、s.name、局部变量以及字符串插值"""
+        if isinstance(value, list):
+            return [self.resolve(v) for v in value]
+        if isinstance(value, dict):
+            return {k: self.resolve(v) for k, v in value.items()}
+        if isinstance(value, RubyChoice):
+            return RubyChoice([self.resolve(v) for v in value.options], value.condition)
+        if isinstance(value, RubyExpr):
+            resolved = self._resolve_reference(value.text)
+            return value if resolved is None else resolved
+        if isinstance(value, str) and '#{' in value:
+            return self._interpolate(value)
+        return value
+
+    def _resolve_reference(self, text: str) -> Any:
+        ref = re.sub(r'\.to_s$', '', text.strip())
+        parts = ref.split('.')
+        if len(parts) == 2 and parts[1] in ('version', 'name'):
+            return self.version if parts[1] == 'version' else self.root.name
+        if len(parts) == 1 and ref in self.variables:
+            return self.resolve(self.variables[ref])
+        return None
+
+    def _interpolate(self, value: str, variables: Optional[Dict[str, Any]] = None) -> Any:
+        """展开字符串中的 #{...}，变量有多个候选值时保留原样"""
+        def repl(match: 're.Match[str]') -> str:
+            inner = match.group(1)
+            if variables and inner in variables:
+                return str(variables[inner])
+            resolved = self._resolve_reference(inner)
+            if resolved is None or isinstance(resolved, (RubyChoice, RubyExpr)):
+                return match.group(0)
+            return str(resolved)
+        return re.sub(r'#\{([^}]*)\}', repl, value)
+
+    def variable_options(self) -> Dict[str, List[str]]:
+        """取值为三元表达式的局部变量及其候选值"""
+        options = {}
+        for name, value in self.variables.items():
+            if isinstance(value, RubyChoice):
+                options[name] = [str(v) for v in value.options if isinstance(v, str)]
+        return options
+
+    def expand_variants(self, value: str, fixed: Optional[Dict[str, str]] = None) -> List[str]:
+        """展开包含多值变量插值的字符串的所有取值
+
+        Args:
+            value: 字符串
+            fixed: 已确定取值的变量（只展开其余变量）
+        """
+        names = re.findall(r'#\{([^}]*)\}', value)
+        options = {name: [fixed[name]] if fixed and name in fixed else vals
+                   for name, vals in self.variable_options().items() if name in names}
+        combos: List[Dict[str, str]] = [{}]
+        for name, vals in options.items():
+            combos = [dict(c, **{name: v}) for c in combos for v in vals]
+        return [self._interpolate(value, combo) for combo in combos]
+
+    # -- 输出 ------------------------------------------------------------
+
+    def to_json(self) -> Dict[str, Any]:
+        """转换为 CocoaPods .podspec.json 结构
+
+        Raises:
+            PodspecError: 属性值依赖无法静态求值的 Ruby 表达式（三元表达式、ENV、未展开的 #{} 插值），
+                或者 spec 中有条件语句，此时只有 CocoaPods 本身才能得到正确的 JSON
+        """
+        if self.conditionals:
+            statement = ' '.join(self.conditionals[0].split())
+            raise PodspecError(f"{self.full_name} has a statement that depends on a runtime condition: {statement}")
+        data: Dict[str, Any] = {}
+        platforms: Dict[str, Any] = {}
+        scoped: Dict[str, Dict[str, Any]] = {}
+        for key in self.attributes:
+            value = _jsonable(self.get(key), f"{self.full_name}.{key}")
+            prefix, _, attr = key.partition('.')
+            if key == 'platform':
+                if isinstance(value, list) and value:
+                    platforms[str(value[0])] = str(value[1]) if len(value) > 1 else None
+                continue
+            if prefix in PLATFORMS and attr:
+                if attr == 'deployment_target':
+                    platforms[prefix] = value
+                else:
+                    scoped.setdefault(prefix, {})[attr] = value
+                continue
+            if key == 'author':
+                key = 'authors'
+            data[key] = value
+        if platforms:
+            data['platforms'] = platforms
+        if self.dependencies:
+            data['dependencies'] = {name: _jsonable(self.resolve(reqs), f"{self.full_name}.dependency {name}")
+                                    for name, reqs in self.dependencies.items()}
+        data.update(scoped)
+        if self.spec_type == 'test':
+            data.setdefault('test_type', 'unit')
+        for spec_type, json_key in _SPEC_TYPE_KEYS.items():
+            subs = [sub.to_json() for sub in self.subspecs if sub.spec_type == spec_type]
+            if subs:
+                data[json_key] = subs
+        return data
+
+    def set_attribute_text(self, key: str, ruby_value: str) -> str:
+        """返回把属性值替换为 ruby_value 后的源码（只替换值部分）"""
+        if key not in self.spans:
+            raise KeyError(key)
+        start, end = self.spans[key]
+        return self.source_text[:start] + ruby_value + self.source_text[end:]
+
+    # -- 构造 ------------------------------------------------------------
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> 'Podspec':
+        """从 .podspec 或 .podspec.json 文件解析"""
+        path = Path(path)
+        text = path.read_text(encoding='utf-8')
+        if path.name.endswith('.json'):
+            try:
+                spec = cls.from_json(json.loads(text))
+            except json.JSONDecodeError as e:
+                raise PodspecError(f"invalid JSON: {e}") from e
+        else:
+            spec = cls.parse(text)
+        spec.path = path
+        return spec
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any], parent: Optional['Podspec'] = None) -> 'Podspec':
+        """从 JSON 结构构造"""
+        spec = cls(parent=parent)
+        spec.format = 'json'
+        for key, value in data.items():
+            if key in _JSON_SPEC_TYPES:
+                for sub_data in value:
+                    sub = cls.from_json(sub_data, spec)
+                    sub.spec_type = _JSON_SPEC_TYPES[key]
+                    spec.subspecs.append(sub)
+            elif key == 'dependencies':
+                spec.dependencies = {name: list(reqs) for name, reqs in value.items()}
+            elif key == 'platforms' and isinstance(value, dict):
+                for platform, target in value.items():
+                    spec.attributes[f'{platform}.deployment_target'] = target
+            elif key in PLATFORMS and isinstance(value, dict):
+                for attr, attr_value in value.items():
+                    spec.attributes[f'{key}.{attr}'] = attr_value
+            else:
+                spec.attributes[key] = value
+        return spec
+
+    @classmethod
+    def parse(cls, text: str) -> 'Podspec':
+        """解析 Ruby DSL 源码"""
+        parser = _Parser(text)
+        spec = parser.parse()
+        spec.source_text = text
+        return spec
+
+
+# spec 类型在 .podspec.json 中对应的键
+_SPEC_TYPE_KEYS = {'library': 'subspecs', 'test': 'testspecs', 'app': 'appspecs'}
+_JSON_SPEC_TYPES = {json_key: spec_type for spec_type, json_key in _SPEC_TYPE_KEYS.items()}
+
+
+def _jsonable(value: Any, where: str) -> Any:
+    if isinstance(value, list):
+        return [_jsonable(v, where) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v, where) for k, v in value.items()}
+    if isinstance(value, RubyChoice):
+        raise PodspecError(f"{where} depends on a runtime condition ({value.condition or '?:'})")
+    if isinstance(value, RubyExpr):
+        raise PodspecError(f"{where} is a Ruby expression that cannot be evaluated: {value.text}")
+    if isinstance(value, str) and re.search(r'#\{[^}]*\}', value):
+        raise PodspecError(f"{where} has an unresolved interpolation: {value}")
+    return value
+
+
+# ---------------------------------------------------------------------------
+# 语法分析
+# ---------------------------------------------------------------------------
+
+_BLOCK_OPENERS = {'if', 'unless', 'case', 'begin', 'while', 'until', 'def', 'class', 'module'}
+_CONDITIONALS = ('if', 'unless', 'case')
+
+
+class _Parser:
+    """递归下降解析器"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = tokenize(text)
+        self.pos = 0
+        self._last_was_list = False
+
+    # -- 工具方法 --------------------------------------------------------
+
+    @property
+    def tok(self) -> Token:
+        return self.tokens[self.pos]
+
+    def peek(self, offset: int = 1) -> Token:
+        return self.tokens[min(self.pos + offset, len(self.tokens) - 1)]
+
+    def advance(self) -> Token:
+        token = self.tokens[self.pos]
+        self.pos = min(self.pos + 1, len(self.tokens) - 1)
+        return token
+
+    def expect_op(self, op: str) -> Token:
+        if not self.tok.is_op(op):
+            raise PodspecError(f"line {self.tok.line}: expected {op!r}, got {self.tok.value!r}")
+        return self.advance()
+
+    def skip_newlines(self) -> None:
+        while self.tok.kind == 'nl':
+            self.advance()
+
+    def skip_statement(self) -> None:
+        """跳过无法识别的语句（包括嵌套的 do/end 块）"""
+        depth = 0
+        while self.tok.kind != 'eof':
+            if self.tok.is_ident('do') or (self.tok.is_ident(*_BLOCK_OPENERS)
+                                           and (self.pos == 0 or self.peek(-1).kind == 'nl'
+                                                or self.peek(-1).is_op('='))):
+                depth += 1
+            elif self.tok.is_ident('end'):
+                if depth == 0:
+                    return
+                depth -= 1
+                if depth == 0:
+                    self.advance()
+                    return
+            elif self.tok.kind == 'nl' and depth == 0:
+                return
+            self.advance()
+
+    # -- 语句 ------------------------------------------------------------
+
+    def parse(self) -> Podspec:
+        variables: Dict[str, Any] = {}
+        while self.tok.kind != 'eof':
+            self.skip_newlines()
+            if self.tok.kind == 'eof':
+                break
+            if self._at_spec_new():
+                spec = Podspec()
+                spec.variables.update(variables)
+                var = self._parse_block_header()
+                self._parse_block(spec, var)
+                return spec
+            if self.tok.kind == 'ident' and self.peek().is_op('='):
+                name = self.advance().value
+                self.advance()
+                variables[name] = self.parse_expr()
+            else:
+                self.skip_statement()
+                if self.tok.is_ident('end'):
+                    self.advance()
+        raise PodspecError("no Pod::Spec.new block found")
+
+    def _at_spec_new(self) -> bool:
+        return (self.tok.is_ident('Pod') and self.peek().is_op('::')
+                and self.peek(2).is_ident('Spec') and self.peek(3).is_op('.')
+                and self.peek(4).is_ident('new'))
+
+    def _parse_block_header(self) -> str:
+        """解析 ... do |s| 并返回块变量名"""
+        while not (self.tok.is_ident('do') or self.tok.is_op('{')):
+            if self.tok.kind in ('nl', 'eof'):
+                raise PodspecError(f"line {self.tok.line}: expected block")
+            self.advance()
+        self.advance()
+        self.expect_op('|')
+        var = self.advance()
+        if var.kind != 'ident':
+            raise PodspecError(f"line {var.line}: expected block variable")
+        self.expect_op('|')
+        return str(var.value)
+
+    def _parse_block(self, spec: Podspec, var: str) -> None:
+        while True:
+            self.skip_newlines()
+            tok = self.tok
+            if tok.kind == 'eof':
+                raise PodspecError("unexpected end of file, missing 'end'")
+            if tok.is_ident('end') or tok.is_op('}'):
+                self.advance()
+                return
+            if tok.is_ident(var) and self.peek().is_op('.'):
+                self._parse_spec_statement(spec, var)
+            elif tok.kind == 'ident' and self.peek().is_op('=') and not tok.is_ident(*_BLOCK_OPENERS):
+                name = self.advance().value
+                self.advance()
+                spec.variables[name] = self.parse_expr()
+            else:
+                self.skip_statement()
+                if self.tok.is_ident('end') and not tok.is_ident('end'):
+                    # skip_statement 停在属于本块的 end 上
+                    if tok.is_ident(*_BLOCK_OPENERS):
+                        self.advance()
+                if tok.is_ident(*_CONDITIONALS):
+                    spec.conditionals.append(self.text[tok.start:self.tokens[self.pos - 1].end])
+
+    def _skip_modifier(self, spec: Podspec, start: int) -> None:
+        """语句带后置 if / unless 时记录整条语句并跳过条件部分"""
+        if self.tok.is_ident(*_CONDITIONALS):
+            self.skip_statement()
+            spec.conditionals.append(self.text[start:self.tokens[self.pos - 1].end])
+
+    def _parse_spec_statement(self, spec: Podspec, var: str) -> None:
+        statement_start = self.tok.start
+        self.advance()  # var
+        chain: List[str] = []
+        while self.tok.is_op('.'):
+            self.advance()
+            attr = self.advance()
+            if attr.kind != 'ident':
+                raise PodspecError(f"line {attr.line}: expected attribute name")
+            chain.append(attr.value)
+        key = '.'.join(chain)
+
+        if self.tok.is_op('='):
+            self.advance()
+            start = self.tok.start
+            value = self.parse_value_list()
+            end = self.tokens[self.pos - 1].end
+            last = self.tokens[self.pos - 1].value
+            if isinstance(last, _Heredoc):
+                end = last.end
+            spec.attributes[key] = value
+            spec.spans[key] = (start, end)
+            self._skip_modifier(spec, statement_start)
+            return
+
+        method = chain[-1]
+        if method in ('subspec', 'test_spec', 'app_spec'):
+            args = self.parse_args()
+            name = spec.resolve(args[0]) if args else None
+            sub = Podspec(str(name), parent=spec)
+            if method != 'subspec':
+                sub.spec_type = method[:-len('_spec')]
+            sub_var = self._parse_block_header()
+            self._parse_block(sub, sub_var)
+            spec.subspecs.append(sub)
+            return
+
+        args = self.parse_args()
+        if method in _LIST_CALLS and args:
+            name = spec.resolve(args[0])
+            reqs = [spec.resolve(a) for a in args[1:] if not isinstance(a, dict)]
+            spec.dependencies[str(name)] = [str(r) for r in reqs]
+        else:
+            spec.attributes[key] = args[0] if len(args) == 1 else args
+        self._skip_modifier(spec, statement_start)
+        if self.tok.is_ident('do'):
+            self.skip_statement()
+            if self.tok.is_ident('end'):
+                self.advance()
+
+    # -- 表达式 ----------------------------------------------------------
+
+    def parse_args(self) -> List[Any]:
+        """解析方法参数（可带括号）"""
+        if self.tok.is_op('(') and self.tok.start == self.tokens[self.pos - 1].end:
+            self.advance()
+            args = []
+            while not self.tok.is_op(')'):
+                self.skip_newlines()
+                args.append(self._parse_arg())
+                self.skip_newlines()
+                if self.tok.is_op(','):
+                    self.advance()
+            self.advance()
+            return args
+        if self.tok.kind in ('nl', 'eof') or self.tok.is_ident('do', 'end'):
+            return []
+        value = self.parse_value_list()
+        return value if isinstance(value, list) and self._last_was_list else [value]
+
+    def _parse_arg(self) -> Any:
+        """参数中允许出现不带花括号的 hash（key => value / key: value）"""
+        if self.tok.kind == 'label' or (self.peek().is_op('=>') and self.tok.kind in ('sym', 'str')):
+            result = {}
+            while True:
+                key, value = self._parse_pair()
+                result[key] = value
+                if self.tok.is_op(',') and (self.peek().kind == 'label' or self.peek(2).is_op('=>')):
+                    self.advance()
+                    continue
+                return result
+        return self.parse_expr()
+
+    def parse_value_list(self) -> Any:
+        """解析逗号分隔的值，多个值时返回列表"""
+        values = [self._parse_arg()]
+        while self.tok.is_op(','):
+            self.advance()
+            self.skip_newlines()
+            values.append(self._parse_arg())
+        self._last_was_list = len(values) > 1
+        return values[0] if len(values) == 1 else values
+
+    def parse_expr(self) -> Any:
+        start = self.tok.start
+        value = self._parse_binary()
+        if self.tok.is_op('?'):
+            condition = self.text[start:self.tok.start].strip()
+            self.advance()
+            self.skip_newlines()
+            first = self.parse_expr()
+            self.skip_newlines()
+            self.expect_op(':')
+            self.skip_newlines()
+            second = self.parse_expr()
+            return RubyChoice([first, second], condition)
+        return value
+
+    def _parse_binary(self) -> Any:
+        start = self.tok.start
+        value = self._parse_postfix()
+        if self.tok.is_op('==', '!=', '=~', '||', '&&', '+', '-', '*', '/', '<', '>', '<=', '>='):
+            while self.tok.is_op('==', '!=', '=~', '||', '&&', '+', '-', '*', '/', '<', '>', '<=', '>='):
+                self.advance()
+                self._parse_postfix()
+            return RubyExpr(self.text[start:self.tokens[self.pos - 1].end])
+        return value
+
+    def _parse_postfix(self) -> Any:
+        start = self.tok.start
+        value = self._parse_primary()
+        complex_expr = False
+        while True:
+            if self.tok.is_op('.') or self.tok.is_op('::'):
+                self.advance()
+                self.advance()
+                complex_expr = True
+                if self.tok.is_op('(') and self.tok.start == self.tokens[self.pos - 1].end:
+                    self._skip_balanced('(', ')')
+            elif self.tok.is_op('[') and self.tok.start == self.tokens[self.pos - 1].end:
+                self._skip_balanced('[', ']')
+                complex_expr = True
+            else:
+                break
+        if complex_expr:
+            return RubyExpr(self.text[start:self.tokens[self.pos - 1].end])
+        return value
+
+    def _skip_balanced(self, opener: str, closer: str) -> None:
+        depth = 0
+        while self.tok.kind != 'eof':
+            if self.tok.is_op(opener):
+                depth += 1
+            elif self.tok.is_op(closer):
+                depth -= 1
+                if depth == 0:
+                    self.advance()
+                    return
+            self.advance()
+
+    def _parse_primary(self) -> Any:
+        tok = self.tok
+        if tok.kind in ('str', 'sym'):
+            self.advance()
+            return tok.value
+        if tok.kind == 'num':
+            self.advance()
+            return int(tok.value) if tok.value.isdigit() else tok.value
+        if tok.kind == 'list':
+            self.advance()
+            return list(tok.value)
+        if tok.is_op('-') and self.peek().kind == 'num':
+            self.advance()
+            return '-' + self.advance().value
+        if tok.is_op('!'):
+            self.advance()
+            return RubyExpr('!' + str(self._parse_postfix()))
+        if tok.is_op('['):
+            self.advance()
+            items: List[Any] = []
+            while True:
+                self.skip_newlines()
+                if self.tok.is_op(']'):
+                    self.advance()
+                    return items
+                items.append(self.parse_expr())
+                self.skip_newlines()
+                if self.tok.is_op(','):
+                    self.advance()
+        if tok.is_op('{'):
+            self.advance()
+            result: Dict[Any, Any] = {}
+            while True:
+                self.skip_newlines()
+                if self.tok.is_op('}'):
+                    self.advance()
+                    return result
+                key, value = self._parse_pair()
+                result[key] = value
+                self.skip_newlines()
+                if self.tok.is_op(','):
+                    self.advance()
+        if tok.is_op('('):
+            self.advance()
+            value = self.parse_expr()
+            self.expect_op(')')
+            return value
+        if tok.kind == 'ident':
+            self.advance()
+            if tok.value == 'true':
+                return True
+            if tok.value == 'false':
+                return False
+            if tok.value == 'nil':
+                return None
+            return RubyExpr(tok.value)
+        raise PodspecError(f"line {tok.line}: unexpected {tok.value!r}")
+
+    def _parse_pair(self) -> Tuple[Any, Any]:
+        if self.tok.kind == 'label':
+            key = self.advance().value
+        else:
+            key = self.parse_expr()
+            self.skip_newlines()
+            self.expect_op('=>')
+        self.skip_newlines()
+        value = self.parse_expr()
+        if isinstance(key, RubyExpr):
+            key = key.text
+        return key, value
+
+
+# ---------------------------------------------------------------------------
+# 预检查
+# ---------------------------------------------------------------------------
+
+VERSION_RE = re.compile(r'^\d+(\.\d+)*([-+][0-9A-Za-z.+-]+)?$')
+SOURCE_KEYS = ('git', 'http', 'svn', 'hg', 'path')
+GIT_REF_KEYS = ('tag', 'commit', 'branch')
+
+
+def version_key(version: str) -> Tuple:
+    """版本号排序键：数字段按数值比较，预发布版本（1.0.0-beta）排在正式版本之前"""
+    main, _, pre = str(version).partition('-')
+    main = main.split('+')[0]
+    parts = tuple(int(p) if p.isdigit() else 0 for p in main.split('.'))
+    # 去掉末尾的 0，使 1.0 与 1.0.0 相等
+    while len(parts) > 1 and parts[-1] == 0:
+        parts = parts[:-1]
+    pre_key = tuple((0, int(p), '') if p.isdigit() else (1, 0, p) for p in pre.split('.')) if pre else ()
+    return parts, 0 if pre else 1, pre_key
+
+
+class LintIssue:
+    """预检查发现的问题"""
+
+    def __init__(self, level: str, message: str):
+        self.level = level  # 'error' 或 'warning'
+        self.message = message
+
+    @property
+    def is_error(self) -> bool:
+        return self.level == 'error'
+
+    def __repr__(self) -> str:
+        return f"LintIssue({self.level}, {self.message!r})"
+
+    def __str__(self) -> str:
+        return f"[{self.level.upper()}] {self.message}"
+
+
+def _literal(value: Any) -> Optional[str]:
+    """只有完全求值的字符串才视为字面量"""
+    if isinstance(value, str) and '#{' not in value:
+        return value
+    return None
+
+
+def prelint(spec: Podspec, file_path: Optional[Union[str, Path]] = None) -> List[LintIssue]:
+    """进程内预检查，覆盖 pod spec lint 中最常见的错误
+
+    Args:
+        spec: 已解析的 podspec
+        file_path: podspec 文件路径（用于检查文件名）
+
+    Returns:
+        问题列表
+    """
+    issues: List[LintIssue] = []
+
+    def error(message: str) -> None:
+        issues.append(LintIssue('error', message))
+
+    def warning(message: str) -> None:
+        issues.append(LintIssue('warning', message))
+
+    name = spec.name
+    if not name:
+        error("Missing required attribute `name`.")
+    elif file_path is not None:
+        file_name = Path(file_path).name
+        stem = file_name[:-len('.podspec.json')] if file_name.endswith('.podspec.json') \
+            else file_name[:-len('.podspec')] if file_name.endswith('.podspec') else None
+        if stem is not None and stem != name:
+            error(f"The name of the spec `{name}` should match the name of the file `{file_name}`.")
+
+    version = spec.version
+    raw_version = spec.attributes.get('version')
+    if raw_version is None:
+        error("Missing required attribute `version`.")
+    elif version is None:
+        warning("The version could not be evaluated in-process.")
+    elif not VERSION_RE.match(version):
+        error(f"The version `{version}` is not a valid version number.")
+
+    for attr in ('summary', 'homepage'):
+        if not spec.get(attr):
+            error(f"Missing required attribute `{attr}`.")
+    if not (spec.get('authors') or spec.get('author')):
+        error("Missing required attribute `authors`.")
+    if not spec.get('license'):
+        warning("Missing license type.")
+
+    summary = spec.get('summary')
+    if isinstance(summary, str) and summary.startswith('A short description of'):
+        warning("The summary is not meaningful.")
+    description = spec.get('description')
+    if isinstance(description, str) and 'TODO' in description:
+        warning("The description is not meaningful.")
+    homepage = spec.get('homepage')
+    if isinstance(homepage, str) and not re.match(r'^https?://', homepage):
+        warning(f"The homepage `{homepage}` is not an http(s) URL.")
+
+    source = spec.get('source')
+    if source is None:
+        error("Missing required attribute `source`.")
+    elif not isinstance(source, dict) or not any(k in source for k in SOURCE_KEYS):
+        error(f"The source should specify one of {', '.join(':' + k for k in SOURCE_KEYS)}.")
+    elif 'git' in source:
+        refs = [k for k in GIT_REF_KEYS if k in source]
+        if not refs:
+            warning("Git sources should specify a tag.")
+        tag = source.get('tag')
+        if 'tag' in source and version is not None:
+            literal = _literal(tag)
+            if literal is None and not isinstance(tag, (str, RubyExpr)):
+                warning("The source tag could not be evaluated in-process.")
+            elif literal is not None and version not in literal:
+                # Foo-1.0.0、release/1.0.0 之类的 tag 也是合法的，只有不含版本号时才提示
+                warning(f"The source tag `{literal}` does not contain the version `{version}`.")
+
+    for platform, target in spec.platforms.items():
+        if target is not None and not VERSION_RE.match(str(target)):
+            error(f"The deployment target `{target}` for {platform} is not a valid version.")
+
+    seen = set()
+    for sub in spec.walk():
+        if sub is spec:
+            continue
+        if sub.full_name in seen:
+            error(f"Duplicate subspec `{sub.full_name}`.")
+        seen.add(sub.full_name)
+
+    for sub in spec.walk():
+        for dep in sub.dependencies:
+            if name and dep == name:
+                error(f"`{sub.full_name}` should not depend on its own pod (`{dep}`).")
+            elif name and dep.split('/')[0] == name and dep not in seen:
+                error(f"`{sub.full_name}` depends on unknown subspec `{dep}`.")
+
+    return issues
+
+
+def ruby_string(value: str) -> str:
+    """生成单引号 Ruby 字符串字面量"""
+    return "'" + value.replace('\\', '\\\\').replace("'", "\\'") + "'"
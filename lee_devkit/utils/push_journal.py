@@ -0,0 +1,153 @@
+"""
+发布队列日志
+把批量发布中每个 podspec 的状态持久化到磁盘，失败后可以从第一个未完成的条目继续
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union, cast
+
+JOURNAL_VERSION = 1
+
+PENDING = 'pending'
+LINTED = 'linted'
+PUSHED = 'pushed'
+FAILED = 'failed'
+STATES = (PENDING, LINTED, PUSHED, FAILED)
+
+
+def file_sha256(path: Union[str, Path]) -> Optional[str]:
+    """计算文件的 sha256，文件不存在时返回 None"""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+class PushJournal:
+    """批量发布日志，每次状态变化都会原子地写回磁盘（线程安全）"""
+
+    def __init__(self, path: Union[str, Path], data: Dict[str, Any]):
+        self.path = Path(path)
+        self.data = data
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls, path: Union[str, Path], repo_name: str, pods: Dict[str, str],
+               dependencies: Dict[str, List[str]], options: Optional[Dict[str, Any]] = None) -> 'PushJournal':
+        """创建新的发布日志并写入磁盘
+
+        Args:
+            path: 日志文件路径
+            repo_name: 目标 spec 仓库
+            pods: pod 名称到 podspec 路径
+            dependencies: pod 名称到批次内依赖
+            options: 发布选项（用于恢复时复用）
+        """
+        now = time.time()
+        data = {
+            'version': JOURNAL_VERSION,
+            'repo': repo_name,
+            'options': options or {},
+            'created': now,
+            'updated': now,
+            'items': {
+                name: {
+                    'podspec': os.path.abspath(podspec),
+                    'depends_on': list(dependencies.get(name, [])),
+                    'state': PENDING,
+                    'attempts': 0,
+                    'error': None,
+                    'lint': None,
+                    'log': None,
+                    'updated': now,
+                }
+                for name, podspec in pods.items()
+            },
+        }
+        journal = cls(path, data)
+        journal.save()
+        return journal
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'PushJournal':
+        """读取已有的发布日志"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != JOURNAL_VERSION:
+            raise ValueError(f"不支持的发布日志版本: {data.get('version')}")
+        return cls(path, data)
+
+    # -- 查询 ------------------------------------------------------------
+
+    @property
+    def repo(self) -> str:
+        return cast(str, self.data['repo'])
+
+    @property
+    def options(self) -> Dict[str, Any]:
+        return cast(Dict[str, Any], self.data.get('options', {}))
+
+    @property
+    def items(self) -> Dict[str, Dict[str, Any]]:
+        return cast(Dict[str, Dict[str, Any]], self.data['items'])
+
+    def state(self, name: str) -> str:
+        return cast(str, self.items[name]['state'])
+
+    def incomplete(self) -> List[str]:
+        """尚未发布成功的条目"""
+        return [name for name, item in self.items.items() if item['state'] != PUSHED]
+
+    def lint_still_valid(self, name: str) -> bool:
+        """lint 通过后 podspec 是否未被修改（可以跳过重新 lint）"""
+        item = self.items[name]
+        lint = item.get('lint')
+        return bool(lint and lint.get('passed')
+                    and lint.get('podspec_sha256') == file_sha256(item['podspec']))
+
+    def counts(self) -> Dict[str, int]:
+        """各状态的条目数量"""
+        counts = {state: 0 for state in STATES}
+        for item in self.items.values():
+            counts[item['state']] += 1
+        return counts
+
+    # -- 更新 ------------------------------------------------------------
+
+    def mark_linted(self, name: str) -> None:
+        """记录 lint 通过及当时的 podspec 哈希"""
+        item = self.items[name]
+        self.update(name, LINTED, lint={
+            'passed': True,
+            'podspec_sha256': file_sha256(item['podspec']),
+            'time': time.time(),
+        }, error=None)
+
+    def update(self, name: str, state: Optional[str] = None, **fields: Any) -> None:
+        """更新条目状态和字段，并立即写回磁盘"""
+        if state is not None and state not in STATES:
+            raise ValueError(f"未知状态: {state}")
+        with self._lock:
+            item = self.items[name]
+            if state is not None:
+                item['state'] = state
+            item.update(fields)
+            item['updated'] = self.data['updated'] = time.time()
+            self._save_locked()
+
+    def save(self) -> None:
+        with self._lock:
+            self._save_locked()
+
+    def _save_locked(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, self.path)
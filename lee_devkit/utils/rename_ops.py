@@ -0,0 +1,168 @@
+"""
+模块重命名工具
+在已有项目中批量重命名路径并替换文件内容
+"""
+
+import os
+import re
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .file_ops import FileOperations
+from .git_ops import GitOperations
+
+
+# 重命名时不处理的目录
+SKIP_DIRS = {'.git', '.svn', '.hg'}
+
+
+def rename_path_parts(rel_path: str, old_name: str, new_name: str) -> str:
+    """逐级替换相对路径中的名称（与 rename_files_and_dirs 的规则一致）"""
+    return '/'.join(part.replace(old_name, new_name) for part in rel_path.split('/'))
+
+
+class ModuleRenamer:
+    """模块重命名工具类"""
+
+    def __init__(self, root: Path, old_name: str, new_name: str,
+                 jobs: Optional[int] = None, use_git: bool = True):
+        """初始化重命名工具
+
+        Args:
+            root: 项目根目录
+            old_name: 原模块名
+            new_name: 新模块名
+            jobs: 并行线程数，默认根据 CPU 数量决定
+            use_git: 在 Git 仓库中时是否以 git mv 的方式更新索引
+        """
+        self.root = Path(root).resolve()
+        self.old_name = old_name
+        self.new_name = new_name
+        self.jobs = jobs or min(32, (os.cpu_count() or 1) + 4)
+        self.use_git = use_git
+        self.content_files: List[Path] = []
+        self.path_renames: List[Tuple[Path, Path]] = []
+
+    def scan(self) -> Tuple[List[Path], List[Tuple[Path, Path]]]:
+        """单次遍历收集需要改名的路径，并行预扫描需要替换内容的文件
+
+        Returns:
+            (需要替换内容的文件, 需要重命名的路径对（从深到浅）)
+        """
+        candidates: List[Path] = []
+        renames: List[Tuple[Path, Path]] = []
+
+        for root, dirs, files in os.walk(self.root):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            for name in files:
+                path = Path(root) / name
+                if not path.is_symlink():
+                    candidates.append(path)
+            for name in files + dirs:
+                if self.old_name in name:
+                    renames.append((Path(root) / name,
+                                    Path(root) / name.replace(self.old_name, self.new_name)))
+
+        needle = self.old_name.encode('utf-8')
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            hits = executor.map(lambda p: FileOperations.file_contains(p, needle), candidates)
+            self.content_files = [path for path, hit in zip(candidates, hits) if hit]
+
+        # 深层路径先重命名，避免父目录改名后子路径失效
+        renames.sort(key=lambda item: len(item[0].parts), reverse=True)
+        self.path_renames = renames
+        return self.content_files, self.path_renames
+
+    def check_conflicts(self) -> List[Path]:
+        """返回重命名目标已存在的路径"""
+        return [new for _, new in self.path_renames if new.exists()]
+
+    def apply(self) -> Dict[str, int]:
+        """执行内容替换和路径重命名
+
+        Returns:
+            统计信息，包含 files、replacements、renamed、git_moved
+        """
+        pattern = re.compile(re.escape(self.old_name.encode('utf-8')))
+        replacement = self.new_name.encode('utf-8')
+        max_match = len(self.old_name.encode('utf-8'))
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            counts = list(executor.map(
+                lambda p: FileOperations.stream_replace(p, pattern, replacement, max_match),
+                self.content_files
+            ))
+
+        index_moves = self._collect_index_moves() if self.use_git else []
+
+        for old_path, new_path in self.path_renames:
+            old_path.rename(new_path)
+
+        if index_moves:
+            self._move_index_entries(index_moves)
+
+        return {
+            'files': len(self.content_files),
+            'replacements': sum(counts),
+            'renamed': len(self.path_renames),
+            'git_moved': len(index_moves),
+        }
+
+    def _git_toplevel(self) -> Optional[Path]:
+        """返回 Git 仓库根目录，不在仓库中时返回 None"""
+        git = GitOperations(str(self.root))
+        try:
+            result = git.run_git_command(['rev-parse', '--show-toplevel'], check=False)
+        except FileNotFoundError:
+            return None
+        if result.returncode != 0:
+            return None
+        return Path(result.stdout.strip()).resolve()
+
+    def _collect_index_moves(self) -> List[Tuple[str, str, str, str]]:
+        """收集需要在索引中移动的已跟踪文件
+
+        Returns:
+            (mode, sha, 旧路径, 新路径) 列表，路径相对于仓库根目录
+        """
+        if not self.path_renames:
+            return []
+
+        toplevel = self._git_toplevel()
+        if toplevel is None:
+            return []
+
+        prefix = self.root.relative_to(toplevel).as_posix()
+        prefix = '' if prefix == '.' else prefix + '/'
+        git = GitOperations(str(toplevel))
+        result = git.run_git_command(['ls-files', '-s', '-z', '--', prefix or '.'])
+
+        moves = []
+        for record in result.stdout.split('\0'):
+            if not record:
+                continue
+            info, path = record.split('\t', 1)
+            mode, sha, _stage = info.split(' ')
+            rel = path[len(prefix):]
+            new_rel = rename_path_parts(rel, self.old_name, self.new_name)
+            if new_rel != rel:
+                moves.append((mode, sha, path, prefix + new_rel))
+        self._toplevel = toplevel
+        return moves
+
+    def _move_index_entries(self, moves: List[Tuple[str, str, str, str]]) -> None:
+        """与 git mv 相同：只移动索引条目，不暂存内容修改"""
+        lines = []
+        for mode, sha, old_path, new_path in moves:
+            lines.append(f"0 {'0' * len(sha)}\t{old_path}")
+            lines.append(f"{mode} {sha}\t{new_path}")
+        subprocess.run(
+            ['git', 'update-index', '-z', '--index-info'],
+            cwd=self._toplevel,
+            input='\0'.join(lines) + '\0',
+            text=True,
+            capture_output=True,
+            check=True
+        )
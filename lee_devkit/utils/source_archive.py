@@ -0,0 +1,131 @@
+"""
+发布源码归档
+把 git archive 的输出按块写入归档文件，同时计算 sha256（不重新读取文件，内存占用与仓库大小无关），
+并生成 source 为 :http / :sha256 的 podspec 变体
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from .archive_ops import detect_archive_format
+from .podspec import Podspec, PodspecError
+
+# 每次从 git archive 读取的字节数
+CHUNK_SIZE = 1 << 20
+
+# 归档格式对应的 podspec :type
+HTTP_TYPES = {'zip': 'zip', 'tar.gz': 'tgz', 'tar': 'tar'}
+
+ARCHIVE_EXTENSIONS = {'zip': '.zip', 'tar.gz': '.tar.gz', 'tar': '.tar'}
+
+
+class SourceArchiveError(RuntimeError):
+    """无法生成源码归档"""
+
+
+def archive_path(target: Union[str, Path], name: str, tag: str, archive_format: Optional[str] = None) -> Path:
+    """归档文件路径：target 带有归档扩展名时为文件本身，否则为目录下的 <name>-<tag>.<ext>
+
+    Raises:
+        SourceArchiveError: target 的扩展名与指定的 archive_format 不一致
+    """
+    target = Path(target)
+    lowered = target.name.lower()
+    if lowered.endswith(('.zip', '.tar', '.tar.gz', '.tgz')):
+        detected = detect_archive_format(lowered)
+        if archive_format and archive_format != detected:
+            raise SourceArchiveError(f"归档文件名 {target.name} 与归档格式 {archive_format} 不一致")
+        return target
+    return target / f"{name}-{tag}{ARCHIVE_EXTENSIONS[archive_format or 'zip']}"
+
+
+def stream_git_archive(repo_path: Union[str, Path], ref: str, output: Union[str, Path],
+                       archive_format: Optional[str] = None, prefix: Optional[str] = None) -> Dict[str, Any]:
+    """把 ref 的 git archive 输出写入 output，边写边计算 sha256
+
+    Args:
+        repo_path: Git 仓库目录
+        ref: 要归档的 tag 或提交
+        output: 归档文件路径（先写入同目录的临时文件，完成后替换）
+        archive_format: zip / tar.gz / tar（默认根据扩展名推断）
+        prefix: 归档中所有路径的前缀目录
+
+    Returns:
+        path、format、sha256、size
+    """
+    output = Path(output)
+    archive_format = archive_format or detect_archive_format(str(output), default='zip')
+    if archive_format not in HTTP_TYPES:
+        raise SourceArchiveError(f"不支持的归档格式: {archive_format}")
+    cmd = ['git', 'archive', f'--format={archive_format}']
+    if prefix:
+        cmd.append(f'--prefix={prefix.rstrip("/")}/')
+    cmd.append(ref)
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = output.with_name(f".{output.name}.{os.getpid()}.tmp")
+    digest = hashlib.sha256()
+    size = 0
+    # stderr 写入临时文件，避免读取 stdout 时因 stderr 管道写满而阻塞
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(cmd, cwd=str(repo_path), stdout=subprocess.PIPE, stderr=stderr)
+        stdout = process.stdout
+        assert stdout is not None
+        try:
+            with open(temp_path, 'wb') as f:
+                for chunk in iter(lambda: stdout.read(CHUNK_SIZE), b''):
+                    digest.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+            stdout.close()
+            if process.wait() != 0:
+                stderr.seek(0)
+                message = stderr.read().decode('utf-8', errors='replace').strip()
+                raise SourceArchiveError(message or f"git archive 失败: {ref}")
+            os.replace(temp_path, output)
+        except BaseException:
+            process.kill()
+            process.wait()
+            try:
+                temp_path.unlink()
+            except FileNotFoundError:
+                pass
+            raise
+    return {'path': output, 'format': archive_format, 'sha256': digest.hexdigest(), 'size': size}
+
+
+def http_source(url: str, sha256: str, archive_format: str) -> Dict[str, Any]:
+    """podspec 的 :http source（归档带有前缀目录，zip 需要显式 :flatten）"""
+    source: Dict[str, Any] = {'http': url, 'type': HTTP_TYPES[archive_format], 'sha256': sha256}
+    if archive_format == 'zip':
+        source['flatten'] = True
+    return source
+
+
+def _ruby_literal(value: Any) -> str:
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    text = str(value).replace('\\', '\\\\').replace("'", "\\'")
+    return f"'{text}'"
+
+
+def render_http_podspec(podspec_path: Union[str, Path], source: Dict[str, Any]) -> str:
+    """把 podspec 的 source 替换为 source 后的内容（Ruby podspec 只替换 s.source 的值）"""
+    podspec_path = Path(podspec_path)
+    if podspec_path.name.endswith('.json'):
+        try:
+            data = json.loads(podspec_path.read_text(encoding='utf-8'))
+        except json.JSONDecodeError as e:
+            raise PodspecError(f"invalid JSON: {e}") from e
+        data['source'] = source
+        return json.dumps(data, indent=2, ensure_ascii=False) + '\n'
+    spec = Podspec.from_file(podspec_path)
+    if 'source' not in spec.spans:
+        raise PodspecError("podspec 中没有 s.source")
+    ruby = '{ ' + ', '.join(f":{key} => {_ruby_literal(value)}" for key, value in source.items()) + ' }'
+    return spec.set_attribute_text('source', ruby)
@@ -0,0 +1,345 @@
+"""
+私有 spec 仓库索引
+把本地 spec 仓库中的 podspec（名称、版本、依赖、source tag）写入 SQLite，
+通过 git diff 增量更新，用于在发布前快速查询版本是否存在、最新版本和反向依赖
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .git_ops import GitOperations
+from .podspec import Podspec, PodspecError, version_key
+
+INDEX_VERSION = 1
+
+# 缓存目录中的索引文件名
+INDEX_FILE_NAME = 'spec-index.sqlite'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS repos (
+    name TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    commit_sha TEXT,
+    indexed_at REAL
+);
+CREATE TABLE IF NOT EXISTS specs (
+    repo TEXT NOT NULL,
+    name TEXT NOT NULL,
+    version TEXT NOT NULL,
+    path TEXT NOT NULL,
+    source_url TEXT,
+    source_tag TEXT,
+    error TEXT,
+    PRIMARY KEY (repo, name, version)
+);
+CREATE TABLE IF NOT EXISTS dependencies (
+    repo TEXT NOT NULL,
+    name TEXT NOT NULL,
+    version TEXT NOT NULL,
+    dependency TEXT NOT NULL,
+    dependency_root TEXT NOT NULL,
+    requirement TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_specs_name ON specs (name);
+CREATE INDEX IF NOT EXISTS idx_specs_path ON specs (repo, path);
+CREATE INDEX IF NOT EXISTS idx_deps_spec ON dependencies (repo, name, version);
+CREATE INDEX IF NOT EXISTS idx_deps_root ON dependencies (dependency_root);
+"""
+
+
+def default_repos_dir() -> Path:
+    """CocoaPods 本地 spec 仓库目录（遵循 CP_REPOS_DIR 环境变量）"""
+    return Path(os.environ.get('CP_REPOS_DIR') or Path.home() / '.cocoapods' / 'repos')
+
+
+def spec_index_path(cache_dir: Optional[Union[str, Path]] = None) -> Path:
+    """索引数据库路径（没有缓存目录时放在临时目录）"""
+    base = Path(cache_dir) if cache_dir is not None else Path(tempfile.gettempdir()) / 'lee-devkit'
+    return base / INDEX_FILE_NAME
+
+
+def update_spec_index(index: 'SpecIndex', repo_names: Iterable[str]) -> Dict[str, Optional[Dict]]:
+    """按本地 checkout（default_repos_dir() 下的同名目录）增量更新索引
+
+    Args:
+        index: 索引
+        repo_names: 要更新的 spec 仓库名称
+
+    Returns:
+        仓库名称到 update() 的统计（另含耗时 seconds）；没有本地 checkout 的仓库为 None
+    """
+    repos_dir = default_repos_dir()
+    results: Dict[str, Optional[Dict]] = {}
+    for name in repo_names:
+        repo_path = repos_dir / name
+        if not repo_path.is_dir():
+            results[name] = None
+            continue
+        start = time.monotonic()
+        stats = index.update(name, repo_path)
+        results[name] = dict(stats, seconds=time.monotonic() - start)
+    return results
+
+
+def spec_path_info(rel_path: str) -> Optional[Tuple[str, str]]:
+    """从 spec 仓库中的相对路径解析 (名称, 版本)
+
+    支持 <Name>/<version>/<Name>.podspec(.json)，以及 Specs/ 下带分片目录的布局。
+    """
+    parts = rel_path.split('/')
+    if len(parts) < 3:
+        return None
+    file_name, version, name = parts[-1], parts[-2], parts[-3]
+    if file_name not in (f"{name}.podspec", f"{name}.podspec.json"):
+        return None
+    return name, version
+
+
+def spec_paths(rel_paths: Iterable[str]) -> Dict[str, Tuple[str, str]]:
+    """podspec 相对路径到 (名称, 版本)，跳过不是 podspec 的路径"""
+    result: Dict[str, Tuple[str, str]] = {}
+    for rel_path in rel_paths:
+        info = spec_path_info(rel_path)
+        if info is not None:
+            result[rel_path] = info
+    return result
+
+
+def scan_spec_files(repo_path: Path) -> List[str]:
+    """spec 仓库中所有 podspec 文件的相对路径（跳过隐藏目录）"""
+    files = []
+    for dirpath, dirs, filenames in os.walk(repo_path):
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        rel_dir = Path(dirpath).relative_to(repo_path).as_posix()
+        for file_name in filenames:
+            rel_path = file_name if rel_dir == '.' else f"{rel_dir}/{file_name}"
+            if spec_path_info(rel_path):
+                files.append(rel_path)
+    return sorted(files)
+
+
+class SpecIndex:
+    """spec 仓库的 SQLite 索引"""
+
+    def __init__(self, db_path: Union[str, Path], jobs: Optional[int] = None):
+        """打开（或创建）索引数据库
+
+        Args:
+            db_path: 数据库文件路径
+            jobs: 解析 podspec 的并行线程数
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.jobs = jobs or min(32, (os.cpu_count() or 1) + 4)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.executescript(SCHEMA)
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is None or int(row[0]) != INDEX_VERSION:
+            self._reset()
+
+    def _reset(self) -> None:
+        with self.conn:
+            for table in ('repos', 'specs', 'dependencies'):
+                self.conn.execute(f"DELETE FROM {table}")
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (str(INDEX_VERSION),))
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> 'SpecIndex':
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # -- 更新 ------------------------------------------------------------
+
+    def update(self, repo_name: str, repo_path: Union[str, Path]) -> Dict[str, Union[str, int]]:
+        """更新一个仓库的索引，上次索引的提交可用时只处理 git diff 中变更的文件
+
+        Args:
+            repo_name: 仓库名称
+            repo_path: 本地仓库目录
+
+        Returns:
+            统计信息，包含 mode（full / incremental / unchanged）、indexed、removed
+        """
+        repo_path = Path(repo_path)
+        if not repo_path.is_dir():
+            raise FileNotFoundError(f"本地 spec 仓库不存在: {repo_path}")
+
+        git = GitOperations(str(repo_path))
+        head = git.get_head_commit()
+        row = self.conn.execute(
+            "SELECT path, commit_sha FROM repos WHERE name = ?", (repo_name,)
+        ).fetchone()
+
+        changes = None
+        if row and row[0] == str(repo_path) and row[1] and head:
+            if row[1] == head:
+                return {'mode': 'unchanged', 'indexed': 0, 'removed': 0}
+            changes = git.diff_name_status(row[1], head)
+
+        removed_paths: Optional[Dict[str, Tuple[str, str]]] = None
+        if changes is None:
+            mode = 'full'
+            to_index = spec_paths(self._scan(repo_path))
+        else:
+            mode = 'incremental'
+            to_index = spec_paths(rel_path for status, rel_path in changes if status != 'D')
+            removed_paths = spec_paths(rel_path for status, rel_path in changes if status == 'D')
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            records = list(executor.map(lambda item: self._parse(repo_path, *item), to_index.items()))
+
+        with self.conn:
+            if removed_paths is None:
+                self.conn.execute("DELETE FROM specs WHERE repo = ?", (repo_name,))
+                self.conn.execute("DELETE FROM dependencies WHERE repo = ?", (repo_name,))
+                removed = 0
+            else:
+                removed = self._remove_paths(repo_name, removed_paths)
+            for spec_row, deps in records:
+                self.conn.execute("INSERT OR REPLACE INTO specs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                  (repo_name,) + spec_row)
+                self.conn.execute("DELETE FROM dependencies WHERE repo = ? AND name = ? AND version = ?",
+                                  (repo_name, spec_row[0], spec_row[1]))
+                self.conn.executemany(
+                    "INSERT INTO dependencies VALUES (?, ?, ?, ?, ?, ?)",
+                    [(repo_name, spec_row[0], spec_row[1], dep, dep.split('/')[0], req)
+                     for dep, req in deps]
+                )
+            self.conn.execute("INSERT OR REPLACE INTO repos VALUES (?, ?, ?, ?)",
+                              (repo_name, str(repo_path), head, time.time()))
+
+        return {'mode': mode, 'indexed': len(records), 'removed': removed}
+
+    def _scan(self, repo_path: Path) -> List[str]:
+        return scan_spec_files(repo_path)
+
+    def _parse(self, repo_path: Path, rel_path: str,
+               info: Tuple[str, str]) -> Tuple[Tuple[Optional[str], ...], List[Tuple[str, str]]]:
+        name, version = info
+        source_url = source_tag = error = None
+        deps: List[Tuple[str, str]] = []
+        try:
+            spec = Podspec.from_file(repo_path / rel_path)
+            source = spec.get('source')
+            if isinstance(source, dict):
+                url = next((source[k] for k in ('git', 'http', 'svn', 'hg') if k in source), None)
+                source_url = str(url) if url is not None else None
+                tag = source.get('tag')
+                source_tag = str(tag) if tag is not None else None
+            for dep, reqs in spec.all_dependencies().items():
+                deps.append((dep, ', '.join(reqs)))
+        except (PodspecError, OSError, UnicodeDecodeError) as e:
+            error = str(e)
+        return (name, version, rel_path, source_url, source_tag, error), deps
+
+    def _remove_paths(self, repo_name: str, rel_paths: Dict[str, Tuple[str, str]]) -> int:
+        removed = 0
+        for rel_path, info in rel_paths.items():
+            cursor = self.conn.execute("DELETE FROM specs WHERE repo = ? AND path = ?",
+                                       (repo_name, rel_path))
+            if cursor.rowcount:
+                removed += cursor.rowcount
+                self.conn.execute("DELETE FROM dependencies WHERE repo = ? AND name = ? AND version = ?",
+                                  (repo_name,) + info)
+        return removed
+
+    def remove_repo(self, repo_name: str) -> None:
+        """删除一个仓库的全部索引"""
+        with self.conn:
+            for table in ('specs', 'dependencies'):
+                self.conn.execute(f"DELETE FROM {table} WHERE repo = ?", (repo_name,))
+            self.conn.execute("DELETE FROM repos WHERE name = ?", (repo_name,))
+
+    # -- 查询 ------------------------------------------------------------
+
+    def repos(self) -> List[Dict]:
+        """已索引的仓库及其 spec 数量"""
+        rows = self.conn.execute(
+            "SELECT r.name, r.path, r.commit_sha, r.indexed_at, COUNT(s.name) "
+            "FROM repos r LEFT JOIN specs s ON s.repo = r.name GROUP BY r.name ORDER BY r.name"
+        ).fetchall()
+        return [{'name': r[0], 'path': r[1], 'commit': r[2], 'indexed_at': r[3], 'specs': r[4]}
+                for r in rows]
+
+    def exists(self, name: str, version: str, repo: Optional[str] = None) -> bool:
+        """指定版本是否已存在"""
+        sql = "SELECT 1 FROM specs WHERE name = ? AND version = ?"
+        params: Tuple = (name, version)
+        if repo:
+            sql += " AND repo = ?"
+            params += (repo,)
+        return self.conn.execute(sql + " LIMIT 1", params).fetchone() is not None
+
+    def versions(self, name: str, repo: Optional[str] = None) -> List[str]:
+        """pod 的所有版本（升序）"""
+        sql = "SELECT DISTINCT version FROM specs WHERE name = ?"
+        params: Tuple = (name,)
+        if repo:
+            sql += " AND repo = ?"
+            params += (repo,)
+        return sorted((row[0] for row in self.conn.execute(sql, params)), key=version_key)
+
+    def latest(self, name: str, repo: Optional[str] = None,
+               include_prerelease: bool = False) -> Optional[str]:
+        """pod 的最新版本（默认忽略预发布版本，除非只有预发布版本）"""
+        versions = self.versions(name, repo)
+        stable = [v for v in versions if '-' not in v]
+        candidates = versions if include_prerelease or not stable else stable
+        return candidates[-1] if candidates else None
+
+    def spec(self, name: str, version: str, repo: Optional[str] = None) -> Optional[Dict]:
+        """查询单个版本的记录"""
+        sql = "SELECT repo, name, version, path, source_url, source_tag, error FROM specs " \
+              "WHERE name = ? AND version = ?"
+        params: Tuple = (name, version)
+        if repo:
+            sql += " AND repo = ?"
+            params += (repo,)
+        row = self.conn.execute(sql, params).fetchone()
+        if row is None:
+            return None
+        keys = ('repo', 'name', 'version', 'path', 'source_url', 'source_tag', 'error')
+        result = dict(zip(keys, row))
+        result['dependencies'] = {
+            dep: req for dep, req in self.conn.execute(
+                "SELECT dependency, requirement FROM dependencies "
+                "WHERE repo = ? AND name = ? AND version = ?", (row[0], name, version))
+        }
+        return result
+
+    def dependents(self, name: str, repo: Optional[str] = None,
+                   latest_only: bool = True) -> List[Dict[str, str]]:
+        """依赖指定 pod（含其子 spec）的 pod
+
+        Args:
+            name: pod 名称
+            repo: 只查询指定仓库
+            latest_only: 只考虑每个 pod 的最新版本（与 latest() 相同，按该仓库中的全部版本计算，
+                最新版本不再依赖 name 时不返回该 pod）
+        """
+        sql = "SELECT repo, name, version, dependency, requirement FROM dependencies " \
+              "WHERE dependency_root = ? AND name != ?"
+        params: Tuple = (name, name)
+        if repo:
+            sql += " AND repo = ?"
+            params += (repo,)
+        rows = self.conn.execute(sql, params).fetchall()
+        if latest_only:
+            latest: Dict[Tuple[str, str], Optional[str]] = {}
+            for row in rows:
+                key = (row[0], row[1])
+                if key not in latest:
+                    latest[key] = self.latest(row[1], row[0])
+            rows = [row for row in rows if latest[(row[0], row[1])] == row[2]]
+        keys = ('repo', 'name', 'version', 'dependency', 'requirement')
+        return [dict(zip(keys, row)) for row in sorted(rows, key=lambda r: (r[1], version_key(r[2])))]
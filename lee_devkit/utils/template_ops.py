@@ -0,0 +1,232 @@
+"""
+模板包工具
+从已有模块中提取模板包，以及读取、渲染模板包
+"""
+
+import fnmatch
+import json
+import os
+import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .file_ops import FileOperations
+from .text_ops import TextProcessor
+
+
+MANIFEST_NAME = 'template.json'
+FILES_DIR = 'files'
+MANIFEST_VERSION = 1
+
+# 提取模板时默认排除的路径
+DEFAULT_EXCLUDES = [
+    '.git', '.svn', '.hg', '.DS_Store', 'Pods', 'build', 'DerivedData',
+    'xcuserdata', '*.xcuserstate', '*.orig', '*~',
+]
+
+PLACEHOLDER_PATTERN = re.compile(rb'\{\{(\w+)\}\}')
+
+
+def name_variants_full(name: str) -> Dict[str, str]:
+    """生成所有占位符变量的取值
+
+    Args:
+        name: 模块名，例如 MyModule
+
+    Returns:
+        占位符变量名到取值的映射
+    """
+    snake = TextProcessor.camel_to_snake(name)
+    return {
+        'module_name': name,
+        'module_name_snake': snake,
+        'module_name_kebab': TextProcessor.camel_to_kebab(name),
+        'module_name_constant': snake.upper(),
+        'module_name_lower': name.lower(),
+        'module_name_upper': name.upper(),
+    }
+
+
+def name_variants(name: str) -> Dict[str, str]:
+    """生成模块名的大小写变体，重复的变体只保留第一个（用于提取）"""
+    variants: Dict[str, str] = {}
+    for key, value in name_variants_full(name).items():
+        if value and value not in variants.values():
+            variants[key] = value
+    return variants
+
+
+def _matches_any(rel_path: str, patterns: List[str]) -> bool:
+    """路径本身或其中任意一级名称匹配模式即视为命中"""
+    if any(fnmatch.fnmatch(rel_path, pattern) for pattern in patterns):
+        return True
+    parts = rel_path.split('/')
+    return any(fnmatch.fnmatch(part, pattern) for part in parts for pattern in patterns)
+
+
+class TemplateExtractor:
+    """从已有模块提取模板包"""
+
+    def __init__(self, source: Path, token: str,
+                 includes: Optional[List[str]] = None,
+                 excludes: Optional[List[str]] = None,
+                 jobs: Optional[int] = None):
+        """初始化提取工具
+
+        Args:
+            source: 已有模块的根目录
+            token: 模块名，会被替换为占位符
+            includes: 只提取匹配这些模式的文件（默认全部）
+            excludes: 排除的路径模式，追加在 DEFAULT_EXCLUDES 之后
+            jobs: 并行线程数
+        """
+        self.source = Path(source).resolve()
+        self.token = token
+        self.includes = list(includes or [])
+        self.excludes = DEFAULT_EXCLUDES + list(excludes or [])
+        self.jobs = jobs or min(32, (os.cpu_count() or 1) + 4)
+        self.variants = name_variants(token)
+
+        # 变体按长度降序排列，保证优先匹配较长的变体
+        by_value = {value: key for key, value in self.variants.items()}
+        alternatives = sorted(by_value, key=len, reverse=True)
+        self._pattern = re.compile(b'|'.join(re.escape(v.encode('utf-8')) for v in alternatives))
+        self._placeholders = {
+            value.encode('utf-8'): f'{{{{{key}}}}}'.encode('utf-8')
+            for value, key in by_value.items()
+        }
+        self._max_match = max(len(v.encode('utf-8')) for v in alternatives)
+
+    def to_placeholders(self, text: str) -> str:
+        """将文本中的模块名变体替换为占位符"""
+        return self._pattern.sub(
+            lambda m: self._placeholders[m.group(0)],
+            text.encode('utf-8')
+        ).decode('utf-8')
+
+    def collect(self, skip: Optional[Path] = None) -> List[str]:
+        """收集需要提取的文件（相对路径）
+
+        Args:
+            skip: 需要跳过的目录（例如输出目录位于源目录内时）
+        """
+        files = []
+        for root, dirs, filenames in os.walk(self.source):
+            rel_root = Path(root).relative_to(self.source).as_posix()
+            rel_root = '' if rel_root == '.' else rel_root + '/'
+            dirs[:] = sorted(
+                d for d in dirs
+                if not _matches_any(rel_root + d, self.excludes)
+                and (skip is None or Path(root, d).resolve() != skip)
+            )
+            for name in sorted(filenames):
+                rel_path = rel_root + name
+                if _matches_any(rel_path, self.excludes):
+                    continue
+                if self.includes and not _matches_any(rel_path, self.includes):
+                    continue
+                if Path(root, name).is_symlink():
+                    continue
+                files.append(rel_path)
+        return files
+
+    def extract(self, output: Path) -> Dict[str, int]:
+        """并行提取模板包到 output 目录
+
+        Args:
+            output: 输出目录，必须不存在或为空
+
+        Returns:
+            统计信息，包含 files、rendered、renamed、replacements
+        """
+        output = Path(output).resolve()
+        files_dir = output / FILES_DIR
+        files = self.collect(skip=output)
+
+        def process(rel_path: str) -> Tuple[dict, int]:
+            src = self.source / rel_path
+            target_rel = self.to_placeholders(rel_path)
+            dst = files_dir / target_rel
+            dst.parent.mkdir(parents=True, exist_ok=True)
+
+            count = 0
+            if FileOperations.is_binary_file(src):
+                shutil.copyfile(src, dst)
+            else:
+                count = FileOperations.stream_replace(
+                    src, self._pattern,
+                    lambda m: self._placeholders[m.group(0)],
+                    self._max_match, dest_path=dst
+                )
+            mode = src.stat().st_mode & 0o777
+            os.chmod(dst, mode)
+            return {'path': target_rel, 'mode': mode, 'render': count > 0}, count
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            results = list(executor.map(process, files))
+
+        entries = [entry for entry, _ in results]
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'token': self.token,
+            'placeholders': self.variants,
+            'include': self.includes,
+            'exclude': self.excludes,
+            'files': entries,
+        }
+        with open(output / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+        return {
+            'files': len(entries),
+            'rendered': sum(1 for entry in entries if entry['render']),
+            'renamed': sum(1 for rel, entry in zip(files, entries) if rel != entry['path']),
+            'replacements': sum(count for _, count in results),
+        }
+
+
+class TemplatePackage:
+    """已编译的模板包"""
+
+    def __init__(self, path: Path):
+        """加载模板包
+
+        Args:
+            path: 模板包目录（包含 template.json）
+        """
+        self.path = Path(path)
+        manifest_path = self.path / MANIFEST_NAME
+        if not manifest_path.exists():
+            raise FileNotFoundError(f"模板包缺少 {MANIFEST_NAME}: {self.path}")
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        if self.manifest.get('version') != MANIFEST_VERSION:
+            raise ValueError(f"不支持的模板包版本: {self.manifest.get('version')}")
+
+    @property
+    def token(self) -> str:
+        """提取模板时使用的原模块名"""
+        return str(self.manifest['token'])
+
+    def variables(self, module_name: str) -> Dict[str, str]:
+        """计算新模块名对应的占位符取值"""
+        return name_variants_full(module_name)
+
+    def iter_files(self, module_name: str) -> Iterator[Tuple[str, Path, int, bool]]:
+        """遍历模板包中的文件
+
+        Yields:
+            (渲染后的相对路径, 源文件路径, 权限位, 是否需要渲染内容)
+        """
+        variables = self.variables(module_name)
+        for entry in self.manifest['files']:
+            rel_path = TextProcessor.replace_variables(entry['path'], variables)
+            yield rel_path, self.path / FILES_DIR / entry['path'], entry['mode'], entry['render']
+
+    def render(self, data: bytes, module_name: str) -> bytes:
+        """渲染文件内容中的占位符"""
+        variables = {key.encode('ascii'): value.encode('utf-8')
+                     for key, value in self.variables(module_name).items()}
+        return PLACEHOLDER_PATTERN.sub(lambda m: variables.get(m.group(1), m.group(0)), data)
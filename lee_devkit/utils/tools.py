@@ -0,0 +1,115 @@
+"""
+外部工具解析
+统一解析 pod、git、编辑器等外部命令，便于替换为本地实现（例如测试桩）
+"""
+
+import os
+import selectors
+import shlex
+import subprocess
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+
+def tool_env_var(name: str) -> str:
+    """返回覆盖指定工具时使用的环境变量名，例如 pod -> LEE_DEVKIT_POD"""
+    return 'LEE_DEVKIT_' + name.upper().replace('-', '_')
+
+
+def resolve_tool(name: str, config: Any = None, default: Optional[str] = None) -> List[str]:
+    """解析外部工具的命令前缀
+
+    优先级：环境变量 LEE_DEVKIT_<NAME> > 配置项 tools.<name> > default > name
+
+    Args:
+        name: 工具名称，例如 pod、git、editor
+        config: Config 实例（可选）
+        default: 默认命令
+
+    Returns:
+        命令前缀参数列表
+    """
+    command = os.environ.get(tool_env_var(name))
+    if not command and config is not None:
+        command = config.get(f'tools.{name}')
+    if not command:
+        command = default or name
+    return shlex.split(command)
+
+
+def run_tool(command: List[str], cwd: Optional[Union[str, Path]] = None,
+             timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+    """执行外部工具并捕获输出，命令不存在时返回码为 127"""
+    try:
+        return subprocess.run(command, cwd=cwd, capture_output=True, text=True,
+                              timeout=timeout)
+    except FileNotFoundError as e:
+        return subprocess.CompletedProcess(command, 127, '', str(e))
+
+
+def tool_version(name: str, config: Any = None, args: Sequence[str] = ('--version',)) -> Optional[str]:
+    """返回外部工具输出的版本号（第一行），工具不可用时返回 None"""
+    return command_version(resolve_tool(name, config) + list(args))
+
+
+def command_version(command: Sequence[str]) -> Optional[str]:
+    """执行已解析的版本命令（例如 ['pod', '--version']），返回输出的第一行，失败时返回 None"""
+    result = run_tool(list(command))
+    if result.returncode != 0:
+        return None
+    lines = result.stdout.strip().splitlines()
+    return lines[0].strip() if lines else None
+
+
+def stream_tool(command: List[str], on_line: Callable[[str, str], None],
+                cwd: Optional[Union[str, Path]] = None, chunk_size: int = 65536,
+                max_line: int = 65536) -> int:
+    """执行外部工具，在单个线程中通过 selectors 同时读取 stdout 和 stderr
+
+    Args:
+        command: 命令参数列表
+        on_line: 每读到一行完整输出时调用 on_line(流名称, 行内容)，流名称为 stdout 或 stderr
+        cwd: 工作目录
+        chunk_size: 每次读取的字节数
+        max_line: 单行的最大字节数，超过时按该长度拆分后交给 on_line（不换行的输出不会无限累积）
+
+    Returns:
+        进程返回码
+    """
+    process = subprocess.Popen(command, cwd=cwd, stdout=subprocess.PIPE,
+                               stderr=subprocess.PIPE, bufsize=0)
+    stdout, stderr = process.stdout, process.stderr
+    assert stdout is not None and stderr is not None
+    selector = selectors.DefaultSelector()
+    pending: Dict[str, bytes] = {}
+    try:
+        for stream, name in ((stdout, 'stdout'), (stderr, 'stderr')):
+            selector.register(stream, selectors.EVENT_READ, name)
+            pending[name] = b''
+
+        while selector.get_map():
+            for key, _ in selector.select():
+                name = key.data
+                data = os.read(key.fd, chunk_size)
+                if not data:
+                    selector.unregister(key.fileobj)
+                    if pending[name]:
+                        on_line(name, pending[name].decode('utf-8', errors='replace'))
+                        pending[name] = b''
+                    continue
+                *lines, rest = (pending[name] + data).split(b'\n')
+                for line in lines:
+                    on_line(name, line.rstrip(b'\r').decode('utf-8', errors='replace'))
+                while len(rest) > max_line:
+                    on_line(name, rest[:max_line].decode('utf-8', errors='replace'))
+                    rest = rest[max_line:]
+                pending[name] = rest
+        return process.wait()
+    except BaseException:
+        process.kill()
+        process.wait()
+        raise
+    finally:
+        selector.close()
+        stdout.close()
+        stderr.close()
@@ -0,0 +1,204 @@
+"""
+伞头文件和 module.modulemap 生成
+按 public_header_files（未声明时为 source_files 中的所有头文件）生成伞头文件和 module map，
+公开头文件集合记录在缓存目录的清单中，集合与生成的文件都未变化时不写入，避免 Xcode 重新编译
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .deps_check import module_name
+from .pod_glob import HEADER_EXTENSIONS, evaluate_podspec
+from .podspec import Podspec
+
+HEADERS_VERSION = 1
+
+GENERATED_MARKER = 'Generated by lee-devkit pod headers'
+
+
+class HeaderPlan:
+    """一个 pod 的伞头文件和 module map 更新计划"""
+
+    def __init__(self, root: Path, module: str, headers: List[str], outputs: Dict[Path, str],
+                 manifest_path: Optional[Path], previous: Optional[Dict]):
+        self.root = root
+        self.module = module
+        self.headers = headers
+        self.outputs = outputs
+        self.manifest_path = manifest_path
+        self.previous = previous
+
+    @property
+    def added(self) -> List[str]:
+        """与上次生成相比新增的头文件"""
+        old = set(self.previous.get('headers', [])) if self.previous else set()
+        return [header for header in self.headers if header not in old]
+
+    @property
+    def removed(self) -> List[str]:
+        """与上次生成相比删除的头文件"""
+        new = set(self.headers)
+        return [header for header in (self.previous or {}).get('headers', []) if header not in new]
+
+    @property
+    def changed(self) -> List[Path]:
+        """内容需要更新的文件"""
+        return [path for path, text in self.outputs.items() if _read(path) != text]
+
+    @property
+    def foreign(self) -> List[Path]:
+        """已存在但不是由本工具生成的文件（默认不覆盖）"""
+        return [path for path in self.changed if path.exists() and GENERATED_MARKER not in (_read(path) or '')]
+
+    @property
+    def conflicts(self) -> Dict[str, List[str]]:
+        """文件名相同的公开头文件（在 framework 的 Headers 目录中会互相覆盖）"""
+        by_name: Dict[str, List[str]] = {}
+        for header in self.headers:
+            by_name.setdefault(Path(header).name, []).append(header)
+        return {name: paths for name, paths in by_name.items() if len(paths) > 1}
+
+
+def _read(path: Path) -> Optional[str]:
+    try:
+        return path.read_text(encoding='utf-8')
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def public_headers(spec: Podspec, root: Path) -> List[str]:
+    """公开头文件（所有变体的并集，相对路径）"""
+    report = evaluate_podspec(spec, root)
+    files: Dict[str, set] = {}
+    for match in report.matches:
+        files.setdefault(match.attribute, set()).update(match.files)
+    declared = any(match.attribute == 'public_header_files' for match in report.matches)
+    headers = files.get('public_header_files', set()) if declared else files.get('source_files', set())
+    headers = headers - files.get('private_header_files', set()) - files.get('project_header_files', set())
+    return sorted(header for header in headers if header.lower().endswith(HEADER_EXTENSIONS))
+
+
+def render_umbrella(headers: List[str], platforms: Dict[str, Optional[str]]) -> str:
+    """生成伞头文件内容"""
+    uikit = not platforms or any(name in platforms for name in ('ios', 'tvos', 'visionos'))
+    framework = 'UIKit/UIKit.h' if uikit else 'Foundation/Foundation.h'
+    lines = [
+        f"// {GENERATED_MARKER}, do not edit.",
+        "",
+        "#ifdef __OBJC__",
+        f"#import <{framework}>",
+        "#endif",
+        "",
+    ]
+    lines += [f'#import "{Path(header).name}"' for header in headers]
+    return '\n'.join(lines) + '\n'
+
+
+def render_modulemap(module: str, umbrella: str) -> str:
+    """生成 module.modulemap 内容"""
+    return (
+        f"// {GENERATED_MARKER}, do not edit.\n"
+        f"framework module {module} {{\n"
+        f"  umbrella header \"{umbrella}\"\n"
+        "\n"
+        "  export *\n"
+        "  module * { export * }\n"
+        "}\n"
+    )
+
+
+def plan_headers(podspec_path: Union[str, Path], output_dir: Optional[Union[str, Path]] = None,
+                 cache_dir: Optional[Union[str, Path]] = None, spec: Optional[Podspec] = None) -> HeaderPlan:
+    """计算伞头文件和 module map 的内容
+
+    Args:
+        podspec_path: podspec 文件路径
+        output_dir: 输出目录（默认为 pod 根目录下与模块同名的目录，不存在时为 pod 根目录）
+        cache_dir: 缓存目录，保存上次生成的清单
+        spec: 已解析的 podspec（为 None 时从 podspec_path 解析）
+
+    Returns:
+        HeaderPlan；头文件集合和生成的文件都与清单一致时 outputs 为空
+    """
+    podspec_path = Path(podspec_path)
+    root = podspec_path.resolve().parent
+    if spec is None:
+        spec = Podspec.from_file(podspec_path)
+    module = spec.get('module_name') if isinstance(spec.get('module_name'), str) else module_name(spec.name or '')
+    if output_dir is None:
+        output_dir = root / module if (root / module).is_dir() else root
+    output_dir = Path(output_dir).resolve()
+    umbrella_path = output_dir / f"{module}.h"
+    modulemap_path = output_dir / 'module.modulemap'
+
+    manifest_path = None
+    previous = None
+    if cache_dir is not None:
+        key = hashlib.sha1(str(root).encode('utf-8')).hexdigest()[:16]
+        manifest_path = Path(cache_dir) / 'headers' / f"{key}.json"
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+            if previous.get('version') != HEADERS_VERSION:
+                previous = None
+        except (OSError, ValueError):
+            previous = None
+
+    umbrella_rel = umbrella_path.relative_to(root).as_posix() if root in umbrella_path.parents else None
+    headers = [header for header in public_headers(spec, root) if header != umbrella_rel]
+
+    # 头文件集合未变且生成的文件没有被修改时，不需要重新生成
+    if previous and previous.get('module') == module and previous.get('headers') == headers:
+        files = previous.get('files', {})
+        if set(files) == {str(umbrella_path), str(modulemap_path)} and all(
+                _digest(_read(Path(path))) == digest for path, digest in files.items()):
+            return HeaderPlan(root, module, headers, {}, manifest_path, previous)
+
+    outputs = {
+        umbrella_path: render_umbrella(headers, spec.platforms),
+        modulemap_path: render_modulemap(module, umbrella_path.name),
+    }
+    return HeaderPlan(root, module, headers, outputs, manifest_path, previous)
+
+
+def _digest(text: Optional[str]) -> Optional[str]:
+    return None if text is None else hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def apply_headers(plan: HeaderPlan, force: bool = False) -> List[Path]:
+    """写入内容有变化的文件并更新清单
+
+    Args:
+        plan: plan_headers 的结果
+        force: 覆盖不是由本工具生成的同名文件
+
+    Returns:
+        写入的文件
+    """
+    if plan.foreign and not force:
+        raise FileExistsError(', '.join(str(path) for path in plan.foreign))
+    written = []
+    for path in plan.changed:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(plan.outputs[path])
+        os.replace(temp_path, path)
+        written.append(path)
+
+    if plan.manifest_path is not None and plan.outputs:
+        plan.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        manifest = {
+            'version': HEADERS_VERSION,
+            'module': plan.module,
+            'headers': plan.headers,
+            'files': {str(path): _digest(text) for path, text in plan.outputs.items()},
+        }
+        temp_path = plan.manifest_path.with_name(f".{plan.manifest_path.name}.{os.getpid()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(temp_path, plan.manifest_path)
+    return written
@@ -0,0 +1,250 @@
+"""
+批量版本号更新
+一次并行扫描找出 podspec 的 s.version、Info.plist 的 CFBundleShortVersionString
+和 project.pbxproj 的 MARKETING_VERSION，全部计算成功后再原子地写回；
+Info.plist 和 project.pbxproj 中只更新与 podspec 原版本号相同的值
+"""
+
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from .pod_graph import SKIP_DIRS, discover_podspecs
+from .podspec import VERSION_RE, Podspec, PodspecError
+
+BUMP_PARTS = ('major', 'minor', 'patch')
+
+PLIST_VERSION_RE = re.compile(r'(<key>CFBundleShortVersionString</key>\s*<string>)([^<]*)(</string>)')
+PBXPROJ_VERSION_RE = re.compile(r'(\bMARKETING_VERSION\s*=\s*)("?)([^;"\n]*)\2(;)')
+JSON_VERSION_RE = re.compile(r'("version"\s*:\s*")([^"]*)(")')
+
+
+class BumpError(ValueError):
+    """无法更新版本号"""
+
+
+def bump_version(current: str, part: str) -> str:
+    """计算新版本号
+
+    Args:
+        current: 当前版本号
+        part: major / minor / patch，或明确的版本号
+
+    Returns:
+        新版本号（按 major / minor / patch 递增时去掉预发布后缀）
+    """
+    if part not in BUMP_PARTS:
+        if not VERSION_RE.match(part):
+            raise BumpError(f"无效的版本号: {part}")
+        return part
+    if not VERSION_RE.match(current or ''):
+        raise BumpError(f"无法递增版本号: {current}")
+    main = re.split(r'[-+]', current, 1)[0]
+    numbers = [int(n) for n in main.split('.')] + [0, 0]
+    major, minor, patch = numbers[:3]
+    if part == 'major':
+        return f"{major + 1}.0.0"
+    if part == 'minor':
+        return f"{major}.{minor + 1}.0"
+    return f"{major}.{minor}.{patch + 1}"
+
+
+class VersionSite:
+    """一个文件中的版本号位置"""
+
+    def __init__(self, path: Path, kind: str, old_values: List[str], new_text: str):
+        """初始化
+
+        Args:
+            path: 文件路径
+            kind: podspec / plist / pbxproj
+            old_values: 替换前的值
+            new_text: 替换后的文件内容
+        """
+        self.path = path
+        self.kind = kind
+        self.old_values = old_values
+        self.new_text = new_text
+
+
+class ModuleBump:
+    """一个模块（podspec 所在目录）的版本更新"""
+
+    def __init__(self, root: Path, name: str, old_version: str, new_version: str,
+                 sites: List[VersionSite], skipped: Optional[List[Tuple[Path, str, List[str]]]] = None):
+        self.root = root
+        self.name = name
+        self.old_version = old_version
+        self.new_version = new_version
+        self.sites = sites
+        # 值与 podspec 原版本号不同而未更新的位置：(路径, 类型, 值)
+        self.skipped = skipped or []
+
+
+def _replace_podspec(path: Path, new_version: Optional[str], part: str) -> Tuple[str, str, VersionSite]:
+    text = path.read_text(encoding='utf-8')
+    try:
+        spec = Podspec.from_file(path)
+    except PodspecError as e:
+        raise BumpError(f"{path}: 无法解析 podspec: {e}") from e
+    old = spec.version
+    if old is None:
+        raise BumpError(f"{path}: s.version 不是字面量，无法更新")
+    new = new_version or bump_version(old, part)
+    if spec.format == 'json':
+        new_text, count = JSON_VERSION_RE.subn(lambda m: m.group(1) + new + m.group(3), text, count=1)
+        if not count:
+            raise BumpError(f"{path}: 未找到 version 字段")
+    else:
+        if 'version' not in spec.spans:
+            raise BumpError(f"{path}: s.version 不是字面量，无法更新")
+        start, end = spec.spans['version']
+        quote = '"' if text[start:end].startswith('"') else "'"
+        new_text = spec.set_attribute_text('version', f"{quote}{new}{quote}")
+    return old, new, VersionSite(path, 'podspec', [old], new_text)
+
+
+def _replace_pattern(path: Path, kind: str, old_version: str,
+                     new_version: str) -> Tuple[Optional[VersionSite], List[str]]:
+    """替换文件中等于 old_version 的版本号
+
+    Returns:
+        (需要写回的位置或 None, 值不同而跳过的版本号)
+    """
+    # 保留原有换行符
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        text = f.read()
+    old_values: List[str] = []
+    skipped: List[str] = []
+
+    def replace(match: 're.Match[str]') -> str:
+        value = match.group(3) if kind == 'pbxproj' else match.group(2)
+        # 引用构建设置的值（例如 $(MARKETING_VERSION)）由其他位置决定
+        if '$' in value:
+            return match.group(0)
+        # 版本号不同的目标（例如 Example 应用）独立管理版本
+        if value.strip() != old_version:
+            skipped.append(value)
+            return match.group(0)
+        old_values.append(value)
+        if kind == 'pbxproj':
+            return f"{match.group(1)}{match.group(2)}{new_version}{match.group(2)}{match.group(4)}"
+        return f"{match.group(1)}{new_version}{match.group(3)}"
+
+    pattern = PBXPROJ_VERSION_RE if kind == 'pbxproj' else PLIST_VERSION_RE
+    new_text = pattern.sub(replace, text)
+    if not old_values:
+        return None, skipped
+    return VersionSite(path, kind, old_values, new_text), skipped
+
+
+def scan_module_files(root: Path, exclude: Iterable[Path] = ()) -> List[Tuple[Path, str]]:
+    """查找模块目录中的 Info.plist 和 project.pbxproj（跳过 Pods、build 等目录和其他模块）"""
+    exclude = {Path(p).resolve() for p in exclude}
+    found = []
+    for dirpath, dirs, files in os.walk(root):
+        current = Path(dirpath)
+        dirs[:] = sorted(
+            d for d in dirs
+            if d not in SKIP_DIRS and not d.startswith('.') and (current / d).resolve() not in exclude
+        )
+        for name in sorted(files):
+            if name == 'Info.plist' or name.endswith('-Info.plist'):
+                found.append((current / name, 'plist'))
+            elif name == 'project.pbxproj':
+                found.append((current / name, 'pbxproj'))
+    return found
+
+
+def plan_bump(paths: Iterable[Union[str, Path]], part: str, jobs: Optional[int] = None) -> List[ModuleBump]:
+    """扫描模块并计算所有版本号位置的新内容（不写入文件）
+
+    Args:
+        paths: 模块目录、podspec 文件或包含多个模块的目录
+        part: major / minor / patch，或明确的版本号
+        jobs: 并行线程数
+
+    Returns:
+        每个模块的更新计划；任何位置无法更新时抛出 BumpError
+    """
+    explicit = None if part in BUMP_PARTS else bump_version('', part)
+    podspecs: List[Path] = []
+    for path in paths:
+        path = Path(path)
+        if path.is_file():
+            podspecs.append(path)
+        elif path.is_dir():
+            podspecs.extend(discover_podspecs(path))
+        else:
+            raise BumpError(f"路径不存在: {path}")
+    if not podspecs:
+        raise BumpError("未找到 podspec")
+
+    # 同一目录下的多个 podspec 属于同一个模块
+    modules: Dict[Path, List[Path]] = {}
+    for podspec in podspecs:
+        modules.setdefault(podspec.parent.resolve(), [])
+        if podspec.resolve() not in modules[podspec.parent.resolve()]:
+            modules[podspec.parent.resolve()].append(podspec.resolve())
+    roots = list(modules)
+
+    def plan(root: Path) -> ModuleBump:
+        sites: List[VersionSite] = []
+        skipped: List[Tuple[Path, str, List[str]]] = []
+        versions: Dict[str, Tuple[str, str]] = {}
+        for podspec in modules[root]:
+            old, new, podspec_site = _replace_podspec(podspec, explicit, part)
+            sites.append(podspec_site)
+            versions[podspec.name.split('.')[0]] = (old, new)
+        # Info.plist 和 project.pbxproj 按原版本号匹配，同一模块的 podspec 必须一致
+        if len({old for old, _ in versions.values()}) > 1:
+            found = ', '.join(f"{name} {old}" for name, (old, _) in versions.items())
+            raise BumpError(f"{root}: 模块中的 podspec 版本号不一致（{found}）")
+        old_version, new_version = next(iter(versions.values()))
+        nested = [other for other in roots if other != root and root in other.parents]
+        for path, kind in scan_module_files(root, nested):
+            site, values = _replace_pattern(path, kind, old_version, new_version)
+            if site is not None:
+                sites.append(site)
+            if values:
+                skipped.append((path, kind, values))
+        return ModuleBump(root, ', '.join(versions), old_version, new_version, sites, skipped)
+
+    workers = jobs or min(32, (os.cpu_count() or 1) + 4)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(plan, roots))
+
+
+def apply_bump(modules: List[ModuleBump]) -> None:
+    """写回所有文件：先全部写入临时文件，再逐个替换；替换失败时恢复已替换的文件"""
+    sites = [site for module in modules for site in module.sites]
+    temp_paths = []
+    try:
+        for index, site in enumerate(sites):
+            temp_path = site.path.with_name(f".{site.path.name}.{os.getpid()}.{index}.bump")
+            with open(temp_path, 'w', encoding='utf-8', newline='') as f:
+                f.write(site.new_text)
+            try:
+                os.chmod(temp_path, site.path.stat().st_mode)
+            except OSError:
+                pass
+            temp_paths.append(temp_path)
+    except OSError:
+        for temp_path in temp_paths:
+            temp_path.unlink(missing_ok=True)
+        raise
+
+    originals: List[Tuple[Path, bytes]] = []
+    try:
+        for site, temp_path in zip(sites, temp_paths):
+            original = site.path.read_bytes()
+            os.replace(temp_path, site.path)
+            originals.append((site.path, original))
+    except OSError:
+        for path, original in originals:
+            path.write_bytes(original)
+        for temp_path in temp_paths:
+            temp_path.unlink(missing_ok=True)
+        raise
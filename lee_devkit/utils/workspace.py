@@ -0,0 +1,154 @@
+"""
+本地开发工作区生成
+从依赖图中选出指定 pod 及其本地依赖闭包，生成使用 :path 引用的 Podfile
+和对应的 .xcworkspace/contents.xcworkspacedata；内容未变化时不写入
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from xml.sax.saxutils import quoteattr
+
+from .pod_graph import PodGraph
+from .podspec import version_key
+
+WORKSPACE_MARKER = 'Generated by lee-devkit pod workspace'
+
+# CocoaPods Podfile 中的平台名称
+PODFILE_PLATFORMS = {'ios': 'ios', 'osx': 'osx', 'macos': 'osx', 'tvos': 'tvos',
+                     'watchos': 'watchos', 'visionos': 'visionos'}
+
+
+class WorkspaceError(ValueError):
+    """无法生成工作区"""
+
+
+def select_pods(graph: PodGraph, names: Optional[Iterable[str]] = None) -> List[str]:
+    """选中的 pod 及其图内依赖闭包（未指定时为全部 pod）"""
+    names = [name.split('/')[0] for name in names or []]
+    if not names:
+        return sorted(graph.nodes)
+    unknown = [name for name in names if name not in graph.nodes]
+    if unknown:
+        raise WorkspaceError(f"未找到 pod: {', '.join(unknown)}")
+    selected = set(names)
+    for name in names:
+        selected.update(graph.dependencies(name, transitive=True))
+    return sorted(selected)
+
+
+def deployment_target(graph: PodGraph, pods: Iterable[str]) -> Tuple[str, Optional[str]]:
+    """所选 pod 共同的平台和最高部署版本（没有声明平台时为 ios）"""
+    targets: Dict[str, List[str]] = {}
+    for name in pods:
+        for platform, target in graph.nodes[name].platforms.items():
+            targets.setdefault(PODFILE_PLATFORMS.get(platform, platform), [])
+            if target:
+                targets[PODFILE_PLATFORMS.get(platform, platform)].append(target)
+    platform = 'ios' if 'ios' in targets or not targets else sorted(targets)[0]
+    versions = targets.get(platform, [])
+    return platform, max(versions, key=version_key) if versions else None
+
+
+def render_podfile(pods: List[Tuple[str, str]], platform: str, target_version: Optional[str],
+                   workspace: str, target: str, project: Optional[str] = None) -> str:
+    """生成 Podfile
+
+    Args:
+        pods: (pod 名称, 相对于 Podfile 的目录)
+        platform: 平台
+        target_version: 部署版本
+        workspace: 工作区名称
+        target: target 名称
+        project: 用户工程路径（相对于 Podfile）
+    """
+    lines = [f"# {WORKSPACE_MARKER}, do not edit.", "use_frameworks!", ""]
+    lines.append(f"platform :{platform}, '{target_version}'" if target_version else f"platform :{platform}")
+    lines.append(f"workspace '{workspace}'")
+    if project:
+        lines.append(f"project '{project}'")
+    lines += ["", f"target '{target}' do"]
+    lines += [f"  pod '{name}', :path => '{path}'" for name, path in pods]
+    lines.append("end")
+    return '\n'.join(lines) + '\n'
+
+
+def render_workspace(pods: List[Tuple[str, str]], project: Optional[str] = None) -> str:
+    """生成 contents.xcworkspacedata（用户工程、Pods 工程和每个本地 pod 的目录）"""
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', f"<!-- {WORKSPACE_MARKER} -->",
+             '<Workspace', '   version = "1.0">']
+    locations = ([project] if project else []) + ['Pods/Pods.xcodeproj']
+    for location in locations:
+        lines += ['   <FileRef', f'      location = {quoteattr("group:" + location)}>', '   </FileRef>']
+    if pods:
+        lines += ['   <Group', '      location = "container:"', '      name = "Local Pods">']
+        for _, path in pods:
+            lines += ['      <FileRef', f'         location = {quoteattr("group:" + path)}>', '      </FileRef>']
+        lines.append('   </Group>')
+    lines.append('</Workspace>')
+    return '\n'.join(lines) + '\n'
+
+
+def plan_workspace(graph: PodGraph, output_dir: Path, names: Optional[Iterable[str]] = None,
+                   workspace: str = 'Dev', target: Optional[str] = None, project: Optional[str] = None,
+                   platform: Optional[str] = None) -> Tuple[List[str], Dict[Path, str]]:
+    """计算工作区文件的内容
+
+    Args:
+        graph: 依赖图
+        output_dir: Podfile 所在目录
+        names: 选中的 pod（为空时为全部）
+        workspace: 工作区名称
+        target: target 名称（默认与工作区同名）
+        project: 用户工程路径
+        platform: 平台和部署版本，例如 ios:13.0（默认取所选 pod 的最高部署版本）
+
+    Returns:
+        (所选 pod, 文件路径到内容)
+    """
+    if graph.root is None:
+        raise WorkspaceError("依赖图没有根目录")
+    selected = select_pods(graph, names)
+    broken = [name for name in selected if graph.nodes[name].error]
+    if broken:
+        raise WorkspaceError(f"无法解析 podspec: {', '.join(graph.nodes[n].path for n in broken)}")
+
+    output_dir = Path(output_dir).resolve()
+    pods = []
+    for name in selected:
+        pod_dir = (graph.root / graph.nodes[name].path).parent
+        pods.append((name, Path(os.path.relpath(pod_dir, output_dir)).as_posix()))
+
+    target_version: Optional[str]
+    if platform:
+        platform_name, _, version_text = platform.partition(':')
+        target_version = version_text or None
+    else:
+        platform_name, target_version = deployment_target(graph, selected)
+    if project:
+        project = Path(os.path.relpath(Path(project).resolve(), output_dir)).as_posix()
+
+    files = {
+        output_dir / 'Podfile': render_podfile(pods, platform_name, target_version, workspace,
+                                               target or workspace, project),
+        output_dir / f"{workspace}.xcworkspace" / 'contents.xcworkspacedata': render_workspace(pods, project),
+    }
+    return selected, files
+
+
+def write_if_changed(files: Dict[Path, str]) -> List[Path]:
+    """只写入内容有变化的文件（先写临时文件再替换）"""
+    written = []
+    for path, text in files.items():
+        try:
+            if path.read_text(encoding='utf-8') == text:
+                continue
+        except (OSError, UnicodeDecodeError):
+            pass
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(temp_path, path)
+        written.append(path)
+    return written
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Tests for mapping Git changes to affected pods
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lee_devkit.commands import cocoapods
+from lee_devkit.utils.affected import affected_pods, pod_owners, podspec_paths
+from lee_devkit.utils.git_ops import GitOperations
+from lee_devkit.utils.pod_graph import PodGraph
+from tests.test_pod_graph import write_pod
+from tests.test_spec_index import git
+
+
+def write_source_pod(root: Path, name: str, dependencies=(), resources="'Assets'") -> Path:
+    """Write a pod directory with one source file, an asset and a README"""
+    pod = root / name
+    (pod / 'Sources' / 'Internal').mkdir(parents=True)
+    (pod / 'Assets').mkdir()
+    (pod / 'Sources' / f'{name}.swift').write_text('// source\n')
+    (pod / 'Assets' / 'icon.png').write_text('png\n')
+    (pod / 'README.md').write_text(f'# {name}\n')
+    return write_pod(root, name, dependencies, attributes=[
+        "source_files = 'Sources/**/*.{swift,h}'", f"resources = {resources}"])
+
+
+class TestAffected(unittest.TestCase):
+    """Test path to pod mapping, dependent expansion and the command"""
+
+    def setUp(self):
+        """Create a monorepo with a small dependency chain"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.root = self.temp_dir / 'mono'
+        self.root.mkdir()
+        write_source_pod(self.root, 'Core')
+        write_source_pod(self.root, 'Net', ['Core'])
+        write_source_pod(self.root, 'UI', ['Net/Base'])
+        write_source_pod(self.root, 'Other', resources="['Assets/*.png']")
+        (self.root / 'Gemfile').write_text("source 'https://rubygems.org'\n")
+        git(self.root, 'init', '-q')
+        git(self.root, 'add', '-A')
+        git(self.root, 'commit', '-q', '-m', 'Initial pods')
+        self.cache_dir = self.temp_dir / 'cache'
+
+    def tearDown(self):
+        """Clean up the test environment"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_owners(self):
+        """Files map to pods through their file patterns, not their directory"""
+        graph = PodGraph.build(self.root)
+        owners = pod_owners(graph, [
+            'Core/Sources/Internal/Deleted.h',
+            'Core/Assets/nested/file.json',
+            'Core/README.md',
+            'Other/Assets/icon.png',
+            'Other/Assets/icon.pdf',
+            'Net/Net.podspec',
+            'Gemfile',
+        ])
+        self.assertEqual(owners, {
+            'Core': ['Core/Sources/Internal/Deleted.h', 'Core/Assets/nested/file.json'],
+            'Net': ['Net/Net.podspec'],
+            'Other': ['Other/Assets/icon.png'],
+        })
+
+    def test_dependents(self):
+        """Reverse dependents are added in dependency order"""
+        graph = PodGraph.build(self.root)
+        result = affected_pods(graph, ['Core/Sources/Core.swift', 'Gemfile'])
+        self.assertEqual(result['pods'], ['Core', 'Net', 'UI'])
+        self.assertEqual(result['dependents'], ['Net', 'UI'])
+        self.assertEqual(result['unowned'], ['Gemfile'])
+        self.assertEqual(affected_pods(graph, ['Net/Sources/Net.swift'], dependents=False)['pods'], ['Net'])
+        self.assertEqual(podspec_paths(graph, ['Net']), [graph.root / 'Net' / 'Net.podspec'])
+        with self.assertRaises(ValueError):
+            podspec_paths(PodGraph(graph.nodes.values()), ['Net'])
+
+    def test_changed_files(self):
+        """Committed, uncommitted and untracked changes since the merge base are included"""
+        git(self.root, 'branch', 'base')
+        git(self.root, 'checkout', '-q', '-b', 'feature')
+        (self.root / 'Net' / 'Sources' / 'Net.swift').write_text('// changed\n')
+        git(self.root, 'commit', '-q', '-am', 'Change Net')
+        (self.root / 'Other' / 'README.md').write_text('changed\n')
+        (self.root / 'UI' / 'Sources' / 'New.swift').write_text('// new\n')
+        changed = GitOperations(str(self.root / 'Net')).changed_files('base')
+        self.assertEqual(changed, ['Sources/Net.swift'])
+        changed = GitOperations(str(self.root)).changed_files('base')
+        self.assertEqual(changed, ['Net/Sources/Net.swift', 'Other/README.md', 'UI/Sources/New.swift'])
+        self.assertIsNone(GitOperations(str(self.root)).changed_files('no-such-ref'))
+
+    def test_command(self):
+        """pod affected prints the pods to lint, dependencies first"""
+        config = mock.MagicMock()
+        config.get_cache_dir.return_value = self.cache_dir
+        (self.root / 'Core' / 'Sources' / 'Core.swift').write_text('// changed\n')
+        with mock.patch('sys.stdout.write') as write:
+            self.assertTrue(cocoapods.show_affected(self.root, config, output_format='json'))
+        self.assertEqual(json.loads(write.call_args[0][0])['pods'], ['Core', 'Net', 'UI'])
+        with mock.patch('builtins.print') as mock_print:
+            self.assertTrue(cocoapods.show_affected(self.root, config, output_format='paths'))
+            self.assertFalse(cocoapods.show_affected(self.root, config, since='no-such-ref'))
+        printed = [call[0][0] for call in mock_print.call_args_list]
+        self.assertEqual(printed[:3], [self.root.resolve() / p for p in
+                                       ('Core/Core.podspec', 'Net/Net.podspec', 'UI/UI.podspec')])
+
+    def test_performance(self):
+        """Mapping changes on a repo with hundreds of pods stays well under a second"""
+        root = self.temp_dir / 'large'
+        for index in range(300):
+            pod = root / f'Pod{index}'
+            pod.mkdir(parents=True)
+            deps = f"  s.dependency 'Pod{index - 1}'\n" if index % 10 else ''
+            (pod / f'Pod{index}.podspec').write_text(
+                f"Pod::Spec.new do |s|\n  s.name = 'Pod{index}'\n  s.version = '1.0.0'\n"
+                f"  s.source_files = 'Sources/**/*.{{swift,h,m}}'\n"
+                f"  s.resource_bundles = {{ 'Pod{index}' => ['Resources/**/*'] }}\n{deps}end\n")
+        PodGraph.build(root, cache_dir=self.cache_dir)
+        changed = [f'Pod{index}/Sources/File{n}.swift' for index in range(0, 300, 7) for n in range(20)]
+        start = time.monotonic()
+        graph = PodGraph.build(root, cache_dir=self.cache_dir)
+        result = affected_pods(graph, changed)
+        elapsed = time.monotonic() - start
+        self.assertEqual(graph.stats['parsed'], 0)
+        self.assertEqual(len(result['direct']), 43)
+        self.assertIn('Pod9', result['pods'])
+        self.assertLess(elapsed, 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Tests for the Pods CI cache key
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lee_devkit.commands import cocoapods
+from lee_devkit.utils.cache_key import compute_cache_key, local_pods
+
+PODFILE = """platform :ios, '13.0'
+target 'App' do
+  pod 'MyLib', :path => '../MyLib'
+  pod 'Tools/Core', path: '../Tools'
+  pod 'Alamofire', '~> 5.0'
+end
+"""
+
+LOCKFILE = """PODS:
+  - Alamofire (5.8.0)
+  - MyLib (1.0.0)
+
+DEPENDENCIES:
+  - MyLib (from `../MyLib`)
+
+EXTERNAL SOURCES:
+  MyLib:
+    :path: "../MyLib"
+
+COCOAPODS: 1.16.2
+"""
+
+
+class TestCacheKey(unittest.TestCase):
+    """Test inputs, stability, memoization and change reports of the cache key"""
+
+    def setUp(self):
+        """Create an app with two local pods"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.workspace = self.temp_dir / 'workspace'
+        self.app = self.workspace / 'App'
+        self.app.mkdir(parents=True)
+        (self.app / 'Podfile').write_text(PODFILE)
+        (self.app / 'Podfile.lock').write_text(LOCKFILE)
+        for name in ('MyLib', 'Tools'):
+            pod = self.workspace / name
+            (pod / 'Sources').mkdir(parents=True)
+            (pod / 'Sources' / f'{name}.swift').write_text(f'struct {name} {{}}\n')
+            (pod / 'README.md').write_text('not an input\n')
+            (pod / f'{name}.podspec').write_text(
+                f"Pod::Spec.new do |s|\n  s.name = '{name}'\n  s.version = '1.0.0'\n"
+                "  s.source_files = 'Sources/**/*.{h,swift}'\nend\n")
+        self.cache_dir = self.temp_dir / 'cache'
+        self.age_files()
+
+    def tearDown(self):
+        """Clean up the test environment"""
+        shutil.rmtree(self.temp_dir)
+
+    def age_files(self):
+        """Move modification times out of the racy window so hashes are memoized"""
+        past = time.time() - 60
+        for dirpath, _, files in os.walk(self.workspace):
+            for name in files:
+                os.utime(os.path.join(dirpath, name), (past, past))
+
+    def compute(self, pod_version='1.16.2', **kwargs):
+        return compute_cache_key(self.app, {'pod': pod_version}, cache_dir=self.cache_dir, **kwargs)
+
+    def test_inputs(self):
+        """Podfile, lockfile, local podspecs, their sources and tool versions are inputs"""
+        self.assertEqual(list(local_pods(self.app)), ['MyLib', 'Tools'])
+        result = self.compute()
+        self.assertEqual(sorted(result['inputs']), [
+            'MyLib:MyLib.podspec', 'MyLib:Sources/MyLib.swift', 'Podfile', 'Podfile.lock',
+            'Tools:Sources/Tools.swift', 'Tools:Tools.podspec', 'tool:pod',
+        ])
+        self.assertIsNone(result['changes'])
+
+    def test_memo_and_stability(self):
+        """Unchanged files are not hashed again and the key does not depend on the location"""
+        first = self.compute()
+        self.assertEqual(first['stats'], {'hashed': 6, 'cached': 0})
+        second = self.compute()
+        self.assertEqual(second['stats'], {'hashed': 0, 'cached': 6})
+        self.assertEqual(second['key'], first['key'])
+        self.assertEqual(second['changes'], [])
+
+        moved = self.temp_dir / 'moved'
+        shutil.copytree(self.workspace, moved)
+        self.assertEqual(compute_cache_key(moved / 'App', {'pod': '1.16.2'})['key'], first['key'])
+
+    def test_change_report(self):
+        """A changed key reports which inputs changed"""
+        first = self.compute()
+        (self.workspace / 'MyLib' / 'Sources' / 'MyLib.swift').write_text('struct MyLib { let x = 1 }\n')
+        (self.workspace / 'Tools' / 'Sources' / 'Extra.h').write_text('// extra\n')
+        (self.workspace / 'Tools' / 'README.md').write_text('still not an input\n')
+        result = self.compute(pod_version='1.15.2')
+        self.assertNotEqual(result['key'], first['key'])
+        self.assertEqual(result['changes'], [('~', 'MyLib:Sources/MyLib.swift'),
+                                             ('+', 'Tools:Sources/Extra.h'), ('~', 'tool:pod')])
+        self.assertNotEqual(self.compute(pod_version='1.15.2', salt='v2')['key'], result['key'])
+
+    def test_command(self):
+        """pod cache-key prints only the key on stdout"""
+        config = mock.MagicMock()
+        config.get.return_value = None
+        config.get_cache_dir.return_value = self.cache_dir
+        pod = f"{sys.executable} -c \"print('1.16.2')\""
+        with mock.patch.dict(os.environ, {'LEE_DEVKIT_POD': pod}), \
+                mock.patch('builtins.print') as mock_print:
+            self.assertTrue(cocoapods.show_cache_key(self.app, config))
+            with mock.patch('sys.stdout.write') as write:
+                self.assertTrue(cocoapods.show_cache_key(self.app, config, output_format='json'))
+        stdout = [call for call in mock_print.call_args_list if 'file' not in call.kwargs]
+        self.assertEqual(len(stdout), 1)
+        key = stdout[0].args[0]
+        self.assertEqual(key, self.compute()['key'])
+        self.assertEqual(json.loads(write.call_args[0][0])['key'], key)
+
+        with mock.patch('builtins.print'):
+            self.assertFalse(cocoapods.show_cache_key(self.temp_dir, config))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Tests for the static CDN spec source generator
+"""
+
+import argparse
+import functools
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+import urllib.request
+from http.server import HTTPServer, SimpleHTTPRequestHandler
+from pathlib import Path
+from unittest import mock
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lee_devkit.commands import pod_repo_push
+from lee_devkit.utils.cdn_index import build_cdn_index, shard_file_name, shard_parts, spec_json_path
+from tests.test_spec_index import add_spec, git
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """Static file handler without request logging"""
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestCDNIndex(unittest.TestCase):
+    """Test the CDN layout, incremental updates and serving it over HTTP"""
+
+    def setUp(self):
+        """Create a spec repository with a few published versions"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.repo = self.temp_dir / 'private'
+        self.repo.mkdir()
+        git(self.repo, 'init', '-q')
+        add_spec(self.repo, 'Core', '1.0.0')
+        add_spec(self.repo, 'Core', '1.10.0')
+        add_spec(self.repo, 'Core', '1.2.0')
+        add_spec(self.repo, 'UI', '0.9.0', {'Core': None}, json_format=True)
+        git(self.repo, 'add', '-A')
+        git(self.repo, 'commit', '-q', '-m', 'Initial specs')
+        self.output = self.temp_dir / 'cdn'
+
+    def tearDown(self):
+        """Clean up the test environment"""
+        shutil.rmtree(self.temp_dir)
+
+    def read(self, rel_path: str) -> str:
+        return (self.output / rel_path).read_text()
+
+    def test_layout(self):
+        """Specs are sharded by the MD5 of the name like trunk"""
+        self.assertEqual(shard_parts('Alamofire'), ['d', 'a', '2'])
+        self.assertEqual(spec_json_path('Alamofire', '5.0.0'), 'Specs/d/a/2/Alamofire/5.0.0/Alamofire.podspec.json')
+
+        stats = build_cdn_index(self.repo, self.output, jobs=2)
+        self.assertEqual((stats['mode'], stats['written'], stats['pods']), ('full', 4, 2))
+        self.assertEqual(self.read(shard_file_name(shard_parts('Core'))), 'Core/1.0.0/1.2.0/1.10.0\n')
+        self.assertEqual(self.read('all_pods.txt'), 'Core\nUI\n')
+        self.assertEqual(self.read('deprecated_podspecs.txt'), '')
+        self.assertIn('prefix_lengths:\n- 1\n- 1\n- 1\n', self.read('CocoaPods-version.yml'))
+        core = json.loads(self.read(spec_json_path('Core', '1.2.0')))
+        self.assertEqual(core['source'], {'git': 'https://example.com/Core.git', 'tag': '1.2.0'})
+        ui = json.loads(self.read(spec_json_path('UI', '0.9.0')))
+        self.assertEqual(ui['dependencies'], {'Core': []})
+
+    def test_incremental(self):
+        """Only specs changed since the last indexed commit are processed"""
+        build_cdn_index(self.repo, self.output, jobs=2)
+        self.assertEqual(build_cdn_index(self.repo, self.output)['mode'], 'unchanged')
+
+        add_spec(self.repo, 'Net', '1.0.0')
+        shutil.rmtree(self.repo / 'Core' / '1.0.0')
+        spec = self.repo / 'UI' / '0.9.0' / 'UI.podspec.json'
+        data = json.loads(spec.read_text())
+        spec.write_text(json.dumps(dict(data, deprecated_in_favor_of='Net')))
+        git(self.repo, 'add', '-A')
+        git(self.repo, 'commit', '-q', '-m', 'Update specs')
+
+        stats = build_cdn_index(self.repo, self.output, jobs=2)
+        self.assertEqual((stats['mode'], stats['written'], stats['removed'], stats['pods']),
+                         ('incremental', 2, 1, 3))
+        self.assertFalse((self.output / spec_json_path('Core', '1.0.0')).parent.exists())
+        self.assertEqual(self.read(shard_file_name(shard_parts('Core'))), 'Core/1.2.0/1.10.0\n')
+        self.assertIn('Net/1.0.0\n', self.read(shard_file_name(shard_parts('Net'))))
+        self.assertEqual(self.read('deprecated_podspecs.txt'), spec_json_path('UI', '0.9.0') + '\n')
+
+        # An incremental run ends up identical to a full rebuild
+        full = self.temp_dir / 'full'
+        build_cdn_index(self.repo, full, full=True)
+        for path in full.rglob('*'):
+            if path.is_file() and path.name != '.lee-devkit-cdn.json':
+                self.assertEqual(path.read_text(), self.read(path.relative_to(full).as_posix()), path)
+
+    def test_dynamic_spec(self):
+        """Specs that depend on ENV are reported instead of published with a guessed value"""
+        spec = self.repo / 'Core' / '1.2.0' / 'Core.podspec'
+        spec.write_text(spec.read_text().replace(
+            "end\n",
+            "  type = ENV['type'] == 'overseas' ? 'Overseas' : 'China'\n"
+            "  s.resource_bundles = { 'Core' => [\"Core/Resources/#{type}/**/*\"] }\n"
+            "end\n"))
+        git(self.repo, 'commit', '-q', '-am', 'Dynamic spec')
+
+        stats = build_cdn_index(self.repo, self.output)
+        self.assertEqual(list(stats['errors']), ['Core/1.2.0/Core.podspec'])
+        self.assertIn('resource_bundles', stats['errors']['Core/1.2.0/Core.podspec'])
+        self.assertFalse((self.output / spec_json_path('Core', '1.2.0')).exists())
+        self.assertEqual(self.read(shard_file_name(shard_parts('Core'))), 'Core/1.0.0/1.10.0\n')
+
+    def test_failed_specs_are_retried(self):
+        """A spec that stops converting is unpublished and retried on the next run"""
+        build_cdn_index(self.repo, self.output)
+        rel = 'Core/1.2.0/Core.podspec'
+        spec = self.repo / rel
+        spec.write_text(spec.read_text().replace("end\n", "  s.dependency 'Baz' if ENV['BAZ']\nend\n"))
+        git(self.repo, 'commit', '-q', '-am', 'Conditional dependency')
+
+        stats = build_cdn_index(self.repo, self.output)
+        self.assertIn('runtime condition', stats['errors'][rel])
+        self.assertFalse((self.output / spec_json_path('Core', '1.2.0')).exists())
+        self.assertEqual(self.read(shard_file_name(shard_parts('Core'))), 'Core/1.0.0/1.10.0\n')
+        self.assertEqual(json.loads(self.read('.lee-devkit-cdn.json'))['retry'], [rel])
+
+        # The failed spec is processed again although the commit did not change
+        stats = build_cdn_index(self.repo, self.output)
+        self.assertEqual((stats['mode'], list(stats['errors'])), ('incremental', [rel]))
+        converted = ('{"name": "Core", "version": "1.2.0"}\n', False)
+        with mock.patch('lee_devkit.utils.cdn_index.convert_spec', return_value=converted) as convert:
+            stats = build_cdn_index(self.repo, self.output)
+        convert.assert_called_once_with(self.repo.resolve() / rel)
+        self.assertEqual((stats['written'], stats['errors']), (1, {}))
+        self.assertEqual(self.read(shard_file_name(shard_parts('Core'))), 'Core/1.0.0/1.2.0/1.10.0\n')
+        self.assertEqual(build_cdn_index(self.repo, self.output)['mode'], 'unchanged')
+
+    def test_serve(self):
+        """The output can be served as-is by a static file server"""
+        build_cdn_index(self.repo, self.output)
+        handler = functools.partial(QuietHandler, directory=str(self.output))
+        server = HTTPServer(('127.0.0.1', 0), handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            base = f"http://127.0.0.1:{server.server_address[1]}/"
+            shard = shard_file_name(shard_parts('UI'))
+            with urllib.request.urlopen(base + shard) as response:
+                self.assertIn('UI/0.9.0\n', response.read().decode())
+            with urllib.request.urlopen(base + spec_json_path('UI', '0.9.0')) as response:
+                self.assertEqual(json.loads(response.read())['name'], 'UI')
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_command(self):
+        """pod-push cdn-index reads a spec repo directory given with --repo"""
+        parser = argparse.ArgumentParser()
+        pod_repo_push.register_arguments(parser)
+        args = parser.parse_args(['cdn-index', str(self.output), '--repo', str(self.repo), '-j', '2'])
+        with mock.patch('builtins.print'):
+            self.assertTrue(pod_repo_push.execute(args, mock.MagicMock()))
+            self.assertFalse(pod_repo_push.cdn_index_command(mock.MagicMock(), str(self.temp_dir / 'none'),
+                                                             repo='Missing'))
+        self.assertTrue((self.output / 'all_pods.txt').is_file())
+        # --full belongs to cdn-index only
+        with self.assertRaises(SystemExit), mock.patch('sys.stderr'):
+            parser.parse_args(['Kit.podspec', '--full'])
+
+        (self.repo / 'Core' / '1.2.0' / 'Core.podspec').write_text('Pod::Spec.new do |s|\n  s.name = (\n')
+        git(self.repo, 'commit', '-q', '-am', 'Break a spec')
+        with mock.patch('builtins.print'):
+            self.assertFalse(pod_repo_push.execute(args, mock.MagicMock()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Tests for the cocoapods command
+"""
+
+import io
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lee_devkit.commands import cocoapods
+from lee_devkit.utils.archive_ops import StreamingArchive
+from lee_devkit.utils.file_ops import FileOperations
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / 'template'
+
+
+class CocoaPodsTestCase(unittest.TestCase):
+    """Base class that points the scaffold at a copy of the bundled template"""
+
+    def setUp(self):
+        """Set up the test environment"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.templates_dir = self.temp_dir / 'template'
+        shutil.copytree(TEMPLATE_DIR, self.templates_dir)
+
+        config = mock.MagicMock()
+        config.get.side_effect = lambda key, default=None: {
+            'author': 'Tester',
+            'email': 'tester@example.com',
+        }.get(key, default)
+        config.config_dir = self.temp_dir
+
+        with mock.patch('lee_devkit.config.Config', return_value=config):
+            self.scaffold = cocoapods.CocoaPodsScaffold()
+        self.scaffold.templates_dir = self.templates_dir
+
+    def tearDown(self):
+        """Clean up the test environment"""
+        shutil.rmtree(self.temp_dir)
+
+    def snapshot(self, root: Path) -> dict:
+        """Map every file under root to its content"""
+        return {
+            path.relative_to(root).as_posix(): path.read_bytes()
+            for path in root.rglob('*') if path.is_file()
+        }
+
+
+class TestCreateArchive(CocoaPodsTestCase):
+    """Test streaming a generated project into an archive"""
+
+    def test_archive_matches_created_project(self):
+        """The archive holds exactly what create_project writes to disk"""
+        out_dir = self.temp_dir / 'out'
+        with mock.patch('builtins.print'):
+            self.assertTrue(self.scaffold.create_project('MyLib', True, str(out_dir)))
+        expected = self.snapshot(out_dir)
+
+        archive = self.temp_dir / 'MyLib.tar.gz'
+        with mock.patch('builtins.print'):
+            self.assertTrue(self.scaffold.create_archive('MyLib', str(archive)))
+
+        with tarfile.open(archive) as tar:
+            actual = {
+                member.name: tar.extractfile(member).read()
+                for member in tar.getmembers() if member.isfile()
+            }
+
+        self.assertEqual(actual, expected)
+        self.assertIn(b"s.name             = 'MyLib'", actual['MyLib/MyLib.podspec'])
+
+    def test_zip_archive(self):
+        """Zip output contains the renamed podspec"""
+        archive = self.temp_dir / 'MyLib.zip'
+        with mock.patch('builtins.print'):
+            self.assertTrue(self.scaffold.create_archive('MyLib', str(archive)))
+
+        with zipfile.ZipFile(archive) as zf:
+            self.assertIn('MyLib/MyLib.podspec', zf.namelist())
+            self.assertNotIn(b'NBTemplateModule', zf.read('MyLib/MyLib.podspec'))
+
+    def test_archive_to_stdout(self):
+        """'-' streams the archive to stdout and keeps messages off it"""
+        buffer = io.BytesIO()
+        fake_stdout = mock.MagicMock(buffer=buffer)
+        with mock.patch('sys.stdout', fake_stdout), mock.patch('sys.stderr', io.StringIO()):
+            self.assertTrue(self.scaffold.create_archive('MyLib', '-', archive_format='tar'))
+
+        buffer.seek(0)
+        with tarfile.open(fileobj=buffer) as tar:
+            self.assertIn('MyLib/MyLib.podspec', tar.getnames())
+        fake_stdout.write.assert_not_called()
+
+    def test_pigz_needs_a_file_descriptor(self):
+        """Streams without a real fileno() use gzip even when pigz is installed"""
+        buffer = io.BytesIO()
+        with mock.patch('lee_devkit.utils.archive_ops.shutil.which', return_value='/usr/bin/pigz'), \
+                mock.patch('lee_devkit.utils.archive_ops.subprocess.Popen') as popen:
+            with StreamingArchive(buffer, 'tar.gz') as archive:
+                archive.add_file('a.txt', io.BytesIO(b'hello'), 5)
+        popen.assert_not_called()
+        buffer.seek(0)
+        with tarfile.open(fileobj=buffer, mode='r:gz') as tar:
+            self.assertEqual(tar.extractfile('a.txt').read(), b'hello')
+
+
+class TestCreateWithGit(CocoaPodsTestCase):
+    """Test writing the first commit with git fast-import"""
+
+    def test_first_commit_matches_files(self):
+        """The commit contains every generated file and the tree is clean"""
+        out_dir = self.temp_dir / 'out'
+        with mock.patch('builtins.print'):
+            self.assertTrue(self.scaffold.create_project(
+                'MyLib', True, str(out_dir), git_init=True,
+                remote_url='git@example.com:me/MyLib.git'
+            ))
+
+        project = out_dir / 'MyLib'
+
+        def git(*args):
+            return subprocess.run(['git', *args], cwd=project, check=True,
+                                  capture_output=True, text=True).stdout
+
+        self.assertEqual(git('branch', '--show-current').strip(), 'main')
+        self.assertEqual(git('status', '--porcelain'), '')
+        self.assertEqual(git('remote', 'get-url', 'origin').strip(), 'git@example.com:me/MyLib.git')
+        committed = set(git('ls-tree', '-r', '--name-only', 'HEAD').split('\n')) - {''}
+        on_disk = {
+            path.relative_to(project).as_posix() for path in project.rglob('*')
+            if path.is_file() and '.git' not in path.relative_to(project).parts
+        }
+        self.assertEqual(committed, on_disk)
+        self.assertIn("s.name             = 'MyLib'", git('show', 'HEAD:MyLib.podspec'))
+        self.assertEqual([p.name for p in out_dir.iterdir()], ['MyLib'])
+
+
+class TestTemplateExtract(CocoaPodsTestCase):
+    """Test extracting a template package from an existing pod"""
+
+    def setUp(self):
+        """Create a small pod to extract from"""
+        super().setUp()
+        self.pod = self.temp_dir / 'MyModule'
+        sources = self.pod / 'MyModule' / 'Sources'
+        sources.mkdir(parents=True)
+        (self.pod / 'MyModule.podspec').write_text("s.name = 'MyModule'\n")
+        (sources / 'MyModuleView.swift').write_text(
+            'let MY_MODULE_KEY = "my_module"\nclass MyModuleView {}\n'
+        )
+        (sources / 'logo.png').write_bytes(b'\x89PNG\0MyModule')
+        (self.pod / 'Pods').mkdir()
+        (self.pod / 'Pods' / 'Manifest.lock').write_text('MyModule')
+
+    def test_extract_and_render(self):
+        """Every case variant becomes a placeholder and renders back"""
+        package = self.temp_dir / 'package'
+        with mock.patch('builtins.print'):
+            self.assertTrue(cocoapods.extract_template(self.pod, 'MyModule', package))
+
+        files = package / 'files'
+        self.assertTrue((files / '{{module_name}}.podspec').exists())
+        self.assertFalse((files / 'Pods').exists())
+        view = files / '{{module_name}}' / 'Sources' / '{{module_name}}View.swift'
+        self.assertEqual(
+            view.read_text(),
+            'let {{module_name_constant}}_KEY = "{{module_name_snake}}"\nclass {{module_name}}View {}\n'
+        )
+
+        out_dir = self.temp_dir / 'out'
+        with mock.patch('builtins.print'):
+            self.assertTrue(self.scaffold.create_project(
+                'OtherKit', True, str(out_dir), template_package=str(package)
+            ))
+        project = out_dir / 'OtherKit'
+        self.assertEqual((project / 'OtherKit.podspec').read_text(), "s.name = 'OtherKit'\n")
+        self.assertEqual(
+            (project / 'OtherKit' / 'Sources' / 'OtherKitView.swift').read_text(),
+            'let OTHER_KIT_KEY = "other_kit"\nclass OtherKitView {}\n'
+        )
+        # Binary content is copied verbatim
+        self.assertEqual((project / 'OtherKit' / 'Sources' / 'logo.png').read_bytes(),
+                         b'\x89PNG\0MyModule')
+
+
+class TestRenameModule(unittest.TestCase):
+    """Test renaming a module inside an existing project"""
+
+    def setUp(self):
+        """Set up a small project tracked by Git"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.project = self.temp_dir / 'OldPod'
+        sources = self.project / 'OldPod' / 'Sources'
+        sources.mkdir(parents=True)
+        (self.project / 'OldPod.podspec').write_text("s.name = 'OldPod'\n")
+        (sources / 'OldPodView.swift').write_text('class OldPodView {}\n')
+        (sources / 'Helper.swift').write_text('struct Helper {}\n')
+        (self.project / 'icon.png').write_bytes(b'\x89PNG\0OldPod')
+
+        self.git('init', '-q')
+        self.git('add', '.')
+        self.git('-c', 'user.name=t', '-c', 'user.email=t@t', 'commit', '-q', '-m', 'init')
+
+    def tearDown(self):
+        """Clean up the test environment"""
+        shutil.rmtree(self.temp_dir)
+
+    def git(self, *args) -> str:
+        return subprocess.run(['git', *args], cwd=self.project, check=True,
+                              capture_output=True, text=True).stdout
+
+    def test_rename_in_git_repo(self):
+        """Paths and contents are rewritten and the index records renames"""
+        with mock.patch('builtins.print'):
+            self.assertTrue(cocoapods.rename_module(self.project, 'OldPod', 'NewPod'))
+
+        sources = self.project / 'NewPod' / 'Sources'
+        self.assertEqual((self.project / 'NewPod.podspec').read_text(), "s.name = 'NewPod'\n")
+        self.assertEqual((sources / 'NewPodView.swift').read_text(), 'class NewPodView {}\n')
+        self.assertEqual((sources / 'Helper.swift').read_text(), 'struct Helper {}\n')
+        # Binary files are left untouched by the pre-scan
+        self.assertEqual((self.project / 'icon.png').read_bytes(), b'\x89PNG\0OldPod')
+
+        tracked = set(self.git('ls-files').split())
+        self.assertIn('NewPod.podspec', tracked)
+        self.assertIn('NewPod/Sources/NewPodView.swift', tracked)
+        self.assertNotIn('OldPod.podspec', tracked)
+        status = self.git('status', '--porcelain')
+        self.assertIn('RM OldPod.podspec -> NewPod.podspec', status)
+
+    def test_dry_run_changes_nothing(self):
+        """--dry-run only reports"""
+        with mock.patch('builtins.print'):
+            self.assertTrue(cocoapods.rename_module(self.project, 'OldPod', 'NewPod', dry_run=True))
+        self.assertTrue((self.project / 'OldPod.podspec').exists())
+        self.assertEqual(self.git('status', '--porcelain'), '')
+
+    def test_stream_replace_across_chunks(self):
+        """Matches spanning chunk boundaries are replaced"""
+        path = self.temp_dir / 'big.txt'
+        path.write_bytes(b'xOldPod' * 1000)
+        count = FileOperations.stream_replace(
+            path, re.compile(re.escape(b'OldPod')), b'NewPod', 6, chunk_size=5
+        )
+        self.assertEqual(count, 1000)
+        self.assertEqual(path.read_bytes(), b'xNewPod' * 1000)
+
+
+class TestArguments(unittest.TestCase):
+    """Test the pod command line"""
+
+    def parse(self, *argv):
+        import argparse
+        parser = argparse.ArgumentParser()
+        cocoapods.register_arguments(parser)
+        return parser.parse_args(list(argv))
+
+    def test_action_is_required(self):
+        """A missing action is a usage error instead of an unknown action"""
+        for argv in ([], ['template']):
+            with self.assertRaises(SystemExit), mock.patch('sys.stderr', new_callable=io.StringIO) as stderr:
+                self.parse(*argv)
+            self.assertIn('required', stderr.getvalue())
+        self.assertEqual(self.parse('rename', 'Old', 'New').action, 'rename')
+
+
+if __name__ == '__main__':
+    unittest.main()
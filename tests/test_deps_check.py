@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Tests for the import vs declared dependency checker
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lee_devkit.commands import cocoapods
+from lee_devkit.utils.deps_check import check_dependencies, module_name, scan_imports
+
+SPEC = """Pod::Spec.new do |s|
+  s.name = 'Kit'
+  s.version = '1.0.0'
+  s.source_files = 'Kit/Sources/**/*.{h,m,swift}'
+  s.frameworks = 'UIKit', 'MapKit'
+  s.vendored_frameworks = 'Vendor/Pay.xcframework'
+  s.dependency 'Alamofire', '~> 5.0'
+  s.dependency 'lottie-ios'
+  s.dependency 'Unused'
+end
+"""
+
+SWIFT = """import UIKit
+@testable import Kit
+@_implementationOnly import Alamofire
+import struct Pay.Order
+// import Commented
+/* import Block */
+#if canImport(Optional)
+import Optional
+#endif
+import Missing
+"""
+
+OBJC = """#import <Foundation/Foundation.h>
+#import "Local.h"
+@import Lottie;
+#import <lottie_ios/lottie_ios.h>
+#include <Network/Network.h>
+#import <objc/runtime.h>
+#include <sys/sysctl.h>
+#import <mach-o/dyld.h>
+#if __has_include(<Maybe/Maybe.h>)
+#import <Maybe/Maybe.h>
+#endif
+"""
+
+
+class TestDepsCheck(unittest.TestCase):
+    """Test import scanning, the dependency report and the scan cache"""
+
+    def setUp(self):
+        """Create a pod with Swift and Objective-C sources"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.pod = self.temp_dir / 'Kit'
+        sources = self.pod / 'Kit' / 'Sources'
+        sources.mkdir(parents=True)
+        (sources / 'A.swift').write_text(SWIFT)
+        (sources / 'B.m').write_text(OBJC)
+        (sources / 'Notes.md').write_text('import NotSource\n')
+        (self.pod / 'Kit.podspec').write_text(SPEC)
+        self.cache_dir = self.temp_dir / 'cache'
+
+    def tearDown(self):
+        """Clean up the test environment"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_scan_imports(self):
+        """Swift and Objective-C import forms are recognised, comments are ignored"""
+        self.assertEqual(scan_imports(SWIFT, swift=True),
+                         (['Alamofire', 'Kit', 'Missing', 'Optional', 'Pay', 'UIKit'], ['Optional']))
+        self.assertEqual(scan_imports(OBJC, swift=False),
+                         (['Foundation', 'Lottie', 'Maybe', 'Network', 'lottie_ios', 'mach-o', 'objc', 'sys'],
+                          ['Maybe']))
+        # Comment markers inside string literals do not start a comment
+        text = 'let url = "https://example.com" // import Trailing\nlet glob = "Sources/*.swift"\nimport Real /* note */\n'
+        self.assertEqual(scan_imports(text, swift=True), (['Real'], []))
+        text = 'NSString *glob = @"Sources/*.h";\nchar c = \'"\';\n@import Real;\n/* @import Gone; */\n'
+        self.assertEqual(scan_imports(text, swift=False), (['Real'], []))
+        self.assertEqual(module_name('lottie-ios'), 'lottie_ios')
+        self.assertEqual(module_name('Firebase/Core'), 'Firebase')
+
+    def test_report(self):
+        """Missing and unused dependencies are reported, SDK headers such as <objc/runtime.h> are not"""
+        result = check_dependencies(self.pod / 'Kit.podspec')
+        self.assertEqual(result['module'], 'Kit')
+        self.assertEqual(result['files'], 2)
+        self.assertEqual(result['missing'], {'Lottie': ['Kit/Sources/B.m'], 'Missing': ['Kit/Sources/A.swift']})
+        self.assertEqual(result['unused'], ['Unused'])
+        self.assertEqual(result['unused_frameworks'], ['MapKit'])
+
+        mapped = check_dependencies(self.pod / 'Kit.podspec', module_map={'lottie-ios': 'Lottie'})
+        self.assertEqual(list(mapped['missing']), ['Missing'])
+        self.assertEqual(mapped['unused'], ['Unused'])
+
+    def test_test_specs(self):
+        """Test spec sources and dependencies are not treated as the library's"""
+        tests = self.pod / 'Kit' / 'Tests'
+        tests.mkdir()
+        (tests / 'KitSpec.swift').write_text('import Quick\nimport Nimble\n')
+        (self.pod / 'Kit.podspec').write_text(SPEC.replace(
+            "end\n", "  s.test_spec 'Tests' do |t|\n    t.source_files = 'Kit/Tests/*.swift'\n"
+                     "    t.dependency 'Quick'\n  end\nend\n"))
+        result = check_dependencies(self.pod / 'Kit.podspec')
+        self.assertEqual(result['files'], 2)
+        self.assertEqual(list(result['missing']), ['Lottie', 'Missing'])
+        self.assertEqual(result['unused'], ['Unused'])
+
+    def test_cache(self):
+        """Only files whose content changed are scanned again"""
+        first = check_dependencies(self.pod / 'Kit.podspec', cache_dir=self.cache_dir)
+        self.assertEqual(first['stats'], {'scanned': 2, 'cached': 0})
+        second = check_dependencies(self.pod / 'Kit.podspec', cache_dir=self.cache_dir)
+        self.assertEqual(second['stats'], {'scanned': 0, 'cached': 2})
+        self.assertEqual(second['missing'], first['missing'])
+
+        (self.pod / 'Kit' / 'Sources' / 'A.swift').write_text(SWIFT.replace('import Missing\n', ''))
+        third = check_dependencies(self.pod / 'Kit.podspec', cache_dir=self.cache_dir)
+        self.assertEqual(third['stats'], {'scanned': 1, 'cached': 1})
+        self.assertEqual(list(third['missing']), ['Lottie'])
+
+    def test_cache_key_includes_language(self):
+        """Identical Swift and Objective-C files are scanned with their own syntax"""
+        sources = self.pod / 'Kit' / 'Sources'
+        (sources / 'Same.swift').write_text('import Missing\n@import Lottie;\n')
+        (sources / 'Same.m').write_text('import Missing\n@import Lottie;\n')
+        first = check_dependencies(self.pod / 'Kit.podspec', cache_dir=self.cache_dir)
+        self.assertEqual(first['stats'], {'scanned': 4, 'cached': 0})
+        self.assertEqual(first['missing'], {'Lottie': ['Kit/Sources/B.m', 'Kit/Sources/Same.m'],
+                                            'Missing': ['Kit/Sources/A.swift', 'Kit/Sources/Same.swift']})
+        second = check_dependencies(self.pod / 'Kit.podspec', cache_dir=self.cache_dir)
+        self.assertEqual(second['stats'], {'scanned': 0, 'cached': 4})
+        self.assertEqual(second['missing'], first['missing'])
+
+    def test_command(self):
+        """pod deps-check fails when a dependency is missing"""
+        config = mock.MagicMock()
+        config.get_cache_dir.return_value = self.cache_dir
+        with mock.patch('builtins.print'):
+            self.assertFalse(cocoapods.check_pod_dependencies(self.pod, config))
+            self.assertFalse(cocoapods.check_pod_dependencies(self.pod, config, module_map=['bad']))
+        (self.pod / 'Kit' / 'Sources' / 'A.swift').write_text('import Alamofire\n')
+        with mock.patch('sys.stdout.write') as write:
+            self.assertTrue(cocoapods.check_pod_dependencies(self.pod, config, output_format='json',
+                                                             module_map=['lottie-ios=Lottie']))
+        result = json.loads(write.call_args[0][0])[str(self.pod / 'Kit.podspec')]
+        self.assertEqual(result['missing'], {})
+
+
+if __name__ == '__main__':
+    unittest.main()
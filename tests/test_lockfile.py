@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Tests for the Podfile.lock parser and the lockfile commands
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lee_devkit.commands import cocoapods
+from lee_devkit.utils.lockfile import Lockfile, LockfileError, analyze_lockfiles, compare_lockfiles
+
+LOCKFILE = """PODS:
+  - Alamofire (5.8.0)
+  - "Firebase/Core (10.0.0)":
+    - FirebaseAnalytics (= 10.0.0)
+  - Core (1.0.0)
+  - Net (1.2.0):
+    - Alamofire (~> 5.0)
+    - "Firebase/Core"
+
+DEPENDENCIES:
+  - Alamofire (~> 5.0)
+  - Net (~> 1.0)
+  - MyApp (from `../`)
+
+SPEC REPOS:
+  trunk:
+    - Alamofire
+    - Firebase
+  "git@example.com:Specs.git":
+    - Core
+    - Net
+
+EXTERNAL SOURCES:
+  MyApp:
+    :path: "../"
+
+SPEC CHECKSUMS:
+  Alamofire: 1111
+  Core: 2222
+  Net: 3333
+
+PODFILE CHECKSUM: 1850aaed907e0295d81201e2a4b0e5b2339ee42d
+
+COCOAPODS: 1.16.2
+"""
+
+
+def write_project(root: Path, lockfile: str, manifest: str = None) -> Path:
+    """Write a Podfile.lock and optionally a Pods/Manifest.lock"""
+    root.mkdir(parents=True, exist_ok=True)
+    (root / 'Podfile.lock').write_text(lockfile)
+    if manifest is not None:
+        (root / 'Pods').mkdir(exist_ok=True)
+        (root / 'Pods' / 'Manifest.lock').write_text(manifest)
+    return root / 'Podfile.lock'
+
+
+class TestLockfile(unittest.TestCase):
+    """Test parsing, comparing and bulk analysis of lockfiles"""
+
+    def setUp(self):
+        """Create a temporary directory"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        """Clean up the test environment"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_parse(self):
+        """Pods, dependencies, spec repos and checksums are extracted"""
+        lockfile = Lockfile.parse(LOCKFILE.splitlines(True))
+        self.assertEqual(lockfile.pods, {'Alamofire': '5.8.0', 'Firebase/Core': '10.0.0',
+                                         'Core': '1.0.0', 'Net': '1.2.0'})
+        self.assertEqual(lockfile.pod_dependencies['Net'], ['Alamofire (~> 5.0)', 'Firebase/Core'])
+        self.assertEqual(lockfile.spec_repos['git@example.com:Specs.git'], ['Core', 'Net'])
+        self.assertEqual(lockfile.repo_for('Firebase/Core'), 'trunk')
+        self.assertEqual(lockfile.external_sources, {'MyApp': {':path': '../'}})
+        self.assertEqual(lockfile.checksums['Net'], '3333')
+        self.assertEqual(lockfile.cocoapods_version, '1.16.2')
+        self.assertIn('Firebase', lockfile.root_pods)
+
+    def test_template_lockfile(self):
+        """The lockfile shipped with the template parses"""
+        path = Path(__file__).parent.parent / 'template' / 'Example' / 'Podfile.lock'
+        lockfile = Lockfile.from_file(path)
+        self.assertEqual(lockfile.pods, {'NBTemplateModule': '0.1.0'})
+        self.assertTrue(lockfile.is_external('NBTemplateModule'))
+
+    def test_invalid(self):
+        """Malformed content raises LockfileError"""
+        with self.assertRaises(LockfileError):
+            Lockfile.parse(["PODS:\n", "  - A (1.0)\n", "  B: 1\n"])
+
+    def test_compare(self):
+        """Version, checksum, added and removed pods are reported"""
+        expected = Lockfile.parse(LOCKFILE.splitlines(True))
+        installed = Lockfile.parse(LOCKFILE.replace('Core (1.0.0)', 'Core (0.9.0)')
+                                   .replace('Net: 3333', 'Net: 4444')
+                                   .replace('  - Alamofire (5.8.0)\n', '')
+                                   .replace('PODS:\n', 'PODS:\n  - Old (1.0)\n').splitlines(True))
+        self.assertEqual(compare_lockfiles(expected, installed), [
+            ('+', 'Alamofire', '5.8.0'),
+            ('~', 'Core', '0.9.0 -> 1.0.0'),
+            ('~', 'Net', '校验和不同'),
+            ('-', 'Old', '1.0'),
+        ])
+        self.assertEqual(compare_lockfiles(expected, expected), [])
+
+    def test_analyze(self):
+        """Bulk analysis reports version drift, stale sandboxes and errors"""
+        write_project(self.temp_dir / 'a', LOCKFILE, LOCKFILE)
+        write_project(self.temp_dir / 'b', LOCKFILE.replace('Core (1.0.0)', 'Core (1.1.0)'), LOCKFILE)
+        write_project(self.temp_dir / 'c', "PODS:\n  - A (1.0)\n  B: 1\n")
+        paths = [self.temp_dir / name / 'Podfile.lock' for name in 'abc']
+
+        report = analyze_lockfiles(paths, jobs=2)
+        self.assertEqual(list(report['drift']), ['Core'])
+        self.assertEqual(sorted(report['drift']['Core']), ['1.0.0', '1.1.0'])
+        self.assertEqual([item['stale'] for item in report['lockfiles']], [False, True])
+        self.assertEqual(list(report['errors']), [str(paths[2])])
+
+        with mock.patch('builtins.print'):
+            self.assertFalse(cocoapods.analyze_lockfiles_command([str(self.temp_dir)]))
+            shutil.rmtree(self.temp_dir / 'c')
+            self.assertTrue(cocoapods.analyze_lockfiles_command([str(self.temp_dir)]))
+
+    def test_check_sandbox(self):
+        """pod check fails when Manifest.lock is missing or differs"""
+        project = self.temp_dir / 'app'
+        write_project(project, LOCKFILE)
+        with mock.patch('builtins.print'):
+            self.assertFalse(cocoapods.check_sandbox(project))
+            write_project(project, LOCKFILE, LOCKFILE)
+            self.assertTrue(cocoapods.check_sandbox(project))
+            write_project(project, LOCKFILE, LOCKFILE.replace('5.8.0', '5.7.0'))
+            self.assertFalse(cocoapods.check_sandbox(project / 'Podfile.lock'))
+
+    def test_outdated(self):
+        """Newer versions in the local spec repos are reported offline"""
+        repos_dir = self.temp_dir / 'repos'
+        repo = repos_dir / 'Private'
+        for name, version in (('Core', '1.0.0'), ('Core', '1.3.0'), ('Core', '2.0.0-beta'), ('Net', '1.2.0')):
+            spec_dir = repo / name / version
+            spec_dir.mkdir(parents=True)
+            (spec_dir / f'{name}.podspec.json').write_text(json.dumps({'name': name, 'version': version}))
+        env = {'GIT_AUTHOR_NAME': 't', 'GIT_AUTHOR_EMAIL': 't@example.com',
+               'GIT_COMMITTER_NAME': 't', 'GIT_COMMITTER_EMAIL': 't@example.com'}
+        for args in (['init', '-q'], ['add', '-A'], ['commit', '-q', '-m', 'specs']):
+            subprocess.run(['git', *args], cwd=repo, check=True, env={**os.environ, **env})
+
+        config = mock.MagicMock()
+        config.get_cache_dir.return_value = self.temp_dir / 'cache'
+        config.get_spec_repos.return_value = {'Private': 'git@example.com:Specs.git'}
+        project = self.temp_dir / 'app'
+        write_project(project, LOCKFILE)
+
+        with mock.patch.dict(os.environ, {'CP_REPOS_DIR': str(repos_dir)}), \
+                mock.patch('sys.stdout.write') as write:
+            self.assertTrue(cocoapods.show_outdated(project, config, output_format='json'))
+        rows = {row['pod']: row for row in json.loads(write.call_args[0][0])}
+        self.assertEqual(rows['Core']['latest'], '1.3.0')
+        self.assertEqual(rows['Core']['status'], 'outdated')
+        self.assertEqual(rows['Net']['status'], 'current')
+        self.assertEqual(rows['Alamofire']['status'], 'unknown')
+        self.assertNotIn('MyApp', rows)
+
+
+if __name__ == '__main__':
+    unittest.main()
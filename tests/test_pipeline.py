@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests for the pipeline utilities and the post-create steps
+"""
+
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lee_devkit.commands import cocoapods
+from lee_devkit.utils.pipeline import Pipeline, PipelineStep
+
+
+def write_stub(path: Path, marker: Path) -> Path:
+    """Create an executable stand-in that records its arguments and cwd"""
+    path.write_text(
+        f"#!{sys.executable}\n"
+        "import os, sys\n"
+        f"with open({str(marker)!r}, 'a') as f:\n"
+        "    f.write(os.getcwd() + ' ' + ' '.join(sys.argv[1:]) + '\\n')\n"
+    )
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return path
+
+
+class TestPipeline(unittest.TestCase):
+    """Test the dependency-aware pipeline"""
+
+    def test_independent_steps_run_concurrently(self):
+        """Two steps without dependencies overlap in time"""
+        barrier = threading.Barrier(2, timeout=5)
+        steps = [
+            PipelineStep('a', lambda: barrier.wait() is not None),
+            PipelineStep('b', lambda: barrier.wait() is not None),
+        ]
+        with mock.patch('builtins.print'):
+            results = Pipeline(steps).run()
+        self.assertTrue(all(result.success for result in results.values()))
+
+    def test_dependencies_and_failures(self):
+        """Dependents wait for their dependencies and are skipped on failure"""
+        order = []
+        steps = [
+            PipelineStep('build', lambda: order.append('build') or True),
+            PipelineStep('test', lambda: order.append('test') or False, depends_on=['build']),
+            PipelineStep('deploy', lambda: order.append('deploy') or True, depends_on=['test']),
+        ]
+        with mock.patch('builtins.print'):
+            results = Pipeline(steps).run()
+
+        self.assertEqual(order, ['build', 'test'])
+        self.assertTrue(results['build'].success)
+        self.assertFalse(results['test'].success)
+        self.assertTrue(results['deploy'].skipped)
+
+    def test_cycle_detection(self):
+        """Cyclic dependencies are rejected up front"""
+        steps = [
+            PipelineStep('a', lambda: True, depends_on=['b']),
+            PipelineStep('b', lambda: True, depends_on=['a']),
+        ]
+        with self.assertRaises(ValueError):
+            Pipeline(steps)
+
+
+class TestPostCreate(unittest.TestCase):
+    """Test the post-create pipeline with local stand-ins for external tools"""
+
+    def setUp(self):
+        """Create a project directory and tool stubs"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.project = self.temp_dir / 'MyLib'
+        (self.project / 'Example').mkdir(parents=True)
+        (self.project / 'Example' / 'Podfile').write_text("pod 'MyLib', :path => '../'\n")
+        (self.project / 'MyLib.podspec').write_text("s.name = 'MyLib'\n")
+        self.marker = self.temp_dir / 'calls.txt'
+
+        self.config = mock.MagicMock()
+        self.config.get.side_effect = lambda key, default=None: default
+
+        env = {
+            'LEE_DEVKIT_POD': str(write_stub(self.temp_dir / 'pod', self.marker)),
+            'LEE_DEVKIT_EDITOR': str(write_stub(self.temp_dir / 'editor', self.marker)),
+            'GIT_AUTHOR_NAME': 'Tester', 'GIT_AUTHOR_EMAIL': 'tester@example.com',
+            'GIT_COMMITTER_NAME': 'Tester', 'GIT_COMMITTER_EMAIL': 'tester@example.com',
+        }
+        patcher = mock.patch.dict(os.environ, env)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Clean up the test environment"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_all_steps(self):
+        """pod install runs in Example, the editor opens the project, git commits"""
+        steps = cocoapods.parse_post_create_steps('all')
+        with mock.patch('builtins.print'):
+            self.assertTrue(cocoapods.run_post_create(self.project, steps, self.config))
+
+        calls = self.marker.read_text().splitlines()
+        self.assertIn(f"{self.project / 'Example'} install", calls)
+        self.assertIn(f"{self.project} {self.project}", calls)
+        self.assertTrue((self.project / '.git').exists())
+
+    def test_unknown_step(self):
+        """Unknown step names are reported"""
+        with self.assertRaises(ValueError):
+            cocoapods.parse_post_create_steps('git,deploy')
+
+
+if __name__ == '__main__':
+    unittest.main()
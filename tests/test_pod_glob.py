@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-process podspec file pattern evaluator
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lee_devkit.commands import cocoapods
+from lee_devkit.utils.pod_glob import (FileTree, compile_glob, compile_patterns, evaluate_podspec,
+                                       expand_braces, glob_issues, resolve_patterns)
+from lee_devkit.utils.podspec import Podspec
+
+SPEC = """Pod::Spec.new do |s|
+  s.name = 'Kit'
+  s.version = '1.0.0'
+  s.source_files = 'Kit/Sources/**/*.{h,m,swift}'
+  s.exclude_files = 'Kit/Sources/Legacy'
+  type = ENV['type'] == 'overseas' ? 'Overseas' : 'China'
+  s.resource_bundles = {
+    'Kit' => ["Kit/Resources/#{type}/**/*.*"]
+  }
+  s.subspec 'Core' do |ss|
+    ss.source_files = 'Kit/Core'
+    ss.public_header_files = 'Kit/Core/Public/*.h'
+  end
+end
+"""
+
+
+def touch(root: Path, *paths: str, size: int = 0):
+    """Create files with the given size"""
+    for rel in paths:
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b'x' * size)
+
+
+class TestPodGlob(unittest.TestCase):
+    """Test glob semantics, per-variant reports and the pod files command"""
+
+    def setUp(self):
+        """Create a pod with sources, resources and a second variant"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.pod = self.temp_dir / 'Kit'
+        touch(self.pod,
+              'Kit/Sources/A.swift', 'Kit/Sources/Nested/B.M', 'Kit/Sources/README.md',
+              'Kit/Sources/.hidden/C.swift', 'Kit/Sources/Legacy/Old.m',
+              'Kit/Core/Core.h', 'Kit/Core/Core.m', 'Kit/Core/Deep/Skipped.m', 'Kit/Core/Public/Core.h')
+        touch(self.pod, 'Kit/Resources/China/logo.png', 'Kit/Resources/China/Images.xcassets/Contents.json',
+              size=100)
+        (self.pod / 'Kit.podspec').write_text(SPEC)
+
+    def tearDown(self):
+        """Clean up the test environment"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_glob_semantics(self):
+        """Globs follow File.fnmatch with FNM_PATHNAME and FNM_CASEFOLD"""
+        self.assertEqual(expand_braces('a/{b,c{d,e}}/*.{h,m}'),
+                         ['a/b/*.h', 'a/b/*.m', 'a/cd/*.h', 'a/cd/*.m', 'a/ce/*.h', 'a/ce/*.m'])
+        self.assertTrue(compile_glob('Sources/**/*.swift').fullmatch('Sources/A.swift'))
+        self.assertTrue(compile_glob('Sources/**/*.swift').fullmatch('sources/x/y/A.SWIFT'))
+        self.assertFalse(compile_glob('Sources/**/*.swift').fullmatch('Sources/.x/A.swift'))
+        self.assertFalse(compile_glob('Sources/*.swift').fullmatch('Sources/x/A.swift'))
+        self.assertFalse(compile_glob('*').fullmatch('.DS_Store'))
+        self.assertTrue(compile_glob('File[0-9]?.[!m]').fullmatch('File1a.h'))
+        self.assertFalse(compile_glob('File[0-9]?.[!m]').fullmatch('File1a.m'))
+        matcher = compile_patterns(['./Sources/*.{h,m}', 'Assets/'])
+        self.assertTrue(matcher.fullmatch('Sources/A.m') and matcher.fullmatch('Assets'))
+        self.assertFalse(matcher.fullmatch('Sources/A.swift'))
+        self.assertIsNone(compile_patterns([]))
+
+        tree = FileTree(self.pod)
+        self.assertEqual(tree.match('Kit/Core', dir_pattern='*.{h,m}'), ['Kit/Core/Core.h', 'Kit/Core/Core.m'])
+        self.assertEqual(tree.match('Kit/Resources/*/*.xcassets', include_dirs=True),
+                         ['Kit/Resources/China/Images.xcassets'])
+        self.assertEqual(tree.match('Kit/Resources/*/*.xcassets'), [])
+        self.assertEqual(resolve_patterns(self.pod, ['Kit/Resources/China/*.xcassets', './Kit/Core/*.h']),
+                         ['Kit/Core/Core.h', 'Kit/Resources/China/Images.xcassets/Contents.json'])
+
+    def test_evaluate(self):
+        """Every pattern is resolved per variant with exclusions, unmatched files and bundle sizes"""
+        report = evaluate_podspec(Podspec.from_file(self.pod / 'Kit.podspec'))
+        self.assertEqual(report.variants, ['type=Overseas', 'type=China'])
+        matches = {(m.spec, m.attribute, m.variant): m.files for m in report.matches}
+        self.assertEqual(matches[('Kit', 'source_files', '')], ['Kit/Sources/A.swift', 'Kit/Sources/Nested/B.M'])
+        self.assertEqual(matches[('Kit/Core', 'source_files', '')], ['Kit/Core/Core.h', 'Kit/Core/Core.m'])
+        self.assertEqual(matches[('Kit', 'resource_bundles', 'type=Overseas')], [])
+        self.assertEqual(matches[('Kit', 'resource_bundles', 'type=China')],
+                         ['Kit/Resources/China/Images.xcassets', 'Kit/Resources/China/Images.xcassets/Contents.json',
+                          'Kit/Resources/China/logo.png'])
+        self.assertEqual(report.unmatched, ['Kit/Core/Deep/Skipped.m', 'Kit/Sources/README.md'])
+        self.assertEqual(report.bundles, {'type=Overseas': {'Kit': (0, 0)}, 'type=China': {'Kit': (2, 200)}})
+
+        issues = glob_issues(report)
+        self.assertEqual([issue.level for issue in issues], ['warning'])
+        self.assertIn('type=Overseas', issues[0].message)
+
+    def test_command(self):
+        """pod files fails when a pattern matches nothing in every variant"""
+        with mock.patch('builtins.print'):
+            self.assertTrue(cocoapods.show_pod_files(self.pod))
+        shutil.rmtree(self.pod / 'Kit' / 'Core')
+        with mock.patch('builtins.print'), mock.patch('sys.stdout.write') as write:
+            self.assertFalse(cocoapods.show_pod_files(self.pod / 'Kit.podspec', output_format='json'))
+        data = json.loads(write.call_args[0][0])[str(self.pod / 'Kit.podspec')]
+        self.assertEqual(sorted({item['attribute'] for item in data['empty']}),
+                         ['public_header_files', 'resource_bundles', 'source_files'])
+
+    def test_large_tree(self):
+        """A pod with 10k files is evaluated in a single quick walk"""
+        for module in range(10):
+            directory = self.pod / 'Kit' / 'Sources' / f'M{module}'
+            directory.mkdir(parents=True)
+            for index in range(1000):
+                (directory / f'F{index}.{"swift" if index % 2 else "png"}').touch()
+        spec = Podspec.from_file(self.pod / 'Kit.podspec')
+        start = time.perf_counter()
+        report = evaluate_podspec(spec)
+        elapsed = time.perf_counter() - start
+        self.assertEqual(len(report.matches[0].files), 5002)
+        self.assertEqual(len(report.unmatched), 5002)
+        self.assertLess(elapsed, 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Tests for the podspec dependency graph
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lee_devkit.commands import cocoapods
+from lee_devkit.utils.pod_graph import PodGraph, discover_podspecs
+
+
+def write_pod(root: Path, name: str, dependencies=(), subspecs=(), attributes=()) -> Path:
+    """Write root/<name>/<name>.podspec with extra attribute lines, dependencies and subspecs
+
+    Shared by the test modules that need a tree of local pods.
+    """
+    lines = [
+        "Pod::Spec.new do |s|",
+        f"  s.name = '{name}'",
+        "  s.version = '1.0.0'",
+    ]
+    lines += [f"  s.{attribute}" for attribute in attributes]
+    lines += [f"  s.dependency '{dep}'" for dep in dependencies]
+    for sub_name, sub_deps in subspecs:
+        lines.append(f"  s.subspec '{sub_name}' do |ss|")
+        lines += [f"    ss.dependency '{dep}'" for dep in sub_deps]
+        lines.append("  end")
+    lines.append("end")
+    path = root / name / f"{name}.podspec"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+class TestPodGraph(unittest.TestCase):
+    """Test discovery, analysis, export and caching of the pod graph"""
+
+    def setUp(self):
+        """Create a small workspace of pods"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.root = self.temp_dir / 'pods'
+        self.cache_dir = self.temp_dir / 'cache'
+        write_pod(self.root, 'Core', ['Alamofire'])
+        write_pod(self.root, 'Net', ['Core/Base'])
+        write_pod(self.root, 'UI', subspecs=[('Views', ['Core']), ('Net', ['Net', 'SnapKit'])])
+        write_pod(self.root, 'App', ['UI/Views', 'Net'])
+        write_pod(self.root / 'App' / 'Pods', 'Vendored')
+
+    def tearDown(self):
+        """Clean up the test environment"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_discovery_skips_pods(self):
+        """Podspecs inside Pods directories are ignored"""
+        names = sorted(path.name for path in discover_podspecs(self.root))
+        self.assertEqual(names, ['App.podspec', 'Core.podspec', 'Net.podspec', 'UI.podspec'])
+
+    def test_analysis(self):
+        """Levels, reverse dependencies and external dependencies"""
+        graph = PodGraph.build(self.root)
+        self.assertEqual(graph.levels(), [['Core'], ['Net'], ['UI'], ['App']])
+        self.assertEqual(graph.reverse_dependencies('Core'), ['Net', 'UI'])
+        self.assertEqual(graph.reverse_dependencies('Core', transitive=True), ['App', 'Net', 'UI'])
+        self.assertEqual(graph.dependencies('App', transitive=True), ['Core', 'Net', 'UI'])
+        self.assertEqual(list(graph.external_dependencies('UI')), ['SnapKit'])
+        self.assertEqual(graph.find_cycles(), [])
+
+    def test_cycles(self):
+        """Cycles are reported and excluded from the levels"""
+        write_pod(self.root, 'Core', ['App'])
+        graph = PodGraph.build(self.root)
+        self.assertEqual(graph.find_cycles(), [['App', 'Core', 'Net', 'UI']])
+        self.assertEqual(graph.levels(), [])
+
+    def test_exports(self):
+        """DOT and JSON exports contain the internal edges"""
+        graph = PodGraph.build(self.root)
+        dot = graph.to_dot(include_external=True)
+        self.assertIn('"App" -> "UI";', dot)
+        self.assertIn('"UI" -> "SnapKit" [style=dotted];', dot)
+
+        data = json.loads(json.dumps(graph.to_json()))
+        self.assertEqual(data['pods']['Core']['dependents'], ['Net', 'UI'])
+        self.assertEqual(data['pods']['UI']['subspecs'], ['UI/Views', 'UI/Net'])
+
+    def test_mtime_cache(self):
+        """Unchanged podspecs are not parsed again"""
+        graph = PodGraph.build(self.root, cache_dir=self.cache_dir)
+        self.assertEqual(graph.stats, {'parsed': 4, 'cached': 0})
+
+        graph = PodGraph.build(self.root, cache_dir=self.cache_dir)
+        self.assertEqual(graph.stats, {'parsed': 0, 'cached': 4})
+
+        write_pod(self.root, 'Net', ['Core', 'Moya'])
+        graph = PodGraph.build(self.root, cache_dir=self.cache_dir)
+        self.assertEqual(graph.stats, {'parsed': 1, 'cached': 3})
+        self.assertEqual(list(graph.external_dependencies('Net')), ['Moya'])
+
+        shutil.rmtree(self.root / 'App')
+        graph = PodGraph.build(self.root, cache_dir=self.cache_dir)
+        self.assertNotIn('App', graph.nodes)
+
+    def test_discovery_cache(self):
+        """The podspec list is reused until a directory changes"""
+        self.assertEqual(PodGraph.build(self.root, cache_dir=self.cache_dir).discovery, 'walked')
+        graph = PodGraph.build(self.root, cache_dir=self.cache_dir)
+        self.assertEqual((graph.discovery, len(graph.nodes)), ('cached', 4))
+
+        write_pod(self.root / 'Nested', 'Extra')
+        graph = PodGraph.build(self.root, cache_dir=self.cache_dir)
+        self.assertEqual(graph.discovery, 'walked')
+        self.assertIn('Extra', graph.nodes)
+
+    def test_command(self):
+        """pod graph writes exports and fails on cycles"""
+        config = mock.MagicMock()
+        config.get_cache_dir.return_value = self.cache_dir
+        output = self.temp_dir / 'graph.json'
+        with mock.patch('builtins.print'):
+            self.assertTrue(cocoapods.show_pod_graph(self.root, config, 'json', str(output)))
+            self.assertIn('App', json.loads(output.read_text())['pods'])
+
+            write_pod(self.root, 'Core', ['App'])
+            self.assertFalse(cocoapods.show_pod_graph(self.root, config))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,7 +3,9 @@
 Tests for the pod_repo_push command
 """
 
+import json
 import os
+import subprocess
 import unittest
 from unittest import mock
 from pathlib import Path
@@ -241,5 +243,495 @@ class TestPodRepoPush(unittest.TestCase):
         mock_print.assert_called()
 
 
+POD_STUB = """#!{python}
+import os, sys
+if sys.argv[1:] == ['--version']:
+    print('1.15.2')
+    sys.exit(0)
+with open({marker!r}, 'a') as f:
+    f.write(' '.join(sys.argv[1:]) + '\\n')
+if sys.argv[1:3] == ['spec', 'lint']:
+    # STUB_LINT_FAIL_ARG fails the lint jobs that were given this argument
+    fail = os.environ.get('STUB_LINT_FAIL_ARG')
+    if fail and fail in sys.argv:
+        print('    - ERROR | [' + fail + '] xcodebuild: Returned an unsuccessful exit code.')
+        print('    - WARN  | summary: The summary is not meaningful.')
+        sys.exit(1)
+    print(os.environ.get('STUB_LINT_OUTPUT', ''))
+    sys.exit(int(os.environ.get('STUB_LINT_RC', '0')))
+if sys.argv[1:3] == ['repo', 'push']:
+    # STUB_PUSH_FAIL="Pod:times:message;..." fails the first pushes of a pod
+    name = os.path.basename(sys.argv[4]).split('.')[0]
+    for rule in filter(None, os.environ.get('STUB_PUSH_FAIL', '').split(';')):
+        pod, times, message = rule.split(':', 2)
+        counter = {marker!r} + '.' + pod
+        failures = int(open(counter).read()) if os.path.exists(counter) else 0
+        if pod == name and failures < int(times):
+            open(counter, 'w').write(str(failures + 1))
+            print(message)
+            sys.exit(1)
+"""
+
+
+def write_podspec(path: Path, name: str, dependencies=()):
+    """Write a minimal valid podspec"""
+    lines = [
+        "Pod::Spec.new do |s|",
+        f"  s.name = '{name}'",
+        "  s.version = '1.0.0'",
+        f"  s.summary = '{name} library'",
+        "  s.homepage = 'https://example.com'",
+        "  s.license = { :type => 'MIT' }",
+        "  s.author = { 'Tester' => 'tester@example.com' }",
+        f"  s.source = {{ :git => 'https://example.com/{name}.git', :tag => s.version.to_s }}",
+        f"  s.source_files = '{name}/Sources/**/*.{{h,m,swift}}'",
+    ]
+    lines += [f"  s.dependency '{dep}'" for dep in dependencies]
+    lines.append("end")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+class PodStubTestCase(unittest.TestCase):
+    """Base class providing a pod with sources and a stub pod executable"""
+
+    def setUp(self):
+        """Create a pod with sources and a stub pod executable"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.pod_dir = self.temp_dir / 'MyLib'
+        (self.pod_dir / 'MyLib' / 'Sources').mkdir(parents=True)
+        self.source = self.pod_dir / 'MyLib' / 'Sources' / 'MyLib.swift'
+        self.source.write_text('public struct MyLib {}\n')
+        (self.pod_dir / 'README.md').write_text('unrelated\n')
+        self.podspec = write_podspec(self.pod_dir / 'MyLib.podspec', 'MyLib')
+
+        self.marker = self.temp_dir / 'lint_calls.txt'
+        pod = self.temp_dir / 'pod'
+        pod.write_text(POD_STUB.format(python=sys.executable, marker=str(self.marker)))
+        pod.chmod(0o755)
+        patcher = mock.patch.dict(os.environ, {'LEE_DEVKIT_POD': str(pod)})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.config = mock.MagicMock(spec=Config)
+        self.config.get.return_value = None
+        self.config.get_cache_dir.return_value = self.temp_dir / 'cache'
+
+    def tearDown(self):
+        """Clean up the test environment"""
+        shutil.rmtree(self.temp_dir)
+
+    def lint_count(self) -> int:
+        return len(self.marker.read_text().splitlines()) if self.marker.exists() else 0
+
+    def validate(self, options=None, use_cache=True, assume_yes=False) -> bool:
+        with mock.patch('builtins.print'):
+            return pod_repo_push.validate_podspec_file(
+                str(self.podspec), options, self.config, use_cache, assume_yes)
+
+
+class TestLintCache(PodStubTestCase):
+    """Test that lint results are cached by content"""
+
+    def test_cache_hit_and_invalidation(self):
+        """Only changes to the podspec, covered files or flags trigger a new lint"""
+        self.assertTrue(self.validate())
+        self.assertTrue(self.validate())
+        self.assertEqual(self.lint_count(), 1)
+
+        # Files outside source_files do not affect the key
+        (self.pod_dir / 'README.md').write_text('still unrelated\n')
+        self.assertTrue(self.validate())
+        self.assertEqual(self.lint_count(), 1)
+
+        self.source.write_text('public struct MyLib { let x = 1 }\n')
+        self.assertTrue(self.validate())
+        self.assertEqual(self.lint_count(), 2)
+
+        options = pod_repo_push.PushOptions()
+        options.use_libraries = False
+        self.assertTrue(self.validate(options))
+        self.assertEqual(self.lint_count(), 3)
+
+    def test_yes_with_lint_warnings_and_errors(self):
+        """--yes accepts lint warnings when warnings are allowed, never errors"""
+        with mock.patch.dict(os.environ, {'STUB_LINT_RC': '1',
+                                          'STUB_LINT_OUTPUT': '- WARN  | summary: too short'}):
+            self.assertTrue(self.validate(use_cache=False, assume_yes=True))
+            options = pod_repo_push.PushOptions()
+            options.allow_warnings = False
+            self.assertFalse(self.validate(options, use_cache=False, assume_yes=True))
+
+        with mock.patch.dict(os.environ, {'STUB_LINT_RC': '1',
+                                          'STUB_LINT_OUTPUT': '- ERROR | source: no tag'}), \
+                mock.patch('builtins.input') as prompt:
+            self.assertFalse(self.validate(use_cache=False, assume_yes=True))
+        prompt.assert_not_called()
+
+    def test_failures_are_not_cached(self):
+        """A failed lint is retried, e.g. once a missing dependency has been pushed"""
+        with mock.patch.dict(os.environ, {'STUB_LINT_RC': '1',
+                                          'STUB_LINT_OUTPUT': '- ERROR | Unable to find a specification for `Dep`'}):
+            self.assertFalse(self.validate(assume_yes=True))
+            self.assertFalse(self.validate(assume_yes=True))
+        self.assertEqual(self.lint_count(), 2)
+        self.assertTrue(self.validate())
+        self.assertTrue(self.validate())
+        self.assertEqual(self.lint_count(), 3)
+
+    def test_no_lint_cache(self):
+        """use_cache=False always runs pod spec lint"""
+        self.assertTrue(self.validate())
+        self.assertTrue(self.validate(use_cache=False))
+        self.assertEqual(self.lint_count(), 2)
+
+
+class BatchPushTestCase(PodStubTestCase):
+    """Base class providing several pods where Net and UI depend on Core"""
+
+    def setUp(self):
+        """Create several pods where Net and UI depend on Core"""
+        super().setUp()
+        self.pods_dir = self.temp_dir / 'pods'
+        write_podspec(self.pods_dir / 'Core' / 'Core.podspec', 'Core')
+        write_podspec(self.pods_dir / 'Net' / 'Net.podspec', 'Net', ['Core', 'Alamofire'])
+        write_podspec(self.pods_dir / 'UI' / 'UI.podspec', 'UI', ['Core/Base', 'Net'])
+        # Podspecs under Pods are ignored
+        write_podspec(self.pods_dir / 'UI' / 'Pods' / 'Local Podspecs' / 'Old.podspec', 'Old')
+
+        self.config.get_default_spec_repo.return_value = 'Specs'
+        self.config.get_spec_repo_url.return_value = 'git@example.com:specs.git'
+
+    def run_push(self, *argv) -> bool:
+        import argparse
+        parser = argparse.ArgumentParser()
+        pod_repo_push.register_arguments(parser)
+        args = parser.parse_args(list(argv))
+        with mock.patch('builtins.print'), mock.patch('builtins.input') as prompt:
+            result = pod_repo_push.execute(args, self.config)
+        prompt.assert_not_called()
+        return result
+
+    def pushed(self):
+        calls = self.marker.read_text().splitlines()
+        return [Path(line.split()[3]).stem for line in calls if line.startswith('repo push')]
+
+
+class TestBatchPush(BatchPushTestCase):
+    """Test non-interactive batch pushes in dependency order"""
+
+    def test_dependency_order(self):
+        """Pods are pushed after the batch pods they depend on"""
+        self.assertTrue(self.run_push(str(self.pods_dir), '--yes'))
+        self.assertEqual(self.pushed(), ['Core', 'Net', 'UI'])
+
+    def test_lint_failure_skips_dependents(self):
+        """A failing lint stops the pod and everything that depends on it"""
+        with mock.patch.dict(os.environ, {'STUB_LINT_RC': '1',
+                                          'STUB_LINT_OUTPUT': '- ERROR | boom'}):
+            self.assertFalse(self.run_push(str(self.pods_dir), '--yes', '--no-lint-cache'))
+        self.assertFalse(any(line.startswith('repo push')
+                             for line in self.marker.read_text().splitlines()))
+
+    def test_yes_does_not_widen_auto_detection(self):
+        """--yes without paths refuses to pick among several podspecs in the current directory"""
+        write_podspec(self.temp_dir / 'work' / 'A.podspec', 'A')
+        write_podspec(self.temp_dir / 'work' / 'B.podspec', 'B')
+        cwd = os.getcwd()
+        os.chdir(self.temp_dir / 'work')
+        try:
+            self.assertFalse(self.run_push('--yes'))
+        finally:
+            os.chdir(cwd)
+        self.assertFalse(self.marker.exists())
+
+    def test_dependency_cycle(self):
+        """Cycles inside the batch are reported before anything runs"""
+        write_podspec(self.pods_dir / 'Core' / 'Core.podspec', 'Core', ['UI'])
+        self.assertFalse(self.run_push(str(self.pods_dir), '--yes'))
+        self.assertFalse(self.marker.exists())
+
+
+class TestDirectPush(BatchPushTestCase):
+    """Test publishing straight into a spec repo checkout"""
+
+    def setUp(self):
+        """Create a bare spec repository with an initial commit"""
+        super().setUp()
+        env = {'CP_REPOS_DIR': str(self.temp_dir / 'repos'),
+               'GIT_AUTHOR_NAME': 'Tester', 'GIT_AUTHOR_EMAIL': 'tester@example.com',
+               'GIT_COMMITTER_NAME': 'Tester', 'GIT_COMMITTER_EMAIL': 'tester@example.com'}
+        patcher = mock.patch.dict(os.environ, env)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.remote = self.temp_dir / 'specs.git'
+        seed = self.temp_dir / 'seed'
+        subprocess.run(['git', 'init', '-q', '--bare', str(self.remote)], check=True)
+        subprocess.run(['git', 'clone', '-q', str(self.remote), str(seed)], check=True, capture_output=True)
+        (seed / 'Specs').mkdir()
+        (seed / 'Specs' / '.gitkeep').write_text('')
+        subprocess.run(['git', 'add', '-A'], cwd=seed, check=True)
+        subprocess.run(['git', 'commit', '-q', '-m', 'Initial'], cwd=seed, check=True)
+        subprocess.run(['git', 'push', '-q', 'origin', 'HEAD'], cwd=seed, check=True, capture_output=True)
+        self.config.get_spec_repo_url.return_value = str(self.remote)
+
+    def remote_git(self, *args) -> str:
+        return subprocess.run(['git', *args], cwd=self.remote, check=True,
+                              capture_output=True, text=True).stdout
+
+    def test_direct_batch(self):
+        """Specs are committed as JSON and pushed without running pod repo push"""
+        self.assertTrue(self.run_push(str(self.pods_dir), '--yes', '--direct', '--jobs', '1'))
+        self.assertEqual(self.pushed(), [])
+
+        subjects = self.remote_git('log', '--format=%s').splitlines()
+        self.assertEqual(subjects, ['[Add] UI 1.0.0', '[Add] Net 1.0.0', '[Add] Core 1.0.0', 'Initial'])
+        spec = json.loads(self.remote_git('show', 'HEAD:Specs/UI/1.0.0/UI.podspec.json'))
+        self.assertEqual(spec['name'], 'UI')
+        self.assertEqual(spec['source'], {'git': 'https://example.com/UI.git', 'tag': '1.0.0'})
+        self.assertEqual(spec['dependencies'], {'Core/Base': [], 'Net': []})
+
+    def test_direct_refuses_existing_version(self):
+        """A version that is already in the spec repo is not overwritten"""
+        podspec = str(self.pods_dir / 'Core' / 'Core.podspec')
+        self.assertTrue(self.run_push(podspec, '--yes', '--direct'))
+        with mock.patch('builtins.print'):
+            self.assertFalse(pod_repo_push.direct_push(podspec, 'Specs', str(self.remote), self.config))
+        self.assertEqual(len(self.remote_git('log', '--format=%s').splitlines()), 2)
+
+    def test_direct_falls_back_for_dynamic_specs(self):
+        """Specs depending on ENV are pushed with pod repo push instead of committing guessed JSON"""
+        podspec = self.pods_dir / 'Core' / 'Core.podspec'
+        podspec.write_text(podspec.read_text().replace(
+            "end\n",
+            "  type = ENV['type'] == 'overseas' ? 'Overseas' : 'China'\n"
+            "  s.resource_bundles = { 'Core' => [\"Core/Resources/#{type}/**/*\"] }\n"
+            "end\n"))
+        self.assertTrue(self.run_push(str(podspec), '--yes', '--direct'))
+        self.assertEqual(self.pushed(), ['Core'])
+        self.assertEqual(self.remote_git('log', '--format=%s').splitlines(), ['Initial'])
+
+    def test_direct_after_remote_moved(self):
+        """The checkout is updated before writing, so other publishers are not clobbered"""
+        self.assertTrue(self.run_push(str(self.pods_dir / 'Core' / 'Core.podspec'), '--yes', '--direct'))
+        other = self.temp_dir / 'other'
+        subprocess.run(['git', 'clone', '-q', str(self.remote), str(other)], check=True, capture_output=True)
+        (other / 'Specs' / 'Other' / '2.0.0').mkdir(parents=True)
+        (other / 'Specs' / 'Other' / '2.0.0' / 'Other.podspec.json').write_text('{}')
+        subprocess.run(['git', 'add', '-A'], cwd=other, check=True)
+        subprocess.run(['git', 'commit', '-q', '-m', '[Add] Other 2.0.0'], cwd=other, check=True)
+        subprocess.run(['git', 'push', '-q'], cwd=other, check=True, capture_output=True)
+
+        self.assertTrue(self.run_push(str(self.pods_dir / 'Net' / 'Net.podspec'), '--yes', '--direct'))
+        self.assertEqual(self.remote_git('log', '--format=%s').splitlines()[:2],
+                         ['[Add] Net 1.0.0', '[Add] Other 2.0.0'])
+
+
+class TestLintMatrix(PodStubTestCase):
+    """Test splitting a lint into subspec, platform and Swift version jobs"""
+
+    def setUp(self):
+        """Add subspecs, platforms and Swift versions to the pod"""
+        super().setUp()
+        text = self.podspec.read_text().replace("end\n", "")
+        text += ("  s.ios.deployment_target = '13.0'\n"
+                 "  s.osx.deployment_target = '10.15'\n"
+                 "  s.swift_versions = ['5.0', '5.9']\n"
+                 "  s.subspec 'Core' do |ss|\n    ss.source_files = 'MyLib/Sources/*.swift'\n  end\n"
+                 "  s.subspec 'UI' do |ss|\n    ss.dependency 'MyLib/Core'\n  end\n"
+                 "  s.test_spec 'Tests' do |ts|\n    ts.source_files = 'MyLib/Tests/*.swift'\n  end\n"
+                 "end\n")
+        self.podspec.write_text(text)
+
+    def lint(self, *argv) -> bool:
+        import argparse
+        parser = argparse.ArgumentParser()
+        pod_repo_push.register_arguments(parser)
+        args = parser.parse_args(['lint', str(self.podspec)] + list(argv))
+        with mock.patch('builtins.print') as mock_print:
+            result = pod_repo_push.execute(args, self.config)
+        self.output = "\n".join(" ".join(str(a) for a in call.args) for call in mock_print.call_args_list)
+        return result
+
+    def lint_calls(self):
+        return [line.split()[3:] for line in self.marker.read_text().splitlines()]
+
+    def test_matrix_jobs(self):
+        """One job per subspec, platform and Swift version"""
+        self.assertTrue(self.lint('--matrix', '--jobs', '4'))
+        calls = self.lint_calls()
+        self.assertEqual(len(calls), 12)
+        self.assertIn(['--allow-warnings', '--skip-import-validation', '--use-libraries',
+                       '--use-modular-headers', '--subspec=UI', '--platforms=osx', '--swift-version=5.9'], calls)
+        self.assertEqual(sum('--no-subspecs' in call for call in calls), 4)
+        # Test specs are linted with their parent, not as --subspec jobs
+        self.assertFalse(any('--subspec=Tests' in call for call in calls))
+        self.assertIn('12/12 job(s) passed', self.output)
+
+    def test_filters_and_merged_report(self):
+        """Axis filters limit the jobs and identical issues are reported once"""
+        with mock.patch.dict(os.environ, {'STUB_LINT_FAIL_ARG': '--subspec=UI'}):
+            self.assertFalse(self.lint('--matrix', '--subspec', 'Core,UI', '--platforms', 'ios'))
+        self.assertEqual(len(self.lint_calls()), 4)
+        self.assertIn('2/4 job(s) passed', self.output)
+        self.assertEqual(self.output.count('WARN | summary: The summary is not meaningful.'), 1)
+        self.assertIn('in: MyLib/UI · ios · 5.0, MyLib/UI · ios · 5.9', self.output)
+
+    def test_cached_jobs(self):
+        """Jobs that passed before are not linted again"""
+        self.assertTrue(self.lint('--matrix', '--platforms', 'ios', '--swift-version', '5.9'))
+        self.assertEqual(len(self.lint_calls()), 3)
+        self.assertTrue(self.lint('--matrix', '--platforms', 'ios,osx', '--swift-version', '5.9'))
+        self.assertEqual(len(self.lint_calls()), 6)
+
+    def test_without_matrix(self):
+        """Without --matrix a single pod spec lint runs"""
+        self.assertTrue(self.lint('--platforms', 'ios,osx'))
+        self.assertEqual(self.lint_calls()[0][-1], '--platforms=ios,osx')
+        self.assertFalse(self.lint('--swift-version', '5.0,5.9'))
+
+
+class TestRunPodCommand(unittest.TestCase):
+    """Test bounded output capture and phase timing"""
+
+    SCRIPT = (
+        "import sys, time\n"
+        "print('Validating spec', flush=True)\n"
+        "time.sleep(0.2)\n"
+        "for i in range(5000):\n"
+        "    print(f'line {i}')\n"
+        "    if i % 1000 == 0:\n"
+        "        print(f'warning {i}', file=sys.stderr)\n"
+        "sys.stdout.flush()\n"
+        "print(\"Updating the `Specs' repo\", flush=True)\n"
+        "print(\"Pushing the `Specs' repo\", flush=True)\n"
+        "sys.stdout.write('no trailing newline')\n"
+        "sys.exit(int(sys.argv[1]))\n"
+    )
+
+    def setUp(self):
+        """Create a temporary directory for logs"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        """Clean up the test environment"""
+        shutil.rmtree(self.temp_dir)
+
+    def command(self, exit_code: int = 0):
+        return [sys.executable, '-c', self.SCRIPT, str(exit_code)]
+
+    def test_bounded_tail_and_full_log(self):
+        """Only the tail is kept in memory, the log has every line"""
+        log_path = self.temp_dir / 'pod.log'
+        result = pod_repo_push.stream_pod_command(self.command(), log_path=log_path,
+                                                  tail_lines=10, echo=False)
+        self.assertTrue(result.success)
+        self.assertEqual(len(result.tail), 10)
+        self.assertEqual(result.tail[-1], 'no trailing newline')
+
+        log = log_path.read_text().splitlines()
+        self.assertEqual(len(log), 5000 + 5 + 4)
+        self.assertIn('⚠️ warning 4000', log)
+
+    def test_partial_lines_are_capped(self):
+        """Output without newlines is split instead of buffered without bound"""
+        from lee_devkit.utils.tools import stream_tool
+        lines = []
+        script = "import sys; sys.stdout.write('x' * 10000); sys.stdout.flush()"
+        self.assertEqual(stream_tool([sys.executable, '-c', script], lambda stream, line: lines.append(line),
+                                     chunk_size=1024, max_line=4096), 0)
+        self.assertEqual([len(line) for line in lines], [4096, 4096, 1808])
+
+    def test_log_rotation(self):
+        """Only the newest logs are kept"""
+        for index in range(5):
+            old = self.temp_dir / f'pod-old-{index}.log'
+            old.write_text('old')
+            os.utime(old, (index, index))
+        with mock.patch.object(pod_repo_push, 'MAX_LOG_FILES', 3):
+            log_path = pod_repo_push.new_log_path(self.temp_dir)
+        self.assertEqual(sorted(path.name for path in self.temp_dir.glob('pod-*.log')),
+                         sorted(['pod-old-3.log', 'pod-old-4.log', log_path.name]))
+
+    def test_phase_durations(self):
+        """Known phases are detected and timed"""
+        result = pod_repo_push.stream_pod_command(self.command(), log_path=self.temp_dir / 'pod.log',
+                                                  echo=False)
+        self.assertEqual(list(result.phases), ['Linting', 'Updating repo', 'Pushing'])
+        self.assertGreaterEqual(result.phases['Linting'], 0.2)
+
+    def test_failure_report(self):
+        """Failures print the tail in batch mode and point at the log"""
+        with mock.patch('builtins.print') as printed:
+            self.assertFalse(pod_repo_push.run_pod_command(
+                self.command(1), prefix='[MyLib] ', log_dir=self.temp_dir))
+        output = [call.args[0] for call in printed.call_args_list if call.args]
+        self.assertTrue(any('Last 50 lines' in line for line in output))
+        self.assertTrue(any('Full log:' in line for line in output))
+        self.assertEqual(len(list(self.temp_dir.glob('pod-*.log'))), 1)
+
+
+class TestPushJournal(BatchPushTestCase):
+    """Test journaled batch pushes, retries and --resume"""
+
+    def journal(self):
+        from lee_devkit.utils.push_journal import PushJournal
+        return PushJournal.load(self.temp_dir / 'cache' / 'push-journal.json')
+
+    def test_transient_failures_are_retried(self):
+        """Network errors are retried with backoff"""
+        rule = "Net:2:fatal: unable to access 'https://x/': Could not resolve host: x"
+        with mock.patch.dict(os.environ, {'STUB_PUSH_FAIL': rule}), \
+                mock.patch('time.sleep') as sleep:
+            self.assertTrue(self.run_push(str(self.pods_dir), '--yes'))
+        self.assertEqual(sleep.call_count, 2)
+        self.assertEqual(self.pushed(), ['Core', 'Net', 'Net', 'Net', 'UI'])
+        self.assertEqual(self.journal().items['Net']['attempts'], 3)
+
+    def test_resume_after_failure(self):
+        """A permanent failure stops dependents, --resume continues from there"""
+        rule = "Net:1:[!] The spec did not pass validation"
+        with mock.patch.dict(os.environ, {'STUB_PUSH_FAIL': rule}), \
+                mock.patch('time.sleep') as sleep:
+            self.assertFalse(self.run_push(str(self.pods_dir), '--yes'))
+        sleep.assert_not_called()
+
+        journal = self.journal()
+        self.assertEqual(journal.state('Core'), 'pushed')
+        self.assertEqual(journal.state('Net'), 'failed')
+        self.assertEqual(journal.state('UI'), 'linted')
+        self.assertEqual(self.pushed(), ['Core', 'Net'])
+
+        self.marker.write_text('')
+        self.assertTrue(self.run_push('--resume', '--yes'))
+        self.assertEqual(self.pushed(), ['Net', 'UI'])
+        self.assertEqual(self.journal().incomplete(), [])
+
+        # Lint is not repeated for podspecs that passed and did not change
+        calls = self.marker.read_text().splitlines()
+        self.assertFalse(any(line.startswith('spec lint') for line in calls))
+
+    def test_new_batch_keeps_unfinished_journal(self):
+        """A new batch refuses to replace an unfinished journal unless forced"""
+        rule = "Net:1:[!] The spec did not pass validation"
+        with mock.patch.dict(os.environ, {'STUB_PUSH_FAIL': rule}):
+            self.assertFalse(self.run_push(str(self.pods_dir), '--yes'))
+
+        self.marker.write_text('')
+        self.assertFalse(self.run_push(str(self.pods_dir), '--yes'))
+        self.assertEqual(self.marker.read_text(), '')
+        self.assertEqual(self.journal().state('Net'), 'failed')
+
+        self.assertTrue(self.run_push(str(self.pods_dir), '--yes', '--force'))
+        self.assertEqual(self.pushed(), ['Core', 'Net', 'UI'])
+        self.assertEqual(self.journal().incomplete(), [])
+
+    def test_resume_without_journal(self):
+        """--resume without a journal fails cleanly"""
+        self.assertFalse(self.run_push('--resume', '--yes', '--journal', str(self.temp_dir / 'none.json')))
+
+
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
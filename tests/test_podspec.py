@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Tests for the podspec parser and pre-lint
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lee_devkit.commands import pod_repo_push
+from lee_devkit.utils.podspec import Podspec, PodspecError, prelint, ruby_string
+
+TEMPLATE_PODSPEC = Path(__file__).parent.parent / 'template' / 'NBTemplateModule.podspec'
+
+SAMPLE = '''
+Pod::Spec.new do |spec|
+  spec.name     = "Foo"; spec.version = "1.2.0"
+  spec.summary  = %q(Foo does things)
+  spec.authors  = { "Jane" => "jane@example.com" }
+  spec.homepage = "https://example.com/foo"
+  spec.license  = { type: "MIT" }
+  spec.source   = { git: "https://example.com/foo.git", tag: "v#{spec.version}" }
+  spec.platform = :ios, "12.0"
+  spec.swift_versions = %w[5.0 5.5]
+
+  if ENV["EXTRA"]
+    spec.weak_frameworks = "Combine"
+  end
+
+  spec.subspec "Core" do |core|
+    core.source_files = "Core/**/*.{h,m,swift}"
+    core.dependency "Alamofire", "~> 5.0", ">= 5.1"
+    core.ios.frameworks = "UIKit", "Foundation"
+  end
+
+  spec.subspec "UI" do |ui|
+    ui.dependency "Foo/Core"
+  end
+end
+'''
+
+
+class TestPodspecParser(unittest.TestCase):
+    """Test parsing the Ruby DSL subset"""
+
+    def test_template_podspec(self):
+        """The bundled template podspec parses into a structured model"""
+        spec = Podspec.from_file(TEMPLATE_PODSPEC)
+        self.assertEqual(spec.name, 'NBTemplateModule')
+        self.assertEqual(spec.version, '0.1.0')
+        self.assertEqual(spec.get('source')['tag'], '0.1.0')
+        self.assertEqual(spec.get('license'), {'type': 'MIT', 'file': 'LICENSE'})
+        self.assertEqual(spec.platforms, {'ios': '13.0'})
+        self.assertTrue(spec.get('description').startswith('TODO'))
+
+        pattern = spec.get('resource_bundles')['NBTemplateModule'][0]
+        self.assertEqual(spec.expand_variants(pattern), [
+            'NBTemplateModule/Resources/Overseas/**/*.*',
+            'NBTemplateModule/Resources/China/**/*.*',
+        ])
+
+    def test_subspecs_and_dependencies(self):
+        """Subspecs, dependencies, %w lists and Ruby 1.9 hashes are understood"""
+        spec = Podspec.parse(SAMPLE)
+        self.assertEqual(spec.get('source')['tag'], 'v1.2.0')
+        self.assertEqual(spec.get('swift_versions'), ['5.0', '5.5'])
+        self.assertNotIn('weak_frameworks', spec.attributes)
+
+        core, ui = spec.subspecs
+        self.assertEqual(core.full_name, 'Foo/Core')
+        self.assertEqual(core.version, '1.2.0')
+        self.assertEqual(core.dependencies, {'Alamofire': ['~> 5.0', '>= 5.1']})
+        self.assertEqual(core.get('ios.frameworks'), ['UIKit', 'Foundation'])
+        self.assertEqual(spec.all_dependencies(), {'Alamofire': ['~> 5.0', '>= 5.1']})
+
+    def test_json_round_trip(self):
+        """The Ruby model converts to the JSON form, which parses back"""
+        spec = Podspec.parse(SAMPLE.replace('  if ENV["EXTRA"]\n    spec.weak_frameworks = "Combine"\n  end\n', ''))
+        data = spec.to_json()
+        self.assertEqual(data['platforms'], {'ios': '12.0'})
+        self.assertEqual(data['subspecs'][0]['dependencies'], {'Alamofire': ['~> 5.0', '>= 5.1']})
+
+        again = Podspec.from_json(json.loads(json.dumps(data)))
+        self.assertEqual(again.version, '1.2.0')
+        self.assertEqual(again.subspecs[0].get('ios.frameworks'), ['UIKit', 'Foundation'])
+
+    def test_json_spec_types(self):
+        """Test and app specs use the CocoaPods testspecs / appspecs keys"""
+        spec = Podspec.parse("Pod::Spec.new do |s|\n  s.name = 'Foo'\n"
+                             "  s.subspec 'Core' do |c|\n    c.source_files = 'Core/*'\n  end\n"
+                             "  s.test_spec 'Tests' do |t|\n    t.dependency 'Quick'\n  end\n"
+                             "  s.app_spec 'Demo' do |a|\n    a.source_files = 'Demo/*'\n  end\nend\n")
+        data = spec.to_json()
+        self.assertEqual([sub['name'] for sub in data['subspecs']], ['Core'])
+        self.assertEqual(data['testspecs'], [{'name': 'Tests', 'dependencies': {'Quick': []}, 'test_type': 'unit'}])
+        self.assertEqual(data['appspecs'], [{'name': 'Demo', 'source_files': 'Demo/*'}])
+
+        self.assertEqual(spec.all_dependencies(), {})
+        self.assertEqual(spec.all_dependencies(include_non_library=True), {'Quick': []})
+        self.assertEqual([sub.is_library for sub in spec.walk()], [True, True, False, False])
+
+        again = Podspec.from_json(json.loads(json.dumps(data)))
+        self.assertEqual([(sub.name, sub.spec_type) for sub in again.subspecs],
+                         [('Core', 'library'), ('Tests', 'test'), ('Demo', 'app')])
+        self.assertEqual(again.to_json(), data)
+
+    def test_json_rejects_runtime_values(self):
+        """Values that depend on ENV or a ternary cannot be converted to JSON"""
+        spec = Podspec.from_file(TEMPLATE_PODSPEC)
+        with self.assertRaisesRegex(PodspecError, 'resource_bundles'):
+            spec.to_json()
+        spec = Podspec.parse("Pod::Spec.new do |s|\n  s.name = 'Foo'\n"
+                             "  s.static_framework = ENV['STATIC'] ? true : false\nend\n")
+        with self.assertRaisesRegex(PodspecError, 'static_framework'):
+            spec.to_json()
+
+    def test_json_rejects_conditionals(self):
+        """Conditional blocks and trailing if / unless are recorded and refused"""
+        spec = Podspec.parse(SAMPLE)
+        self.assertEqual(spec.conditionals, ['if ENV["EXTRA"]\n    spec.weak_frameworks = "Combine"\n  end'])
+        with self.assertRaisesRegex(PodspecError, 'runtime condition: if ENV'):
+            spec.to_json()
+
+        spec = Podspec.parse("Pod::Spec.new do |s|\n  s.name = 'Foo'\n  s.subspec 'Core' do |c|\n"
+                             "    c.dependency 'Baz' if ENV['X']\n    c.frameworks = 'UIKit'\n  end\nend\n")
+        core = spec.subspecs[0]
+        self.assertEqual(core.conditionals, ["c.dependency 'Baz' if ENV['X']"])
+        self.assertEqual(core.get('frameworks'), 'UIKit')
+        with self.assertRaisesRegex(PodspecError, 'Foo/Core has a statement'):
+            spec.to_json()
+
+    def test_attribute_rewrite(self):
+        """Attribute spans allow rewriting a value, including heredocs"""
+        spec = Podspec.from_file(TEMPLATE_PODSPEC)
+        text = spec.set_attribute_text('description', ruby_string("It's new"))
+        rewritten = Podspec.parse(text)
+        self.assertEqual(rewritten.get('description'), "It's new")
+        self.assertEqual(rewritten.get('homepage'), spec.get('homepage'))
+
+    def test_invalid_source(self):
+        """Unbalanced specs raise PodspecError"""
+        with self.assertRaises(PodspecError):
+            Podspec.parse("Pod::Spec.new do |s|\n  s.name = 'Foo'\n")
+        with self.assertRaises(PodspecError):
+            Podspec.parse("puts 'no spec here'\n")
+
+
+class TestPrelint(unittest.TestCase):
+    """Test the in-process pre-lint"""
+
+    def setUp(self):
+        """Create a temporary directory"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        """Clean up the test environment"""
+        shutil.rmtree(self.temp_dir)
+
+    def errors(self, text: str, file_name: str = 'Foo.podspec'):
+        return [issue.message for issue in prelint(Podspec.parse(text), file_name) if issue.is_error]
+
+    def test_valid_spec(self):
+        """A complete spec has no errors"""
+        self.assertEqual(self.errors(SAMPLE), [])
+
+    def test_broken_specs(self):
+        """Missing fields, bad versions and self dependencies are errors"""
+        broken = SAMPLE.replace('spec.version = "1.2.0"', 'spec.version = "1.2.x"')
+        self.assertTrue(any('not a valid version' in e for e in self.errors(broken)))
+
+        self_dependency = SAMPLE.replace('ui.dependency "Foo/Core"', 'ui.dependency "Foo"')
+        self.assertIn('`Foo/UI` should not depend on its own pod (`Foo`).', self.errors(self_dependency))
+        root_dependency = SAMPLE.replace('spec.platform =', 'spec.dependency "Foo"\n  spec.platform =')
+        self.assertIn('`Foo` should not depend on its own pod (`Foo`).', self.errors(root_dependency))
+
+        missing = SAMPLE.replace('spec.summary  = %q(Foo does things)', '')
+        self.assertIn('Missing required attribute `summary`.', self.errors(missing))
+
+        self.assertTrue(any('match the name of the file' in e for e in self.errors(SAMPLE, 'Bar.podspec')))
+
+        unknown = SAMPLE.replace('"Foo/Core"', '"Foo/Nope"')
+        self.assertTrue(any('unknown subspec' in e for e in self.errors(unknown)))
+
+    def test_source_tags(self):
+        """Any tag containing the version is accepted; other tags are only a warning"""
+        for tag in ('Foo-1.2.0', 'release/1.2.0', 'v1.2.0'):
+            self.assertEqual(self.errors(SAMPLE.replace('v#{spec.version}', tag)), [], tag)
+        issues = prelint(Podspec.parse(SAMPLE.replace('v#{spec.version}', '1.1.0')), 'Foo.podspec')
+        self.assertEqual([(issue.level, issue.message) for issue in issues],
+                         [('warning', 'The source tag `1.1.0` does not contain the version `1.2.0`.')])
+
+    def test_validate_fails_before_pod_lint(self):
+        """validate_podspec_file never spawns pod for a broken spec"""
+        podspec = self.temp_dir / 'Foo.podspec'
+        podspec.write_text(SAMPLE.replace('"1.2.0"', '"one"'))
+        with mock.patch('subprocess.run') as run, mock.patch('builtins.print'):
+            self.assertFalse(pod_repo_push.validate_podspec_file(str(podspec)))
+        run.assert_not_called()
+
+    def test_validate_runs_pod_lint_for_valid_spec(self):
+        """Valid specs continue to pod spec lint"""
+        podspec = self.temp_dir / 'Foo.podspec'
+        podspec.write_text(SAMPLE)
+        completed = mock.MagicMock(returncode=0, stdout='', stderr='')
+        with mock.patch('subprocess.run', return_value=completed) as run, \
+                mock.patch('builtins.print'):
+            self.assertTrue(pod_repo_push.validate_podspec_file(str(podspec)))
+        run.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming release archives and :http podspec variants
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+import tracemalloc
+import unittest
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lee_devkit.commands import git_tag
+from lee_devkit.utils.podspec import Podspec
+from lee_devkit.utils.source_archive import (SourceArchiveError, archive_path, http_source,
+                                             render_http_podspec, stream_git_archive)
+from tests.test_spec_index import git
+
+SPEC = """Pod::Spec.new do |s|
+  s.name = 'Kit'
+  s.version = '1.2.0'
+  s.source = { :git => 'https://example.com/Kit.git', :tag => s.version.to_s }
+  s.source_files = 'Sources/**/*.swift'
+end
+"""
+
+
+class TestSourceArchive(unittest.TestCase):
+    """Test archiving a tag, the checksum and the podspec variant"""
+
+    def setUp(self):
+        """Create a tagged repository with a podspec and a large binary file"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.repo = self.temp_dir / 'Kit'
+        (self.repo / 'Sources').mkdir(parents=True)
+        (self.repo / 'Sources' / 'Kit.swift').write_text('public struct Kit {}\n')
+        (self.repo / 'Kit.podspec').write_text(SPEC)
+        (self.repo / 'blob.bin').write_bytes(os.urandom(8 << 20))
+        git(self.repo, 'init', '-q')
+        git(self.repo, 'add', '-A')
+        git(self.repo, 'commit', '-q', '-m', 'Release')
+        git(self.repo, 'tag', '1.2.0')
+        self.dist = self.temp_dir / 'dist'
+
+    def tearDown(self):
+        """Clean up the test environment"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_stream(self):
+        """The checksum matches the written file and memory stays bounded"""
+        tracemalloc.start()
+        try:
+            result = stream_git_archive(self.repo, '1.2.0', self.dist / 'Kit.tar.gz', prefix='Kit-1.2.0')
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        data = (self.dist / 'Kit.tar.gz').read_bytes()
+        self.assertEqual(result['sha256'], hashlib.sha256(data).hexdigest())
+        self.assertEqual((result['format'], result['size']), ('tar.gz', len(data)))
+        self.assertLess(peak, 4 << 20)
+        with tarfile.open(self.dist / 'Kit.tar.gz') as archive:
+            self.assertIn('Kit-1.2.0/Sources/Kit.swift', archive.getnames())
+
+        with self.assertRaises(SourceArchiveError):
+            stream_git_archive(self.repo, 'missing', self.dist / 'missing.zip')
+        self.assertEqual(sorted(os.listdir(self.dist)), ['Kit.tar.gz'])
+
+    def test_http_podspec(self):
+        """Only the source attribute is replaced in Ruby and JSON podspecs"""
+        self.assertEqual(archive_path(self.dist, 'Kit', '1.2.0'), self.dist / 'Kit-1.2.0.zip')
+        self.assertEqual(archive_path(self.dist / 'a.tgz', 'Kit', '1.2.0'), self.dist / 'a.tgz')
+        self.assertEqual(archive_path(self.dist / 'a.tgz', 'Kit', '1.2.0', 'tar.gz'), self.dist / 'a.tgz')
+        self.assertEqual(archive_path(self.dist, 'Kit', '1.2.0', 'tar.gz'), self.dist / 'Kit-1.2.0.tar.gz')
+        with self.assertRaisesRegex(SourceArchiveError, 'Kit.zip'):
+            archive_path(self.dist / 'Kit.zip', 'Kit', '1.2.0', 'tar.gz')
+        source = http_source("https://cdn.example.com/Kit's.zip", 'abc', 'zip')
+        text = render_http_podspec(self.repo / 'Kit.podspec', source)
+        self.assertIn("  s.source = { :http => 'https://cdn.example.com/Kit\\'s.zip', :type => 'zip', "
+                      ":sha256 => 'abc', :flatten => true }\n", text)
+        self.assertEqual(Podspec.parse(text).get('source')['sha256'], 'abc')
+        self.assertIn("s.source_files = 'Sources/**/*.swift'", text)
+
+        json_spec = self.temp_dir / 'Kit.podspec.json'
+        json_spec.write_text(json.dumps({'name': 'Kit', 'source': {'git': 'x', 'tag': '1.2.0'}}))
+        data = json.loads(render_http_podspec(json_spec, http_source('u', 'abc', 'tar.gz')))
+        self.assertEqual(data['source'], {'http': 'u', 'type': 'tgz', 'sha256': 'abc'})
+
+    def test_command(self):
+        """tag create --archive writes the archive and the :http podspec before pushing"""
+        args = argparse.Namespace(tag_action='create', tag_name='1.3.0', commit=None, message=None,
+                                  remote='origin', dry_run=False, no_push=True, archive=str(self.dist),
+                                  archive_format=None, podspec=None, http_podspec=None,
+                                  archive_url='https://cdn.example.com/{name}/{tag}/{file}')
+        (self.repo / 'Kit.podspec').write_text(SPEC.replace('1.2.0', '1.3.0'))
+        git(self.repo, 'commit', '-q', '-am', 'Bump')
+        cwd = os.getcwd()
+        os.chdir(self.repo)
+        try:
+            with mock.patch.object(git_tag, 'setup_logger'):
+                self.assertTrue(git_tag.execute(args, None))
+                # Writing the variant over the original podspec is refused
+                args.tag_name, args.archive = '1.3.1', str(self.repo)
+                self.assertFalse(git_tag.execute(args, None))
+        finally:
+            os.chdir(cwd)
+
+        archive = self.dist / 'Kit-1.3.0.zip'
+        with zipfile.ZipFile(archive) as zf:
+            self.assertIn('Kit-1.3.0/Kit.podspec', zf.namelist())
+        spec = Podspec.from_file(self.dist / 'Kit.podspec')
+        self.assertEqual(spec.get('source'), {
+            'http': 'https://cdn.example.com/Kit/1.3.0/Kit-1.3.0.zip', 'type': 'zip',
+            'sha256': hashlib.sha256(archive.read_bytes()).hexdigest(), 'flatten': True,
+        })
+
+
+if __name__ == '__main__':
+    unittest.main()
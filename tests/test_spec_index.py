@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Tests for the spec repository index
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lee_devkit.commands import pod_repo_push
+from lee_devkit.utils.podspec import version_key
+from lee_devkit.utils.spec_index import SpecIndex, spec_path_info, spec_paths
+
+
+def git(repo: Path, *args):
+    """Run a git command in the spec repository"""
+    subprocess.run(['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com', *args],
+                   cwd=repo, check=True, capture_output=True)
+
+
+def add_spec(repo: Path, name: str, version: str, dependencies=None, json_format=False, sharded=False):
+    """Add a published spec to the repository in the CocoaPods layout"""
+    base = repo / 'Specs' / 'a' / 'b' / 'c' if sharded else repo
+    spec_dir = base / name / version
+    spec_dir.mkdir(parents=True, exist_ok=True)
+    if json_format:
+        data = {'name': name, 'version': version,
+                'source': {'git': f'https://example.com/{name}.git', 'tag': version},
+                'dependencies': {dep: [req] if req else [] for dep, req in (dependencies or {}).items()}}
+        (spec_dir / f'{name}.podspec.json').write_text(json.dumps(data))
+        return
+    lines = ["Pod::Spec.new do |s|", f"  s.name = '{name}'", f"  s.version = '{version}'",
+             f"  s.source = {{ :git => 'https://example.com/{name}.git', :tag => s.version.to_s }}"]
+    for dep, req in (dependencies or {}).items():
+        lines.append(f"  s.dependency '{dep}'" + (f", '{req}'" if req else ""))
+    lines.append("end")
+    (spec_dir / f'{name}.podspec').write_text("\n".join(lines) + "\n")
+
+
+class TestSpecIndex(unittest.TestCase):
+    """Test full and incremental indexing and the queries"""
+
+    def setUp(self):
+        """Create a spec repository with a few published versions"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.repos_dir = self.temp_dir / 'repos'
+        self.repo = self.repos_dir / 'private'
+        self.repo.mkdir(parents=True)
+        git(self.repo, 'init', '-q')
+        add_spec(self.repo, 'Core', '1.0.0')
+        add_spec(self.repo, 'Core', '1.10.0')
+        add_spec(self.repo, 'Core', '2.0.0-beta.1')
+        add_spec(self.repo, 'Net', '1.2.0', {'Core/Base': '~> 1.0'})
+        add_spec(self.repo, 'UI', '0.9.0', {'Core': None, 'SnapKit': None}, json_format=True)
+        git(self.repo, 'add', '-A')
+        git(self.repo, 'commit', '-q', '-m', 'Initial specs')
+        self.index = SpecIndex(self.temp_dir / 'index.sqlite', jobs=2)
+
+    def tearDown(self):
+        """Clean up the test environment"""
+        self.index.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_spec_path_info(self):
+        """Only <Name>/<version>/<Name>.podspec(.json) paths are specs"""
+        self.assertEqual(spec_path_info('Core/1.0.0/Core.podspec'), ('Core', '1.0.0'))
+        self.assertEqual(spec_path_info('Specs/0/1/2/UI/0.9/UI.podspec.json'), ('UI', '0.9'))
+        self.assertIsNone(spec_path_info('Core/1.0.0/Other.podspec'))
+        self.assertIsNone(spec_path_info('README.md'))
+        self.assertEqual(spec_paths(['README.md', 'Core/1.0.0/Core.podspec']),
+                         {'Core/1.0.0/Core.podspec': ('Core', '1.0.0')})
+
+    def test_version_key(self):
+        """Versions sort numerically with pre-releases first"""
+        versions = ['1.10.0', '1.2', '2.0.0-beta.1', '2.0.0', '1.2.0-rc.2', '1.2.0-rc.10']
+        self.assertEqual(sorted(versions, key=version_key),
+                         ['1.2.0-rc.2', '1.2.0-rc.10', '1.2', '1.10.0', '2.0.0-beta.1', '2.0.0'])
+        self.assertEqual(version_key('1.0'), version_key('1.0.0'))
+
+    def test_queries(self):
+        """Exists, latest, versions and reverse dependency queries"""
+        stats = self.index.update('private', self.repo)
+        self.assertEqual(stats, {'mode': 'full', 'indexed': 5, 'removed': 0})
+
+        self.assertTrue(self.index.exists('Core', '1.10.0'))
+        self.assertFalse(self.index.exists('Core', '1.10.0', repo='other'))
+        self.assertEqual(self.index.versions('Core'), ['1.0.0', '1.10.0', '2.0.0-beta.1'])
+        self.assertEqual(self.index.latest('Core'), '1.10.0')
+        self.assertEqual(self.index.latest('Core', include_prerelease=True), '2.0.0-beta.1')
+        self.assertIsNone(self.index.latest('Missing'))
+
+        dependents = self.index.dependents('Core')
+        self.assertEqual([(d['name'], d['dependency'], d['requirement']) for d in dependents],
+                         [('Net', 'Core/Base', '~> 1.0'), ('UI', 'Core', '')])
+        spec = self.index.spec('UI', '0.9.0')
+        self.assertEqual(spec['source_tag'], '0.9.0')
+        self.assertEqual(spec['dependencies'], {'Core': '', 'SnapKit': ''})
+        self.assertEqual(self.index.spec('Net', '1.2.0')['source_tag'], '1.2.0')
+
+    def test_dependents_latest_version(self):
+        """A pod whose latest version dropped the dependency is not a dependent"""
+        add_spec(self.repo, 'Foo', '1.0.0', {'Core': None})
+        add_spec(self.repo, 'Foo', '2.0.0')
+        git(self.repo, 'add', '-A')
+        git(self.repo, 'commit', '-q', '-m', 'Add Foo')
+        self.index.update('private', self.repo)
+        self.assertEqual([d['name'] for d in self.index.dependents('Core')], ['Net', 'UI'])
+        self.assertEqual([(d['name'], d['version']) for d in self.index.dependents('Core', latest_only=False)],
+                         [('Foo', '1.0.0'), ('Net', '1.2.0'), ('UI', '0.9.0')])
+
+    def test_incremental_update(self):
+        """Only the files changed since the last indexed commit are processed"""
+        self.index.update('private', self.repo)
+        self.assertEqual(self.index.update('private', self.repo)['mode'], 'unchanged')
+
+        add_spec(self.repo, 'Net', '1.3.0', {'Core': '~> 1.10'}, sharded=True)
+        add_spec(self.repo, 'UI', '0.9.0', {'Net': None}, json_format=True)
+        shutil.rmtree(self.repo / 'Core' / '1.0.0')
+        git(self.repo, 'add', '-A')
+        git(self.repo, 'commit', '-q', '-m', 'Update specs')
+
+        stats = self.index.update('private', self.repo)
+        self.assertEqual(stats, {'mode': 'incremental', 'indexed': 2, 'removed': 1})
+        self.assertFalse(self.index.exists('Core', '1.0.0'))
+        self.assertEqual(self.index.latest('Net'), '1.3.0')
+        self.assertEqual(self.index.spec('UI', '0.9.0')['dependencies'], {'Net': ''})
+        self.assertEqual([d['name'] for d in self.index.dependents('Core')], ['Net'])
+
+    def test_full_rebuild_when_history_is_rewritten(self):
+        """An unknown last indexed commit falls back to a full walk"""
+        self.index.update('private', self.repo)
+        self.index.conn.execute("UPDATE repos SET commit_sha = ?", ('0' * 40,))
+        stats = self.index.update('private', self.repo)
+        self.assertEqual(stats['mode'], 'full')
+        self.assertEqual(len(self.index.versions('Core')), 3)
+
+    def test_push_refuses_published_version(self):
+        """pod-push fails before linting when the version is already in the repo"""
+        config = mock.MagicMock()
+        config.get_cache_dir.return_value = self.temp_dir / 'cache'
+        config.get_spec_repos.return_value = {'private': 'https://example.com/specs.git'}
+        podspec = self.temp_dir / 'Net.podspec'
+        podspec.write_text("Pod::Spec.new do |s|\n  s.name = 'Net'\n  s.version = '1.2.0'\nend\n")
+
+        with mock.patch.dict(os.environ, {'CP_REPOS_DIR': str(self.repos_dir)}), \
+                mock.patch('builtins.print'):
+            self.assertFalse(pod_repo_push.check_unpublished(config, 'private', [str(podspec)]))
+            podspec.write_text(podspec.read_text().replace('1.2.0', '1.2.1'))
+            self.assertTrue(pod_repo_push.check_unpublished(config, 'private', [str(podspec)]))
+            # Without a local checkout the check cannot run and passes
+            self.assertTrue(pod_repo_push.check_unpublished(config, 'other', [str(podspec)]))
+            self.assertTrue(pod_repo_push.index_command(config, ['latest', 'Core']))
+            self.assertFalse(pod_repo_push.index_command(config, ['exists', 'Core', '9.9']))
+            self.assertFalse(pod_repo_push.index_command(config, ['latest']))
+
+
+if __name__ == '__main__':
+    unittest.main()
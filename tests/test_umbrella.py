@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for umbrella header and module map generation
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lee_devkit.commands import cocoapods
+from lee_devkit.utils.umbrella import apply_headers, plan_headers
+
+SPEC = """Pod::Spec.new do |s|
+  s.name = 'Kit'
+  s.version = '1.0.0'
+  s.ios.deployment_target = '13.0'
+  s.source_files = 'Kit/**/*.{h,m}'
+  s.public_header_files = 'Kit/Public/**/*.h'
+  s.private_header_files = 'Kit/Public/Internal/*.h'
+end
+"""
+
+
+class TestUmbrella(unittest.TestCase):
+    """Test header discovery, rendering and incremental updates"""
+
+    def setUp(self):
+        """Create an Objective-C pod with public and private headers"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.pod = self.temp_dir / 'Kit'
+        public = self.pod / 'Kit' / 'Public'
+        (public / 'Internal').mkdir(parents=True)
+        for name in ('KTView.h', 'KTModel.h'):
+            (public / name).write_text('@import Foundation;\n')
+        (public / 'Internal' / 'KTPrivate.h').write_text('\n')
+        (self.pod / 'Kit' / 'KTView.m').write_text('\n')
+        (self.pod / 'Kit.podspec').write_text(SPEC)
+        self.cache_dir = self.temp_dir / 'cache'
+        self.umbrella = self.pod / 'Kit' / 'Kit.h'
+        self.modulemap = self.pod / 'Kit' / 'module.modulemap'
+
+    def tearDown(self):
+        """Clean up the test environment"""
+        shutil.rmtree(self.temp_dir)
+
+    def run_plan(self):
+        plan = plan_headers(self.pod / 'Kit.podspec', cache_dir=self.cache_dir)
+        return plan, apply_headers(plan)
+
+    def test_generate(self):
+        """Public headers minus private ones end up in the umbrella header"""
+        plan, written = self.run_plan()
+        self.assertEqual(plan.headers, ['Kit/Public/KTModel.h', 'Kit/Public/KTView.h'])
+        self.assertEqual(written, [self.umbrella, self.modulemap])
+        text = self.umbrella.read_text()
+        self.assertIn('#import <UIKit/UIKit.h>', text)
+        self.assertTrue(text.endswith('#import "KTModel.h"\n#import "KTView.h"\n'))
+        self.assertIn('framework module Kit {\n  umbrella header "Kit.h"', self.modulemap.read_text())
+
+    def test_incremental(self):
+        """Files are rewritten only when the header set changes"""
+        self.run_plan()
+        mtime = self.umbrella.stat().st_mtime_ns
+        plan, written = self.run_plan()
+        self.assertEqual((plan.outputs, written), ({}, []))
+        self.assertEqual(self.umbrella.stat().st_mtime_ns, mtime)
+
+        (self.pod / 'Kit' / 'Public' / 'KTNew.h').write_text('\n')
+        plan, written = self.run_plan()
+        self.assertEqual(plan.added, ['Kit/Public/KTNew.h'])
+        self.assertEqual(written, [self.umbrella])
+        self.assertIn('#import "KTNew.h"', self.umbrella.read_text())
+
+        # Without a manifest, identical content is still left untouched
+        shutil.rmtree(self.cache_dir)
+        mtime = self.modulemap.stat().st_mtime_ns
+        self.assertEqual(self.run_plan()[1], [])
+        self.assertEqual(self.modulemap.stat().st_mtime_ns, mtime)
+
+    def test_command(self):
+        """pod headers --check fails when files are stale and hand-written files are kept"""
+        config = mock.MagicMock()
+        config.get_cache_dir.return_value = self.cache_dir
+        self.umbrella.write_text('// hand written\n')
+        with mock.patch('builtins.print'):
+            self.assertFalse(cocoapods.generate_headers(self.pod, config, check=True))
+            self.assertFalse(cocoapods.generate_headers(self.pod, config))
+            self.assertEqual(self.umbrella.read_text(), '// hand written\n')
+            self.assertTrue(cocoapods.generate_headers(self.pod, config, force=True))
+            self.assertTrue(cocoapods.generate_headers(self.pod, config, check=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
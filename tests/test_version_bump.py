@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Tests for bulk version bumps
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lee_devkit.commands import cocoapods
+from lee_devkit.utils.version_bump import BumpError, bump_version, plan_bump
+
+PLIST = """<?xml version="1.0" encoding="UTF-8"?>
+<plist version="1.0">
+<dict>
+\t<key>CFBundleShortVersionString</key>
+\t<string>{version}</string>
+\t<key>CFBundleVersion</key>
+\t<string>1</string>
+</dict>
+</plist>
+"""
+
+PBXPROJ = """\t\t\tbuildSettings = {{
+\t\t\t\tMARKETING_VERSION = {version};
+\t\t\t}};
+\t\t\tbuildSettings = {{
+\t\t\t\tMARKETING_VERSION = "{version}";
+\t\t\t}};
+"""
+
+
+def write_module(root: Path, name: str, version: str, plist_version: str = None) -> Path:
+    """Write a module with a podspec, an example Info.plist and project"""
+    plist_version = plist_version or version
+    root.mkdir(parents=True)
+    (root / f'{name}.podspec').write_text(
+        f"Pod::Spec.new do |s|\n  s.name = '{name}'\n  s.version = \"{version}\"\n"
+        f"  s.source = {{ :git => 'x', :tag => s.version.to_s }}\nend\n")
+    app = root / 'Example' / f'{name}_Example'
+    app.mkdir(parents=True)
+    (app / 'Info.plist').write_text(PLIST.format(version=plist_version))
+    project = root / 'Example' / f'{name}_Example.xcodeproj'
+    project.mkdir()
+    (project / 'project.pbxproj').write_text(PBXPROJ.format(version=plist_version))
+    # Generated files under Pods are never touched
+    pods = root / 'Example' / 'Pods' / 'Target Support Files'
+    pods.mkdir(parents=True)
+    (pods / 'Pods-Info.plist').write_text(PLIST.format(version='9.9.9'))
+    return root
+
+
+class TestVersionBump(unittest.TestCase):
+    """Test version arithmetic, site discovery and atomic rewrites"""
+
+    def setUp(self):
+        """Create a workspace with two modules"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.core = write_module(self.temp_dir / 'Core', 'Core', '1.4.2')
+        self.net = write_module(self.temp_dir / 'Net', 'Net', '0.9.0-beta.1', '$(MARKETING_VERSION)')
+        # The host app keeps its own version
+        host = self.core / 'Example' / 'Host'
+        host.mkdir()
+        (host / 'Info.plist').write_text(PLIST.format(version='1.0'))
+
+    def tearDown(self):
+        """Clean up the test environment"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_bump_version(self):
+        """Parts increment semantically and explicit versions are validated"""
+        self.assertEqual(bump_version('1.4.2', 'patch'), '1.4.3')
+        self.assertEqual(bump_version('1.4.2', 'minor'), '1.5.0')
+        self.assertEqual(bump_version('1.4', 'major'), '2.0.0')
+        self.assertEqual(bump_version('0.9.0-beta.1', 'patch'), '0.9.1')
+        self.assertEqual(bump_version('1.4.2', '2.0.0-rc.1'), '2.0.0-rc.1')
+        with self.assertRaises(BumpError):
+            bump_version('1.4.2', 'next')
+
+    def test_bump_many_modules(self):
+        """Every module is bumped from its own version in one run"""
+        with mock.patch('builtins.print'):
+            self.assertTrue(cocoapods.bump_versions('minor', [str(self.temp_dir)]))
+
+        self.assertIn('s.version = "1.5.0"', (self.core / 'Core.podspec').read_text())
+        self.assertIn('s.version = "0.10.0"', (self.net / 'Net.podspec').read_text())
+        plist = (self.core / 'Example' / 'Core_Example' / 'Info.plist').read_text()
+        self.assertIn('<string>1.5.0</string>', plist)
+        self.assertIn('<string>1</string>', plist)
+        pbxproj = (self.core / 'Example' / 'Core_Example.xcodeproj' / 'project.pbxproj').read_text()
+        self.assertEqual(pbxproj, PBXPROJ.format(version='1.5.0'))
+        # Build setting references and generated Pods files are left alone
+        self.assertIn('$(MARKETING_VERSION)',
+                      (self.net / 'Example' / 'Net_Example' / 'Info.plist').read_text())
+        self.assertIn('9.9.9', (self.core / 'Example' / 'Pods' / 'Target Support Files'
+                                / 'Pods-Info.plist').read_text())
+        # Targets with an unrelated version are not renumbered
+        self.assertIn('<string>1.0</string>', (self.core / 'Example' / 'Host' / 'Info.plist').read_text())
+
+    def test_plan_sites(self):
+        """The plan lists every site with its previous values"""
+        modules = {m.name: m for m in plan_bump([self.core / 'Core.podspec', self.net], '2.0.0')}
+        self.assertEqual(modules['Core'].new_version, '2.0.0')
+        self.assertEqual([(s.kind, s.old_values) for s in modules['Core'].sites],
+                         [('podspec', ['1.4.2']), ('plist', ['1.4.2']), ('pbxproj', ['1.4.2', '1.4.2'])])
+        self.assertEqual([s.kind for s in modules['Net'].sites], ['podspec'])
+
+    def test_skip_other_versions(self):
+        """Values that differ from the podspec version are reported as skipped"""
+        pbxproj = self.core / 'Example' / 'Core_Example.xcodeproj' / 'project.pbxproj'
+        pbxproj.write_text(PBXPROJ.replace('"{version}"', '2.3').format(version='1.4.2'))
+        modules = {m.name: m for m in plan_bump([self.core], 'patch')}
+        core = modules['Core']
+        self.assertEqual([(s.kind, s.old_values) for s in core.sites],
+                         [('podspec', ['1.4.2']), ('plist', ['1.4.2']), ('pbxproj', ['1.4.2'])])
+        self.assertEqual([(path.name, kind, values) for path, kind, values in core.skipped],
+                         [('project.pbxproj', 'pbxproj', ['2.3']), ('Info.plist', 'plist', ['1.0'])])
+        self.assertIn('MARKETING_VERSION = 2.3;', core.sites[2].new_text)
+        self.assertIn('MARKETING_VERSION = 1.4.3;', core.sites[2].new_text)
+
+    def test_module_versions_must_agree(self):
+        """Podspecs sharing a module directory must have the same version"""
+        (self.core / 'CoreUI.podspec').write_text(
+            (self.core / 'Core.podspec').read_text().replace("'Core'", "'CoreUI'"))
+        modules = plan_bump([self.core], 'patch')
+        self.assertEqual((modules[0].name, modules[0].new_version), ('Core, CoreUI', '1.4.3'))
+
+        (self.core / 'CoreUI.podspec').write_text(
+            (self.core / 'CoreUI.podspec').read_text().replace('"1.4.2"', '"1.5.0"'))
+        with self.assertRaisesRegex(BumpError, 'Core 1.4.2, CoreUI 1.5.0'):
+            plan_bump([self.core], 'patch')
+
+    def test_all_or_nothing(self):
+        """A module that cannot be bumped leaves every file unchanged"""
+        (self.net / 'Net.podspec').write_text("Pod::Spec.new do |s|\n  s.name = 'Net'\n"
+                                              "  s.version = VERSION\nend\n")
+        before = (self.core / 'Core.podspec').read_text()
+        with mock.patch('builtins.print'):
+            self.assertFalse(cocoapods.bump_versions('patch', [str(self.temp_dir)]))
+        self.assertEqual((self.core / 'Core.podspec').read_text(), before)
+
+    def test_dry_run(self):
+        """--dry-run does not write"""
+        before = (self.core / 'Core.podspec').read_text()
+        with mock.patch('builtins.print'):
+            self.assertTrue(cocoapods.bump_versions('major', [str(self.core)], dry_run=True))
+        self.assertEqual((self.core / 'Core.podspec').read_text(), before)
+
+
+if __name__ == '__main__':
+    unittest.main()
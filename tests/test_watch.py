@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Tests for the file watchers and the watch command
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lee_devkit.commands import watch
+from lee_devkit.scaffold import LeeScaffold
+from lee_devkit.utils.file_watch import InotifyWatcher, PollingWatcher, is_ignored, wait_for_changes
+from lee_devkit.utils.podspec import Podspec
+
+SPEC = """Pod::Spec.new do |s|
+  s.name = 'Kit'
+  s.version = '1.0.0'
+  s.summary = 'Kit'
+  s.homepage = 'https://example.com/Kit'
+  s.license = { :type => 'MIT' }
+  s.authors = { 'Lee' => 'lee@example.com' }
+  s.source = { :git => 'https://example.com/Kit.git', :tag => s.version.to_s }
+  s.source_files = 'Kit/**/*.{h,m,swift}'
+  s.public_header_files = 'Kit/Public/*.h'
+  s.dependency 'Alamofire'
+end
+"""
+
+
+def write_later(path: Path, text: str, delay: float):
+    """Write a file from a background thread after a delay"""
+    def run():
+        time.sleep(delay)
+        path.write_text(text)
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+class TestWatchers(unittest.TestCase):
+    """Test the inotify and polling watchers and event batching"""
+
+    def setUp(self):
+        """Create a directory tree to watch"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        (self.temp_dir / 'Kit' / 'Sources').mkdir(parents=True)
+        (self.temp_dir / 'Pods').mkdir()
+
+    def tearDown(self):
+        """Clean up the test environment"""
+        shutil.rmtree(self.temp_dir)
+
+    def make_inotify(self):
+        try:
+            return InotifyWatcher(self.temp_dir)
+        except OSError as e:
+            self.skipTest(f"inotify unavailable: {e}")
+
+    def test_ignored(self):
+        """Hidden, skipped and editor temp files do not count as changes"""
+        self.assertTrue(is_ignored('.git/index'))
+        self.assertTrue(is_ignored('Kit/Pods/Manifest.lock'))
+        self.assertTrue(is_ignored('Kit/.Kit.h.123.tmp'))
+        self.assertTrue(is_ignored('Kit/A.swift~'))
+        self.assertFalse(is_ignored('Kit/Sources/A.swift'))
+
+    def test_inotify(self):
+        """Writes, new directories and their files are reported once per batch"""
+        watcher = self.make_inotify()
+        try:
+            self.assertEqual(watcher.read(0.05), set())
+            (self.temp_dir / 'Kit' / 'Sources' / 'A.swift').write_text('a')
+            (self.temp_dir / 'Kit' / '.hidden').write_text('h')
+            (self.temp_dir / 'Pods' / 'B.swift').write_text('b')
+            new_dir = self.temp_dir / 'Kit' / 'New' / 'Deep'
+            new_dir.mkdir(parents=True)
+            (new_dir / 'C.h').write_text('c')
+            changes = wait_for_changes(watcher, debounce=0.1, timeout=2)
+            self.assertIn('Kit/Sources/A.swift', changes)
+            self.assertIn('Kit/New/Deep/C.h', changes)
+            self.assertFalse(any('hidden' in path or path.startswith('Pods') for path in changes))
+
+            # The new directory is watched from now on
+            (new_dir / 'C.h').write_text('changed')
+            self.assertEqual(wait_for_changes(watcher, debounce=0.1, timeout=2), {'Kit/New/Deep/C.h'})
+        finally:
+            watcher.close()
+
+    def test_polling(self):
+        """The polling fallback reports added, modified and deleted files"""
+        source = self.temp_dir / 'Kit' / 'Sources' / 'A.swift'
+        source.write_text('a')
+        watcher = PollingWatcher(self.temp_dir, interval=0.02)
+        self.assertEqual(watcher.read(0.05), set())
+        source.write_text('changed')
+        (self.temp_dir / 'Kit' / 'B.swift').write_text('b')
+        self.assertEqual(watcher.read(1), {'Kit/Sources/A.swift', 'Kit/B.swift'})
+        source.unlink()
+        self.assertEqual(watcher.read(1), {'Kit/Sources/A.swift'})
+
+    def test_debounce(self):
+        """A burst of writes arrives as a single batch"""
+        watcher = PollingWatcher(self.temp_dir, interval=0.02)
+
+        def burst():
+            for index in range(5):
+                (self.temp_dir / 'Kit' / f'F{index}.m').write_text(str(index))
+                time.sleep(0.03)
+        thread = threading.Thread(target=burst)
+        thread.start()
+        changes = wait_for_changes(watcher, debounce=0.2, timeout=2)
+        thread.join()
+        self.assertEqual(changes, {f'Kit/F{index}.m' for index in range(5)})
+
+
+class TestWatchCommand(unittest.TestCase):
+    """Test mapping changes to checks and the watch loop"""
+
+    def setUp(self):
+        """Create a pod with Swift sources and public headers"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.root = self.temp_dir / 'repo'
+        kit = self.root / 'Kit'
+        (kit / 'Kit' / 'Public').mkdir(parents=True)
+        (kit / 'Kit' / 'A.swift').write_text('import Alamofire\n')
+        (kit / 'Kit' / 'Public' / 'KTView.h').write_text('@import Foundation;\n')
+        (kit / 'README.md').write_text('# Kit\n')
+        (kit / 'Kit.podspec').write_text(SPEC)
+        self.cache_dir = self.temp_dir / 'cache'
+        self.session = watch.WatchSession(self.root, ['lint', 'deps', 'headers'], cache_dir=self.cache_dir)
+
+    def tearDown(self):
+        """Clean up the test environment"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_plan(self):
+        """Changed files only re-run the checks that depend on them"""
+        self.assertEqual(self.session.plan({'Kit/Kit/A.swift'}), {'Kit': ['lint', 'deps']})
+        self.assertEqual(self.session.plan({'Kit/Kit/Public/KTView.h'}), {'Kit': ['lint', 'deps', 'headers']})
+        self.assertEqual(self.session.plan({'Kit/README.md', 'Other/file.txt'}), {})
+        self.assertEqual(self.session.plan(None), {'Kit': ['lint', 'deps', 'headers']})
+
+        # Podspec edits update the in-memory graph without a rebuild of untouched nodes
+        (self.root / 'Kit' / 'Kit.podspec').write_text(
+            SPEC.replace("'Kit/**/*.{h,m,swift}'", "'Kit/*.swift'").replace("'Kit/Public/*.h'", "'Kit/*.h'"))
+        self.assertEqual(self.session.plan({'Kit/Kit.podspec'}), {'Kit': ['lint', 'deps', 'headers']})
+        self.assertEqual(self.session.plan({'Kit/Kit/Public/KTView.h'}), {})
+        spec = self.session.spec('Kit')
+        self.assertIs(self.session.spec('Kit'), spec)
+
+    def test_run(self):
+        """Checks report failures and generated files do not trigger another run"""
+        with mock.patch('builtins.print'):
+            self.assertTrue(self.session.run(self.session.plan_all()))
+        umbrella = self.root / 'Kit' / 'Kit' / 'Kit.h'
+        self.assertTrue(umbrella.is_file())
+        self.assertEqual(self.session.plan({'Kit/Kit/Kit.h', 'Kit/Kit/module.modulemap'}), {})
+
+        (self.root / 'Kit' / 'Kit' / 'A.swift').write_text('import Missing\n')
+        with mock.patch('builtins.print') as mock_print:
+            self.assertFalse(self.session.run(self.session.plan({'Kit/Kit/A.swift'})))
+        printed = '\n'.join(str(call[0][0]) for call in mock_print.call_args_list)
+        self.assertIn('缺少依赖 Missing', printed)
+
+    def test_run_parses_once(self):
+        """All checks for a pod share the session's parsed podspec"""
+        with mock.patch.object(Podspec, 'from_file', wraps=Podspec.from_file) as from_file, \
+                mock.patch('builtins.print'):
+            self.assertTrue(self.session.run(self.session.plan_all()))
+            self.assertTrue(self.session.run(self.session.plan_all()))
+        self.assertEqual(from_file.call_count, 1)
+
+    def test_loop(self):
+        """The loop runs only the affected checks for each batch of changes"""
+        watcher = PollingWatcher(self.root, interval=0.02)
+        thread = write_later(self.root / 'Kit' / 'Kit' / 'B.swift', 'import Alamofire\n', 0.1)
+        with mock.patch('builtins.print') as mock_print:
+            self.assertTrue(watch.watch(self.session, watcher, debounce=0.1, max_runs=1, idle_timeout=2))
+        thread.join()
+        printed = '\n'.join(str(call[0][0]) for call in mock_print.call_args_list)
+        self.assertIn('1 个文件变更: Kit', printed)
+        self.assertIn('✅ Kit deps', printed)
+        self.assertNotIn('headers', printed)
+
+    def test_arguments(self):
+        """watch is registered as a top-level command"""
+        args = LeeScaffold().create_parser().parse_args(['watch', 'Pods', '--run', 'lint,headers', '--poll'])
+        self.assertEqual((args.command, args.path, args.run, args.poll), ('watch', 'Pods', 'lint,headers', True))
+        self.assertEqual(watch.parse_checks('deps, lint'), ['deps', 'lint'])
+        with self.assertRaises(ValueError):
+            watch.parse_checks('lint,build')
+
+
+if __name__ == '__main__':
+    unittest.main()
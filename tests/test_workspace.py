@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for the local development workspace generator
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add the parent directory to the path so we can import the module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from lee_devkit.commands import cocoapods
+from lee_devkit.utils.pod_graph import PodGraph
+from lee_devkit.utils.workspace import WorkspaceError, plan_workspace, select_pods
+from tests.test_pod_graph import write_pod
+
+
+def write_ios_pod(root: Path, name: str, dependencies=(), target='13.0') -> Path:
+    """Write a podspec with an iOS deployment target"""
+    return write_pod(root, name, dependencies, attributes=[f"ios.deployment_target = '{target}'"])
+
+
+class TestWorkspace(unittest.TestCase):
+    """Test pod selection, generated files and the pod workspace command"""
+
+    def setUp(self):
+        """Create local pods with a dependency chain"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.root = self.temp_dir / 'pods'
+        write_ios_pod(self.root, 'Core', ['Alamofire'])
+        write_ios_pod(self.root, 'Net', ['Core/Base'], target='14.0')
+        write_ios_pod(self.root, 'UI', ['Net'])
+        write_ios_pod(self.root / 'features', 'Chat', ['UI'], target='13.4')
+        write_ios_pod(self.root, 'Other')
+        self.config = mock.MagicMock()
+        self.config.get_cache_dir.return_value = self.temp_dir / 'cache'
+
+    def tearDown(self):
+        """Clean up the test environment"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_select(self):
+        """Selected pods bring in their local dependency closure"""
+        graph = PodGraph.build(self.root)
+        self.assertEqual(select_pods(graph, ['Chat']), ['Chat', 'Core', 'Net', 'UI'])
+        self.assertEqual(select_pods(graph), ['Chat', 'Core', 'Net', 'Other', 'UI'])
+        with self.assertRaises(WorkspaceError):
+            select_pods(graph, ['Missing'])
+
+    def test_files(self):
+        """The Podfile uses :path entries and the workspace references every pod"""
+        graph = PodGraph.build(self.root)
+        output = self.root / 'DevWorkspace'
+        selected, files = plan_workspace(graph, output, ['UI'], project=str(self.root / 'App' / 'App.xcodeproj'))
+        podfile = files[output.resolve() / 'Podfile']
+        self.assertIn("platform :ios, '14.0'", podfile)
+        self.assertIn("project '../App/App.xcodeproj'", podfile)
+        self.assertIn("target 'Dev' do\n  pod 'Core', :path => '../Core'\n  pod 'Net', :path => '../Net'\n"
+                      "  pod 'UI', :path => '../UI'\nend\n", podfile)
+        workspace = files[output.resolve() / 'Dev.xcworkspace' / 'contents.xcworkspacedata']
+        self.assertIn('location = "group:../App/App.xcodeproj"', workspace)
+        self.assertIn('location = "group:Pods/Pods.xcodeproj"', workspace)
+        self.assertIn('location = "group:../Net"', workspace)
+
+    def test_command(self):
+        """Regeneration reuses cached discovery and leaves unchanged files alone"""
+        with mock.patch('builtins.print'):
+            self.assertTrue(cocoapods.generate_workspace(self.root, self.config, pods=['Chat']))
+        podfile = self.root / 'DevWorkspace' / 'Podfile'
+        self.assertIn("pod 'Chat', :path => '../features/Chat'", podfile.read_text())
+        mtime = podfile.stat().st_mtime_ns
+
+        with mock.patch('builtins.print'):
+            self.assertTrue(cocoapods.generate_workspace(self.root, self.config, pods=['Chat']))
+        self.assertEqual(podfile.stat().st_mtime_ns, mtime)
+        graph = cocoapods.load_pod_graph(self.root, self.config)
+        self.assertEqual(graph.discovery, 'cached')
+
+        podfile.write_text("platform :ios, '13.0'\n")
+        with mock.patch('builtins.print'):
+            self.assertFalse(cocoapods.generate_workspace(self.root, self.config))
+            self.assertFalse(cocoapods.generate_workspace(self.root, self.config, pods=['Missing'], force=True))
+            self.assertTrue(cocoapods.generate_workspace(self.root, self.config, force=True))
+        self.assertIn("pod 'Other'", podfile.read_text())
+
+
+if __name__ == '__main__':
+    unittest.main()